@@ -122,6 +122,7 @@ class Settings(BaseSettings):
     MAX_WEBSOCKET_CONNECTIONS: int = 500
     MAX_CONNECTIONS_PER_LOBBY: int = 10
     LOBBY_CACHE_TTL_SECONDS: float = 5.0
+    TICK_WORKER_PROCESSES: int = 0  # >0 runs game simulation in sharded worker processes
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
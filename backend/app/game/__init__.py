@@ -5,17 +5,52 @@ Contains authoritative game logic for competitive multiplayer.
 
 Architecture:
 - config.py: All tunable parameters
-- models.py: Data structures
+- models.py: Data structures (slotted per-tick models)
+- pool.py: Freelists recycling inputs, rewind frames and projectiles
 - validation.py: Input validation and anti-cheat
 - lag_compensation.py: Position history and hit detection
 - tick_system.py: Orchestrator (60Hz game loop)
+- combat.py / projectiles.py: Projectile combat (dict or NumPy store)
+- sweep.py: Swept segment tests (earliest time of impact) for projectiles
+- scheduler.py: Shared fixed-timestep loop for all matches
+- rate_control.py: Activity-aware per-match tick and broadcast rates
+- map_registry.py: Arena maps compiled once per layout, shared by matches
+- input_log.py: Per-match binary input log and offline re-simulation
+- timers.py: Deadline heap for respawns, buffs, despawns and quiz timeouts
+- sharding.py: Multi-process tick workers (lobby-hashed shards)
+- snapshots.py: Per-client delta-encoded state snapshots
+- state_cache.py: Dirty-tracked per-entity state fragments for broadcasts
+- frames.py: Per-tick bundling of events and state into one message
+- profiler.py: Per-phase tick timing histograms
+- simulation.py: Headless seeded match simulator for benchmarks
 """
 
-from .config import TICK_CONFIG, MOVEMENT_CONFIG, LAG_COMP_CONFIG, ANTI_CHEAT_CONFIG
-from .models import GameState, PlayerState, PlayerInput, PositionFrame, ViolationType
+from .config import (
+    TICK_CONFIG,
+    MOVEMENT_CONFIG,
+    LAG_COMP_CONFIG,
+    ANTI_CHEAT_CONFIG,
+    SCHEDULER_CONFIG,
+    RATE_CONFIG,
+    COMBAT_CONFIG,
+    NETWORK_CONFIG,
+    PROFILER_CONFIG,
+    POOL_CONFIG,
+    MAP_CONFIG,
+    INPUT_LOG_CONFIG,
+)
+from .models import GameState, PlayerState, PlayerInput, PositionFrame, PositionHistory, ViolationType
 from .validation import InputValidator
 from .lag_compensation import LagCompensator
+from .scheduler import TickScheduler
+from .rate_control import RateController
 from .tick_system import TickSystem, tick_system
+from .sharding import ShardedTickSystem
+from .snapshots import SnapshotRegistry, snapshot_registry
+from .frames import TickFrame
+from .map_registry import MapRegistry, map_registry
+from .input_log import InputLogWriter, resimulate
+from .profiler import TickProfiler
 
 __all__ = [
     # Config
@@ -23,15 +58,35 @@ __all__ = [
     "MOVEMENT_CONFIG",
     "LAG_COMP_CONFIG",
     "ANTI_CHEAT_CONFIG",
+    "SCHEDULER_CONFIG",
+    "RATE_CONFIG",
+    "COMBAT_CONFIG",
+    "NETWORK_CONFIG",
+    "PROFILER_CONFIG",
+    "POOL_CONFIG",
+    "MAP_CONFIG",
+    "INPUT_LOG_CONFIG",
     # Models
     "GameState",
     "PlayerState",
     "PlayerInput",
     "PositionFrame",
+    "PositionHistory",
     "ViolationType",
     # Services
     "InputValidator",
     "LagCompensator",
+    "TickScheduler",
+    "RateController",
     "TickSystem",
+    "ShardedTickSystem",
+    "SnapshotRegistry",
+    "snapshot_registry",
+    "TickFrame",
+    "MapRegistry",
+    "map_registry",
+    "InputLogWriter",
+    "resimulate",
+    "TickProfiler",
     "tick_system",
 ]
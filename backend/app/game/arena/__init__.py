@@ -10,6 +10,8 @@ Server-authoritative arena mechanics split into focused modules:
 - platforms: Moving platforms
 - barriers: Barriers and destructibles
 - powerups: Power-up spawning and collection
+- spatial: Shared uniform-grid broadphase for collision queries
+- maps: Parsed, immutable map definitions (ArenaMap)
 - systems: Main coordinator (ServerArenaSystems)
 """
 
@@ -32,6 +34,8 @@ from .doors import DoorState, DoorTrigger, ServerDoor, DoorManager
 from .platforms import MovementType, ServerPlatform, PlatformManager
 from .barriers import BarrierType, ServerBarrier, BarrierManager, DamageResult
 from .powerups import PowerUpType, ServerPowerUp, PowerUpManager, PowerUpCollectionResult
+from .spatial import SpatialHashGrid
+from .maps import ArenaMap, parse_map
 from .systems import ServerArenaSystems
 
 __all__ = [
@@ -69,6 +73,11 @@ __all__ = [
     "PlatformManager",
     "BarrierManager",
     "PowerUpManager",
+    # Broadphase
+    "SpatialHashGrid",
+    # Map definitions
+    "ArenaMap",
+    "parse_map",
     # Main system
     "ServerArenaSystems",
 ]
@@ -13,7 +13,9 @@ from enum import Enum
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 
+from ..state_cache import FragmentCache
 from .types import ArenaEvent
+from .spatial import SpatialHashGrid, LAYER_BARRIER
 
 
 class BarrierType(str, Enum):
@@ -53,11 +55,16 @@ class BarrierManager:
     Server-authoritative barrier management.
     
     Handles barrier state, collision, damage, and destruction.
+    Active barriers are indexed in a spatial grid; destroyed or removed
+    barriers drop out of it. Broadcast fragments are cached per barrier
+    and only rebuilt when a barrier is added or damaged.
     """
     
-    def __init__(self):
+    def __init__(self, grid: Optional[SpatialHashGrid] = None):
         self.barriers: Dict[str, ServerBarrier] = {}
         self._events: List[ArenaEvent] = []
+        self._grid = grid if grid is not None else SpatialHashGrid()
+        self._fragments: FragmentCache[str] = FragmentCache(self._fragment)
     
     def add(
         self,
@@ -84,6 +91,8 @@ class BarrierManager:
             direction=direction,
         )
         self.barriers[id] = barrier
+        self._grid.insert(LAYER_BARRIER, id, x, y, width, height)
+        self._fragments.mark(id)
         
         self._events.append(ArenaEvent(
             event_type="barrier_spawn",
@@ -106,6 +115,8 @@ class BarrierManager:
         """Remove a barrier."""
         if id in self.barriers:
             del self.barriers[id]
+            self._grid.remove(LAYER_BARRIER, id)
+            self._fragments.drop(id)
             self._events.append(ArenaEvent(
                 event_type="barrier_removed",
                 data={"id": id},
@@ -135,6 +146,7 @@ class BarrierManager:
         old_health = barrier.health
         barrier.health = max(0, barrier.health - damage)
         actual_damage = old_health - barrier.health
+        self._fragments.mark(id)
         
         destroyed = barrier.health <= 0
         
@@ -153,6 +165,7 @@ class BarrierManager:
         # Handle destruction
         if destroyed:
             barrier.is_active = False
+            self._grid.remove(LAYER_BARRIER, id)
             self._events.append(ArenaEvent(
                 event_type="barrier_destroyed",
                 data={
@@ -179,7 +192,8 @@ class BarrierManager:
         
         Returns barrier ID if collision, None otherwise.
         """
-        for barrier in self.barriers.values():
+        for barrier_id in self._grid.query_circle(LAYER_BARRIER, x, y, radius):
+            barrier = self.barriers[barrier_id]
             if not barrier.is_active:
                 continue
             
@@ -204,7 +218,8 @@ class BarrierManager:
         Half walls don't block projectiles.
         Returns barrier ID if collision, None otherwise.
         """
-        for barrier in self.barriers.values():
+        for barrier_id in self._grid.query_point(LAYER_BARRIER, x, y):
+            barrier = self.barriers[barrier_id]
             if not barrier.is_active:
                 continue
             
@@ -277,21 +292,28 @@ class BarrierManager:
     
     def get_state(self) -> List[dict]:
         """Get current barrier state for broadcast."""
-        return [
-            {
-                "id": b.id,
-                "x": b.x,
-                "y": b.y,
-                "width": b.width,
-                "height": b.height,
-                "type": b.barrier_type.value,
-                "health": b.health,
-                "max_health": b.max_health,
-                "is_active": b.is_active,
-                "direction": b.direction,
-            }
-            for b in self.barriers.values()
-        ]
+        return self._fragments.state()
+
+    def _fragment(self, barrier_id: str) -> Optional[dict]:
+        b = self.barriers.get(barrier_id)
+        if b is None:
+            return None
+        return {
+            "id": b.id,
+            "x": b.x,
+            "y": b.y,
+            "width": b.width,
+            "height": b.height,
+            "type": b.barrier_type.value,
+            "health": b.health,
+            "max_health": b.max_health,
+            "is_active": b.is_active,
+            "direction": b.direction,
+        }
+    
+    def has_pending_events(self) -> bool:
+        """True if events are waiting for get_and_clear_events."""
+        return bool(self._events)
     
     def get_and_clear_events(self) -> List[ArenaEvent]:
         """Get and clear pending events."""
@@ -302,4 +324,6 @@ class BarrierManager:
     def clear(self) -> None:
         """Clear all barriers."""
         self.barriers.clear()
+        self._fragments.clear()
         self._events.clear()
+        self._grid.clear(LAYER_BARRIER)
@@ -13,7 +13,9 @@ from enum import Enum
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 
+from ..state_cache import FragmentCache
 from .types import ArenaEvent
+from .spatial import SpatialHashGrid, LAYER_DOOR
 
 
 class DoorState(str, Enum):
@@ -59,12 +61,18 @@ class DoorManager:
     Server-authoritative door management.
     
     Handles door state, collision, and trigger linking.
+    Doors are indexed at their closed bounds; the sliding collision rect
+    always stays inside them, so the index never needs updating.
+    Broadcast fragments are cached per door and only rebuilt while a door
+    is triggered or sliding.
     """
     
-    def __init__(self):
+    def __init__(self, grid: Optional[SpatialHashGrid] = None):
         self.doors: Dict[str, ServerDoor] = {}
         self.trigger_links: Dict[str, List[str]] = {}  # trigger_id -> door_ids
         self._events: List[ArenaEvent] = []
+        self._grid = grid if grid is not None else SpatialHashGrid()
+        self._fragments: FragmentCache[str] = FragmentCache(self._fragment)
     
     def add(
         self,
@@ -93,6 +101,8 @@ class DoorManager:
             open_duration=open_duration,
         )
         self.doors[id] = door
+        self._grid.insert(LAYER_DOOR, id, x, y, width, height)
+        self._fragments.mark(id)
         
         # Link to trigger
         if linked_trigger_id:
@@ -103,6 +113,8 @@ class DoorManager:
     def remove(self, id: str) -> None:
         """Remove a door."""
         door = self.doors.pop(id, None)
+        self._grid.remove(LAYER_DOOR, id)
+        self._fragments.drop(id)
         if door and door.linked_trigger_id:
             links = self.trigger_links.get(door.linked_trigger_id, [])
             if id in links:
@@ -133,6 +145,7 @@ class DoorManager:
         
         door.state = DoorState.OPENING
         door.last_trigger_time = current_time
+        self._fragments.mark(door_id)
         self._events.append(ArenaEvent(
             event_type="door_opening",
             data={"door_id": door_id},
@@ -146,6 +159,7 @@ class DoorManager:
         
         door.state = DoorState.CLOSING
         door.last_trigger_time = current_time
+        self._fragments.mark(door_id)
         self._events.append(ArenaEvent(
             event_type="door_closing",
             data={"door_id": door_id},
@@ -158,6 +172,7 @@ class DoorManager:
             anim_speed = 1.0 / door.open_duration if door.open_duration > 0 else 10.0
             
             if door.state == DoorState.OPENING:
+                self._fragments.mark(door.id)
                 door.progress = min(1.0, door.progress + delta_time * anim_speed)
                 door.is_blocking = door.progress < 0.8
                 
@@ -171,6 +186,7 @@ class DoorManager:
                     ))
             
             elif door.state == DoorState.CLOSING:
+                self._fragments.mark(door.id)
                 door.progress = max(0.0, door.progress - delta_time * anim_speed)
                 door.is_blocking = door.progress > 0.2
                 
@@ -193,7 +209,8 @@ class DoorManager:
         self, x: float, y: float, radius: float
     ) -> Optional[str]:
         """Check if position collides with any blocking door."""
-        for door in self.doors.values():
+        for door_id in self._grid.query_circle(LAYER_DOOR, x, y, radius):
+            door = self.doors[door_id]
             if not door.is_blocking:
                 continue
             
@@ -232,15 +249,22 @@ class DoorManager:
     
     def get_state(self) -> List[dict]:
         """Get current door state for broadcast."""
-        return [
-            {
-                "id": d.id,
-                "state": d.state.value,
-                "progress": d.progress,
-                "is_blocking": d.is_blocking,
-            }
-            for d in self.doors.values()
-        ]
+        return self._fragments.state()
+
+    def _fragment(self, door_id: str) -> Optional[dict]:
+        d = self.doors.get(door_id)
+        if d is None:
+            return None
+        return {
+            "id": d.id,
+            "state": d.state.value,
+            "progress": d.progress,
+            "is_blocking": d.is_blocking,
+        }
+    
+    def has_pending_events(self) -> bool:
+        """True if events are waiting for get_and_clear_events."""
+        return bool(self._events)
     
     def get_and_clear_events(self) -> List[ArenaEvent]:
         """Get and clear pending events."""
@@ -251,5 +275,7 @@ class DoorManager:
     def clear(self) -> None:
         """Clear all doors."""
         self.doors.clear()
+        self._fragments.clear()
         self.trigger_links.clear()
         self._events.clear()
+        self._grid.clear(LAYER_DOOR)
@@ -3,20 +3,42 @@ Hazard Manager - Handles damage zones, slow fields, EMP zones.
 """
 
 import time
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
+from ..state_cache import FragmentCache
+from ..timers import TimerQueue
+from .spatial import SpatialHashGrid, LAYER_HAZARD
 from .types import HazardType, ServerHazard, Bounds, ArenaEvent
 
 
 class HazardManager:
-    """Manages server-side hazard state and effects."""
+    """
+    Manages server-side hazard state and effects.
+
+    Hazards are indexed in the spatial grid. Each player caches the
+    hazards covering its current cell and only re-queries the grid when
+    it changes cell (or hazards are added/removed), so a tick tests the
+    player against the few hazards near it plus the ones it is already
+    inside (for exits), not against every hazard on the map.
+
+    Broadcast fragments are cached per hazard (state_cache.py) and only
+    rebuilt when a hazard is added.
+    """
 
     DAMAGE_TICK_INTERVAL = 0.5  # seconds
 
-    def __init__(self):
+    def __init__(self, grid: Optional[SpatialHashGrid] = None):
         self._hazards: Dict[str, ServerHazard] = {}
         self._player_damage_ticks: Dict[str, Dict[str, float]] = {}
         self._pending_events: List[ArenaEvent] = []
+        self._despawns: TimerQueue[str] = TimerQueue()
+        self._grid = grid if grid is not None else SpatialHashGrid()
+        self._version = 0  # Bumped when hazards are added or removed
+        # player_id -> (cell, version, hazard ids covering the cell)
+        self._player_cells: Dict[str, Tuple[Tuple[int, int], int, List[str]]] = {}
+        # player_id -> hazard ids the player is inside (ordered by entry)
+        self._inside: Dict[str, Dict[str, None]] = {}
+        self._fragments: FragmentCache[str] = FragmentCache(self._fragment)
 
     def add(
         self,
@@ -38,6 +60,13 @@ class HazardManager:
             despawn_time=despawn_time,
         )
         self._hazards[id] = hazard
+        self._grid.insert(LAYER_HAZARD, id, x, y, width, height)
+        self._version += 1
+        self._fragments.mark(id)
+        if despawn_time:
+            self._despawns.schedule(id, despawn_time)
+        else:
+            self._despawns.cancel(id)
         self._pending_events.append(
             ArenaEvent(
                 "hazard_spawn",
@@ -55,21 +84,45 @@ class HazardManager:
         """Remove a hazard from the arena."""
         if id in self._hazards:
             del self._hazards[id]
+            self._grid.remove(LAYER_HAZARD, id)
+            self._fragments.drop(id)
+            self._version += 1
+            for inside in self._inside.values():
+                inside.pop(id, None)
+            self._despawns.cancel(id)
             self._pending_events.append(ArenaEvent("hazard_despawn", {"id": id}))
 
     def update(
         self, player_positions: Dict[str, Tuple[float, float]], current_time: float
     ) -> None:
-        """Update hazard effects on players."""
-        for hazard_id, hazard in self._hazards.items():
-            if not hazard.is_active:
-                continue
+        """Update hazard effects on players (enter/exit events, damage ticks)."""
+        for player_id, (px, py) in player_positions.items():
+            inside = self._inside.get(player_id)
+            if inside is None:
+                inside = self._inside[player_id] = {}
+
+            # Exits: hazards the player was in that no longer contain it
+            for hazard_id in [
+                hid for hid in inside
+                if self._hazards[hid].is_active and not self._hazards[hid].bounds.contains(px, py)
+            ]:
+                del inside[hazard_id]
+                self._hazards[hazard_id].players_inside.discard(player_id)
+                self._pending_events.append(
+                    ArenaEvent(
+                        "hazard_exit",
+                        {"hazard_id": hazard_id, "player_id": player_id},
+                    )
+                )
 
-            for player_id, (px, py) in player_positions.items():
-                was_inside = player_id in hazard.players_inside
-                is_inside = hazard.bounds.contains(px, py)
+            # Enters and damage: only hazards covering the player's cell
+            for hazard_id in self._candidates(player_id, px, py):
+                hazard = self._hazards[hazard_id]
+                if not hazard.is_active or not hazard.bounds.contains(px, py):
+                    continue
 
-                if is_inside and not was_inside:
+                if hazard_id not in inside:
+                    inside[hazard_id] = None
                     hazard.players_inside.add(player_id)
                     self._pending_events.append(
                         ArenaEvent(
@@ -81,19 +134,21 @@ class HazardManager:
                             },
                         )
                     )
-                elif not is_inside and was_inside:
-                    hazard.players_inside.discard(player_id)
-                    self._pending_events.append(
-                        ArenaEvent(
-                            "hazard_exit",
-                            {"hazard_id": hazard_id, "player_id": player_id},
-                        )
-                    )
 
                 # Apply damage ticks
-                if is_inside and hazard.type == HazardType.DAMAGE:
+                if hazard.type == HazardType.DAMAGE:
                     self._apply_damage(player_id, hazard_id, hazard.intensity, current_time)
 
+    def _candidates(self, player_id: str, px: float, py: float) -> List[str]:
+        """Hazards covering the player's cell, re-queried only on cell or hazard changes."""
+        cell = self._grid.cell_of(px, py)
+        cached = self._player_cells.get(player_id)
+        if cached is not None and cached[0] == cell and cached[1] == self._version:
+            return cached[2]
+        candidates = self._grid.query_point(LAYER_HAZARD, px, py)
+        self._player_cells[player_id] = (cell, self._version, candidates)
+        return candidates
+
     def _apply_damage(
         self, player_id: str, hazard_id: str, intensity: float, current_time: float
     ) -> None:
@@ -113,46 +168,50 @@ class HazardManager:
             )
 
     def check_despawns(self, current_time: float) -> None:
-        """Check for dynamic despawns."""
-        to_remove = [
-            h.id for h in self._hazards.values()
-            if h.despawn_time and current_time >= h.despawn_time
-        ]
-        for hid in to_remove:
+        """Remove hazards whose despawn time has passed."""
+        for hid in self._despawns.pop_due(current_time):
             self.remove(hid)
 
     def get_speed_multiplier(self, player_id: str) -> float:
         """Get speed multiplier for player (from slow fields)."""
         multiplier = 1.0
-        for hazard in self._hazards.values():
-            if hazard.type == HazardType.SLOW and player_id in hazard.players_inside:
+        for hazard_id in self._inside.get(player_id, ()):
+            hazard = self._hazards[hazard_id]
+            if hazard.type == HazardType.SLOW:
                 multiplier = min(multiplier, 1.0 - hazard.intensity * 0.5)
         return multiplier
 
     def are_powerups_disabled(self, player_id: str) -> bool:
         """Check if powerups are disabled for player (EMP zone)."""
-        for hazard in self._hazards.values():
-            if hazard.type == HazardType.EMP and player_id in hazard.players_inside:
-                return True
-        return False
+        return any(
+            self._hazards[hazard_id].type == HazardType.EMP
+            for hazard_id in self._inside.get(player_id, ())
+        )
 
     def get_state(self) -> List[dict]:
         """Get current hazard state for broadcast."""
-        return [
-            {
-                "id": h.id,
-                "type": h.type.value,
-                "bounds": {
-                    "x": h.bounds.x,
-                    "y": h.bounds.y,
-                    "width": h.bounds.width,
-                    "height": h.bounds.height,
-                },
-                "intensity": h.intensity,
-                "active": h.is_active,
-            }
-            for h in self._hazards.values()
-        ]
+        return self._fragments.state()
+
+    def _fragment(self, hazard_id: str) -> Optional[dict]:
+        h = self._hazards.get(hazard_id)
+        if h is None:
+            return None
+        return {
+            "id": h.id,
+            "type": h.type.value,
+            "bounds": {
+                "x": h.bounds.x,
+                "y": h.bounds.y,
+                "width": h.bounds.width,
+                "height": h.bounds.height,
+            },
+            "intensity": h.intensity,
+            "active": h.is_active,
+        }
+
+    def has_pending_events(self) -> bool:
+        """True if events are waiting for get_and_clear_events."""
+        return bool(self._pending_events)
 
     def get_and_clear_events(self) -> List[ArenaEvent]:
         """Get pending events and clear the queue."""
@@ -163,5 +222,11 @@ class HazardManager:
     def clear(self) -> None:
         """Clear all hazards."""
         self._hazards.clear()
+        self._fragments.clear()
+        self._grid.clear(LAYER_HAZARD)
+        self._version += 1
+        self._player_cells.clear()
+        self._inside.clear()
+        self._despawns.clear()
         self._player_damage_ticks.clear()
         self._pending_events.clear()
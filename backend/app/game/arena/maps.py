@@ -0,0 +1,253 @@
+"""
+Arena Map Definitions - Parsed, validated, immutable map configs.
+
+Single responsibility: turn the client's arena config dict into an
+ArenaMap of typed spec tuples, once. ServerArenaSystems loads a match
+from an ArenaMap by passing each spec straight to its manager's add().
+
+An ArenaMap may carry a prebuilt SpatialHashGrid of its static layout
+(see app/game/map_registry.py). The grid is shared by every match on the
+map and must never be mutated; matches load it copy-on-write.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .types import HazardType, TrapType, TrapEffect
+from .barriers import BarrierType
+from .spatial import SpatialHashGrid
+
+# Client map config barrier type names -> BarrierType values
+MAP_BARRIER_TYPES = {
+    "full": BarrierType.SOLID.value,
+    "half": BarrierType.HALF_WALL.value,
+}
+
+# Client trap effect names -> TrapEffect values
+MAP_TRAP_EFFECTS = {
+    "damage_burst": TrapEffect.DAMAGE.value,
+}
+
+# Extra clearance around transport pads and spawn points for dynamic spawns
+PAD_EXCLUSION_MARGIN = 60
+SPAWN_EXCLUSION_RADIUS = 100
+
+
+class HazardSpec(NamedTuple):
+    """HazardManager.add() arguments."""
+    id: str
+    type: HazardType
+    x: float
+    y: float
+    width: float
+    height: float
+    intensity: float
+
+
+class TrapSpec(NamedTuple):
+    """TrapManager.add() arguments."""
+    id: str
+    type: TrapType
+    x: float
+    y: float
+    radius: float
+    effect: TrapEffect
+    effect_value: float
+    cooldown: float
+    interval: Optional[float]
+    chain_radius: Optional[float]
+
+
+class TeleporterSpec(NamedTuple):
+    """TransportManager.add_teleporter() arguments."""
+    id: str
+    pair_id: str
+    x: float
+    y: float
+    radius: float
+
+
+class JumpPadSpec(NamedTuple):
+    """TransportManager.add_jump_pad() arguments."""
+    id: str
+    x: float
+    y: float
+    radius: float
+    direction: Any  # Direction name or (dx, dy)
+    force: float
+
+
+class DoorSpec(NamedTuple):
+    """DoorManager.add() arguments."""
+    id: str
+    x: float
+    y: float
+    width: float
+    height: float
+    direction: str
+    trigger: str
+    linked_trigger_id: Optional[str]
+    auto_close_delay: float
+    open_duration: float
+
+
+class PlatformSpec(NamedTuple):
+    """PlatformManager.add() arguments."""
+    id: str
+    width: float
+    height: float
+    waypoints: Tuple[Dict[str, float], ...]
+    speed: float
+    movement_type: str
+    loop: bool
+    pause_at_waypoints: float
+
+
+class BarrierSpec(NamedTuple):
+    """BarrierManager.add() arguments."""
+    id: str
+    x: float
+    y: float
+    width: float
+    height: float
+    barrier_type: str
+    health: int
+    direction: Optional[str]
+
+
+class PowerUpSpec(NamedTuple):
+    """PowerUpManager.spawn() arguments."""
+    id: str
+    x: float
+    y: float
+    powerup_type: str
+    radius: float
+
+
+@dataclass(frozen=True)
+class ArenaMap:
+    """Immutable arena layout, shared by every match on the map."""
+    hazards: Tuple[HazardSpec, ...] = ()
+    traps: Tuple[TrapSpec, ...] = ()
+    teleporters: Tuple[TeleporterSpec, ...] = ()
+    jump_pads: Tuple[JumpPadSpec, ...] = ()
+    doors: Tuple[DoorSpec, ...] = ()
+    platforms: Tuple[PlatformSpec, ...] = ()
+    barriers: Tuple[BarrierSpec, ...] = ()
+    powerups: Tuple[PowerUpSpec, ...] = ()
+    exclusion_zones: Tuple[Dict[str, float], ...] = ()  # Dynamic spawn keep-out circles
+    grid: Optional[SpatialHashGrid] = None  # Prebuilt static index (read-only)
+
+
+def _pos(entry: dict, key: str = "position") -> Tuple[float, float]:
+    return entry[key]["x"], entry[key]["y"]
+
+
+def _hazard(h: dict) -> HazardSpec:
+    b = h["bounds"]
+    return HazardSpec(
+        h["id"], HazardType(h["type"]),
+        b["x"], b["y"], b["width"], b["height"],
+        h.get("intensity", 1.0),
+    )
+
+
+def _trap(t: dict) -> TrapSpec:
+    effect = t["effect"]
+    return TrapSpec(
+        t["id"], TrapType(t["type"]), *_pos(t), t["radius"],
+        TrapEffect(MAP_TRAP_EFFECTS.get(effect, effect)),
+        t.get("effectValue", 10), t.get("cooldown", 5.0),
+        t.get("interval"), t.get("chainRadius"),
+    )
+
+
+def _teleporter(tp: dict) -> TeleporterSpec:
+    return TeleporterSpec(tp["id"], tp["pairId"], *_pos(tp), tp["radius"])
+
+
+def _jump_pad(jp: dict) -> JumpPadSpec:
+    direction = jp["direction"]
+    if not isinstance(direction, str):
+        direction = tuple(direction)
+    return JumpPadSpec(jp["id"], *_pos(jp), jp["radius"], direction, jp["force"])
+
+
+def _door(door: dict) -> DoorSpec:
+    return DoorSpec(
+        door["id"], *_pos(door), door["size"]["width"], door["size"]["height"],
+        door.get("direction", "horizontal"), door.get("trigger", "manual"),
+        door.get("linkedTriggerId"), door.get("autoCloseDelay", 0),
+        door.get("openDuration", 0.5),
+    )
+
+
+def _platform(plat: dict) -> PlatformSpec:
+    return PlatformSpec(
+        plat["id"], plat["size"]["width"], plat["size"]["height"],
+        tuple({"x": wp["x"], "y": wp["y"]} for wp in plat["waypoints"]),
+        plat["speed"], plat.get("movementType", "linear"),
+        plat.get("loop", True), plat.get("pauseAtWaypoints", 0),
+    )
+
+
+def _barrier(barrier: dict) -> BarrierSpec:
+    # Client map configs use size {x, y} and full/half types
+    size = barrier["size"]
+    barrier_type = barrier.get("type", "solid")
+    return BarrierSpec(
+        barrier["id"], *_pos(barrier),
+        size["width"] if "width" in size else size["x"],
+        size["height"] if "height" in size else size["y"],
+        MAP_BARRIER_TYPES.get(barrier_type, barrier_type),
+        barrier.get("health", 100), barrier.get("direction"),
+    )
+
+
+def _powerup(powerup: dict) -> PowerUpSpec:
+    return PowerUpSpec(powerup["id"], *_pos(powerup), powerup["type"], powerup.get("radius", 30))
+
+
+def _section(config: dict, key: str, parse: Callable[[dict], Any]) -> tuple:
+    specs = []
+    for i, entry in enumerate(config.get(key) or ()):
+        try:
+            specs.append(parse(entry))
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid {key}[{i}]: {type(e).__name__}: {e}") from e
+    return tuple(specs)
+
+
+def _exclusion_zones(config: dict) -> Tuple[Dict[str, float], ...]:
+    zones: List[Dict[str, float]] = []
+    for key in ("teleporters", "jumpPads"):
+        for pad in config.get(key) or ():
+            x, y = _pos(pad)
+            zones.append({"x": x, "y": y, "radius": pad["radius"] + PAD_EXCLUSION_MARGIN})
+    for sp in config.get("spawnPoints") or ():
+        x, y = _pos(sp)
+        zones.append({"x": x, "y": y, "radius": SPAWN_EXCLUSION_RADIUS})
+    return tuple(zones)
+
+
+def parse_map(config: dict) -> ArenaMap:
+    """
+    Parse and validate a client arena config.
+
+    Raises ValueError naming the first malformed entry.
+    """
+    try:
+        exclusion_zones = _exclusion_zones(config)
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Invalid spawn or transport position: {type(e).__name__}: {e}") from e
+    return ArenaMap(
+        hazards=_section(config, "hazards", _hazard),
+        traps=_section(config, "traps", _trap),
+        teleporters=_section(config, "teleporters", _teleporter),
+        jump_pads=_section(config, "jumpPads", _jump_pad),
+        doors=_section(config, "doors", _door),
+        platforms=_section(config, "platforms", _platform),
+        barriers=_section(config, "barriers", _barrier),
+        powerups=_section(config, "powerups", _powerup),
+        exclusion_zones=exclusion_zones,
+    )
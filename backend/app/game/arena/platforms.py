@@ -9,7 +9,9 @@ from enum import Enum
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 
+from ..state_cache import FragmentCache
 from .types import ArenaEvent
+from .spatial import SpatialHashGrid, LAYER_PLATFORM
 
 
 class MovementType(str, Enum):
@@ -61,11 +63,19 @@ class PlatformManager:
     Server-authoritative moving platform management.
     
     Handles platform movement, player riding, and state sync.
+    Platforms are re-indexed in the spatial grid as they move.
+    Broadcast fragments are cached per platform and only rebuilt while a
+    platform moves (or stops at a waypoint).
     """
     
-    def __init__(self):
+    # Vertical distance between feet and platform top that counts as riding
+    RIDE_TOLERANCE = 5.0
+    
+    def __init__(self, grid: Optional[SpatialHashGrid] = None):
         self.platforms: Dict[str, ServerPlatform] = {}
         self._events: List[ArenaEvent] = []
+        self._grid = grid if grid is not None else SpatialHashGrid()
+        self._fragments: FragmentCache[str] = FragmentCache(self._fragment)
     
     def add(
         self,
@@ -92,10 +102,21 @@ class PlatformManager:
             pause_at_waypoints=pause_at_waypoints,
         )
         self.platforms[id] = platform
+        self._index(platform)
+        self._fragments.mark(id)
     
     def remove(self, id: str) -> None:
         """Remove a platform."""
         self.platforms.pop(id, None)
+        self._grid.remove(LAYER_PLATFORM, id)
+        self._fragments.drop(id)
+    
+    def _index(self, platform: ServerPlatform) -> None:
+        """Insert or move a platform in the spatial grid."""
+        self._grid.insert(
+            LAYER_PLATFORM, platform.id,
+            platform.x, platform.y, platform.width, platform.height,
+        )
     
     def update(self, delta_time: float) -> None:
         """Update all platforms for one tick."""
@@ -107,8 +128,10 @@ class PlatformManager:
         # Handle pause at waypoints
         if platform.pause_timer > 0:
             platform.pause_timer -= delta_time
-            platform.velocity_x = 0
-            platform.velocity_y = 0
+            if platform.velocity_x or platform.velocity_y:
+                platform.velocity_x = 0
+                platform.velocity_y = 0
+                self._fragments.mark(platform.id)
             return
         
         waypoints = platform.waypoints
@@ -147,6 +170,8 @@ class PlatformManager:
         prev_x, prev_y = platform.x, platform.y
         platform.x = start.x + dx * eased_progress
         platform.y = start.y + dy * eased_progress
+        self._index(platform)
+        self._fragments.mark(platform.id)
         
         # Calculate velocity for player movement
         if delta_time > 0:
@@ -160,14 +185,14 @@ class PlatformManager:
             platform.pause_timer = platform.pause_at_waypoints
             
             self._events.append(ArenaEvent(
-                type="platform_waypoint",
+                event_type="platform_waypoint",
                 data={"platform_id": platform.id, "waypoint": next_idx},
             ))
             
             # Check for loop completion
             if next_idx == 0 and platform.loop:
                 self._events.append(ArenaEvent(
-                    type="platform_loop",
+                    event_type="platform_loop",
                     data={"platform_id": platform.id},
                 ))
 
@@ -180,10 +205,15 @@ class PlatformManager:
         
         Returns (platform_id, velocity_x, velocity_y) if on platform, None otherwise.
         """
-        for platform in self.platforms.values():
-            # Check if player's feet are on the platform
-            # Player center is at (player_x, player_y), feet at bottom
-            feet_y = player_y + player_radius
+        # Player center is at (player_x, player_y), feet at bottom
+        feet_y = player_y + player_radius
+        tolerance = self.RIDE_TOLERANCE
+        candidates = self._grid.query_rect(
+            LAYER_PLATFORM, player_x, feet_y - tolerance, 0, tolerance * 2
+        )
+        
+        for platform_id in candidates:
+            platform = self.platforms[platform_id]
             
             # Platform top surface
             platform_top = platform.y
@@ -196,7 +226,6 @@ class PlatformManager:
                 continue
             
             # Check if player's feet are near platform top (within small tolerance)
-            tolerance = 5.0
             if abs(feet_y - platform_top) < tolerance:
                 return (platform.id, platform.velocity_x, platform.velocity_y)
         
@@ -211,18 +240,25 @@ class PlatformManager:
     
     def get_state(self) -> List[dict]:
         """Get current platform state for broadcast."""
-        return [
-            {
-                "id": p.id,
-                "x": p.x,
-                "y": p.y,
-                "current_waypoint": p.current_waypoint,
-                "progress": p.progress,
-                "velocity_x": p.velocity_x,
-                "velocity_y": p.velocity_y,
-            }
-            for p in self.platforms.values()
-        ]
+        return self._fragments.state()
+
+    def _fragment(self, platform_id: str) -> Optional[dict]:
+        p = self.platforms.get(platform_id)
+        if p is None:
+            return None
+        return {
+            "id": p.id,
+            "x": p.x,
+            "y": p.y,
+            "current_waypoint": p.current_waypoint,
+            "progress": p.progress,
+            "velocity_x": p.velocity_x,
+            "velocity_y": p.velocity_y,
+        }
+    
+    def has_pending_events(self) -> bool:
+        """True if events are waiting for get_and_clear_events."""
+        return bool(self._events)
     
     def get_and_clear_events(self) -> List[ArenaEvent]:
         """Get and clear pending events."""
@@ -233,4 +269,6 @@ class PlatformManager:
     def clear(self) -> None:
         """Clear all platforms."""
         self.platforms.clear()
+        self._fragments.clear()
         self._events.clear()
+        self._grid.clear(LAYER_PLATFORM)
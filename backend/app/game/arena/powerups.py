@@ -13,6 +13,7 @@ from enum import Enum
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 
+from ..state_cache import FragmentCache
 from .types import ArenaEvent
 
 
@@ -50,6 +51,8 @@ class PowerUpManager:
     Server-authoritative power-up management.
     
     Handles power-up spawning, collection validation, and state sync.
+    Broadcast fragments are cached per power-up and only rebuilt when a
+    power-up spawns or is collected.
     """
     
     DEFAULT_RADIUS = 30.0
@@ -57,6 +60,7 @@ class PowerUpManager:
     def __init__(self):
         self.powerups: Dict[str, ServerPowerUp] = {}
         self._events: List[ArenaEvent] = []
+        self._fragments: FragmentCache[str] = FragmentCache(self._fragment)
     
     def spawn(
         self,
@@ -87,6 +91,7 @@ class PowerUpManager:
             spawn_time=spawn_time,
         )
         self.powerups[id] = powerup
+        self._fragments.mark(id)
         
         self._events.append(ArenaEvent(
             event_type="powerup_spawn",
@@ -126,6 +131,7 @@ class PowerUpManager:
             if distance <= powerup.radius:
                 # Collect the power-up
                 powerup.is_active = False
+                self._fragments.mark(powerup.id)
                 
                 result = PowerUpCollectionResult(
                     powerup_id=powerup.id,
@@ -153,6 +159,7 @@ class PowerUpManager:
         """Remove a power-up."""
         if id in self.powerups:
             del self.powerups[id]
+            self._fragments.drop(id)
             self._events.append(ArenaEvent(
                 event_type="powerup_removed",
                 data={"id": id},
@@ -168,17 +175,24 @@ class PowerUpManager:
     
     def get_state(self) -> List[dict]:
         """Get current power-up state for broadcast."""
-        return [
-            {
-                "id": p.id,
-                "x": p.x,
-                "y": p.y,
-                "type": p.powerup_type.value,
-                "radius": p.radius,
-                "is_active": p.is_active,
-            }
-            for p in self.powerups.values()
-        ]
+        return self._fragments.state()
+
+    def _fragment(self, powerup_id: str) -> Optional[dict]:
+        p = self.powerups.get(powerup_id)
+        if p is None:
+            return None
+        return {
+            "id": p.id,
+            "x": p.x,
+            "y": p.y,
+            "type": p.powerup_type.value,
+            "radius": p.radius,
+            "is_active": p.is_active,
+        }
+    
+    def has_pending_events(self) -> bool:
+        """True if events are waiting for get_and_clear_events."""
+        return bool(self._events)
     
     def get_and_clear_events(self) -> List[ArenaEvent] :
         """Get and clear pending events."""
@@ -189,4 +203,5 @@ class PowerUpManager:
     def clear(self) -> None:
         """Clear all power-ups."""
         self.powerups.clear()
+        self._fragments.clear()
         self._events.clear()
@@ -0,0 +1,189 @@
+"""
+Spatial Hash Grid - Uniform-grid broadphase for arena collision queries.
+
+One grid is shared by all arena managers; each manager owns a layer
+("barrier", "door", ...). Objects are bucketed by the cells their
+bounding box covers, so a query only visits objects near the query
+point instead of every object on the map.
+
+Queries return candidate IDs in insertion order, matching the order a
+linear scan over the manager's dict would visit them. Managers still run
+their exact test on each candidate.
+
+A match grid can load() a prebuilt map grid copy-on-write: cell buckets
+stay shared with the map until the match first writes to one (a
+platform moves, a barrier is destroyed, a hazard spawns).
+"""
+
+import math
+from typing import Dict, List, Optional, Set, Tuple
+
+DEFAULT_CELL_SIZE = 64.0
+
+# Layer names used by the arena managers
+LAYER_BARRIER = "barrier"
+LAYER_DOOR = "door"
+LAYER_PLATFORM = "platform"
+LAYER_TELEPORTER = "teleporter"
+LAYER_JUMP_PAD = "jump_pad"
+LAYER_HAZARD = "hazard"
+LAYER_TRAP = "trap"
+
+
+class SpatialHashGrid:
+    """
+    Layered uniform grid of axis-aligned bounding boxes.
+
+    Static objects are inserted once; moving objects call insert() again
+    with their new bounds, which only re-buckets when the covered cells
+    change. Re-inserting an object with unchanged cells is a no-op, so
+    managers can add() their objects over a loaded map grid for free.
+    """
+
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        # (layer, cx, cy) -> {id: seq}
+        self._cells: Dict[Tuple[str, int, int], Dict[str, int]] = {}
+        # (layer, id) -> (seq, cx0, cy0, cx1, cy1)
+        self._entries: Dict[Tuple[str, str], Tuple[int, int, int, int, int]] = {}
+        self._next_seq = 0
+        # Bucket keys still shared with a loaded base grid
+        self._borrowed: Set[Tuple[str, int, int]] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self._entries
+
+    def _cell_range(
+        self, x: float, y: float, width: float, height: float
+    ) -> Tuple[int, int, int, int]:
+        size = self.cell_size
+        return (
+            math.floor(x / size),
+            math.floor(y / size),
+            math.floor((x + width) / size),
+            math.floor((y + height) / size),
+        )
+
+    def insert(
+        self, layer: str, id: str, x: float, y: float, width: float, height: float
+    ) -> None:
+        """Insert an object, or move it if already present."""
+        key = (layer, id)
+        cx0, cy0, cx1, cy1 = self._cell_range(x, y, width, height)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[1:] == (cx0, cy0, cx1, cy1):
+                return
+            # Keep the original sequence so query order stays stable
+            seq = entry[0]
+            self._unlink(layer, id, entry)
+        else:
+            seq = self._next_seq
+            self._next_seq += 1
+
+        cells = self._cells
+        borrowed = self._borrowed
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = (layer, cx, cy)
+                bucket = cells.get(cell)
+                if bucket is None:
+                    bucket = cells[cell] = {}
+                elif borrowed and cell in borrowed:
+                    bucket = cells[cell] = dict(bucket)
+                    borrowed.discard(cell)
+                bucket[id] = seq
+        self._entries[key] = (seq, cx0, cy0, cx1, cy1)
+
+    def remove(self, layer: str, id: str) -> None:
+        """Remove an object. Missing objects are ignored."""
+        entry = self._entries.pop((layer, id), None)
+        if entry is not None:
+            self._unlink(layer, id, entry)
+
+    def _unlink(self, layer: str, id: str, entry: Tuple[int, int, int, int, int]) -> None:
+        _, cx0, cy0, cx1, cy1 = entry
+        cells = self._cells
+        borrowed = self._borrowed
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = (layer, cx, cy)
+                bucket = cells.get(cell)
+                if bucket is None or id not in bucket:
+                    continue
+                if borrowed and cell in borrowed:
+                    bucket = cells[cell] = dict(bucket)
+                    borrowed.discard(cell)
+                del bucket[id]
+                if not bucket:
+                    del cells[cell]
+
+    def query_rect(
+        self, layer: str, x: float, y: float, width: float, height: float
+    ) -> List[str]:
+        """IDs in the layer whose cells overlap the rect, in insertion order."""
+        cx0, cy0, cx1, cy1 = self._cell_range(x, y, width, height)
+        cells = self._cells
+
+        if cx0 == cx1 and cy0 == cy1:
+            bucket = cells.get((layer, cx0, cy0))
+            if not bucket:
+                return []
+            found = bucket
+        else:
+            found = {}
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    bucket = cells.get((layer, cx, cy))
+                    if bucket:
+                        found.update(bucket)
+            if not found:
+                return []
+
+        if len(found) == 1:
+            return list(found)
+        return sorted(found, key=found.__getitem__)
+
+    def cell_of(self, x: float, y: float) -> Tuple[int, int]:
+        """Cell coordinates containing a point."""
+        size = self.cell_size
+        return math.floor(x / size), math.floor(y / size)
+
+    def query_point(self, layer: str, x: float, y: float) -> List[str]:
+        """IDs in the layer whose cells contain the point."""
+        return self.query_rect(layer, x, y, 0, 0)
+
+    def query_circle(self, layer: str, x: float, y: float, radius: float) -> List[str]:
+        """IDs in the layer whose cells overlap the circle's bounding box."""
+        return self.query_rect(layer, x - radius, y - radius, radius * 2, radius * 2)
+
+    def load(self, base: "SpatialHashGrid") -> None:
+        """
+        Replace this grid's contents with base's, sharing base's buckets.
+
+        Buckets are copied on first write, so base is never modified and
+        cells this grid never touches cost one dict slot, not a bucket.
+        """
+        self.cell_size = base.cell_size
+        self._cells = dict(base._cells)
+        self._entries = dict(base._entries)
+        self._next_seq = base._next_seq
+        self._borrowed = set(self._cells)
+
+    def clear(self, layer: Optional[str] = None) -> None:
+        """Remove every object, or only those in one layer."""
+        if layer is None or not self._entries:
+            self._cells.clear()
+            self._entries.clear()
+            self._borrowed.clear()
+            return
+        # Drop the layer's buckets whole (no per-object unlinks, and no
+        # copies of buckets still shared with a loaded base grid)
+        self._entries = {k: v for k, v in self._entries.items() if k[0] != layer}
+        self._cells = {k: v for k, v in self._cells.items() if k[0] != layer}
+        if self._borrowed:
+            self._borrowed = {k for k in self._borrowed if k[0] != layer}
@@ -3,16 +3,18 @@ Server Arena Systems - Main coordinator for all arena mechanics.
 """
 
 import time
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 
-from .types import HazardType, TrapType, TrapEffect, ArenaEvent
+from .types import ArenaEvent
 from .hazards import HazardManager
 from .traps import TrapManager
 from .transport import TransportManager
 from .doors import DoorManager
 from .platforms import PlatformManager
-from .barriers import BarrierManager, BarrierType
+from .barriers import BarrierManager
 from .powerups import PowerUpManager, PowerUpType
+from .spatial import SpatialHashGrid
+from .maps import ArenaMap, parse_map
 
 
 class ServerArenaSystems:
@@ -27,129 +29,60 @@ class ServerArenaSystems:
     - PlatformManager: Moving platforms
     - BarrierManager: Barriers and destructibles
     - PowerUpManager: Power-up spawning and collection
+
+    Collision managers share one SpatialHashGrid for broadphase queries.
+    Managers that read the time themselves use the given clock.
     """
 
-    def __init__(self):
-        self.hazards = HazardManager()
-        self.traps = TrapManager()
-        self.transport = TransportManager()
-        self.doors = DoorManager()
-        self.platforms = PlatformManager()
-        self.barriers = BarrierManager()
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self.grid = SpatialHashGrid()
+        self.hazards = HazardManager(self.grid)
+        self.traps = TrapManager(self.grid, clock)
+        self.transport = TransportManager(self.grid, clock)
+        self.doors = DoorManager(self.grid)
+        self.platforms = PlatformManager(self.grid)
+        self.barriers = BarrierManager(self.grid)
         self.powerups = PowerUpManager()
 
     def initialize_from_config(self, config: dict) -> None:
         """Initialize arena systems from map config."""
-        self.reset()
+        self.initialize_from_map(parse_map(config))
 
-        # Load hazards
-        for h in config.get("hazards", []):
-            self.hazards.add(
-                h["id"],
-                HazardType(h["type"]),
-                h["bounds"]["x"],
-                h["bounds"]["y"],
-                h["bounds"]["width"],
-                h["bounds"]["height"],
-                h.get("intensity", 1.0),
-            )
-
-        # Load traps
-        for t in config.get("traps", []):
-            effect_str = t["effect"]
-            if effect_str == "damage_burst":
-                effect_str = "damage"
-            self.traps.add(
-                t["id"],
-                TrapType(t["type"]),
-                t["position"]["x"],
-                t["position"]["y"],
-                t["radius"],
-                TrapEffect(effect_str),
-                t.get("effectValue", 10),
-                t.get("cooldown", 5.0),
-                t.get("interval"),
-                t.get("chainRadius"),
-            )
-
-        # Load teleporters
-        for tp in config.get("teleporters", []):
-            self.transport.add_teleporter(
-                tp["id"],
-                tp["pairId"],
-                tp["position"]["x"],
-                tp["position"]["y"],
-                tp["radius"],
-            )
-        self.transport.link_teleporters()
+    def initialize_from_map(self, arena_map: ArenaMap) -> None:
+        """
+        Initialize arena systems from a parsed map.
 
-        # Load jump pads
-        for jp in config.get("jumpPads", []):
-            self.transport.add_jump_pad(
-                jp["id"],
-                jp["position"]["x"],
-                jp["position"]["y"],
-                jp["radius"],
-                jp["direction"],
-                jp["force"],
-            )
-
-        # Load doors
-        for door in config.get("doors", []):
-            self.doors.add(
-                door["id"],
-                door["position"]["x"],
-                door["position"]["y"],
-                door["size"]["width"],
-                door["size"]["height"],
-                door.get("direction", "horizontal"),
-                door.get("trigger", "manual"),
-                door.get("linkedTriggerId"),
-                door.get("autoCloseDelay", 0),
-                door.get("openDuration", 0.5),
-            )
-
-        # Load moving platforms
-        for plat in config.get("platforms", []):
-            self.platforms.add(
-                plat["id"],
-                plat["size"]["width"],
-                plat["size"]["height"],
-                plat["waypoints"],
-                plat["speed"],
-                plat.get("movementType", "linear"),
-                plat.get("loop", True),
-                plat.get("pauseAtWaypoints", 0),
-            )
-
-        # Load barriers
-        for barrier in config.get("barriers", []):
-            self.barriers.add(
-                barrier["id"],
-                barrier["position"]["x"],
-                barrier["position"]["y"],
-                barrier["size"]["width"],
-                barrier["size"]["height"],
-                barrier.get("type", "solid"),
-                barrier.get("health", 100),
-                barrier.get("direction"),
-            )
-
-        # Load power-ups (if pre-configured)
-        for powerup in config.get("powerups", []):
-            self.powerups.spawn(
-                powerup["id"],
-                powerup["position"]["x"],
-                powerup["position"]["y"],
-                powerup["type"],
-                powerup.get("radius", 30),
-            )
+        When the map carries a prebuilt grid it is loaded copy-on-write
+        first, so each add() below finds its object already indexed.
+        """
+        self.reset()
+        if arena_map.grid is not None:
+            self.grid.load(arena_map.grid)
+
+        for hazard in arena_map.hazards:
+            self.hazards.add(*hazard)
+        for trap in arena_map.traps:
+            self.traps.add(*trap)
+        for tp in arena_map.teleporters:
+            self.transport.add_teleporter(*tp)
+        self.transport.link_teleporters()
+        for jp in arena_map.jump_pads:
+            self.transport.add_jump_pad(*jp)
+        for door in arena_map.doors:
+            self.doors.add(*door)
+        for plat in arena_map.platforms:
+            self.platforms.add(*plat)
+        for barrier in arena_map.barriers:
+            self.barriers.add(*barrier)
+        for powerup in arena_map.powerups:
+            self.powerups.spawn(*powerup)
 
     def update(
         self, delta_time: float, player_positions: Dict[str, Tuple[float, float]]
     ) -> None:
         """Update all arena systems for one tick."""
-        current_time = time.time()
+        current_time = self._clock()
 
         self.hazards.update(player_positions, current_time)
         self.traps.update(delta_time, player_positions, current_time)
@@ -224,7 +157,7 @@ class ServerArenaSystems:
 
     def trigger_door(self, trigger_id: str) -> None:
         """Trigger doors linked to a trigger ID (e.g., from pressure plate)."""
-        self.doors.trigger_by_link(trigger_id, time.time())
+        self.doors.trigger_by_link(trigger_id, self._clock())
 
     def get_and_clear_events(self) -> List[ArenaEvent]:
         """Get all pending events from all managers."""
@@ -238,6 +171,18 @@ class ServerArenaSystems:
         events.extend(self.powerups.get_and_clear_events())
         return events
 
+    def has_pending_events(self) -> bool:
+        """True if any manager has events waiting for broadcast."""
+        return (
+            self.hazards.has_pending_events()
+            or self.traps.has_pending_events()
+            or self.transport.has_pending_events()
+            or self.doors.has_pending_events()
+            or self.platforms.has_pending_events()
+            or self.barriers.has_pending_events()
+            or self.powerups.has_pending_events()
+        )
+
     def get_arena_state(self) -> dict:
         """Get current arena state for broadcast."""
         return {
@@ -288,6 +233,7 @@ class ServerArenaSystems:
 
     def reset(self) -> None:
         """Reset all arena state."""
+        self.grid.clear()  # First, so each manager's layer clear is a no-op
         self.hazards.clear()
         self.traps.clear()
         self.transport.clear()
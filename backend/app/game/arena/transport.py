@@ -4,9 +4,10 @@ Transport Manager - Handles teleporters and jump pads.
 
 import math
 import time
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 
 from .types import ServerTeleporter, ServerJumpPad, ArenaEvent
+from .spatial import SpatialHashGrid, LAYER_TELEPORTER, LAYER_JUMP_PAD
 
 
 class TransportManager:
@@ -15,10 +16,12 @@ class TransportManager:
     TELEPORTER_COOLDOWN = 2.0
     JUMP_PAD_COOLDOWN = 1.0
 
-    def __init__(self):
+    def __init__(self, grid: Optional[SpatialHashGrid] = None, clock: Callable[[], float] = time.time):
+        self._clock = clock
         self._teleporters: Dict[str, ServerTeleporter] = {}
         self._jump_pads: Dict[str, ServerJumpPad] = {}
         self._pending_events: List[ArenaEvent] = []
+        self._grid = grid if grid is not None else SpatialHashGrid()
 
     def add_teleporter(
         self, id: str, pair_id: str, x: float, y: float, radius: float
@@ -26,6 +29,7 @@ class TransportManager:
         """Add a teleporter to the arena."""
         tp = ServerTeleporter(id=id, pair_id=pair_id, position=(x, y), radius=radius)
         self._teleporters[id] = tp
+        self._grid.insert(LAYER_TELEPORTER, id, x - radius, y - radius, radius * 2, radius * 2)
         return tp
 
     def add_jump_pad(
@@ -36,6 +40,7 @@ class TransportManager:
             direction = self._direction_to_vector(direction)
         jp = ServerJumpPad(id=id, position=(x, y), radius=radius, direction=direction, force=force)
         self._jump_pads[id] = jp
+        self._grid.insert(LAYER_JUMP_PAD, id, x - radius, y - radius, radius * 2, radius * 2)
         return jp
 
     def link_teleporters(self) -> None:
@@ -55,9 +60,10 @@ class TransportManager:
         self, player_id: str, position: Tuple[float, float]
     ) -> Optional[Tuple[float, float]]:
         """Check if player should teleport. Returns destination or None."""
-        current_time = time.time()
+        current_time = self._clock()
 
-        for tp in self._teleporters.values():
+        for tp_id in self._grid.query_point(LAYER_TELEPORTER, position[0], position[1]):
+            tp = self._teleporters[tp_id]
             if self._distance(tp.position, position) > tp.radius:
                 continue
 
@@ -96,9 +102,10 @@ class TransportManager:
         self, player_id: str, position: Tuple[float, float]
     ) -> Optional[Tuple[float, float]]:
         """Check if player should be launched. Returns velocity or None."""
-        current_time = time.time()
+        current_time = self._clock()
 
-        for jp in self._jump_pads.values():
+        for jp_id in self._grid.query_point(LAYER_JUMP_PAD, position[0], position[1]):
+            jp = self._jump_pads[jp_id]
             if self._distance(jp.position, position) > jp.radius:
                 continue
 
@@ -131,6 +138,10 @@ class TransportManager:
                 k: v for k, v in jp.player_cooldowns.items() if v > current_time
             }
 
+    def has_pending_events(self) -> bool:
+        """True if events are waiting for get_and_clear_events."""
+        return bool(self._pending_events)
+
     def get_and_clear_events(self) -> List[ArenaEvent]:
         """Get pending events and clear the queue."""
         events = self._pending_events
@@ -142,6 +153,8 @@ class TransportManager:
         self._teleporters.clear()
         self._jump_pads.clear()
         self._pending_events.clear()
+        self._grid.clear(LAYER_TELEPORTER)
+        self._grid.clear(LAYER_JUMP_PAD)
 
     @staticmethod
     def _direction_to_vector(direction: str) -> Tuple[float, float]:
@@ -4,22 +4,43 @@ Trap Manager - Handles pressure, timed, and projectile traps.
 
 import math
 import time
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
+from ..state_cache import FragmentCache
+from ..timers import TimerQueue
+from .spatial import SpatialHashGrid, LAYER_TRAP
 from .types import TrapType, TrapState, TrapEffect, ServerTrap, ArenaEvent
 
 
 class TrapManager:
-    """Manages server-side trap state and triggers."""
+    """
+    Manages server-side trap state and triggers.
+
+    Traps are indexed in the spatial grid by their trigger circle. Armed
+    pressure and projectile traps are idle: they are only examined when
+    a player (or projectile hit) lands in a cell they cover. Traps in
+    their warning/triggered/cooldown cycle, and timed traps, are kept in
+    a busy set that update() steps every tick.
+
+    Broadcast fragments are cached per trap (state_cache.py) and only
+    rebuilt when a trap is added or changes state.
+    """
 
     WARNING_DURATION = 0.3
     TRIGGER_DURATION = 0.1
     CHAIN_DELAY = 0.3
 
-    def __init__(self):
+    def __init__(self, grid: Optional[SpatialHashGrid] = None, clock: Callable[[], float] = time.time):
+        self._clock = clock
         self._traps: Dict[str, ServerTrap] = {}
         self._pending_events: List[ArenaEvent] = []
-        self._pending_chains: List[Tuple[str, float]] = []
+        self._pending_chains: TimerQueue[str] = TimerQueue()  # Trap id -> chain trigger time
+        self._despawns: TimerQueue[str] = TimerQueue()
+        self._grid = grid if grid is not None else SpatialHashGrid()
+        self._busy: Dict[str, None] = {}  # Traps update() must step every tick
+        self._order: Dict[str, int] = {}  # Trap id -> add order, the order traps are stepped in
+        self._added = 0
+        self._fragments: FragmentCache[str] = FragmentCache(self._fragment)
 
     def add(
         self,
@@ -49,6 +70,16 @@ class TrapManager:
             despawn_time=despawn_time,
         )
         self._traps[id] = trap
+        if id not in self._order:
+            self._added += 1
+            self._order[id] = self._added
+        self._grid.insert(LAYER_TRAP, id, x - radius, y - radius, radius * 2, radius * 2)
+        self._fragments.mark(id)
+        self._track(id, trap)
+        if despawn_time:
+            self._despawns.schedule(id, despawn_time)
+        else:
+            self._despawns.cancel(id)
         self._pending_events.append(
             ArenaEvent(
                 "trap_spawn",
@@ -69,6 +100,12 @@ class TrapManager:
         """Remove a trap from the arena."""
         if id in self._traps:
             del self._traps[id]
+            self._grid.remove(LAYER_TRAP, id)
+            self._fragments.drop(id)
+            self._busy.pop(id, None)
+            self._order.pop(id, None)
+            self._despawns.cancel(id)
+            self._pending_chains.cancel(id)
             self._pending_events.append(ArenaEvent("trap_despawn", {"id": id}))
 
     def update(
@@ -78,7 +115,12 @@ class TrapManager:
         current_time: float,
     ) -> None:
         """Update trap states."""
-        for trap_id, trap in self._traps.items():
+        # Busy traps plus idle pressure traps covering a player's cell,
+        # stepped in add order so chains resolve as in a full scan
+        stepping = dict.fromkeys(self._pressed(player_positions))
+        stepping.update(self._busy)
+        for trap_id in sorted(stepping, key=self._order.__getitem__):
+            trap = self._traps[trap_id]
             if trap.state == TrapState.COOLDOWN:
                 self._update_cooldown(trap_id, trap, delta_time)
             elif trap.state == TrapState.WARNING:
@@ -87,12 +129,35 @@ class TrapManager:
                 self._update_triggered(trap, current_time)
             elif trap.state == TrapState.ARMED:
                 self._check_trigger(trap_id, trap, current_time, player_positions)
+            self._track(trap_id, trap)
+
+    def _track(self, trap_id: str, trap: ServerTrap) -> None:
+        """Keep the busy set in step with the trap's state."""
+        if trap.state == TrapState.ARMED and trap.type != TrapType.TIMED:
+            self._busy.pop(trap_id, None)
+        else:
+            self._busy[trap_id] = None
+
+    def _pressed(self, player_positions: Dict[str, Tuple[float, float]]) -> List[str]:
+        """Idle armed pressure traps with a player inside their radius."""
+        pressed: Dict[str, None] = {}
+        for px, py in player_positions.values():
+            for trap_id in self._grid.query_point(LAYER_TRAP, px, py):
+                trap = self._traps[trap_id]
+                if (
+                    trap.type == TrapType.PRESSURE
+                    and trap.state == TrapState.ARMED
+                    and self._distance(trap.position, (px, py)) <= trap.radius
+                ):
+                    pressed[trap_id] = None
+        return list(pressed)
 
     def _update_cooldown(self, trap_id: str, trap: ServerTrap, delta_time: float) -> None:
         trap.cooldown_remaining -= delta_time
         if trap.cooldown_remaining <= 0:
             trap.state = TrapState.ARMED
             trap.cooldown_remaining = 0
+            self._fragments.mark(trap_id)
             self._pending_events.append(ArenaEvent("trap_armed", {"id": trap_id}))
 
     def _update_warning(
@@ -109,6 +174,7 @@ class TrapManager:
         if current_time - trap.last_trigger_time >= self.TRIGGER_DURATION:
             trap.state = TrapState.COOLDOWN
             trap.cooldown_remaining = trap.cooldown
+            self._fragments.mark(trap.id)
 
     def _check_trigger(
         self,
@@ -134,6 +200,8 @@ class TrapManager:
     def _start_warning(self, trap_id: str, trap: ServerTrap, current_time: float) -> None:
         trap.state = TrapState.WARNING
         trap.last_trigger_time = current_time
+        self._fragments.mark(trap_id)
+        self._busy[trap_id] = None
         self._pending_events.append(ArenaEvent("trap_warning", {"id": trap_id}))
 
     def _execute(
@@ -145,6 +213,7 @@ class TrapManager:
     ) -> None:
         trap.state = TrapState.TRIGGERED
         trap.last_trigger_time = current_time
+        self._fragments.mark(trap_id)
 
         # Find affected players
         affected = [
@@ -184,20 +253,21 @@ class TrapManager:
         if not source:
             return
 
-        for trap_id, trap in self._traps.items():
+        x, y = source.position
+        for trap_id in self._grid.query_circle(LAYER_TRAP, x, y, chain_radius):
+            trap = self._traps[trap_id]
             if trap_id == source_id or trap.state != TrapState.ARMED:
                 continue
+            if trap_id in self._pending_chains:
+                continue  # Already chained; the earlier trigger stands
             if self._distance(source.position, trap.position) <= chain_radius:
-                self._pending_chains.append((trap_id, current_time + self.CHAIN_DELAY))
+                self._pending_chains.schedule(trap_id, current_time + self.CHAIN_DELAY)
 
     def process_chains(
         self, current_time: float, player_positions: Dict[str, Tuple[float, float]]
     ) -> None:
         """Process pending chain triggers."""
-        to_process = [(tid, t) for tid, t in self._pending_chains if current_time >= t]
-        self._pending_chains = [(tid, t) for tid, t in self._pending_chains if current_time < t]
-
-        for trap_id, _ in to_process:
+        for trap_id in self._pending_chains.pop_due(current_time):
             trap = self._traps.get(trap_id)
             if trap and trap.state == TrapState.ARMED:
                 self._start_warning(trap_id, trap, current_time)
@@ -206,36 +276,40 @@ class TrapManager:
         self, position: Tuple[float, float], player_positions: Dict[str, Tuple[float, float]]
     ) -> None:
         """Handle projectile hit for projectile-triggered traps."""
-        current_time = time.time()
-        for trap_id, trap in self._traps.items():
+        current_time = self._clock()
+        for trap_id in self._grid.query_point(LAYER_TRAP, position[0], position[1]):
+            trap = self._traps[trap_id]
             if trap.type != TrapType.PROJECTILE or trap.state != TrapState.ARMED:
                 continue
             if self._distance(trap.position, position) <= trap.radius:
                 self._start_warning(trap_id, trap, current_time)
 
     def check_despawns(self, current_time: float) -> None:
-        """Check for dynamic despawns."""
-        to_remove = [
-            t.id for t in self._traps.values()
-            if t.despawn_time and current_time >= t.despawn_time
-        ]
-        for tid in to_remove:
+        """Remove traps whose despawn time has passed."""
+        for tid in self._despawns.pop_due(current_time):
             self.remove(tid)
 
     def get_state(self) -> List[dict]:
         """Get current trap state for broadcast."""
-        return [
-            {
-                "id": t.id,
-                "type": t.type.value,
-                "x": t.position[0],
-                "y": t.position[1],
-                "radius": t.radius,
-                "state": t.state.value,
-                "effect": t.effect.value,
-            }
-            for t in self._traps.values()
-        ]
+        return self._fragments.state()
+
+    def _fragment(self, trap_id: str) -> Optional[dict]:
+        t = self._traps.get(trap_id)
+        if t is None:
+            return None
+        return {
+            "id": t.id,
+            "type": t.type.value,
+            "x": t.position[0],
+            "y": t.position[1],
+            "radius": t.radius,
+            "state": t.state.value,
+            "effect": t.effect.value,
+        }
+
+    def has_pending_events(self) -> bool:
+        """True if events are waiting for get_and_clear_events."""
+        return bool(self._pending_events)
 
     def get_and_clear_events(self) -> List[ArenaEvent]:
         """Get pending events and clear the queue."""
@@ -246,8 +320,13 @@ class TrapManager:
     def clear(self) -> None:
         """Clear all traps."""
         self._traps.clear()
+        self._fragments.clear()
+        self._grid.clear(LAYER_TRAP)
+        self._busy.clear()
+        self._order.clear()
         self._pending_events.clear()
         self._pending_chains.clear()
+        self._despawns.clear()
 
     @staticmethod
     def _distance(p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
@@ -99,7 +99,7 @@ class ServerJumpPad:
     player_cooldowns: Dict[str, float] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class ArenaEvent:
     """Arena event to broadcast to clients."""
     event_type: str
@@ -8,7 +8,10 @@ All buff effects are applied server-side for anti-cheat.
 import time
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .state_cache import FragmentCache
+from .timers import TimerQueue
 
 
 class BuffType(Enum):
@@ -20,7 +23,7 @@ class BuffType(Enum):
     INVULNERABLE = "invulnerable"      # No damage taken
 
 
-@dataclass
+@dataclass(slots=True)
 class Buff:
     """Single active buff instance."""
     buff_type: BuffType
@@ -68,14 +71,21 @@ class BuffManager:
     Manages all player buffs server-side.
     
     Integrates with combat system for damage/speed modifiers.
+    Broadcast lists are cached per player (state_cache.py); only players
+    with active buffs, whose remaining times count down, are rebuilt on
+    every broadcast.
     """
     
-    def __init__(self):
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
         self._players: Dict[str, PlayerBuffState] = {}
+        self._expiries: TimerQueue[Tuple[str, BuffType]] = TimerQueue()
+        self._fragments: FragmentCache[str] = FragmentCache(self._fragment, keyed=True)
     
     def init_player(self, player_id: str) -> None:
         """Initialize buff tracking for a player."""
         self._players[player_id] = PlayerBuffState(player_id=player_id)
+        self._fragments.mark(player_id)
     
     def apply_buff(
         self,
@@ -93,19 +103,25 @@ class BuffManager:
         buff = Buff(
             buff_type=buff_type,
             value=value,
-            expires_at=time.time() + duration_s,
+            expires_at=self._clock() + duration_s,
             source=source,
         )
         state.add_buff(buff)
+        self._expiries.schedule((player_id, buff_type), buff.expires_at)
+        self._fragments.mark(player_id)
         return buff
     
     def update(self, current_time: float) -> Dict[str, List[Buff]]:
-        """Update all buffs, return dict of expired buffs by player."""
+        """Expire due buffs, return dict of expired buffs by player."""
         expired_by_player: Dict[str, List[Buff]] = {}
-        for player_id, state in self._players.items():
-            expired = state.remove_expired(current_time)
-            if expired:
-                expired_by_player[player_id] = expired
+        for player_id, buff_type in self._expiries.pop_due(current_time):
+            state = self._players.get(player_id)
+            buff = state.get_buff(buff_type) if state else None
+            if buff is None:
+                continue
+            state.buffs.remove(buff)
+            self._fragments.mark(player_id)
+            expired_by_player.setdefault(player_id, []).append(buff)
         return expired_by_player
     
     def get_damage_multiplier(self, player_id: str) -> float:
@@ -146,25 +162,36 @@ class BuffManager:
     
     def get_buff_state_for_broadcast(self) -> Dict[str, List[dict]]:
         """Get buff state formatted for client broadcast."""
-        current_time = time.time()
-        result = {}
         for player_id, state in self._players.items():
-            result[player_id] = [
-                {
-                    "type": b.buff_type.value,
-                    "value": b.value,
-                    "remaining": b.time_remaining(current_time),
-                    "source": b.source,
-                }
-                for b in state.buffs
-            ]
-        return result
+            if state.buffs:
+                self._fragments.mark(player_id)
+        return self._fragments.state()
+
+    def _fragment(self, player_id: str) -> Optional[List[dict]]:
+        state = self._players.get(player_id)
+        if state is None:
+            return None
+        current_time = self._clock()
+        return [
+            {
+                "type": b.buff_type.value,
+                "value": b.value,
+                "remaining": b.time_remaining(current_time),
+                "source": b.source,
+            }
+            for b in state.buffs
+        ]
     
     def clear_player(self, player_id: str) -> None:
         """Clear all buffs for a player (on death/respawn)."""
         if player_id in self._players:
+            for buff in self._players[player_id].buffs:
+                self._expiries.cancel((player_id, buff.buff_type))
             self._players[player_id].buffs = []
+            self._fragments.mark(player_id)
     
     def reset(self) -> None:
         """Reset all buff state."""
         self._players.clear()
+        self._expiries.clear()
+        self._fragments.clear()
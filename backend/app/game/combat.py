@@ -11,15 +11,31 @@ Handles authoritative combat state:
 
 import time
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
 from collections import deque
 import math
 
+from app.core.logging import get_logger
+from .arena.spatial import SpatialHashGrid, LAYER_BARRIER
+from .config import POOL_CONFIG
+from .pool import FreeList
+from .state_cache import FragmentCache
+from .projectiles import (
+    NUMPY_AVAILABLE,
+    VectorizedProjectileStore,
+    barrier_rects,
+    target_arrays,
+)
+from .timers import TimerQueue
+from .sweep import segment_aabb_toi, segment_circle_toi, segment_exit_toi, range_toi
+
 if TYPE_CHECKING:
     from .buffs import BuffManager
 
+logger = get_logger("game.combat")
+
 
-@dataclass
+@dataclass(slots=True)
 class ServerProjectile:
     """Server-side projectile state."""
     id: str
@@ -39,7 +55,11 @@ class ServerProjectile:
         return math.sqrt(dx * dx + dy * dy)
 
 
-@dataclass
+# Spent projectiles (dict store) kept for reuse by process_fire
+PROJECTILE_POOL: FreeList[ServerProjectile] = FreeList(ServerProjectile, POOL_CONFIG.projectile_capacity)
+
+
+@dataclass(slots=True)
 class PlayerCombatState:
     """Combat state for a player."""
     player_id: str
@@ -55,7 +75,7 @@ class PlayerCombatState:
     is_regenerating: bool = False
     
 
-@dataclass
+@dataclass(slots=True)
 class CombatEvent:
     """Combat event to broadcast to clients."""
     event_type: str  # 'fire', 'hit', 'death', 'respawn'
@@ -69,6 +89,17 @@ class ServerCombatSystem:
     
     Processes fire inputs, simulates projectiles, detects hits,
     and broadcasts authoritative combat state.
+    
+    With vectorized=True (and numpy installed) projectiles live in a
+    VectorizedProjectileStore and are simulated in batched passes.
+    
+    With swept=True each projectile is tested along the segment it covers
+    in a tick and resolves at its earliest impact, so hits do not depend
+    on the tick rate. swept=False keeps the end-of-tick point tests.
+    
+    Per-player broadcast state is cached (state_cache.py) and rebuilt only
+    when health, death, regen or invulnerability changes; projectiles move
+    every tick and are serialized fresh.
     """
     
     # Combat config
@@ -105,12 +136,41 @@ class ServerCombatSystem:
         (640, 620),
     ]
     
-    def __init__(self, buff_manager: Optional["BuffManager"] = None):
+    def __init__(
+        self,
+        buff_manager: Optional["BuffManager"] = None,
+        vectorized: bool = False,
+        swept: bool = True,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._clock = clock
         self._projectiles: Dict[str, ServerProjectile] = {}
         self._combat_states: Dict[str, PlayerCombatState] = {}
         self._pending_events: List[CombatEvent] = []
         self._next_projectile_id = 0
         self._buff_manager: Optional["BuffManager"] = buff_manager
+        self._swept = swept
+        self._respawns: TimerQueue[str] = TimerQueue()  # Dead player id -> respawn time
+        self._wounded: Dict[str, None] = {}  # Living players below max health (regen candidates)
+        self._invulnerable: TimerQueue[str] = TimerQueue()  # Respawned player id -> invulnerability end
+        self._player_fragments: FragmentCache[str] = FragmentCache(self._player_fragment, keyed=True)
+        
+        # Static barrier broadphase
+        self._barrier_grid = SpatialHashGrid()
+        for i, barrier in enumerate(self.BARRIERS):
+            self._barrier_grid.insert(
+                LAYER_BARRIER, str(i),
+                barrier["x"], barrier["y"], barrier["width"], barrier["height"],
+            )
+        
+        # Optional struct-of-arrays projectile store
+        self._store: Optional[VectorizedProjectileStore] = None
+        if vectorized:
+            if NUMPY_AVAILABLE:
+                self._store = VectorizedProjectileStore()
+                self._barrier_rects = barrier_rects(self.BARRIERS)
+            else:
+                logger.warning("numpy not installed, using dict projectile store")
     
     def set_buff_manager(self, buff_manager: "BuffManager") -> None:
         """Set the buff manager for damage modifiers."""
@@ -119,6 +179,7 @@ class ServerCombatSystem:
     def init_player(self, player_id: str) -> None:
         """Initialize combat state for a player."""
         self._combat_states[player_id] = PlayerCombatState(player_id=player_id)
+        self._player_fragments.mark(player_id)
     
     def process_fire(
         self,
@@ -136,7 +197,7 @@ class ServerCombatSystem:
             return None
         
         # Check if player can fire
-        current_time = time.time()
+        current_time = self._clock()
         if state.is_dead:
             return None
         if current_time - state.last_fire_time < self.FIRE_COOLDOWN:
@@ -153,19 +214,23 @@ class ServerCombatSystem:
         proj_id = f"p_{player_id}_{self._next_projectile_id}"
         self._next_projectile_id += 1
         
-        projectile = ServerProjectile(
-            id=proj_id,
-            owner_id=player_id,
-            x=position[0],
-            y=position[1],
-            vx=dx * self.PROJECTILE_SPEED,
-            vy=dy * self.PROJECTILE_SPEED,
-            spawn_x=position[0],
-            spawn_y=position[1],
-            spawn_time=current_time,
-        )
-        
-        self._projectiles[proj_id] = projectile
+        vx = dx * self.PROJECTILE_SPEED
+        vy = dy * self.PROJECTILE_SPEED
+        
+        if self._store is not None:
+            self._store.add(proj_id, player_id, position[0], position[1], vx, vy, current_time)
+        else:
+            self._projectiles[proj_id] = PROJECTILE_POOL.acquire(
+                id=proj_id,
+                owner_id=player_id,
+                x=position[0],
+                y=position[1],
+                vx=vx,
+                vy=vy,
+                spawn_x=position[0],
+                spawn_y=position[1],
+                spawn_time=current_time,
+            )
         state.last_fire_time = current_time
         
         # Queue fire event for broadcast
@@ -176,8 +241,8 @@ class ServerCombatSystem:
                 'owner_id': player_id,
                 'x': position[0],
                 'y': position[1],
-                'vx': projectile.vx,
-                'vy': projectile.vy,
+                'vx': vx,
+                'vy': vy,
             }
         ))
         
@@ -191,12 +256,36 @@ class ServerCombatSystem:
             delta_time: Time since last tick in seconds
             player_positions: Current positions of all players
         """
-        current_time = time.time()
+        current_time = self._clock()
+        
+        if self._store is not None:
+            self._update_projectiles_vectorized(delta_time, player_positions, current_time)
+        else:
+            self._update_projectiles(delta_time, player_positions, current_time)
+        
+        # Respawns due this tick
+        for player_id in self._respawns.pop_due(current_time):
+            self._respawn_player(player_id, player_positions, current_time)
         
-        # Update projectiles
+        # Health regeneration (only living players below max health)
+        for player_id in list(self._wounded):
+            self._update_health_regen(player_id, player_positions.get(player_id), delta_time, current_time)
+    
+    def _update_projectiles(
+        self,
+        delta_time: float,
+        player_positions: Dict[str, Tuple[float, float]],
+        current_time: float,
+    ) -> None:
+        """Move projectiles and resolve collisions one projectile at a time."""
         projectiles_to_remove = []
         
         for proj_id, proj in self._projectiles.items():
+            if self._swept:
+                if self._sweep_projectile(proj, delta_time, player_positions, current_time):
+                    projectiles_to_remove.append(proj_id)
+                continue
+            
             # Move projectile
             proj.x += proj.vx * delta_time
             proj.y += proj.vy * delta_time
@@ -241,21 +330,165 @@ class ServerCombatSystem:
                     projectiles_to_remove.append(proj_id)
                     break
         
-        # Remove destroyed projectiles
+        # Remove destroyed projectiles (recycled for the next shot)
         for proj_id in projectiles_to_remove:
-            self._projectiles.pop(proj_id, None)
-        
-        # Check respawns and health regeneration
-        for player_id, state in self._combat_states.items():
-            if state.is_dead and state.respawn_time and current_time >= state.respawn_time:
-                self._respawn_player(player_id, player_positions, current_time)
-            elif not state.is_dead:
-                # Health regeneration for living players
-                self._update_health_regen(player_id, player_positions.get(player_id), delta_time, current_time)
+            proj = self._projectiles.pop(proj_id, None)
+            if proj is not None:
+                PROJECTILE_POOL.release(proj)
+    
+    def _sweep_projectile(
+        self,
+        proj: ServerProjectile,
+        delta_time: float,
+        player_positions: Dict[str, Tuple[float, float]],
+        current_time: float,
+    ) -> bool:
+        """
+        Move one projectile and resolve its earliest impact this tick.
+        
+        Range, arena bounds and barriers stop the projectile; a player hit
+        only counts if it happens strictly before that. Returns True if the
+        projectile is destroyed.
+        """
+        x0, y0 = proj.x, proj.y
+        dx = proj.vx * delta_time
+        dy = proj.vy * delta_time
+        proj.x += dx
+        proj.y += dy
+        
+        # Earliest stop (2.0 = survives the tick)
+        t_stop = 2.0
+        sx = x0 - proj.spawn_x
+        sy = y0 - proj.spawn_y
+        for t in (
+            range_toi(
+                math.sqrt(sx * sx + sy * sy),
+                math.sqrt(dx * dx + dy * dy),
+                self.PROJECTILE_MAX_RANGE,
+            ),
+            segment_exit_toi(x0, y0, dx, dy, self.ARENA_WIDTH, self.ARENA_HEIGHT),
+            self._barrier_toi(x0, y0, dx, dy),
+        ):
+            if t is not None and t < t_stop:
+                t_stop = t
+        
+        # Earliest player hit before the stop
+        hit_id = None
+        for player_id, (px, py) in player_positions.items():
+            if player_id == proj.owner_id:
+                continue
+            
+            state = self._combat_states.get(player_id)
+            if not state or state.is_dead:
+                continue
+            if state.invulnerable_until and current_time < state.invulnerable_until:
+                continue
+            
+            t = segment_circle_toi(x0, y0, dx, dy, px, py, self.HIT_RADIUS)
+            if t is not None and t < t_stop:
+                t_stop = t
+                hit_id = player_id
+        
+        if hit_id is not None:
+            self._apply_damage(hit_id, proj.owner_id, proj.damage, current_time)
+            return True
+        return t_stop <= 1.0
+    
+    def _barrier_toi(self, x0: float, y0: float, dx: float, dy: float) -> Optional[float]:
+        """Earliest time the segment enters any barrier."""
+        earliest = None
+        for index in self._barrier_grid.query_rect(
+            LAYER_BARRIER, min(x0, x0 + dx), min(y0, y0 + dy), abs(dx), abs(dy)
+        ):
+            barrier = self.BARRIERS[int(index)]
+            t = segment_aabb_toi(
+                x0, y0, dx, dy,
+                barrier["x"], barrier["y"],
+                barrier["x"] + barrier["width"], barrier["y"] + barrier["height"],
+            )
+            if t is not None and (earliest is None or t < earliest):
+                earliest = t
+        return earliest
+    
+    def _update_projectiles_vectorized(
+        self,
+        delta_time: float,
+        player_positions: Dict[str, Tuple[float, float]],
+        current_time: float,
+    ) -> None:
+        """
+        Move projectiles and resolve collisions in batched passes.
+        
+        Movement, range, bounds, barrier and overlap tests are vectorized.
+        Only projectiles that overlap a player are resolved in Python, in
+        spawn order, so a target killed earlier in the tick is skipped
+        exactly as in the per-projectile loop.
+        """
+        store = self._store
+        if not store.count:
+            return
+        
+        if self._swept:
+            sweep = store.sweep(
+                delta_time,
+                self.PROJECTILE_MAX_RANGE,
+                self.ARENA_WIDTH,
+                self.ARENA_HEIGHT,
+                self._barrier_rects,
+            )
+            alive = sweep.t_stop > 1.0
+        else:
+            alive = store.advance(
+                delta_time,
+                self.PROJECTILE_MAX_RANGE,
+                self.ARENA_WIDTH,
+                self.ARENA_HEIGHT,
+                self._barrier_rects,
+            )
+        
+        # Hittable players (alive and not invulnerable), in dict order
+        targets = []
+        for player_id, (px, py) in player_positions.items():
+            state = self._combat_states.get(player_id)
+            if not state or state.is_dead:
+                continue
+            if state.invulnerable_until and current_time < state.invulnerable_until:
+                continue
+            targets.append((player_id, px, py))
+        
+        if targets and self._swept:
+            target_xy, target_codes = target_arrays(targets, store)
+            toi = store.hit_toi(sweep, target_xy, target_codes, self.HIT_RADIUS)
+            for i, candidates in store.hit_order(toi):
+                for j in candidates:
+                    target_id = targets[j][0]
+                    if self._combat_states[target_id].is_dead:
+                        continue
+                    self._apply_damage(
+                        target_id, store.owner_id(i), int(store.damage[i]), current_time
+                    )
+                    alive[i] = False
+                    break
+        elif targets:
+            target_xy, target_codes = target_arrays(targets, store)
+            hits = store.hit_matrix(alive, target_xy, target_codes, self.HIT_RADIUS)
+            for i in hits.any(axis=1).nonzero()[0].tolist():
+                for j in hits[i].nonzero()[0].tolist():
+                    target_id = targets[j][0]
+                    if self._combat_states[target_id].is_dead:
+                        continue
+                    self._apply_damage(
+                        target_id, store.owner_id(i), int(store.damage[i]), current_time
+                    )
+                    alive[i] = False
+                    break
+        
+        store.compact(alive)
     
     def _check_barrier_collision(self, x: float, y: float) -> bool:
         """Check if position collides with any barrier."""
-        for barrier in self.BARRIERS:
+        for index in self._barrier_grid.query_point(LAYER_BARRIER, x, y):
+            barrier = self.BARRIERS[int(index)]
             if (barrier["x"] <= x <= barrier["x"] + barrier["width"] and
                 barrier["y"] <= y <= barrier["y"] + barrier["height"]):
                 return True
@@ -283,6 +516,10 @@ class ServerCombatSystem:
             damage = int(base_damage * damage_mult * taken_mult)
         
         state.health = max(0, state.health - damage)
+        self._player_fragments.mark(target_id)
+        if state.health < state.max_health and target_id not in self._wounded:
+            state.last_position = None
+            self._wounded[target_id] = None
         
         # Queue hit event (include actual damage dealt for client feedback)
         self._pending_events.append(CombatEvent(
@@ -300,6 +537,10 @@ class ServerCombatSystem:
         if state.health <= 0:
             state.is_dead = True
             state.respawn_time = current_time + self.RESPAWN_TIME
+            state.is_regenerating = False
+            state.stationary_since = None
+            self._wounded.pop(target_id, None)
+            self._respawns.schedule(target_id, state.respawn_time)
             
             self._pending_events.append(CombatEvent(
                 event_type='death',
@@ -323,9 +564,12 @@ class ServerCombatSystem:
         
         # Check if player is at max health - no need to regen
         if state.health >= state.max_health:
-            state.is_regenerating = False
+            if state.is_regenerating:
+                state.is_regenerating = False
+                self._player_fragments.mark(player_id)
             state.stationary_since = None
             state.last_position = position
+            self._wounded.pop(player_id, None)
             return
         
         # Check if player has moved
@@ -342,6 +586,7 @@ class ServerCombatSystem:
             # Player moved - reset regen timer
             if state.is_regenerating:
                 state.is_regenerating = False
+                self._player_fragments.mark(player_id)
                 self._pending_events.append(CombatEvent(
                     event_type='regen_stop',
                     data={'player_id': player_id}
@@ -358,6 +603,7 @@ class ServerCombatSystem:
                 # Start or continue regenerating
                 if not state.is_regenerating:
                     state.is_regenerating = True
+                    self._player_fragments.mark(player_id)
                     self._pending_events.append(CombatEvent(
                         event_type='regen_start',
                         data={'player_id': player_id}
@@ -370,6 +616,7 @@ class ServerCombatSystem:
                 
                 # Only emit heal event if health actually changed (integer threshold)
                 if int(state.health) > int(old_health):
+                    self._player_fragments.mark(player_id)
                     self._pending_events.append(CombatEvent(
                         event_type='heal',
                         data={
@@ -414,6 +661,8 @@ class ServerCombatSystem:
         state.is_dead = False
         state.respawn_time = None
         state.invulnerable_until = current_time + self.INVULNERABILITY_TIME
+        self._invulnerable.schedule(player_id, state.invulnerable_until)
+        self._player_fragments.mark(player_id)
         
         self._pending_events.append(CombatEvent(
             event_type='respawn',
@@ -433,8 +682,10 @@ class ServerCombatSystem:
     
     def get_combat_state(self) -> dict:
         """Get current combat state for broadcast."""
-        return {
-            'projectiles': [
+        if self._store is not None:
+            projectiles = self._store.get_state()
+        else:
+            projectiles = [
                 {
                     'id': p.id,
                     'owner_id': p.owner_id,
@@ -444,19 +695,32 @@ class ServerCombatSystem:
                     'vy': round(p.vy, 1),
                 }
                 for p in self._projectiles.values()
-            ],
-            'players': {
-                pid: {
-                    'health': int(s.health),
-                    'max_health': s.max_health,
-                    'is_dead': s.is_dead,
-                    'invulnerable': s.invulnerable_until is not None and time.time() < s.invulnerable_until,
-                    'is_regenerating': s.is_regenerating,
-                }
-                for pid, s in self._combat_states.items()
-            }
+            ]
+        # Invulnerability is timed: players whose window has ended change state
+        for player_id in self._invulnerable.pop_due(self._clock()):
+            self._player_fragments.mark(player_id)
+        return {
+            'projectiles': projectiles,
+            'players': self._player_fragments.state(),
         }
     
+    def _player_fragment(self, player_id: str) -> Optional[dict]:
+        s = self._combat_states.get(player_id)
+        if s is None:
+            return None
+        return {
+            'health': int(s.health),
+            'max_health': s.max_health,
+            'is_dead': s.is_dead,
+            'invulnerable': s.invulnerable_until is not None and self._clock() < s.invulnerable_until,
+            'is_regenerating': s.is_regenerating,
+        }
+    
+    def has_activity(self) -> bool:
+        """True while projectiles are in flight or events await broadcast."""
+        count = self._store.count if self._store is not None else len(self._projectiles)
+        return bool(count or self._pending_events)
+    
     def get_player_health(self, player_id: str) -> Optional[int]:
         """Get a player's current health."""
         state = self._combat_states.get(player_id)
@@ -469,7 +733,14 @@ class ServerCombatSystem:
     
     def reset(self) -> None:
         """Reset all combat state."""
+        PROJECTILE_POOL.release_all(list(self._projectiles.values()))
         self._projectiles.clear()
+        self._respawns.clear()
+        self._wounded.clear()
+        self._invulnerable.clear()
+        self._player_fragments.clear()
+        if self._store is not None:
+            self._store.clear()
         self._combat_states.clear()
         self._pending_events.clear()
         self._next_projectile_id = 0
@@ -20,6 +20,82 @@ class TickConfig:
     @property
     def duration_s(self) -> float:
         return 1.0 / self.rate_hz
+    
+    @classmethod
+    def at_rate(cls, rate_hz: int, broadcast_hz: int = 10) -> "TickConfig":
+        """Config for a simulation rate (e.g. 30 or 20Hz) at the same broadcast rate."""
+        return cls(rate_hz=rate_hz, broadcast_divisor=max(1, round(rate_hz / broadcast_hz)))
+
+
+@dataclass(frozen=True)
+class SchedulerConfig:
+    """Shared tick scheduler configuration."""
+    shared: bool = False  # Step every match from one loop instead of a task per lobby
+    max_catchup_ticks: int = 5  # Max ticks stepped per wake-up before dropping backlog
+    match_budget_ms: float = 2.0  # Per-match tick budget; slower matches are flagged
+    overrun_log_interval: int = 300  # Log at most once per N overruns per match
+
+
+@dataclass(frozen=True)
+class RateConfig:
+    """Activity-aware per-match tick rate configuration."""
+    adaptive: bool = True  # Slow quiescent matches down; input or fire restores the full rate
+    idle_after_s: float = 2.0  # Quiet time before a match drops to the idle rate
+    idle_divisor: int = 4  # Idle matches step every Nth tick (60/4 = 15Hz, broadcasts 10 -> 2.5Hz)
+
+
+@dataclass(frozen=True)
+class CombatConfig:
+    """Combat simulation configuration."""
+    vectorized_projectiles: bool = False  # NumPy struct-of-arrays projectile store (needs numpy)
+    swept_collision: bool = True  # Segment tests with earliest time of impact (safe below 60Hz)
+
+
+@dataclass(frozen=True)
+class NetworkConfig:
+    """Outbound state replication configuration."""
+    delta_snapshots: bool = True  # Send state_delta to clients that ack snapshots
+    snapshot_history: int = 32  # Snapshots kept per lobby for delta bases (~3s at 10Hz)
+    binary_codec: bool = True  # Accept the binary wire codec when a client offers it
+    tick_frames: bool = True  # Bundle each tick's events + state into one tick_frame (False = legacy per-message broadcasts)
+    send_queue_depth: int = 64  # Outbound messages buffered per connection before the slow-consumer policy applies
+    slow_consumer_policy: str = "drop_oldest"  # drop_oldest | coalesce | disconnect
+    coalesce_updates: bool = True  # Newer unsent position/state messages replace older ones in send queues
+    spectator_interval_s: float = 0.25  # Spectators get one full snapshot per interval (4Hz)
+    spectator_delay_s: float = 2.0  # Spectator snapshots are held back this long, so watchers can't relay live positions
+    max_spectators_per_lobby: int = 500  # Spectator connections per lobby (separate from max_per_lobby)
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """Freelist sizes for recycled per-tick objects (0 disables a pool)."""
+    input_capacity: int = 1024  # PlayerInput objects kept for reuse (process-wide)
+    frame_capacity: int = 64  # PositionFrame objects kept for lag-compensation rewinds
+    projectile_capacity: int = 512  # ServerProjectile objects kept for reuse (dict store)
+
+
+@dataclass(frozen=True)
+class MapConfig:
+    """Compiled arena map registry configuration."""
+    registry_size: int = 32  # Compiled (map_slug, layout) definitions kept per process
+
+
+@dataclass(frozen=True)
+class InputLogConfig:
+    """Per-match input log (deterministic re-simulation) configuration."""
+    enabled: bool = False  # Stream each match's inputs to directory
+    directory: str = "input_logs"  # Local directory, one .ilog file per match
+    flush_every_ticks: int = 120  # Compress and write buffered ticks every N steps (a crash loses at most these)
+    compress_level: int = 6  # zlib level; runs once per flush, not per tick
+
+
+@dataclass(frozen=True)
+class ProfilerConfig:
+    """Per-phase tick profiling configuration."""
+    enabled: bool = False  # Record per-phase tick timings
+    sample_every: int = 1  # Profile 1 in N ticks
+    window: int = 1024  # Samples kept per rolling histogram
+    per_lobby: bool = False  # Also keep histograms per lobby
 
 
 @dataclass(frozen=True)
@@ -63,6 +139,14 @@ class AntiCheatConfig:
 
 # Default configurations
 TICK_CONFIG = TickConfig()
+SCHEDULER_CONFIG = SchedulerConfig()
+RATE_CONFIG = RateConfig()
+COMBAT_CONFIG = CombatConfig()
+NETWORK_CONFIG = NetworkConfig()
+PROFILER_CONFIG = ProfilerConfig()
+POOL_CONFIG = PoolConfig()
+MAP_CONFIG = MapConfig()
+INPUT_LOG_CONFIG = InputLogConfig()
 MOVEMENT_CONFIG = MovementConfig()
 LAG_COMP_CONFIG = LagCompConfig()
 ANTI_CHEAT_CONFIG = AntiCheatConfig()
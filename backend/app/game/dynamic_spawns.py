@@ -3,14 +3,31 @@ Server-Side Dynamic Spawn Manager
 
 Controls random spawning of hazards and traps with server authority.
 Ensures both clients see the same spawns at the same time.
+
+Spawn positions come from a FreeSpace lattice: the cells that clear
+every exclusion zone are listed once per map and spawn clearance and
+shared by its matches. Each match keeps per-cell block counts, so live
+dynamic hazards and traps block the cells around them until they
+despawn. Picking a position is a random draw from the free cells
+instead of rejection-testing random points against every zone.
 """
 
 import time
 import random
 import math
+from array import array
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple, Set
+from typing import Callable, Dict, List, Optional, Tuple, Set
 from .arena_systems import HazardType, TrapType, TrapEffect
+from .timers import TimerQueue
+
+# Minimum distance from a spawn position to any exclusion zone edge
+HAZARD_CLEARANCE = 80
+TRAP_CLEARANCE = 40
+
+# Precomputed static free space per (zones, area, clearance), shared by matches
+FREE_SPACE_CACHE_SIZE = 64
 
 
 @dataclass
@@ -32,6 +49,7 @@ class SpawnConfig:
     arena_width: float = 1280
     arena_height: float = 720
     spawn_margin: float = 100  # margin from edges
+    sample_step: float = 10  # FreeSpace lattice cell size
 
 
 @dataclass
@@ -42,17 +60,160 @@ class ExclusionZone:
     radius: float
 
 
+class FreeSpace:
+    """
+    Spawn candidates on a lattice of cells, sampled in O(1) expected time.
+
+    A cell is free while no blocking circle (grown by the clearance)
+    reaches any point in it, so a uniform point inside a free cell is a
+    valid spawn. The cells left free by the map's static zones are listed
+    once and shared by copies; each copy only keeps its own per-cell
+    block counts (overlapping circles each release their own count).
+    Sampling draws from the shared list and skips cells blocked since,
+    falling back to a scan only when nearly everything is blocked.
+    """
+
+    __slots__ = ("x0", "y0", "step", "cols", "rows", "clearance", "_reach", "_blocked", "_cells", "_taken")
+
+    MAX_TRIES = 16  # Random draws before scanning for the remaining free cells
+
+    def __init__(
+        self, x0: float, y0: float, x1: float, y1: float, step: float, clearance: float,
+        zones: Tuple[Tuple[float, float, float], ...] = (),
+    ):
+        self.step = step
+        self.cols = max(1, int((x1 - x0) // step))
+        self.rows = max(1, int((y1 - y0) // step))
+        # Center the lattice in the area
+        self.x0 = x0 + ((x1 - x0) - self.cols * step) / 2
+        self.y0 = y0 + ((y1 - y0) - self.rows * step) / 2
+        self.clearance = clearance
+        # Extra distance covering every point in a cell from its center
+        self._reach = clearance + step * math.sqrt(2) / 2
+        self._blocked = array("H", bytes(2 * self.cols * self.rows))  # Blocking circles per cell
+        for x, y, radius in zones:
+            for cell in self._cells_near(x, y, radius):
+                self._blocked[cell] += 1
+        blocked = self._blocked
+        self._cells = array("i", (cell for cell in range(len(blocked)) if not blocked[cell]))
+        self._taken = 0  # Cells in _cells blocked since construction
+
+    def __len__(self) -> int:
+        return len(self._cells) - self._taken
+
+    def copy(self) -> "FreeSpace":
+        """Independent block counts over the same (shared) free cell list."""
+        clone = object.__new__(FreeSpace)
+        for name in ("x0", "y0", "step", "cols", "rows", "clearance", "_reach", "_cells", "_taken"):
+            setattr(clone, name, getattr(self, name))
+        clone._blocked = self._blocked[:]
+        return clone
+
+    def block(self, x: float, y: float, radius: float) -> None:
+        """Mark cells within radius (+ clearance) of (x, y) as taken."""
+        blocked = self._blocked
+        for cell in self._cells_near(x, y, radius):
+            blocked[cell] += 1
+            if blocked[cell] == 1:
+                self._taken += 1
+
+    def unblock(self, x: float, y: float, radius: float) -> None:
+        """Release cells taken by an earlier block() with the same circle."""
+        blocked = self._blocked
+        for cell in self._cells_near(x, y, radius):
+            if blocked[cell] == 0:
+                continue
+            blocked[cell] -= 1
+            if blocked[cell] == 0:
+                self._taken -= 1
+
+    def sample(self, rng) -> Optional[Tuple[float, float]]:
+        """Uniform point in a uniformly chosen free cell, or None when full."""
+        if self._taken >= len(self._cells):
+            return None
+        cells, blocked = self._cells, self._blocked
+        for _ in range(self.MAX_TRIES):
+            cell = cells[rng.randrange(len(cells))]
+            if not blocked[cell]:
+                break
+        else:
+            cell = rng.choice([c for c in cells if not blocked[c]])
+        row, col = divmod(cell, self.cols)
+        return (
+            self.x0 + (col + rng.random()) * self.step,
+            self.y0 + (row + rng.random()) * self.step,
+        )
+
+    def _cells_near(self, x: float, y: float, radius: float) -> List[int]:
+        reach = radius + self._reach
+        step, cols = self.step, self.cols
+        col0 = max(0, int((x - reach - self.x0) // step))
+        col1 = min(cols - 1, int((x + reach - self.x0) // step))
+        row0 = max(0, int((y - reach - self.y0) // step))
+        row1 = min(self.rows - 1, int((y + reach - self.y0) // step))
+        limit = reach * reach
+        cells = []
+        for row in range(row0, row1 + 1):
+            dy = self.y0 + (row + 0.5) * step - y
+            for col in range(col0, col1 + 1):
+                dx = self.x0 + (col + 0.5) * step - x
+                if dx * dx + dy * dy < limit:
+                    cells.append(row * cols + col)
+        return cells
+
+
+_free_space_cache: "OrderedDict[tuple, FreeSpace]" = OrderedDict()
+
+
+def static_free_space(
+    zones: Tuple[Tuple[float, float, float], ...], config: SpawnConfig, clearance: float
+) -> FreeSpace:
+    """
+    Free space around a map's static exclusion zones, built once.
+
+    Returns the shared instance; callers copy() it before blocking.
+    """
+    key = (zones, config.arena_width, config.arena_height, config.spawn_margin, config.sample_step, clearance)
+    space = _free_space_cache.get(key)
+    if space is not None:
+        _free_space_cache.move_to_end(key)
+        return space
+
+    margin = config.spawn_margin
+    space = FreeSpace(
+        margin, margin, config.arena_width - margin, config.arena_height - margin,
+        config.sample_step, clearance, zones,
+    )
+    _free_space_cache[key] = space
+    while len(_free_space_cache) > FREE_SPACE_CACHE_SIZE:
+        _free_space_cache.popitem(last=False)
+    return space
+
+
 class ServerDynamicSpawnManager:
     """
     Server-authoritative dynamic spawn manager.
     
     Controls when and where hazards/traps spawn, ensuring
     both clients see identical spawns.
+    
+    All randomness comes from rng (the global random module by default);
+    pass random.Random(seed) for a reproducible spawn sequence.
     """
     
-    def __init__(self, config: Optional[SpawnConfig] = None):
+    def __init__(
+        self,
+        config: Optional[SpawnConfig] = None,
+        rng: Optional[random.Random] = None,
+        clock: Callable[[], float] = time.time,
+    ):
         self.config = config or SpawnConfig()
+        self._clock = clock
+        self._rng = rng if rng is not None else random
         self._exclusion_zones: List[ExclusionZone] = []
+        self._free_space: Dict[float, FreeSpace] = {}  # Clearance -> this match's free space
+        self._live: Dict[str, Tuple[str, float, float, float]] = {}  # Spawn id -> (kind, x, y, radius)
+        self._despawns: TimerQueue[str] = TimerQueue()
         self._last_hazard_spawn: float = 0
         self._last_trap_spawn: float = 0
         self._active_hazard_count: int = 0
@@ -66,8 +227,13 @@ class ServerDynamicSpawnManager:
             ExclusionZone(z["x"], z["y"], z["radius"])
             for z in exclusion_zones
         ]
-        self._last_hazard_spawn = time.time()
-        self._last_trap_spawn = time.time()
+        self._free_space.clear()
+        self._live.clear()
+        self._despawns.clear()
+        for clearance in (HAZARD_CLEARANCE, TRAP_CLEARANCE):
+            self._space(clearance)
+        self._last_hazard_spawn = self._clock()
+        self._last_trap_spawn = self._clock()
         self._active_hazard_count = 0
         self._active_trap_count = 0
         self._initialized = True
@@ -85,6 +251,10 @@ class ServerDynamicSpawnManager:
         
         result = {"new_hazards": [], "new_traps": []}
         
+        # Free the space and slots of spawns whose lifetime is over
+        for spawn_id in self._despawns.pop_due(current_time):
+            self._release(spawn_id)
+        
         # Check hazard spawn
         if (current_time - self._last_hazard_spawn >= self.config.hazard_spawn_interval and
             self._active_hazard_count < self.config.max_hazards):
@@ -105,29 +275,53 @@ class ServerDynamicSpawnManager:
         
         return result
     
-    def on_hazard_despawn(self) -> None:
-        """Called when a hazard despawns."""
-        self._active_hazard_count = max(0, self._active_hazard_count - 1)
+    def on_hazard_despawn(self, hazard_id: str) -> None:
+        """Called when a dynamic hazard is removed before its lifetime ends."""
+        self._release(hazard_id)
+    
+    def on_trap_despawn(self, trap_id: str) -> None:
+        """Called when a dynamic trap is removed before its lifetime ends."""
+        self._release(trap_id)
+    
+    def _occupy(self, spawn_id: str, kind: str, x: float, y: float, radius: float, despawn_time: float) -> None:
+        """Block the space around a new spawn until it despawns."""
+        self._live[spawn_id] = (kind, x, y, radius)
+        for space in self._free_space.values():
+            space.block(x, y, radius)
+        self._despawns.schedule(spawn_id, despawn_time)
     
-    def on_trap_despawn(self) -> None:
-        """Called when a trap despawns."""
-        self._active_trap_count = max(0, self._active_trap_count - 1)
+    def _release(self, spawn_id: str) -> None:
+        live = self._live.pop(spawn_id, None)
+        if live is None:
+            return
+        kind, x, y, radius = live
+        for space in self._free_space.values():
+            space.unblock(x, y, radius)
+        self._despawns.cancel(spawn_id)
+        if kind == "hazard":
+            self._active_hazard_count = max(0, self._active_hazard_count - 1)
+        else:
+            self._active_trap_count = max(0, self._active_trap_count - 1)
     
     def _spawn_hazard(self, current_time: float) -> Optional[Dict]:
         """Generate a random hazard spawn."""
-        position = self._find_valid_position(80)  # hazard size
+        rng = self._rng
+        position = self._find_valid_position(HAZARD_CLEARANCE)
         if not position:
             return None
         
         self._next_id += 1
-        hazard_type = random.choice(self.config.hazard_types)
+        hazard_type = rng.choice(self.config.hazard_types)
         
         # Random size
-        width = random.randint(60, 120)
-        height = random.randint(60, 120)
+        width = rng.randint(60, 120)
+        height = rng.randint(60, 120)
         
+        hazard_id = f"dyn_hazard_{self._next_id}"
+        despawn_time = current_time + self.config.hazard_lifetime
+        self._occupy(hazard_id, "hazard", position[0], position[1], max(width, height) / 2, despawn_time)
         return {
-            "id": f"dyn_hazard_{self._next_id}",
+            "id": hazard_id,
             "type": hazard_type.value,
             "bounds": {
                 "x": position[0] - width / 2,
@@ -135,59 +329,56 @@ class ServerDynamicSpawnManager:
                 "width": width,
                 "height": height,
             },
-            "intensity": random.uniform(0.5, 1.5),
-            "despawn_time": current_time + self.config.hazard_lifetime,
+            "intensity": rng.uniform(0.5, 1.5),
+            "despawn_time": despawn_time,
         }
     
     def _spawn_trap(self, current_time: float) -> Optional[Dict]:
         """Generate a random trap spawn."""
-        position = self._find_valid_position(40)  # trap radius
+        rng = self._rng
+        position = self._find_valid_position(TRAP_CLEARANCE)
         if not position:
             return None
         
         self._next_id += 1
-        trap_type = random.choice(self.config.trap_types)
+        trap_type = rng.choice(self.config.trap_types)
         
         # Effect based on type
         if trap_type == TrapType.PRESSURE:
-            effect = random.choice([TrapEffect.DAMAGE, TrapEffect.STUN, TrapEffect.KNOCKBACK])
+            effect = rng.choice([TrapEffect.DAMAGE, TrapEffect.STUN, TrapEffect.KNOCKBACK])
         else:
             effect = TrapEffect.DAMAGE
         
+        trap_id = f"dyn_trap_{self._next_id}"
+        radius = rng.randint(25, 40)
+        despawn_time = current_time + self.config.trap_lifetime
+        self._occupy(trap_id, "trap", position[0], position[1], radius, despawn_time)
         return {
-            "id": f"dyn_trap_{self._next_id}",
+            "id": trap_id,
             "type": trap_type.value,
             "position": {"x": position[0], "y": position[1]},
-            "radius": random.randint(25, 40),
+            "radius": radius,
             "effect": effect.value,
-            "effectValue": random.randint(10, 25),
-            "cooldown": random.uniform(3.0, 6.0),
-            "interval": random.uniform(4.0, 8.0) if trap_type == TrapType.TIMED else None,
-            "despawn_time": current_time + self.config.trap_lifetime,
+            "effectValue": rng.randint(10, 25),
+            "cooldown": rng.uniform(3.0, 6.0),
+            "interval": rng.uniform(4.0, 8.0) if trap_type == TrapType.TIMED else None,
+            "despawn_time": despawn_time,
         }
     
-    def _find_valid_position(self, min_distance: float, max_attempts: int = 20) -> Optional[Tuple[float, float]]:
-        """Find a valid spawn position avoiding exclusion zones."""
-        cfg = self.config
-        
-        for _ in range(max_attempts):
-            x = random.uniform(cfg.spawn_margin, cfg.arena_width - cfg.spawn_margin)
-            y = random.uniform(cfg.spawn_margin, cfg.arena_height - cfg.spawn_margin)
-            
-            # Check exclusion zones
-            valid = True
-            for zone in self._exclusion_zones:
-                dx = x - zone.x
-                dy = y - zone.y
-                dist = math.sqrt(dx * dx + dy * dy)
-                if dist < zone.radius + min_distance:
-                    valid = False
-                    break
-            
-            if valid:
-                return (x, y)
-        
-        return None
+    def _find_valid_position(self, min_distance: float) -> Optional[Tuple[float, float]]:
+        """Random position at least min_distance clear of exclusion zones and live spawns."""
+        return self._space(min_distance).sample(self._rng)
+    
+    def _space(self, clearance: float) -> FreeSpace:
+        """This match's free space for a clearance, copied from the map's on first use."""
+        space = self._free_space.get(clearance)
+        if space is None:
+            zones = tuple((z.x, z.y, z.radius) for z in self._exclusion_zones)
+            space = static_free_space(zones, self.config, clearance).copy()
+            for _, x, y, radius in self._live.values():
+                space.block(x, y, radius)
+            self._free_space[clearance] = space
+        return space
     
     def reset(self) -> None:
         """Reset spawn manager state."""
@@ -196,4 +387,7 @@ class ServerDynamicSpawnManager:
         self._active_hazard_count = 0
         self._active_trap_count = 0
         self._next_id = 0
+        self._free_space.clear()
+        self._live.clear()
+        self._despawns.clear()
         self._initialized = False
@@ -0,0 +1,69 @@
+"""
+Per-tick outbound frames.
+
+Single responsibility: collect everything a lobby sends on one tick
+(combat events, arena events, then the state snapshot) into one
+ordered tick_frame message.
+
+Frame-capable clients receive the tick_frame as one message. Other
+clients get the bundled messages unpacked and sent one by one, in the
+same order, so they see exactly the legacy message stream.
+"""
+
+from typing import List, Optional, Tuple
+
+TICK_FRAME = "tick_frame"
+STATE_UPDATE = "state_update"
+
+
+class TickFrame:
+    """Ordered outbound messages for one lobby tick."""
+
+    __slots__ = ("tick", "messages")
+
+    def __init__(self, tick: int):
+        self.tick = tick
+        self.messages: List[dict] = []
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    def add(self, message: dict) -> None:
+        self.messages.append(message)
+
+    def add_events(self, prefix: str, events) -> None:
+        """Add CombatEvent/ArenaEvent objects as {prefix}_{event_type} messages."""
+        for event in events:
+            self.messages.append({
+                "type": f"{prefix}_{event.event_type}",
+                "payload": event.data,
+            })
+
+    def to_message(self) -> dict:
+        return {
+            "type": TICK_FRAME,
+            "payload": {"tick": self.tick, "messages": self.messages},
+        }
+
+
+def build_frame(tick: int, messages: List[dict]) -> dict:
+    """Wrap already-built messages in a tick_frame."""
+    return {"type": TICK_FRAME, "payload": {"tick": tick, "messages": messages}}
+
+
+def split_frame(message: dict) -> Tuple[List[dict], Optional[dict]]:
+    """
+    Split an outbound tick message into (events, state_update).
+
+    Accepts a tick_frame or a bare message; a bare state_update yields
+    no events, any other bare message yields no state.
+    """
+    msg_type = message.get("type")
+    if msg_type == TICK_FRAME:
+        messages = message["payload"]["messages"]
+    else:
+        messages = [message]
+
+    if messages and messages[-1].get("type") == STATE_UPDATE:
+        return messages[:-1], messages[-1]
+    return messages, None
@@ -0,0 +1,422 @@
+"""
+Per-match input log for deterministic re-simulation.
+
+Single responsibility: stream what a match consumed (its seed, map,
+accepted movement and fire inputs, tick times and quiz rewards) to a
+compact binary file, and rebuild any tick of the match from that file.
+
+Everything else in a tick is derived: the simulation only reads the
+clock, the match's seeded RNG and these inputs, so replaying them
+through a fresh TickSystem reproduces the match.
+
+File layout: b"ILOG" + version byte, then one zlib stream of records,
+each a type byte followed by:
+- MATCH / ARENA / QUIZ: time, JSON length, JSON (rare control records)
+- START / END: time
+- BLOCK: tick count, then the ticks since the previous record as
+  fixed-size rows in separate streams: ticks (time, base ticks
+  covered, which players moved, fire count), one movement stream per
+  player, and fires
+
+The tick path only packs rows onto those streams. Every
+flush_every_ticks steps (and before any control record) the writer
+emits a BLOCK: each stream, read as one little-endian integer, has
+itself shifted by one row subtracted, so every row becomes its
+difference from the previous one (a tick time or sequence that moved
+by a step becomes a short, repeating number), then its bytes are
+transposed so equal byte positions of every row sit together. Both are
+single big-integer and slicing operations, and zlib does the rest. A sync
+flush follows, so a crashed process loses at most one block and
+nothing grows in memory over a match. Values are stored as the raw
+doubles and integers the tick consumed, so the log is lossless.
+
+Usage:
+    game = resimulate("input_logs/L1-1f2e3d4c.ilog", until_tick=600)
+"""
+
+import asyncio
+import json
+import os
+import struct
+import zlib
+from dataclasses import replace
+from typing import Awaitable, Callable, Iterator, List, Optional, Sequence, Tuple
+
+from app.core.logging import get_logger
+from .config import COMBAT_CONFIG, INPUT_LOG_CONFIG, RateConfig, TickConfig
+from .models import INPUT_POOL, FireInput, GameState
+from .rate_control import RateController
+
+logger = get_logger("game.input_log")
+
+MAGIC = b"ILOG"
+VERSION = 1
+MAX_PLAYERS = 8  # Players that moved in a tick are a bitmask byte
+
+REC_MATCH = 1
+REC_ARENA = 2
+REC_START = 3
+REC_BLOCK = 4
+REC_QUIZ = 5
+REC_END = 6
+REC_TICK = 7  # Decoded from blocks by read_input_log
+
+_CONTROL = struct.Struct("<BdI")  # type, time, JSON length
+_TIMED = struct.Struct("<Bd")  # type, time
+_BLOCK = struct.Struct("<BH")  # type, ticks
+_TICK = struct.Struct("<dBBH")  # time, base ticks, players that moved (bitmask), fires
+_MOVE = struct.Struct("<dddddd")  # x, y, dx, dy, sequence, client ts
+_FIRE = struct.Struct("<ddddd")  # player, dx, dy, sequence, client ts
+_FIRE_COUNT = struct.Struct("<H")  # Last field of a _TICK row, set by fires()
+
+# Sequences are packed as doubles so a fractional one still packs; the WebSocket
+# handlers replace non-numbers (including null) with 0 before inputs are queued
+Move = Tuple[int, float, float, float, float, int, float]  # player, x, y, dx, dy, sequence, client ts
+Fire = Tuple[int, float, float, int, float]  # player, dx, dy, sequence, client ts
+
+
+def _delta(rows: bytes, width: int) -> bytes:
+    """Subtract from every row the one before it, then transpose bytes by position in the row."""
+    n = len(rows)
+    value = int.from_bytes(rows, "little")
+    value = (value - (value << (width * 8))) & ((1 << (n * 8)) - 1)
+    data = value.to_bytes(n, "little")
+    return b"".join(data[k::width] for k in range(width))
+
+
+def _undelta(data: bytes, width: int) -> bytes:
+    """Inverse of _delta."""
+    n = len(data)
+    count = n // width
+    rows = bytearray(n)
+    for k in range(width):
+        rows[k::width] = data[k * count:(k + 1) * count]
+    value = int.from_bytes(rows, "little")
+    mask = (1 << (n * 8)) - 1
+    shift = width * 8
+    while shift < n * 8:  # Prefix sum in log2(rows) steps
+        value = (value + (value << shift)) & mask
+        shift *= 2
+    return value.to_bytes(n, "little")
+
+
+def _sequence(value: float):
+    return int(value) if value.is_integer() else value
+
+
+class InputLogWriter:
+    """Buffered, compressed input log for one match."""
+
+    def __init__(
+        self,
+        path: str,
+        players: Sequence[str],
+        tick_duration_s: float,
+        flush_every_ticks: int = INPUT_LOG_CONFIG.flush_every_ticks,
+        compress_level: int = INPUT_LOG_CONFIG.compress_level,
+    ):
+        if len(players) > MAX_PLAYERS:
+            raise ValueError(f"Input log supports up to {MAX_PLAYERS} players")
+        self.path = path
+        self._index = {pid: i for i, pid in enumerate(players)}
+        self._tick_duration_s = tick_duration_s
+        self._flush_every = max(1, min(flush_every_ticks, 0xFFFF))
+        self._ticks = bytearray()
+        self._moves = [bytearray() for _ in players]
+        self._fires = bytearray()
+        self._compressor = zlib.compressobj(compress_level)
+        self._file = open(path, "wb")
+        self._file.write(MAGIC + bytes((VERSION,)))
+        self.bytes_written = len(MAGIC) + 1
+        self.ticks = 0
+
+    def _control(self, record: bytes) -> None:
+        self.flush()
+        self._write(self._compressor.compress(record) + self._compressor.flush(zlib.Z_SYNC_FLUSH))
+
+    def _json(self, record_type: int, now: float, payload: dict) -> None:
+        encoded = json.dumps(payload, separators=(",", ":")).encode()
+        self._control(_CONTROL.pack(record_type, now, len(encoded)) + encoded)
+
+    def match(self, now: float, meta: dict) -> None:
+        self._json(REC_MATCH, now, meta)
+
+    def arena(self, now: float, map_slug: Optional[str], config: dict) -> None:
+        self._json(REC_ARENA, now, {"map_slug": map_slug, "config": config})
+
+    def quiz(self, now: float, round_result: dict, question_time_ms: int) -> None:
+        self._json(REC_QUIZ, now, {"round_result": round_result, "question_time_ms": question_time_ms})
+
+    def start(self, now: float) -> None:
+        self._control(_TIMED.pack(REC_START, now))
+
+    def tick(self, now: float, tick_duration: float, inputs: list) -> None:
+        """Record a stepped tick and the movement inputs it consumed."""
+        if len(self._ticks) >= self._flush_every * _TICK.size:
+            self.flush()
+        index = self._index
+        moves = self._moves
+        moved = 0
+        for i in inputs:
+            player = index.get(i.player_id)
+            if player is None or moved >> player & 1:
+                continue
+            moved |= 1 << player
+            moves[player] += _MOVE.pack(
+                i.x, i.y, i.direction_x, i.direction_y, i.sequence, i.client_timestamp
+            )
+        self._ticks += _TICK.pack(now, round(tick_duration / self._tick_duration_s), moved, 0)
+        self.ticks += 1
+
+    def fires(self, fire_inputs: list) -> None:
+        """Record the fire inputs processed by the tick just recorded."""
+        index = self._index
+        count = 0
+        for f in fire_inputs:
+            player = index.get(f.player_id)
+            if player is None:
+                continue
+            count += 1
+            self._fires += _FIRE.pack(player, f.direction_x, f.direction_y, f.sequence, f.client_timestamp)
+        if count:
+            _FIRE_COUNT.pack_into(self._ticks, len(self._ticks) - _FIRE_COUNT.size, count)
+
+    def flush(self) -> None:
+        """Write the ticks since the last flush as a BLOCK (sync flush: readable up to here)."""
+        if self._file is None or not self._ticks:
+            return
+        compress = self._compressor.compress
+        data = compress(_BLOCK.pack(REC_BLOCK, len(self._ticks) // _TICK.size))
+        data += compress(_delta(self._ticks, _TICK.size))
+        for moves in self._moves:
+            data += compress(_delta(moves, _MOVE.size))
+            moves.clear()
+        data += compress(_delta(self._fires, _FIRE.size))
+        self._ticks.clear()
+        self._fires.clear()
+        self._write(data + self._compressor.flush(zlib.Z_SYNC_FLUSH))
+
+    def _write(self, data: bytes) -> None:
+        self._file.write(data)
+        self._file.flush()
+        self.bytes_written += len(data)
+
+    def close(self, now: float) -> None:
+        """Write the END record and finish the stream."""
+        if self._file is None:
+            return
+        self.flush()
+        self._write(self._compressor.compress(_TIMED.pack(REC_END, now)) + self._compressor.flush())
+        self._file.close()
+        self._file = None
+
+
+def open_input_log(
+    config, lobby_id: str, seed: int, players: Sequence[str], tick_duration_s: float
+) -> Optional[InputLogWriter]:
+    """Writer for a new match, or None when disabled or the file cannot be opened."""
+    if not config.enabled:
+        return None
+    path = os.path.join(config.directory, f"{lobby_id}-{seed:08x}.ilog")
+    try:
+        os.makedirs(config.directory, exist_ok=True)
+        return InputLogWriter(
+            path, players, tick_duration_s,
+            flush_every_ticks=config.flush_every_ticks,
+            compress_level=config.compress_level,
+        )
+    except OSError as e:
+        logger.warning(f"[INPUT_LOG] Cannot open {path}: {e}")
+        return None
+
+
+def _read_block(data: bytes, offset: int) -> Tuple[List[tuple], int]:
+    """Decode the BLOCK at offset into (REC_TICK, time, base_ticks, [Move], [Fire]) records."""
+    _, count = _BLOCK.unpack_from(data, offset)
+    offset += _BLOCK.size
+
+    def stream(rows: int, row: struct.Struct) -> list:
+        nonlocal offset
+        size = rows * row.size
+        if offset + size > len(data):
+            raise struct.error("block cut off")
+        decoded = list(row.iter_unpack(_undelta(data[offset:offset + size], row.size)))
+        offset += size
+        return decoded
+
+    ticks = stream(count, _TICK)
+    players = max((moved.bit_length() for _, _, moved, _ in ticks), default=0)
+    moves = [
+        iter(stream(sum(moved >> p & 1 for _, _, moved, _ in ticks), _MOVE))
+        for p in range(players)
+    ]
+    fires = iter(stream(sum(f for _, _, _, f in ticks), _FIRE))
+
+    records = []
+    for now, base_ticks, moved, fire_count in ticks:
+        tick_moves = []
+        for p in range(players):
+            if moved >> p & 1:
+                x, y, dx, dy, sequence, ts = next(moves[p])
+                tick_moves.append((p, x, y, dx, dy, _sequence(sequence), ts))
+        tick_fires = [
+            (int(p), dx, dy, _sequence(sequence), ts)
+            for p, dx, dy, sequence, ts in (next(fires) for _ in range(fire_count))
+        ]
+        records.append((REC_TICK, now, base_ticks, tick_moves, tick_fires))
+    return records, offset
+
+
+def read_input_log(path: str) -> Iterator[tuple]:
+    """
+    Decode a log into records.
+
+    Yields (REC_MATCH | REC_ARENA | REC_QUIZ, time, payload),
+    (REC_START | REC_END, time) and per tick
+    (REC_TICK, time, base_ticks, [Move], [Fire]). A log cut off by a
+    crash yields the records up to its last flush.
+    """
+    with open(path, "rb") as f:
+        header = f.read(len(MAGIC) + 1)
+        if header[:len(MAGIC)] != MAGIC or header[len(MAGIC):] != bytes((VERSION,)):
+            raise ValueError(f"Not an input log (version {VERSION}): {path}")
+        data = zlib.decompressobj().decompress(f.read())
+
+    offset, end = 0, len(data)
+    try:
+        while offset < end:
+            record_type = data[offset]
+            if record_type in (REC_MATCH, REC_ARENA, REC_QUIZ):
+                _, now, length = _CONTROL.unpack_from(data, offset)
+                offset += _CONTROL.size
+                if offset + length > end:
+                    return
+                yield record_type, now, json.loads(data[offset:offset + length])
+                offset += length
+            elif record_type in (REC_START, REC_END):
+                yield _TIMED.unpack_from(data, offset)
+                offset += _TIMED.size
+            elif record_type == REC_BLOCK:
+                records, offset = _read_block(data, offset)
+                yield from records
+            else:
+                raise ValueError(f"Corrupt input log {path}: record type {record_type} at {offset}")
+    except struct.error:
+        return  # Cut off mid-record
+
+
+class LoggedRates(RateController):
+    """
+    Rate controller that steps on demand for the durations in the log.
+
+    Still observes activity like the live one, so the reported tick and
+    broadcast rates match what the match sent.
+    """
+
+    def __init__(self, tick_config, config):
+        super().__init__(tick_config, config)
+        self.base_ticks = 1
+
+    def should_step(self, lobby_id: str) -> bool:
+        return True
+
+    def step_duration(self, lobby_id: str) -> float:
+        return self.base_ticks * self._tick_config.duration_s
+
+
+class _LogClock:
+    """Replay TickSystem clock, set to each logged record's time."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def _replay(
+    records: Iterator[tuple],
+    clock: _LogClock,
+    until_tick: Optional[int],
+    broadcast: Optional[Callable[[str, dict], Awaitable[None]]],
+) -> Optional[GameState]:
+    from .tick_system import TickSystem
+
+    system: Optional[TickSystem] = None
+    game: Optional[GameState] = None
+    players: List[str] = []
+    rates: Optional[LoggedRates] = None
+
+    for record in records:
+        record_type = record[0]
+        if game is not None and until_tick is not None and game.tick_count >= until_tick:
+            break
+
+        if record_type == REC_MATCH:
+            clock.now, meta = record[1], record[2]
+            tick_config = TickConfig(rate_hz=meta["rate_hz"], broadcast_divisor=meta["broadcast_divisor"])
+            combat_config = replace(
+                COMBAT_CONFIG,
+                vectorized_projectiles=meta["vectorized"],
+                swept_collision=meta["swept"],
+            )
+            rates = LoggedRates(tick_config, RateConfig(**meta["rates"]))
+            system = TickSystem(
+                tick_config=tick_config,
+                combat_config=combat_config,
+                input_log_config=replace(INPUT_LOG_CONFIG, enabled=False),
+                rates=rates,
+                clock=clock,
+            )
+            if broadcast:
+                system.set_broadcast_callback(broadcast)
+            players = meta["players"]
+            spawns = [tuple(s) for s in meta["spawns"]]
+            game = system.create_game(meta["lobby_id"], *players, *spawns, seed=meta["seed"])
+        elif system is None:
+            raise ValueError("Input log does not start with a MATCH record")
+        elif record_type == REC_ARENA:
+            clock.now = record[1]
+            system.init_arena_config(game.lobby_id, record[2]["config"], record[2]["map_slug"])
+        elif record_type == REC_START:
+            clock.now = record[1]
+            system.start_game(game.lobby_id, headless=True)
+        elif record_type == REC_QUIZ:
+            clock.now = record[1]
+            system.dispatch_quiz_rewards(
+                game.lobby_id, record[2]["round_result"], record[2]["question_time_ms"]
+            )
+        elif record_type == REC_TICK:
+            _, clock.now, rates.base_ticks, moves, fires = record
+            for player, x, y, dx, dy, sequence, client_ts in moves:
+                pid = players[player]
+                game.pending_inputs.offer(
+                    INPUT_POOL.acquire(pid, x, y, dx, dy, sequence, client_ts),
+                    game.players[pid].last_input_sequence,
+                )
+            game.pending_fire_inputs.extend(
+                FireInput(players[p], dx, dy, sequence, client_ts)
+                for p, dx, dy, sequence, client_ts in fires
+            )
+            await system.step_game(game.lobby_id)
+        elif record_type == REC_END:
+            break
+    return game
+
+
+def resimulate(
+    path: str,
+    until_tick: Optional[int] = None,
+    broadcast: Optional[Callable[[str, dict], Awaitable[None]]] = None,
+) -> Optional[GameState]:
+    """
+    Rebuild a match from its input log, offline.
+
+    Steps a fresh headless TickSystem through the logged ticks with its
+    clock set to each record's time and returns the game after
+    tick until_tick (or at the end of the log). broadcast, if given,
+    receives the state messages the match sent.
+
+    Must not be called from a running event loop.
+    """
+    return asyncio.run(_replay(read_input_log(path), _LogClock(), until_tick, broadcast))
@@ -2,12 +2,15 @@
 Lag compensation for hit detection.
 
 Single responsibility: rewind player positions for fair hit detection.
+
+Rewinds bisect the player's PositionHistory ring, so a lookup is
+O(log n) in the history length.
 """
 
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple
 import time
 from app.core.logging import get_logger
-from .models import PlayerState, PositionFrame
+from .models import FRAME_POOL, PlayerState, PositionFrame
 from .config import LAG_COMP_CONFIG
 
 logger = get_logger("game.lag_comp")
@@ -16,8 +19,9 @@ logger = get_logger("game.lag_comp")
 class LagCompensator:
     """Handles position history and lag-compensated hit detection."""
     
-    def __init__(self, config=LAG_COMP_CONFIG):
+    def __init__(self, config=LAG_COMP_CONFIG, clock: Callable[[], float] = time.time):
         self.config = config
+        self._clock = clock
     
     def record_position(
         self,
@@ -26,56 +30,52 @@ class LagCompensator:
         sequence: int,
     ) -> None:
         """Record current position in history."""
-        player.position_history.append(PositionFrame(
-            timestamp=timestamp,
-            x=player.x,
-            y=player.y,
-            sequence=sequence,
-        ))
+        player.position_history.record(timestamp, player.x, player.y, sequence)
     
     def get_position_at_time(
         self,
         player: PlayerState,
         target_time: float,
+        current_time: Optional[float] = None,
     ) -> Optional[PositionFrame]:
         """
         Get interpolated position at a specific time.
         
-        Clamps to max rewind window.
+        Clamps to max rewind window (relative to current_time, which
+        defaults to now). The frame comes from FRAME_POOL; callers that
+        rewind every shot should release it once read.
         """
-        if not player.position_history:
+        history = player.position_history
+        count = len(history)
+        if not count:
             return None
         
         # Clamp to max rewind
-        current_time = time.time()
-        min_time = current_time - self.config.max_rewind_s
-        target_time = max(target_time, min_time)
-        
-        # Find frames to interpolate
-        before: Optional[PositionFrame] = None
-        after: Optional[PositionFrame] = None
+        if current_time is None:
+            current_time = self._clock()
+        target_time = max(target_time, current_time - self.config.max_rewind_s)
         
-        for frame in player.position_history:
-            if frame.timestamp <= target_time:
-                before = frame
-            else:
-                after = frame
-                break
+        # Newest frame at or before the target
+        index = history.index_before(target_time)
+        if index < 0:
+            # Before all history: freeze at the oldest frame
+            return FRAME_POOL.acquire(*history.values(0))
         
-        # Interpolate if we have both
-        if before and after:
-            dt = after.timestamp - before.timestamp
+        before_ts, before_x, before_y, before_seq = history.values(index)
+        if index + 1 < count:
+            after_ts, after_x, after_y, _ = history.values(index + 1)
+            dt = after_ts - before_ts
             if dt > 0:
-                t = min(1.0, max(0.0, (target_time - before.timestamp) / dt))
-                return PositionFrame(
+                t = min(1.0, max(0.0, (target_time - before_ts) / dt))
+                return FRAME_POOL.acquire(
                     timestamp=target_time,
-                    x=before.x + (after.x - before.x) * t,
-                    y=before.y + (after.y - before.y) * t,
-                    sequence=before.sequence,
+                    x=before_x + (after_x - before_x) * t,
+                    y=before_y + (after_y - before_y) * t,
+                    sequence=before_seq,
                 )
         
         # Return closest (freeze, don't extrapolate)
-        return before or after
+        return FRAME_POOL.acquire(before_ts, before_x, before_y, before_seq)
     
     def check_hit(
         self,
@@ -90,7 +90,7 @@ class LagCompensator:
         Returns:
             (hit, debug_info)
         """
-        current_time = time.time()
+        current_time = self._clock()
         rewind_ms = (current_time - client_timestamp) * 1000
         
         # Clamp rewind
@@ -99,9 +99,10 @@ class LagCompensator:
             rewind_ms = self.config.max_rewind_ms
         
         # Get historical position
-        frame = self.get_position_at_time(target, client_timestamp)
+        frame = self.get_position_at_time(target, client_timestamp, current_time)
         if frame:
             target_x, target_y = frame.x, frame.y
+            FRAME_POOL.release(frame)
             debug = f"rewound={rewind_ms:.0f}ms"
         else:
             target_x, target_y = target.x, target.y
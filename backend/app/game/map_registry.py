@@ -0,0 +1,121 @@
+"""
+Compiled arena map registry.
+
+Single responsibility: compile each arena layout once per process and
+hand the same immutable ArenaMap to every match played on it.
+
+The host client still sends the full arena config with arena_init.
+Definitions are keyed by (map_slug, layout fingerprint): the fingerprint
+is a hash of the sections the server loads, so a host that sends a
+different layout under a known slug gets its own definition instead of
+the shared one (and cannot change what other matches load).
+
+Compiling parses and validates the config (arena.maps.parse_map) and
+prebuilds the spatial grid for its static layout. Matches load that
+grid copy-on-write, so per-match startup is a pass of manager add()
+calls that find their objects already indexed.
+
+Usage:
+    arena_map = map_registry.get(map_slug, arena_config)
+    game.arena_systems.initialize_from_map(arena_map)
+"""
+
+import dataclasses
+import hashlib
+import pickle
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.core.logging import get_logger
+from .config import MAP_CONFIG
+from .arena import ServerArenaSystems
+from .arena.maps import ArenaMap, parse_map
+
+logger = get_logger("game.map_registry")
+
+# Config sections that affect the compiled definition
+MAP_SECTIONS = (
+    "hazards", "traps", "teleporters", "jumpPads", "doors",
+    "platforms", "barriers", "powerups", "spawnPoints",
+)
+
+
+def map_fingerprint(config: dict) -> str:
+    """
+    Hash of the sections of a config the server loads.
+
+    Pickled rather than JSON-encoded for speed: configs decoded from the
+    same JSON hash equal, and any difference in content changes the
+    hash. Equal content with a different key order only costs a compile.
+    """
+    layout = [(key, config[key]) for key in MAP_SECTIONS if config.get(key)]
+    encoded = pickle.dumps(layout, protocol=pickle.HIGHEST_PROTOCOL)
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def compile_map(config: dict) -> ArenaMap:
+    """
+    Parse a config and prebuild the spatial grid of its static layout.
+
+    Raises ValueError for malformed configs.
+    """
+    arena_map = parse_map(config)
+    scratch = ServerArenaSystems()
+    try:
+        scratch.initialize_from_map(arena_map)
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid arena layout: {type(e).__name__}: {e}") from e
+    return dataclasses.replace(arena_map, grid=scratch.grid)
+
+
+class MapRegistry:
+    """LRU of compiled ArenaMaps keyed by (map_slug, fingerprint)."""
+
+    def __init__(self, capacity: int = MAP_CONFIG.registry_size):
+        self.capacity = capacity
+        self._maps: "OrderedDict[Tuple[Optional[str], str], ArenaMap]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._maps)
+
+    def get(self, map_slug: Optional[str], config: dict) -> ArenaMap:
+        """
+        Compiled definition for a config, compiling it on first use.
+
+        Raises ValueError for malformed configs (nothing is cached).
+        """
+        key = (map_slug, map_fingerprint(config))
+        arena_map = self._maps.get(key)
+        if arena_map is not None:
+            self._hits += 1
+            self._maps.move_to_end(key)
+            return arena_map
+
+        self._misses += 1
+        arena_map = compile_map(config)
+        if self.capacity > 0:
+            self._maps[key] = arena_map
+            while len(self._maps) > self.capacity:
+                self._maps.popitem(last=False)
+                self._evicted += 1
+        logger.info(f"Compiled arena map {map_slug or '<unnamed>'} ({key[1][:8]})")
+        return arena_map
+
+    def clear(self) -> None:
+        self._maps.clear()
+
+    def get_stats(self) -> dict:
+        return {
+            "maps": len(self._maps),
+            "capacity": self.capacity,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evicted": self._evicted,
+        }
+
+
+# Process-wide registry (each tick shard process has its own)
+map_registry = MapRegistry()
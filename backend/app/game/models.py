@@ -1,15 +1,21 @@
 """
 Game system data models.
 
-Pure data classes with no business logic.
+Pure data classes with no business logic. Per-tick models are slotted
+(no per-instance __dict__); inputs and rewind frames are recycled
+through the freelists below.
 """
 
+from array import array
+from bisect import bisect_right
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
-from collections import deque
+from typing import Dict, Iterator, List, Optional, Tuple
 from enum import Enum
 import time
 
+from .config import LAG_COMP_CONFIG, POOL_CONFIG, TICK_CONFIG
+from .pool import FreeList
+
 
 class ViolationType(Enum):
     """Types of anti-cheat violations."""
@@ -26,7 +32,7 @@ class Violation:
     details: str
 
 
-@dataclass
+@dataclass(slots=True)
 class PositionFrame:
     """Single frame of position history."""
     timestamp: float
@@ -35,7 +41,89 @@ class PositionFrame:
     sequence: int
 
 
-@dataclass
+# Rewound frames handed out by LagCompensator
+FRAME_POOL: FreeList[PositionFrame] = FreeList(PositionFrame, POOL_CONFIG.frame_capacity)
+
+
+class PositionHistory:
+    """
+    Fixed-capacity circular position history.
+    
+    Timestamps, x, y and sequence live in parallel preallocated typed
+    arrays, so recording a frame allocates nothing. Frames must be
+    recorded in timestamp order; index_before() bisects the (at most
+    two) contiguous runs of the ring.
+    
+    Reads behave like the deque it replaces: len(), iteration and
+    [0] / [-1] indexing yield PositionFrame objects (built on access).
+    """
+    
+    __slots__ = ("maxlen", "_ts", "_x", "_y", "_seq", "_head", "_count")
+    
+    def __init__(self, maxlen: Optional[int] = None):
+        if maxlen is None:
+            maxlen = LAG_COMP_CONFIG.history_size(TICK_CONFIG.rate_hz)
+        self.maxlen = max(1, maxlen)
+        self._ts = array("d", bytes(8 * self.maxlen))
+        self._x = array("d", bytes(8 * self.maxlen))
+        self._y = array("d", bytes(8 * self.maxlen))
+        self._seq = array("q", bytes(8 * self.maxlen))
+        self._head = 0  # Physical index of the oldest frame
+        self._count = 0
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __getitem__(self, index: int) -> PositionFrame:
+        return PositionFrame(*self.values(index))
+    
+    def __iter__(self) -> Iterator[PositionFrame]:
+        for i in range(self._count):
+            yield PositionFrame(*self.values(i))
+    
+    def record(self, timestamp: float, x: float, y: float, sequence: int) -> None:
+        """Append a frame, overwriting the oldest when full."""
+        if self._count < self.maxlen:
+            i = (self._head + self._count) % self.maxlen
+            self._count += 1
+        else:
+            i = self._head
+            self._head = (self._head + 1) % self.maxlen
+        self._ts[i] = timestamp
+        self._x[i] = x
+        self._y[i] = y
+        self._seq[i] = sequence
+    
+    def append(self, frame: PositionFrame) -> None:
+        self.record(frame.timestamp, frame.x, frame.y, frame.sequence)
+    
+    def clear(self) -> None:
+        self._head = 0
+        self._count = 0
+    
+    def values(self, index: int) -> Tuple[float, float, float, int]:
+        """(timestamp, x, y, sequence) of the frame at a logical index (oldest = 0)."""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("position history index out of range")
+        i = (self._head + index) % self.maxlen
+        return self._ts[i], self._x[i], self._y[i], self._seq[i]
+    
+    def index_before(self, timestamp: float) -> int:
+        """Logical index of the newest frame at or before timestamp, or -1."""
+        ts = self._ts
+        head = self._head
+        end = head + self._count
+        if end <= self.maxlen:
+            return bisect_right(ts, timestamp, head, end) - 1 - head
+        # Wrapped: [head, maxlen) holds the older run, [0, end - maxlen) the newer
+        if timestamp < ts[0]:
+            return bisect_right(ts, timestamp, head, self.maxlen) - 1 - head
+        return self.maxlen - head + bisect_right(ts, timestamp, 0, end - self.maxlen) - 1
+
+
+@dataclass(slots=True)
 class PlayerInput:
     """Input received from client."""
     player_id: str
@@ -47,7 +135,82 @@ class PlayerInput:
     client_timestamp: float = 0.0
 
 
-@dataclass
+# Recycled by TickSystem once a tick has consumed the input
+INPUT_POOL: FreeList[PlayerInput] = FreeList(PlayerInput, POOL_CONFIG.input_capacity)
+
+
+class InputQueue:
+    """
+    Newest pending movement input per player, with drop counters.
+    
+    Movement inputs carry absolute positions, so only the newest one
+    per player matters between ticks. offer():
+    - Drops sequenced inputs at or below the player's last processed
+      sequence (duplicates and late arrivals from an earlier tick)
+    - Drops inputs older than the one already pending (reordered in flight)
+    - Otherwise replaces the pending input (coalesced)
+    
+    The tick then validates one movement per player, so the anti-cheat
+    distance and speed checks see the whole movement since the last
+    tick. Inputs without a sequence number (0) are never dropped; the
+    newest arrival wins. Discarded inputs go back to INPUT_POOL.
+    """
+    
+    __slots__ = ("_slots", "queued", "dropped", "reordered", "coalesced")
+    
+    def __init__(self):
+        self._slots: Dict[str, PlayerInput] = {}
+        self.queued = 0  # Inputs accepted into a slot
+        self.dropped = 0  # At or below the last processed sequence
+        self.reordered = 0  # Older than the input already pending
+        self.coalesced = 0  # Pending inputs replaced by a newer one
+    
+    def __len__(self) -> int:
+        return len(self._slots)
+    
+    def __iter__(self) -> Iterator[PlayerInput]:
+        return iter(self._slots.values())
+    
+    def offer(self, player_input: PlayerInput, last_sequence: int) -> bool:
+        """Keep the input if it is the player's newest; False when discarded."""
+        sequence = player_input.sequence
+        if sequence and sequence <= last_sequence:
+            self.dropped += 1
+            INPUT_POOL.release(player_input)
+            return False
+        
+        pending = self._slots.get(player_input.player_id)
+        if pending is not None:
+            if sequence and sequence < pending.sequence:
+                self.reordered += 1
+                INPUT_POOL.release(player_input)
+                return False
+            self.coalesced += 1
+            INPUT_POOL.release(pending)
+        
+        self._slots[player_input.player_id] = player_input
+        self.queued += 1
+        return True
+    
+    def drain(self) -> List[PlayerInput]:
+        """Take the pending inputs (one per player) for this tick."""
+        inputs = list(self._slots.values())
+        self._slots.clear()
+        return inputs
+    
+    def clear(self) -> None:
+        self._slots.clear()
+    
+    def get_stats(self) -> dict:
+        return {
+            "queued": self.queued,
+            "dropped": self.dropped,
+            "reordered": self.reordered,
+            "coalesced": self.coalesced,
+        }
+
+
+@dataclass(slots=True)
 class FireInput:
     """Fire input received from client."""
     player_id: str
@@ -57,7 +220,7 @@ class FireInput:
     client_timestamp: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayerState:
     """Server-authoritative state for a player."""
     player_id: str
@@ -68,8 +231,8 @@ class PlayerState:
     last_input_sequence: int = 0
     last_input_tick: int = 0
     
-    # Position history (set maxlen via config)
-    position_history: deque = field(default_factory=deque)
+    # Position history (capacity from lag comp config)
+    position_history: PositionHistory = field(default_factory=PositionHistory)
     
     # Anti-cheat
     violations: List[Violation] = field(default_factory=list)
@@ -89,12 +252,14 @@ class GameState:
     tick_count: int = 0
     start_time: float = field(default_factory=time.time)
     is_running: bool = False
-    pending_inputs: List[PlayerInput] = field(default_factory=list)
+    pending_inputs: InputQueue = field(default_factory=InputQueue)
     pending_fire_inputs: List["FireInput"] = field(default_factory=list)
     combat_system: Optional["ServerCombatSystem"] = None  # type: ignore
     arena_systems: Optional["ServerArenaSystems"] = None  # type: ignore
     dynamic_spawns: Optional["ServerDynamicSpawnManager"] = None  # type: ignore
     buff_manager: Optional["BuffManager"] = None  # type: ignore
+    seed: int = 0  # Seeds the match's RNG (dynamic spawns); logged for re-simulation
+    input_log: Optional["InputLogWriter"] = None  # type: ignore
 
 
 # Import at end to avoid circular imports
@@ -104,3 +269,4 @@ if TYPE_CHECKING:
     from .arena_systems import ServerArenaSystems
     from .dynamic_spawns import ServerDynamicSpawnManager
     from .buffs import BuffManager
+    from .input_log import InputLogWriter
@@ -0,0 +1,73 @@
+"""
+Freelists for per-tick objects.
+
+Single responsibility: recycle short-lived slotted model instances so
+the tick loop does not allocate a fresh object for every input, rewind
+frame or projectile.
+
+acquire() re-runs the dataclass __init__ on a released instance (no new
+object is allocated) or builds a new one when the freelist is empty.
+release() keeps at most `capacity` instances; extras are left to the
+garbage collector. A released object must not be used again by the
+code that released it.
+
+Pools are process-wide: the tick loop is single-threaded and each shard
+worker is its own process.
+
+Usage:
+    INPUT_POOL = FreeList(PlayerInput, POOL_CONFIG.input_capacity)
+    player_input = INPUT_POOL.acquire(player_id, x, y, dx, dy, seq, ts)
+    ...consume...
+    INPUT_POOL.release(player_input)
+"""
+
+from typing import Callable, Generic, List, TypeVar
+
+T = TypeVar("T")
+
+
+class FreeList(Generic[T]):
+    """Bounded stack of released instances of one class."""
+
+    __slots__ = ("cls", "capacity", "_free", "created", "reused")
+
+    def __init__(self, cls: Callable[..., T], capacity: int):
+        self.cls = cls
+        self.capacity = max(0, capacity)
+        self._free: List[T] = []
+        self.created = 0
+        self.reused = 0
+
+    def __len__(self) -> int:
+        return len(self._free)
+
+    def acquire(self, *args, **kwargs) -> T:
+        """Reinitialize a released instance, or construct a new one."""
+        if self._free:
+            obj = self._free.pop()
+            obj.__init__(*args, **kwargs)
+            self.reused += 1
+            return obj
+        self.created += 1
+        return self.cls(*args, **kwargs)
+
+    def release(self, obj: T) -> None:
+        """Return an instance for reuse (dropped when the pool is full)."""
+        if len(self._free) < self.capacity:
+            self._free.append(obj)
+
+    def release_all(self, objs: List[T]) -> None:
+        room = self.capacity - len(self._free)
+        if room > 0:
+            self._free.extend(objs[:room])
+
+    def clear(self) -> None:
+        self._free.clear()
+
+    def get_stats(self) -> dict:
+        return {
+            "free": len(self._free),
+            "capacity": self.capacity,
+            "created": self.created,
+            "reused": self.reused,
+        }
@@ -0,0 +1,170 @@
+"""
+Per-phase tick profiler.
+
+Single responsibility: time each phase of TickSystem._process_tick and
+keep rolling histograms (p50/p95/p99/max) of the results.
+
+Usage from the tick:
+    sample = profiler.begin(lobby_id)   # None when off or not sampled
+    ...input validation...
+    if sample: sample.lap(PHASE_INPUT)
+    ...
+    if sample: profiler.end(sample)
+
+When profiling is disabled begin() is a single attribute check and
+every lap is skipped, so the cost is a handful of `if None` tests per
+tick.
+"""
+
+import time
+from typing import Callable, Dict, List, Optional
+
+from .config import PROFILER_CONFIG
+
+PHASE_INPUT = 0
+PHASE_FIRE = 1
+PHASE_COMBAT = 2
+PHASE_TRANSPORT = 3
+PHASE_ARENA = 4
+PHASE_SPAWNS = 5
+PHASE_BUFFS = 6
+PHASE_LAG_COMP = 7
+PHASE_BROADCAST = 8
+
+PHASES = (
+    "input",
+    "fire",
+    "combat",
+    "transport",
+    "arena",
+    "spawns",
+    "buffs",
+    "lag_comp",
+    "broadcast",
+)
+TOTAL = "total"
+
+
+class RollingHistogram:
+    """Fixed-size window of recent durations (ms) with percentile summary."""
+
+    __slots__ = ("_values", "_index", "_count")
+
+    def __init__(self, window: int):
+        self._values: List[float] = [0.0] * max(1, window)
+        self._index = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return min(self._count, len(self._values))
+
+    def record(self, value_ms: float) -> None:
+        self._values[self._index] = value_ms
+        self._index = (self._index + 1) % len(self._values)
+        self._count += 1
+
+    def summary(self) -> dict:
+        n = len(self)
+        if not n:
+            return {"count": 0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0, "mean_ms": 0.0}
+        ordered = sorted(self._values[:n])
+
+        def pct(q: float) -> float:
+            return round(ordered[min(n - 1, int(q * n))], 4)
+
+        return {
+            "count": self._count,
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "p99_ms": pct(0.99),
+            "max_ms": round(ordered[-1], 4),
+            "mean_ms": round(sum(ordered) / n, 4),
+        }
+
+
+class TickSample:
+    """Phase timings for one profiled tick."""
+
+    __slots__ = ("lobby_id", "durations", "_clock", "_start", "_last")
+
+    def __init__(self, lobby_id: str, clock: Callable[[], float]):
+        self.lobby_id = lobby_id
+        self.durations = [0.0] * len(PHASES)
+        self._clock = clock
+        self._start = self._last = clock()
+
+    def lap(self, phase: int) -> None:
+        """Attribute time since the previous lap to `phase`."""
+        now = self._clock()
+        self.durations[phase] += now - self._last
+        self._last = now
+
+    @property
+    def total(self) -> float:
+        return self._last - self._start
+
+
+class _PhaseHistograms:
+    __slots__ = ("phases", "total")
+
+    def __init__(self, window: int):
+        self.phases = [RollingHistogram(window) for _ in PHASES]
+        self.total = RollingHistogram(window)
+
+    def record(self, sample: TickSample) -> None:
+        for histogram, seconds in zip(self.phases, sample.durations):
+            histogram.record(seconds * 1000)
+        self.total.record(sample.total * 1000)
+
+    def summary(self) -> dict:
+        result = {name: h.summary() for name, h in zip(PHASES, self.phases)}
+        result[TOTAL] = self.total.summary()
+        return result
+
+
+class TickProfiler:
+    """Samples tick phase timings into rolling histograms."""
+
+    def __init__(self, config=PROFILER_CONFIG, clock: Callable[[], float] = time.perf_counter):
+        self.config = config
+        self.enabled = config.enabled
+        self._clock = clock
+        self._sample_every = max(1, config.sample_every)
+        self._ticks = 0
+        self._all = _PhaseHistograms(config.window)
+        self._lobbies: Dict[str, _PhaseHistograms] = {}
+
+    def begin(self, lobby_id: str) -> Optional[TickSample]:
+        """Start timing a tick, or None when this tick isn't sampled."""
+        if not self.enabled:
+            return None
+        self._ticks += 1
+        if self._ticks % self._sample_every:
+            return None
+        return TickSample(lobby_id, self._clock)
+
+    def end(self, sample: TickSample) -> None:
+        """Fold a finished sample into the histograms."""
+        self._all.record(sample)
+        if self.config.per_lobby:
+            histograms = self._lobbies.get(sample.lobby_id)
+            if histograms is None:
+                histograms = self._lobbies[sample.lobby_id] = _PhaseHistograms(self.config.window)
+            histograms.record(sample)
+
+    def remove_lobby(self, lobby_id: str) -> None:
+        self._lobbies.pop(lobby_id, None)
+
+    def get_stats(self) -> dict:
+        """Histogram summaries for monitoring."""
+        stats = {
+            "enabled": self.enabled,
+            "sample_every": self._sample_every,
+            "phases": self._all.summary(),
+        }
+        if self.config.per_lobby:
+            stats["lobbies"] = {
+                lobby_id: histograms.summary()
+                for lobby_id, histograms in self._lobbies.items()
+            }
+        return stats
@@ -0,0 +1,351 @@
+"""
+Vectorized projectile store for the combat system.
+
+Struct-of-arrays layout: positions, velocities, spawn points and owners
+live in preallocated NumPy arrays so movement, max-range, arena-bounds,
+barrier and player-hit tests each run as one vectorized pass per tick.
+
+NumPy is optional. When it is not installed, NUMPY_AVAILABLE is False
+and ServerCombatSystem keeps using its per-projectile dict.
+"""
+
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+NUMPY_AVAILABLE = np is not None
+
+
+class Sweep(NamedTuple):
+    """One tick of projectile movement from VectorizedProjectileStore.sweep()."""
+    t_stop: "np.ndarray"  # Earliest range/bounds/barrier impact (fraction of tick, inf = none)
+    x0: "np.ndarray"
+    y0: "np.ndarray"
+    dx: "np.ndarray"
+    dy: "np.ndarray"
+
+
+class VectorizedProjectileStore:
+    """
+    Preallocated struct-of-arrays projectile storage.
+
+    Slots [0, count) are live and kept in spawn order, so per-tick hit
+    resolution matches the dict-based implementation exactly.
+    """
+
+    def __init__(self, capacity: int = 64):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("numpy is required for VectorizedProjectileStore")
+
+        self.count = 0
+        self._capacity = 0
+        self.ids: List[str] = []
+        self._owner_codes: Dict[str, int] = {}
+        self._owner_names: List[str] = []
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int) -> None:
+        """Grow arrays to capacity, preserving live slots."""
+        def grow(old, dtype):
+            arr = np.zeros(capacity, dtype=dtype)
+            if old is not None:
+                arr[:self.count] = old[:self.count]
+            return arr
+
+        first = self._capacity == 0
+        self.x = grow(None if first else self.x, np.float64)
+        self.y = grow(None if first else self.y, np.float64)
+        self.vx = grow(None if first else self.vx, np.float64)
+        self.vy = grow(None if first else self.vy, np.float64)
+        self.spawn_x = grow(None if first else self.spawn_x, np.float64)
+        self.spawn_y = grow(None if first else self.spawn_y, np.float64)
+        self.spawn_time = grow(None if first else self.spawn_time, np.float64)
+        self.owner = grow(None if first else self.owner, np.int32)
+        self.damage = grow(None if first else self.damage, np.int32)
+        self._capacity = capacity
+
+    def __len__(self) -> int:
+        return self.count
+
+    def owner_code(self, owner_id: str) -> int:
+        """Stable small-int code for an owner ID."""
+        code = self._owner_codes.get(owner_id)
+        if code is None:
+            code = len(self._owner_names)
+            self._owner_codes[owner_id] = code
+            self._owner_names.append(owner_id)
+        return code
+
+    def owner_id(self, index: int) -> str:
+        return self._owner_names[self.owner[index]]
+
+    def add(
+        self,
+        proj_id: str,
+        owner_id: str,
+        x: float,
+        y: float,
+        vx: float,
+        vy: float,
+        spawn_time: float,
+        damage: int = 10,
+    ) -> int:
+        """Append a projectile. Returns its slot index."""
+        if self.count == self._capacity:
+            self._allocate(self._capacity * 2)
+
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.spawn_x[i] = x
+        self.spawn_y[i] = y
+        self.spawn_time[i] = spawn_time
+        self.owner[i] = self.owner_code(owner_id)
+        self.damage[i] = damage
+        self.ids.append(proj_id)
+        self.count += 1
+        return i
+
+    def advance(
+        self,
+        delta_time: float,
+        max_range: float,
+        width: float,
+        height: float,
+        barriers: "np.ndarray",
+    ) -> "np.ndarray":
+        """
+        Move all projectiles and test range, bounds and barriers.
+
+        Args:
+            barriers: (m, 4) array of [x0, y0, x1, y1] rects
+
+        Returns:
+            Boolean mask of projectiles still alive
+        """
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        x += self.vx[:n] * delta_time
+        y += self.vy[:n] * delta_time
+
+        dx = x - self.spawn_x[:n]
+        dy = y - self.spawn_y[:n]
+        alive = (dx * dx + dy * dy) < max_range * max_range
+        alive &= (x >= 0) & (x <= width) & (y >= 0) & (y <= height)
+
+        if len(barriers):
+            xc = x[:, None]
+            yc = y[:, None]
+            inside = (
+                (xc >= barriers[:, 0]) & (xc <= barriers[:, 2]) &
+                (yc >= barriers[:, 1]) & (yc <= barriers[:, 3])
+            )
+            alive &= ~inside.any(axis=1)
+
+        return alive
+
+    def sweep(
+        self,
+        delta_time: float,
+        max_range: float,
+        width: float,
+        height: float,
+        barriers: "np.ndarray",
+    ) -> Sweep:
+        """
+        Move all projectiles and find when each one stops this tick.
+
+        The swept counterpart of advance(): range, bounds and barriers are
+        tested along each projectile's segment, not at its end point.
+        A projectile survives the tick when t_stop > 1.
+
+        Args:
+            barriers: (m, 4) array of [x0, y0, x1, y1] rects
+        """
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        x0 = x.copy()
+        y0 = y.copy()
+        dx = self.vx[:n] * delta_time
+        dy = self.vy[:n] * delta_time
+        x += dx
+        y += dy
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Max range: straight line from spawn
+            sx = x0 - self.spawn_x[:n]
+            sy = y0 - self.spawn_y[:n]
+            traveled = np.sqrt(sx * sx + sy * sy)
+            step = np.sqrt(dx * dx + dy * dy)
+            t_range = np.where(step > 0, np.maximum((max_range - traveled) / step, 0.0), 0.0)
+            t_stop = np.where(traveled + step >= max_range, t_range, np.inf)
+
+            # Arena bounds
+            tx = np.where(dx > 0, (width - x0) / dx, np.where(dx < 0, -x0 / dx, np.inf))
+            ty = np.where(dy > 0, (height - y0) / dy, np.where(dy < 0, -y0 / dy, np.inf))
+            t_exit = np.minimum(tx, ty)
+            t_exit[(x0 < 0) | (x0 > width) | (y0 < 0) | (y0 > height)] = 0.0
+            t_stop = np.minimum(t_stop, np.where(t_exit < 1.0, t_exit, np.inf))
+
+            # Barriers (slab test against every rect)
+            if len(barriers):
+                near_x, far_x = _slab(x0[:, None], dx[:, None], barriers[:, 0], barriers[:, 2])
+                near_y, far_y = _slab(y0[:, None], dy[:, None], barriers[:, 1], barriers[:, 3])
+                t_near = np.maximum(np.maximum(near_x, near_y), 0.0)
+                t_far = np.minimum(np.minimum(far_x, far_y), 1.0)
+                t_barrier = np.where(t_near <= t_far, t_near, np.inf).min(axis=1)
+                t_stop = np.minimum(t_stop, t_barrier)
+
+        return Sweep(t_stop, x0, y0, dx, dy)
+
+    def hit_toi(
+        self,
+        sweep: Sweep,
+        target_xy: "np.ndarray",
+        target_owner_codes: "np.ndarray",
+        hit_radius: float,
+    ) -> "np.ndarray":
+        """
+        Swept player-hit test for all projectiles against all targets.
+
+        Returns:
+            (n, k) time-of-impact matrix; inf where the segment misses the
+            target, the target owns the projectile, or the projectile
+            stopped first
+        """
+        n = self.count
+        dx = sweep.dx[:, None]
+        dy = sweep.dy[:, None]
+        fx = sweep.x0[:, None] - target_xy[None, :, 0]
+        fy = sweep.y0[:, None] - target_xy[None, :, 1]
+        a = dx * dx + dy * dy
+        b = fx * dx + fy * dy
+        c = fx * fx + fy * fy - hit_radius * hit_radius
+        disc = b * b - a * c
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = (-b - np.sqrt(disc)) / a
+        entering = (a > 0) & (b < 0) & (disc >= 0) & (t <= 1.0)
+        toi = np.where(c <= 0, 0.0, np.where(entering, t, np.inf))
+
+        toi[self.owner[:n, None] == target_owner_codes[None, :]] = np.inf
+        toi[toi >= sweep.t_stop[:, None]] = np.inf
+        return toi
+
+    def hit_order(self, toi: "np.ndarray") -> List[Tuple[int, List[int]]]:
+        """
+        Projectiles that hit something, in spawn order, each with its
+        candidate targets sorted by time of impact (ties by target order).
+        """
+        finite = np.isfinite(toi)
+        order = []
+        for i in finite.any(axis=1).nonzero()[0].tolist():
+            row = toi[i]
+            candidates = finite[i].nonzero()[0]
+            candidates = candidates[np.argsort(row[candidates], kind="stable")]
+            order.append((i, candidates.tolist()))
+        return order
+
+    def hit_matrix(
+        self,
+        alive: "np.ndarray",
+        target_xy: "np.ndarray",
+        target_owner_codes: "np.ndarray",
+        hit_radius: float,
+    ) -> "np.ndarray":
+        """
+        Player-hit test for all live projectiles against all targets.
+
+        Args:
+            alive: Mask from advance()
+            target_xy: (k, 2) positions of hittable players
+            target_owner_codes: (k,) owner codes of those players
+
+        Returns:
+            (n, k) boolean matrix of projectile/target overlaps
+        """
+        n = self.count
+        ddx = self.x[:n, None] - target_xy[None, :, 0]
+        ddy = self.y[:n, None] - target_xy[None, :, 1]
+        hits = (ddx * ddx + ddy * ddy) <= hit_radius * hit_radius
+        hits &= self.owner[:n, None] != target_owner_codes[None, :]
+        hits &= alive[:, None]
+        return hits
+
+    def compact(self, keep: "np.ndarray") -> None:
+        """Drop projectiles where keep is False, preserving order."""
+        n = self.count
+        kept = int(keep.sum())
+        if kept == n:
+            return
+        for arr in (
+            self.x, self.y, self.vx, self.vy, self.spawn_x, self.spawn_y,
+            self.spawn_time, self.owner, self.damage,
+        ):
+            arr[:kept] = arr[:n][keep]
+        self.ids = [pid for pid, k in zip(self.ids, keep.tolist()) if k]
+        self.count = kept
+
+    def get_state(self) -> List[dict]:
+        """Projectile state in the same shape as ServerCombatSystem broadcasts."""
+        n = self.count
+        xs = self.x[:n].tolist()
+        ys = self.y[:n].tolist()
+        vxs = self.vx[:n].tolist()
+        vys = self.vy[:n].tolist()
+        owners = self.owner[:n].tolist()
+        return [
+            {
+                'id': self.ids[i],
+                'owner_id': self._owner_names[owners[i]],
+                'x': round(xs[i], 1),
+                'y': round(ys[i], 1),
+                'vx': round(vxs[i], 1),
+                'vy': round(vys[i], 1),
+            }
+            for i in range(n)
+        ]
+
+    def clear(self) -> None:
+        """Remove all projectiles (keeps allocated capacity)."""
+        self.count = 0
+        self.ids = []
+
+
+def _slab(
+    p: "np.ndarray", d: "np.ndarray", lo: "np.ndarray", hi: "np.ndarray"
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Entry and exit times of p + t * d through [lo, hi], broadcast."""
+    t1 = (lo - p) / d
+    t2 = (hi - p) / d
+    still = d == 0
+    inside = (p >= lo) & (p <= hi)
+    near = np.where(still, np.where(inside, -np.inf, np.inf), np.minimum(t1, t2))
+    far = np.where(still, np.where(inside, np.inf, -np.inf), np.maximum(t1, t2))
+    return near, far
+
+
+def barrier_rects(barriers: Sequence[dict]) -> "np.ndarray":
+    """Convert barrier dicts to an (m, 4) [x0, y0, x1, y1] array."""
+    return np.array(
+        [
+            (b["x"], b["y"], b["x"] + b["width"], b["y"] + b["height"])
+            for b in barriers
+        ],
+        dtype=np.float64,
+    ).reshape(-1, 4)
+
+
+def target_arrays(
+    targets: List[Tuple[str, float, float]],
+    store: VectorizedProjectileStore,
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Build (k, 2) positions and (k,) owner codes for hittable players."""
+    xy = np.array([(x, y) for _, x, y in targets], dtype=np.float64).reshape(-1, 2)
+    codes = np.array([store.owner_code(pid) for pid, _, _ in targets], dtype=np.int32)
+    return xy, codes
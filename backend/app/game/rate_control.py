@@ -0,0 +1,101 @@
+"""
+Activity-aware per-match tick rate.
+
+Single responsibility: decide, for each base tick, whether a match
+should be stepped.
+
+Busy matches step on every base tick. A match that has seen no inputs,
+fire, projectiles or arena events for idle_after_s drops to stepping
+every idle_divisor-th base tick; broadcasts (every broadcast_divisor
+steps) slow down with it. Any input or fire restores the full rate on
+the next base tick.
+
+Usage from the tick:
+    if not rates.should_step(lobby_id): return
+    delta_time = rates.step_duration(lobby_id)
+    ...simulate...
+    rates.observe(lobby_id, active, now)
+"""
+
+from dataclasses import dataclass
+from typing import Dict
+
+from .config import TICK_CONFIG, RATE_CONFIG
+
+
+@dataclass
+class MatchRate:
+    """Rate state for one match."""
+    last_active: float
+    divisor: int = 1  # Step every Nth base tick
+    elapsed_ticks: int = 0  # Base ticks since the last step
+
+
+class RateController:
+    """Per-match adaptive tick rate."""
+
+    def __init__(self, tick_config=TICK_CONFIG, config=RATE_CONFIG):
+        self._tick_config = tick_config
+        self.config = config
+        self._matches: Dict[str, MatchRate] = {}
+
+    def add(self, lobby_id: str, now: float) -> None:
+        self._matches[lobby_id] = MatchRate(last_active=now)
+
+    def remove(self, lobby_id: str) -> None:
+        self._matches.pop(lobby_id, None)
+
+    def wake(self, lobby_id: str) -> None:
+        """Return to the full rate (input or fire arrived)."""
+        rate = self._matches.get(lobby_id)
+        if rate:
+            rate.divisor = 1
+
+    def should_step(self, lobby_id: str) -> bool:
+        """Count a base tick; True when the match is due a step."""
+        rate = self._matches.get(lobby_id)
+        if not rate:
+            return True
+        rate.elapsed_ticks += 1
+        return rate.elapsed_ticks >= rate.divisor
+
+    def step_duration(self, lobby_id: str) -> float:
+        """Simulated time covered by this step (all base ticks since the last)."""
+        rate = self._matches.get(lobby_id)
+        if not rate:
+            return self._tick_config.duration_s
+        ticks = max(1, rate.elapsed_ticks)
+        rate.elapsed_ticks = 0
+        return ticks * self._tick_config.duration_s
+
+    def observe(self, lobby_id: str, active: bool, now: float) -> None:
+        """Record whether the step just taken saw any activity."""
+        rate = self._matches.get(lobby_id)
+        if not rate:
+            return
+        if active:
+            rate.last_active = now
+            rate.divisor = 1
+        elif self.config.adaptive and now - rate.last_active >= self.config.idle_after_s:
+            rate.divisor = max(1, self.config.idle_divisor)
+
+    def tick_rate(self, lobby_id: str) -> float:
+        """Current simulation rate in Hz."""
+        rate = self._matches.get(lobby_id)
+        divisor = rate.divisor if rate else 1
+        return self._tick_config.rate_hz / divisor
+
+    def broadcast_rate(self, lobby_id: str) -> float:
+        """Current state broadcast rate in Hz."""
+        return self.tick_rate(lobby_id) / self._tick_config.broadcast_divisor
+
+    def get_stats(self) -> dict:
+        """Matches per current tick rate, for monitoring."""
+        counts: Dict[float, int] = {}
+        for rate in self._matches.values():
+            hz = self._tick_config.rate_hz / rate.divisor
+            counts[hz] = counts.get(hz, 0) + 1
+        return {
+            "adaptive": self.config.adaptive,
+            "matches_by_rate_hz": counts,
+        }
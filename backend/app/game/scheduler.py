@@ -0,0 +1,226 @@
+"""
+Shared fixed-timestep tick scheduler.
+
+Single responsibility: step every registered match from one loop.
+
+Instead of one asyncio task (and one sleep/wake-up) per lobby, a single
+task wakes once per tick and steps all running games in turn. Time is
+tracked with an accumulator so ticks stay phase-aligned across matches:
+- Oversleeping is corrected on the next wake-up (drift correction)
+- A late loop catches up by stepping several ticks, up to a limit
+- Backlog beyond the limit is dropped rather than spiralling
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from app.core.logging import get_logger
+from .config import TICK_CONFIG, SCHEDULER_CONFIG
+from .models import GameState
+
+logger = get_logger("game.scheduler")
+
+
+@dataclass
+class MatchBudget:
+    """Per-match tick cost accounting."""
+    lobby_id: str
+    ticks: int = 0
+    overruns: int = 0
+    last_ms: float = 0.0
+    max_ms: float = 0.0
+    total_ms: float = 0.0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.ticks if self.ticks else 0.0
+
+
+class TickScheduler:
+    """
+    Steps all registered games from one fixed-timestep loop.
+
+    The step callable is the owning TickSystem's per-game tick.
+    """
+
+    def __init__(
+        self,
+        step: Callable[[GameState], Awaitable[None]],
+        tick_config=TICK_CONFIG,
+        config=SCHEDULER_CONFIG,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        self._step = step
+        self._tick_config = tick_config
+        self.config = config
+        self._clock = clock
+
+        self._games: Dict[str, GameState] = {}
+        self._budgets: Dict[str, MatchBudget] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        # Accumulator state
+        self._accumulator = 0.0
+        self._last_time: Optional[float] = None
+
+        # Loop-level stats
+        self._loop_ticks = 0
+        self._dropped_ticks = 0
+        self._catchup_ticks = 0
+        self._last_loop_ms = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def register(self, game: GameState) -> None:
+        """Add a game to the shared loop, starting the loop if needed."""
+        self._games[game.lobby_id] = game
+        self._budgets[game.lobby_id] = MatchBudget(lobby_id=game.lobby_id)
+        if not self.is_running:
+            self.start()
+
+    def unregister(self, lobby_id: str) -> None:
+        """Remove a game; the loop stops once no games remain."""
+        self._games.pop(lobby_id, None)
+        self._budgets.pop(lobby_id, None)
+        if not self._games:
+            self.stop()
+
+    def start(self) -> None:
+        """Start the shared loop."""
+        if self.is_running:
+            return
+        self._accumulator = 0.0
+        self._last_time = None
+        self._task = asyncio.create_task(self._run())
+        logger.info("Started shared tick scheduler")
+
+    def stop(self) -> None:
+        """Stop the shared loop."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+            logger.info("Stopped shared tick scheduler")
+
+    def advance(self, now: float) -> int:
+        """
+        Feed elapsed time into the accumulator.
+
+        Returns the number of ticks to step now, capped at the catch-up
+        limit. Backlog beyond the cap is dropped.
+        """
+        if self._last_time is None:
+            self._last_time = now
+            return 1
+
+        tick_duration = self._tick_config.duration_s
+        self._accumulator += max(0.0, now - self._last_time)
+        self._last_time = now
+
+        # Epsilon absorbs float error so exact multiples aren't lost
+        steps = int((self._accumulator + 1e-9) // tick_duration)
+        if steps > self.config.max_catchup_ticks:
+            dropped = steps - self.config.max_catchup_ticks
+            self._dropped_ticks += dropped
+            steps = self.config.max_catchup_ticks
+            self._accumulator -= dropped * tick_duration
+        if steps > 1:
+            self._catchup_ticks += steps - 1
+
+        self._accumulator -= steps * tick_duration
+        return steps
+
+    def time_until_next_tick(self, now: float) -> float:
+        """Sleep needed to land on the next tick boundary."""
+        if self._last_time is None:
+            return 0.0
+        elapsed = now - self._last_time
+        return max(0.0, self._tick_config.duration_s - self._accumulator - elapsed)
+
+    async def _run(self) -> None:
+        """Main shared loop."""
+        try:
+            while self._games:
+                steps = self.advance(self._clock())
+                for _ in range(steps):
+                    await self._step_all()
+                await asyncio.sleep(self.time_until_next_tick(self._clock()))
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Shared tick loop error: {e}")
+
+    async def _step_all(self) -> None:
+        """Step every running game once, accounting per-match cost."""
+        loop_start = self._clock()
+        budget_ms = self.config.match_budget_ms
+
+        for game in list(self._games.values()):
+            if not game.is_running:
+                continue
+
+            start = self._clock()
+            try:
+                await self._step(game)
+            except Exception as e:
+                logger.error(f"Tick error in {game.lobby_id}: {e}")
+                game.is_running = False
+                self.unregister(game.lobby_id)
+                continue
+            elapsed_ms = (self._clock() - start) * 1000
+
+            budget = self._budgets.get(game.lobby_id)
+            if budget:
+                self._record(budget, elapsed_ms, budget_ms)
+
+        self._loop_ticks += 1
+        self._last_loop_ms = (self._clock() - loop_start) * 1000
+        if self._last_loop_ms > self._tick_config.duration_ms:
+            logger.warning(
+                f"Shared tick {self._loop_ticks} took {self._last_loop_ms:.1f}ms "
+                f"for {len(self._games)} games"
+            )
+
+    def _record(self, budget: MatchBudget, elapsed_ms: float, budget_ms: float) -> None:
+        """Record one tick's cost and flag overruns."""
+        budget.ticks += 1
+        budget.last_ms = elapsed_ms
+        budget.total_ms += elapsed_ms
+        budget.max_ms = max(budget.max_ms, elapsed_ms)
+
+        if elapsed_ms > budget_ms:
+            budget.overruns += 1
+            if (budget.overruns - 1) % self.config.overrun_log_interval == 0:
+                logger.warning(
+                    f"Match {budget.lobby_id} over tick budget: "
+                    f"{elapsed_ms:.2f}ms > {budget_ms:.2f}ms ({budget.overruns} overruns)"
+                )
+
+    def get_overrunning(self) -> List[str]:
+        """Lobby IDs whose last tick exceeded the per-match budget."""
+        budget_ms = self.config.match_budget_ms
+        return [b.lobby_id for b in self._budgets.values() if b.last_ms > budget_ms]
+
+    def get_stats(self) -> dict:
+        """Get scheduler statistics for monitoring."""
+        return {
+            "games": len(self._games),
+            "loop_ticks": self._loop_ticks,
+            "dropped_ticks": self._dropped_ticks,
+            "catchup_ticks": self._catchup_ticks,
+            "last_loop_ms": round(self._last_loop_ms, 3),
+            "match_budget_ms": self.config.match_budget_ms,
+            "overrunning": self.get_overrunning(),
+            "matches": {
+                b.lobby_id: {
+                    "ticks": b.ticks,
+                    "overruns": b.overruns,
+                    "avg_ms": round(b.avg_ms, 3),
+                    "max_ms": round(b.max_ms, 3),
+                }
+                for b in self._budgets.values()
+            },
+        }
@@ -0,0 +1,556 @@
+"""
+Multi-process sharded tick workers.
+
+Single responsibility: run game simulation off the I/O event loop.
+
+Each lobby is hashed to one of N worker processes. A worker owns a
+regular TickSystem and runs it on its own event loop, so simulation
+scales with cores and never shares CPU with HTTP/WebSocket handling.
+
+IPC is a pair of pipes per worker carrying compact tuples:
+- Parent -> worker: (opcode, lobby_id, *fields)
+- Worker -> parent: (event, lobby_id, *fields)
+
+The parent never writes a pipe on its event loop: commands go through a
+per-shard queue to a sender thread, so a worker that falls behind cannot
+stall HTTP/WebSocket handling. Past MAX_SHARD_BACKLOG queued commands,
+inputs and fires for that shard are dropped (and counted); lifecycle
+commands are always queued.
+
+ShardedTickSystem mirrors the public TickSystem API used by handlers,
+so it can be swapped in as the process-wide tick_system.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+import zlib
+from queue import SimpleQueue
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+from app.core.logging import get_logger
+from .config import SCHEDULER_CONFIG
+from .models import PlayerInput, FireInput, INPUT_POOL
+from .buffs import BuffManager
+from .frames import split_frame
+from .quiz_rewards import QuizRewardDispatcher
+
+logger = get_logger("game.sharding")
+
+# Parent -> worker opcodes
+OP_CREATE = 1
+OP_START = 2
+OP_STOP = 3
+OP_INPUT = 4
+OP_FIRE = 5
+OP_ARENA = 6
+OP_REWARDS = 7
+OP_SHUTDOWN = 9
+
+# Worker -> parent events
+EVT_BROADCAST = 1
+EVT_KICK = 2
+EVT_STATS = 3
+EVT_STOPPED = 4
+
+STATS_INTERVAL_S = 1.0
+MAX_SHARD_BACKLOG = 4096  # Queued commands per shard beyond which inputs and fires are dropped
+DROPPED_LOG_EVERY = 1000  # Log the first dropped input of a shard, then every Nth
+
+
+def shard_for(lobby_id: str, num_shards: int) -> int:
+    """Stable lobby -> shard mapping (same in every process)."""
+    return zlib.crc32(lobby_id.encode()) % num_shards
+
+
+def encode_input(lobby_id: str, player_input: PlayerInput) -> tuple:
+    """Pack a movement input into an IPC tuple."""
+    return (
+        OP_INPUT,
+        lobby_id,
+        player_input.player_id,
+        player_input.x,
+        player_input.y,
+        player_input.direction_x,
+        player_input.direction_y,
+        player_input.sequence,
+        player_input.client_timestamp,
+    )
+
+
+def decode_input(cmd: tuple) -> PlayerInput:
+    """Unpack a movement input IPC tuple."""
+    _, _, player_id, x, y, dx, dy, seq, ts = cmd
+    return INPUT_POOL.acquire(
+        player_id=player_id,
+        x=x,
+        y=y,
+        direction_x=dx,
+        direction_y=dy,
+        sequence=seq,
+        client_timestamp=ts,
+    )
+
+
+def encode_fire(lobby_id: str, fire_input: FireInput) -> tuple:
+    """Pack a fire input into an IPC tuple."""
+    return (
+        OP_FIRE,
+        lobby_id,
+        fire_input.player_id,
+        fire_input.direction_x,
+        fire_input.direction_y,
+        fire_input.sequence,
+        fire_input.client_timestamp,
+    )
+
+
+def decode_fire(cmd: tuple) -> FireInput:
+    """Unpack a fire input IPC tuple."""
+    _, _, player_id, dx, dy, seq, ts = cmd
+    return FireInput(
+        player_id=player_id,
+        direction_x=dx,
+        direction_y=dy,
+        sequence=seq,
+        client_timestamp=ts,
+    )
+
+
+def apply_command(system, cmd: tuple) -> None:
+    """Apply one parent command to a worker-local TickSystem."""
+    op, lobby_id = cmd[0], cmd[1]
+
+    if op == OP_INPUT:
+        system.queue_input(lobby_id, decode_input(cmd))
+    elif op == OP_FIRE:
+        system.queue_fire(lobby_id, decode_fire(cmd))
+    elif op == OP_CREATE:
+        _, _, player1_id, player2_id, spawn1, spawn2, seed = cmd
+        system.create_game(lobby_id, player1_id, player2_id, spawn1, spawn2, seed)
+    elif op == OP_START:
+        system.start_game(lobby_id)
+    elif op == OP_STOP:
+        system.stop_game(lobby_id)
+    elif op == OP_ARENA:
+        system.init_arena_config(lobby_id, cmd[2], cmd[3])
+    elif op == OP_REWARDS:
+        system.dispatch_quiz_rewards(lobby_id, cmd[2], cmd[3])
+    else:
+        logger.warning(f"Unknown shard opcode {op}")
+
+
+async def _run_worker(shard_id: int, cmd_conn, evt_conn, scheduler_config) -> None:
+    """Worker event loop: apply commands, stream broadcasts back."""
+    from .tick_system import TickSystem
+
+    system = TickSystem(scheduler_config=scheduler_config)
+
+    async def broadcast(lobby_id: str, message: dict) -> None:
+        evt_conn.send((EVT_BROADCAST, lobby_id, message))
+
+    async def kick(lobby_id: str, player_id: str, reason: str) -> None:
+        evt_conn.send((EVT_KICK, lobby_id, player_id, reason))
+
+    system.set_broadcast_callback(broadcast)
+    system.set_kick_callback(kick)
+
+    loop = asyncio.get_running_loop()
+    done = loop.create_future()
+    started: Set[str] = set()
+
+    def finish() -> None:
+        if not done.done():
+            done.set_result(None)
+
+    def on_readable() -> None:
+        try:
+            while cmd_conn.poll():
+                cmd = cmd_conn.recv()
+                if cmd[0] == OP_SHUTDOWN:
+                    finish()
+                    return
+                if cmd[0] == OP_START:
+                    started.add(cmd[1])
+                try:
+                    apply_command(system, cmd)
+                except Exception as e:
+                    logger.error(f"Shard {shard_id} command {cmd[0]} failed: {e}")
+        except (EOFError, OSError):
+            # Parent went away
+            finish()
+
+    loop.add_reader(cmd_conn.fileno(), on_readable)
+    try:
+        while not done.done():
+            try:
+                await asyncio.wait_for(asyncio.shield(done), timeout=STATS_INTERVAL_S)
+            except asyncio.TimeoutError:
+                # Report games whose tick loop died so the parent stops routing to them
+                stopped = [lid for lid in started if not system.is_running(lid)]
+                for lobby_id in stopped:
+                    started.discard(lobby_id)
+                    system.stop_game(lobby_id)
+                    evt_conn.send((EVT_STOPPED, lobby_id))
+                evt_conn.send((EVT_STATS, "", shard_id, {
+                    "games": system.game_count(),
+                    "scheduler": system.get_scheduler_stats(),
+                    "profiler": system.get_profiler_stats(),
+                    "rates": system.get_rate_stats(),
+                    "pools": system.get_pool_stats(),
+                    "inputs": system.get_input_stats(),
+                    "maps": system.get_map_stats(),
+                    "input_logs": system.get_input_log_stats(),
+                }))
+    finally:
+        loop.remove_reader(cmd_conn.fileno())
+        system.shutdown()
+
+
+def worker_main(shard_id: int, cmd_conn, evt_conn, scheduler_config) -> None:
+    """Process entry point for a tick worker."""
+    try:
+        asyncio.run(_run_worker(shard_id, cmd_conn, evt_conn, scheduler_config))
+    except KeyboardInterrupt:
+        pass
+
+
+class _Shard:
+    """Parent-side handle for one worker process."""
+
+    def __init__(self, shard_id: int, process, cmd_conn, evt_conn):
+        self.shard_id = shard_id
+        self.process = process
+        self.cmd_conn = cmd_conn
+        self.evt_conn = evt_conn
+        self.lobbies: Set[str] = set()
+        self.stats: dict = {}
+        self.alive = True
+        self.outbox: SimpleQueue = SimpleQueue()  # Commands for the sender thread (None stops it)
+        self.sender: Optional[threading.Thread] = None
+        self.dropped = 0  # Inputs and fires dropped over MAX_SHARD_BACKLOG
+
+
+class ShardedTickSystem:
+    """
+    TickSystem facade that routes lobbies to worker processes.
+
+    Read-side getters (arena/buff state) are served from the last
+    state_update each worker broadcast, so they never block on IPC.
+    """
+
+    def __init__(self, num_workers: int, scheduler_config=SCHEDULER_CONFIG):
+        self.num_workers = num_workers
+        self._scheduler_config = scheduler_config
+        self._shards: List[_Shard] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._running: Dict[str, bool] = {}  # lobby_id -> is_running
+        self._kicked: Set[tuple] = set()  # (lobby_id, player_id)
+        self._last_state: Dict[str, dict] = {}  # lobby_id -> last state payload
+
+        self._broadcast_callback: Optional[Callable[[str, dict], Awaitable[None]]] = None
+        self._kick_callback: Optional[Callable[[str, str, str], Awaitable[None]]] = None
+
+    # --- Lifecycle ---
+
+    @property
+    def is_started(self) -> bool:
+        return bool(self._shards)
+
+    def start(self) -> None:
+        """Spawn worker processes and attach their pipes to the running loop."""
+        if self._shards:
+            return
+        ctx = multiprocessing.get_context("spawn")
+        self._loop = asyncio.get_running_loop()
+
+        for shard_id in range(self.num_workers):
+            cmd_parent, cmd_child = ctx.Pipe()
+            evt_parent, evt_child = ctx.Pipe()
+            process = ctx.Process(
+                target=worker_main,
+                args=(shard_id, cmd_child, evt_child, self._scheduler_config),
+                name=f"tick-worker-{shard_id}",
+                daemon=True,
+            )
+            process.start()
+            shard = _Shard(shard_id, process, cmd_parent, evt_parent)
+            shard.sender = threading.Thread(
+                target=self._sender_main, args=(shard,), name=f"tick-sender-{shard_id}", daemon=True,
+            )
+            shard.sender.start()
+            self._shards.append(shard)
+            self._loop.add_reader(evt_parent.fileno(), self._on_worker_event, shard)
+
+        logger.info(f"Started {self.num_workers} tick worker processes")
+
+    def shutdown(self, timeout: float = 2.0) -> None:
+        """Stop all workers."""
+        for shard in self._shards:
+            if self._loop:
+                self._loop.remove_reader(shard.evt_conn.fileno())
+            shard.outbox.put((OP_SHUTDOWN, ""))
+            shard.outbox.put(None)
+        for shard in self._shards:
+            shard.process.join(timeout)
+            if shard.process.is_alive():
+                shard.process.terminate()
+            if shard.sender is not None:
+                shard.sender.join(timeout)
+        self._shards = []
+        self._running.clear()
+        logger.info("Stopped tick worker processes")
+
+    def _shard(self, lobby_id: str) -> _Shard:
+        if not self._shards:
+            self.start()
+        return self._shards[shard_for(lobby_id, self.num_workers)]
+
+    def _send(self, lobby_id: str, cmd: tuple) -> bool:
+        """Queue a command for the shard's sender thread (never blocks the loop)."""
+        shard = self._shard(lobby_id)
+        if not shard.alive:
+            return False
+        if cmd[0] in (OP_INPUT, OP_FIRE) and shard.outbox.qsize() >= MAX_SHARD_BACKLOG:
+            shard.dropped += 1
+            if shard.dropped % DROPPED_LOG_EVERY == 1:
+                logger.warning(f"Tick worker {shard.shard_id} backlogged: {shard.dropped} inputs dropped")
+            return False
+        shard.outbox.put(cmd)
+        return True
+
+    def _sender_main(self, shard: _Shard) -> None:
+        """Sender thread: write queued commands to the worker pipe (may block)."""
+        while True:
+            cmd = shard.outbox.get()
+            if cmd is None:
+                return
+            try:
+                shard.cmd_conn.send(cmd)
+            except (BrokenPipeError, OSError) as e:
+                try:
+                    self._loop.call_soon_threadsafe(self._on_send_error, shard, e)
+                except RuntimeError:
+                    pass  # Loop already closed
+                return
+
+    def _on_send_error(self, shard: _Shard, error: Exception) -> None:
+        logger.error(f"Tick worker {shard.shard_id} unreachable: {error}")
+        self._mark_dead(shard)
+
+    # --- Worker events ---
+
+    def _on_worker_event(self, shard: _Shard) -> None:
+        """Drain events from a worker pipe (runs on the parent loop)."""
+        try:
+            while shard.evt_conn.poll():
+                evt = shard.evt_conn.recv()
+                self._handle_event(shard, evt)
+        except (EOFError, OSError):
+            logger.error(f"Tick worker {shard.shard_id} exited")
+            self._mark_dead(shard)
+
+    def _handle_event(self, shard: _Shard, evt: tuple) -> None:
+        kind, lobby_id = evt[0], evt[1]
+
+        if kind == EVT_BROADCAST:
+            message = evt[2]
+            _, state = split_frame(message)
+            if state is not None:
+                self._last_state[lobby_id] = state.get("payload", {})
+            if self._broadcast_callback:
+                self._loop.create_task(self._broadcast_callback(lobby_id, message))
+        elif kind == EVT_KICK:
+            _, _, player_id, reason = evt
+            self._kicked.add((lobby_id, player_id))
+            if self._kick_callback:
+                self._loop.create_task(self._kick_callback(lobby_id, player_id, reason))
+        elif kind == EVT_STATS:
+            shard.stats = evt[3]
+        elif kind == EVT_STOPPED:
+            self._forget(lobby_id)
+
+    def _mark_dead(self, shard: _Shard) -> None:
+        if not shard.alive:
+            return
+        shard.alive = False
+        shard.outbox.put(None)  # Stop the sender thread
+        if self._loop:
+            self._loop.remove_reader(shard.evt_conn.fileno())
+        for lobby_id in list(shard.lobbies):
+            self._running[lobby_id] = False
+
+    def _forget(self, lobby_id: str) -> None:
+        self._running.pop(lobby_id, None)
+        self._last_state.pop(lobby_id, None)
+        self._kicked = {k for k in self._kicked if k[0] != lobby_id}
+        for shard in self._shards:
+            shard.lobbies.discard(lobby_id)
+
+    # --- TickSystem API ---
+
+    def set_broadcast_callback(self, callback: Callable[[str, dict], Awaitable[None]]) -> None:
+        """Set callback for broadcasting state updates."""
+        self._broadcast_callback = callback
+
+    def set_kick_callback(self, callback: Callable[[str, str, str], Awaitable[None]]) -> None:
+        """Set callback for kicking players."""
+        self._kick_callback = callback
+
+    def create_game(
+        self,
+        lobby_id: str,
+        player1_id: str,
+        player2_id: str,
+        spawn1: tuple = (160, 360),
+        spawn2: tuple = (1120, 360),
+        seed: Optional[int] = None,
+    ) -> None:
+        """Create a new game on its shard."""
+        if self._send(lobby_id, (OP_CREATE, lobby_id, player1_id, player2_id, spawn1, spawn2, seed)):
+            self._running[lobby_id] = False
+            self._shard(lobby_id).lobbies.add(lobby_id)
+
+    def start_game(self, lobby_id: str) -> bool:
+        """Start the tick loop on the game's shard."""
+        if lobby_id not in self._running:
+            return False
+        if self._running[lobby_id]:
+            return True
+        if not self._send(lobby_id, (OP_START, lobby_id)):
+            return False
+        self._running[lobby_id] = True
+        return True
+
+    def stop_game(self, lobby_id: str) -> None:
+        """Stop the game on its shard."""
+        if lobby_id in self._running:
+            self._send(lobby_id, (OP_STOP, lobby_id))
+        self._forget(lobby_id)
+
+    def queue_input(self, lobby_id: str, player_input: PlayerInput) -> bool:
+        """Forward input to the game's shard."""
+        if not self._running.get(lobby_id):
+            return False
+        if (lobby_id, player_input.player_id) in self._kicked:
+            return False
+        cmd = encode_input(lobby_id, player_input)
+        INPUT_POOL.release(player_input)
+        return self._send(lobby_id, cmd)
+
+    def queue_fire(self, lobby_id: str, fire_input: FireInput) -> bool:
+        """Forward a fire input to the game's shard."""
+        if not self._running.get(lobby_id):
+            return False
+        if (lobby_id, fire_input.player_id) in self._kicked:
+            return False
+        return self._send(lobby_id, encode_fire(lobby_id, fire_input))
+
+    def init_arena_config(
+        self, lobby_id: str, arena_config: dict, map_slug: Optional[str] = None
+    ) -> bool:
+        """Forward arena configuration to the game's shard (compiled there)."""
+        if lobby_id not in self._running:
+            return False
+        return self._send(lobby_id, (OP_ARENA, lobby_id, arena_config, map_slug))
+
+    def dispatch_quiz_rewards(
+        self,
+        lobby_id: str,
+        round_result: dict,
+        question_time_ms: int,
+    ) -> dict:
+        """
+        Apply quiz rewards on the shard and return the reward summary.
+
+        Rewards depend only on the round result, so the summary is
+        computed locally against a scratch BuffManager while the worker
+        applies the same rewards to the live game.
+        """
+        if lobby_id not in self._running:
+            return {}
+        self._send(lobby_id, (OP_REWARDS, lobby_id, round_result, question_time_ms))
+
+        scratch = BuffManager()
+        for player_id in round_result.get("answers", {}):
+            scratch.init_player(player_id)
+        return QuizRewardDispatcher(scratch).dispatch_for_round(round_result, question_time_ms)
+
+    def get_arena_state(self, lobby_id: str) -> Optional[dict]:
+        """Get last broadcast arena state for a game."""
+        return self._last_state.get(lobby_id, {}).get("arena")
+
+    def get_buff_state(self, lobby_id: str) -> Optional[dict]:
+        """Get last broadcast buff state for a game."""
+        return self._last_state.get(lobby_id, {}).get("buffs")
+
+    def get_profiler_stats(self) -> dict:
+        """Get per-worker tick timing histograms reported by the workers."""
+        return {
+            "workers": {
+                shard.shard_id: shard.stats.get("profiler")
+                for shard in self._shards
+            },
+        }
+
+    def get_rate_stats(self) -> dict:
+        """Get per-worker tick rate counts reported by the workers."""
+        return {
+            "workers": {
+                shard.shard_id: shard.stats.get("rates")
+                for shard in self._shards
+            },
+        }
+
+    def get_input_stats(self) -> dict:
+        """Get per-worker movement input counters reported by the workers."""
+        return {
+            "workers": {
+                shard.shard_id: shard.stats.get("inputs")
+                for shard in self._shards
+            },
+        }
+
+    def get_pool_stats(self) -> dict:
+        """Get per-worker object pool stats reported by the workers."""
+        return {
+            "workers": {
+                shard.shard_id: shard.stats.get("pools")
+                for shard in self._shards
+            },
+        }
+
+    def get_map_stats(self) -> dict:
+        """Get per-worker compiled arena map registry stats."""
+        return {
+            "workers": {
+                shard.shard_id: shard.stats.get("maps")
+                for shard in self._shards
+            },
+        }
+
+    def get_input_log_stats(self) -> dict:
+        """Get per-worker input log counters."""
+        return {
+            "workers": {
+                shard.shard_id: shard.stats.get("input_logs")
+                for shard in self._shards
+            },
+        }
+
+    def get_scheduler_stats(self) -> Optional[dict]:
+        """Get per-shard stats reported by the workers."""
+        return {
+            "workers": self.num_workers,
+            "shards": {
+                shard.shard_id: {
+                    "alive": shard.alive and shard.process.is_alive(),
+                    "lobbies": len(shard.lobbies),
+                    "backlog": shard.outbox.qsize(),
+                    "dropped_inputs": shard.dropped,
+                    **shard.stats,
+                }
+                for shard in self._shards
+            },
+        }
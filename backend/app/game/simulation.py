@@ -0,0 +1,354 @@
+"""
+Headless match simulator.
+
+Single responsibility: drive TickSystem matches without clients, to
+measure simulation cost for capacity planning and regression benchmarks.
+
+Each run:
+- Creates N games through TickSystem.create_game / init_arena_config
+  with client map configs
+- Feeds seeded synthetic movement and fire inputs every tick
+- Replaces the broadcast callback with a counting stub
+- Steps every game tick by tick for a fixed simulated duration
+
+Simulated time comes from a virtual clock handed to TickSystem, and
+every match gets a seed derived from the run's seed (dynamic spawns draw
+from that match's RNG; bots have their own seeded RNGs), so the same
+seed, maps and config replay the same match. Nothing process-wide is
+patched or reseeded; only the measurements use the wall clock.
+
+Usage:
+    report = simulate(SimulationConfig(matches=50, duration_s=30), maps)
+    print(report.ticks_per_sec, report.tick_ms_p99)
+"""
+
+import asyncio
+import gc
+import hashlib
+import json
+import math
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from .config import MOVEMENT_CONFIG, TICK_CONFIG
+from .models import INPUT_POOL, FireInput, PlayerInput
+from .profiler import RollingHistogram
+
+ARENA_WIDTH = 1280
+ARENA_HEIGHT = 720
+EDGE_MARGIN = 24.0
+DEFAULT_SPAWNS = ((160.0, 360.0), (1120.0, 360.0))
+
+# Per-tick model classes counted in live_objects
+TRACKED_MODELS = (
+    "PlayerState", "PositionFrame", "PlayerInput", "FireInput", "ServerProjectile",
+    "PlayerCombatState", "CombatEvent", "ArenaEvent", "Buff",
+)
+
+
+@dataclass(frozen=True)
+class SimulationConfig:
+    """Headless run parameters."""
+    matches: int = 10
+    duration_s: float = 10.0  # Simulated seconds per match
+    seed: int = 1
+    fire_rate_hz: float = 3.0  # Fire attempts per player per second (combat cooldown still applies)
+    turn_rate_hz: float = 0.5  # Heading changes per player per second
+    move_speed_ratio: float = 0.9  # Fraction of max movement speed bots walk at
+    trace_allocations: bool = False  # tracemalloc per tick (slow; use a separate run from timing)
+
+
+@dataclass
+class SimulationReport:
+    """Measurements from one run."""
+    matches: int
+    maps: List[str]
+    simulated_s: float
+    ticks: int  # Match-ticks processed (matches x ticks each)
+    wall_s: float
+    ticks_per_sec: float
+    tick_ms_p50: float
+    tick_ms_p99: float
+    tick_ms_max: float
+    broadcasts: int
+    checksum: str  # Digest of each match's last broadcast; equal across runs with the same seed
+    alloc_kib_per_tick: Optional[float] = None  # Mean peak traced allocation per match-tick
+    retained_blocks_per_tick: Optional[float] = None  # Net allocator blocks kept per match-tick
+    rss_kib_per_match: Optional[float] = None
+    kib_per_match: Optional[float] = None  # Traced memory held per match at the end of the run
+    growth_kib_per_match: Optional[float] = None  # Traced growth per match over the second half of the run
+    live_objects: Dict[str, int] = field(default_factory=dict)  # Live per-tick model instances at the end
+    pools: dict = field(default_factory=dict)  # TickSystem object pool stats
+    phases: dict = field(default_factory=dict)  # TickSystem profiler stats, when enabled
+
+    def summary(self) -> str:
+        lines = [
+            f"{self.matches} matches x {self.simulated_s:.0f}s on {', '.join(sorted(set(self.maps)))}",
+            f"  {self.ticks} ticks in {self.wall_s:.2f}s = {self.ticks_per_sec:,.0f} ticks/s",
+            f"  tick p50 {self.tick_ms_p50:.3f}ms  p99 {self.tick_ms_p99:.3f}ms  max {self.tick_ms_max:.3f}ms",
+        ]
+        if self.alloc_kib_per_tick is not None:
+            lines.append(
+                f"  alloc {self.alloc_kib_per_tick:.1f} KiB/tick, "
+                f"retained {self.retained_blocks_per_tick:.2f} blocks/tick"
+            )
+            lines.append(
+                f"  traced {self.kib_per_match:,.1f} KiB/match, "
+                f"growth {self.growth_kib_per_match:+.2f} KiB/match over the second half"
+            )
+        if self.rss_kib_per_match is not None:
+            lines.append(f"  RSS {self.rss_kib_per_match:,.0f} KiB/match")
+        return "\n".join(lines)
+
+
+class SimClock:
+    """Virtual wall clock stepped by the simulator."""
+
+    def __init__(self, start: float = 1_700_000_000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class SyntheticPlayer:
+    """Seeded bot: random-walks inside the arena and fires at its opponent."""
+
+    def __init__(self, player_id: str, spawn: Sequence[float], rng: random.Random, config: SimulationConfig):
+        self.player_id = player_id
+        self.x, self.y = float(spawn[0]), float(spawn[1])
+        self.rng = rng
+        self.config = config
+        self.heading = rng.uniform(0, 2 * math.pi)
+        self.sequence = 0
+        self.speed = MOVEMENT_CONFIG.max_speed_px_per_sec * config.move_speed_ratio
+
+    def move(self, dt: float, now: float) -> PlayerInput:
+        """Advance one tick and build the movement input."""
+        rng = self.rng
+        if rng.random() < self.config.turn_rate_hz * dt:
+            self.heading = rng.uniform(0, 2 * math.pi)
+        dx, dy = math.cos(self.heading), math.sin(self.heading)
+
+        x = self.x + dx * self.speed * dt
+        y = self.y + dy * self.speed * dt
+        # Bounce off the arena edges
+        if not EDGE_MARGIN <= x <= ARENA_WIDTH - EDGE_MARGIN:
+            self.heading = math.pi - self.heading
+            x = min(max(x, EDGE_MARGIN), ARENA_WIDTH - EDGE_MARGIN)
+        if not EDGE_MARGIN <= y <= ARENA_HEIGHT - EDGE_MARGIN:
+            self.heading = -self.heading
+            y = min(max(y, EDGE_MARGIN), ARENA_HEIGHT - EDGE_MARGIN)
+        self.x, self.y = x, y
+
+        self.sequence += 1
+        # Rounded like the web client's position_update (services/websocket.ts)
+        return INPUT_POOL.acquire(
+            player_id=self.player_id,
+            x=round(x * 10) / 10,
+            y=round(y * 10) / 10,
+            direction_x=round(dx * 100) / 100,
+            direction_y=round(dy * 100) / 100,
+            sequence=self.sequence,
+            client_timestamp=now,
+        )
+
+    def maybe_fire(self, target: "SyntheticPlayer", dt: float, now: float) -> Optional[FireInput]:
+        """Fire at the target (with aim jitter) at roughly fire_rate_hz."""
+        if self.rng.random() >= self.config.fire_rate_hz * dt:
+            return None
+        angle = math.atan2(target.y - self.y, target.x - self.x) + self.rng.gauss(0, 0.15)
+        return FireInput(
+            player_id=self.player_id,
+            direction_x=round(math.cos(angle) * 1000) / 1000,
+            direction_y=round(math.sin(angle) * 1000) / 1000,
+            sequence=self.sequence,
+            client_timestamp=now,
+        )
+
+
+def _spawns(arena_config: dict) -> Sequence[Sequence[float]]:
+    points = [
+        (sp["position"]["x"], sp["position"]["y"])
+        for sp in arena_config.get("spawnPoints", [])
+    ]
+    return points if len(points) >= 2 else DEFAULT_SPAWNS
+
+
+def _rss_kib() -> Optional[float]:
+    """Current resident set size, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    import resource
+    return pages * resource.getpagesize() / 1024
+
+
+def _traced_snapshot() -> tracemalloc.Snapshot:
+    """Traced allocations made by the game (the simulator's own bookkeeping excluded)."""
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, tracemalloc.__file__),
+    ))
+
+
+def _live_models() -> Dict[str, int]:
+    """Count live instances of the per-tick model classes."""
+    counts = dict.fromkeys(TRACKED_MODELS, 0)
+    for obj in gc.get_objects():
+        name = type(obj).__name__
+        if name in counts:
+            counts[name] += 1
+    return counts
+
+
+async def _run(
+    config: SimulationConfig,
+    maps: Dict[str, dict],
+    clock: SimClock,
+    tick_config,
+    system_kwargs: dict,
+) -> SimulationReport:
+    from .tick_system import TickSystem
+
+    system = TickSystem(tick_config=tick_config, clock=clock, **system_kwargs)
+    broadcasts = 0
+    last_sent: Dict[str, dict] = {}
+
+    async def count_broadcast(lobby_id: str, message: dict) -> None:
+        nonlocal broadcasts
+        broadcasts += 1
+        last_sent[lobby_id] = message
+
+    system.set_broadcast_callback(count_broadcast)
+
+    slugs = sorted(maps)
+    lobby_maps: List[str] = []
+    bots: Dict[str, List[SyntheticPlayer]] = {}
+
+    gc.collect()
+    rss_before = _rss_kib()
+    if config.trace_allocations:
+        tracemalloc.start()
+        traced_before = tracemalloc.get_traced_memory()[0]
+
+    for i in range(config.matches):
+        lobby_id = f"SIM{i:05d}"
+        slug = slugs[i % len(slugs)]
+        arena_config = maps[slug]
+        spawn1, spawn2 = _spawns(arena_config)[:2]
+        p1, p2 = f"{lobby_id}-p1", f"{lobby_id}-p2"
+
+        seed = random.Random(f"{config.seed}:{lobby_id}").getrandbits(32)
+        system.create_game(lobby_id, p1, p2, tuple(spawn1), tuple(spawn2), seed=seed)
+        system.init_arena_config(lobby_id, arena_config, slug)
+        system.start_game(lobby_id, headless=True)
+
+        bots[lobby_id] = [
+            SyntheticPlayer(p1, spawn1, random.Random(f"{config.seed}:{lobby_id}:p1"), config),
+            SyntheticPlayer(p2, spawn2, random.Random(f"{config.seed}:{lobby_id}:p2"), config),
+        ]
+        lobby_maps.append(slug)
+
+    dt = tick_config.duration_s
+    steps = int(round(config.duration_s * tick_config.rate_hz))
+    histogram = RollingHistogram(window=max(1, steps * config.matches))
+    perf = time.perf_counter
+    alloc_bytes = 0
+    ticks = 0
+
+    halfway = steps // 2
+    midpoint = None
+    blocks_before = sys.getallocatedblocks()
+    wall_start = perf()
+
+    for step in range(steps):
+        if config.trace_allocations and step == halfway:
+            midpoint = _traced_snapshot()
+        clock.advance(dt)
+        now = clock.now
+        for lobby_id, (bot1, bot2) in bots.items():
+            system.queue_input(lobby_id, bot1.move(dt, now))
+            system.queue_input(lobby_id, bot2.move(dt, now))
+            for shooter, target in ((bot1, bot2), (bot2, bot1)):
+                fire = shooter.maybe_fire(target, dt, now)
+                if fire:
+                    system.queue_fire(lobby_id, fire)
+
+            if config.trace_allocations:
+                tracemalloc.reset_peak()
+                base, _ = tracemalloc.get_traced_memory()
+            start = perf()
+            await system.step_game(lobby_id)
+            histogram.record((perf() - start) * 1000)
+            if config.trace_allocations:
+                alloc_bytes += tracemalloc.get_traced_memory()[1] - base
+            ticks += 1
+
+    wall_s = perf() - wall_start
+    retained_blocks = sys.getallocatedblocks() - blocks_before
+    if config.trace_allocations:
+        gc.collect()
+        traced_kib = (tracemalloc.get_traced_memory()[0] - traced_before) / 1024
+        growth = _traced_snapshot().compare_to(midpoint, "filename") if midpoint else []
+        tracemalloc.stop()
+    rss_after = _rss_kib()
+
+    summary = histogram.summary()
+    profile = system.get_profiler_stats()
+    report = SimulationReport(
+        matches=config.matches,
+        maps=lobby_maps,
+        simulated_s=steps * dt,
+        ticks=ticks,
+        wall_s=wall_s,
+        ticks_per_sec=ticks / wall_s if wall_s > 0 else 0.0,
+        tick_ms_p50=summary["p50_ms"],
+        tick_ms_p99=summary["p99_ms"],
+        tick_ms_max=summary["max_ms"],
+        broadcasts=broadcasts,
+        checksum=hashlib.sha1(
+            json.dumps(last_sent, sort_keys=True, default=str).encode()
+        ).hexdigest(),
+        pools=system.get_pool_stats(),
+        phases=profile if profile["enabled"] else {},
+    )
+    if config.trace_allocations and ticks:
+        report.alloc_kib_per_tick = alloc_bytes / ticks / 1024
+        report.retained_blocks_per_tick = retained_blocks / ticks
+        report.kib_per_match = traced_kib / config.matches
+        report.growth_kib_per_match = sum(d.size_diff for d in growth) / 1024 / config.matches
+        report.live_objects = _live_models()
+    if rss_before is not None and rss_after is not None and config.matches:
+        report.rss_kib_per_match = max(0.0, rss_after - rss_before) / config.matches
+
+    system.shutdown()
+    return report
+
+
+def simulate(
+    config: SimulationConfig,
+    maps: Dict[str, dict],
+    tick_config=TICK_CONFIG,
+    **system_kwargs,
+) -> SimulationReport:
+    """
+    Run a headless simulation and return its measurements.
+
+    Args:
+        maps: map_slug -> client arena config; games are assigned maps
+            round-robin in slug order
+        system_kwargs: extra TickSystem config (combat_config, rate_config, ...)
+
+    Must not be called from a running event loop.
+    """
+    return asyncio.run(_run(config, maps, SimClock(), tick_config, system_kwargs))
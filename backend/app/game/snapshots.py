@@ -0,0 +1,189 @@
+"""
+Delta-compressed state snapshots.
+
+Single responsibility: turn each lobby's full state_update payload into
+per-client deltas against the last snapshot that client acknowledged.
+
+Protocol:
+- Server keeps the last N full payloads per lobby, keyed by tick
+- Client sends state_ack {tick} for snapshots it has applied
+- Acked clients get state_delta {tick, base_tick, delta}
+- Clients with no usable ack (join, loss, ack older than the history)
+  get a full state_update keyframe. Clients that never ack always get
+  keyframes, so the change is backwards compatible.
+
+Delta format: nested dicts are diffed recursively; unchanged keys are
+omitted, removed keys are listed under REMOVED_KEY, and any other value
+(including lists) is sent whole when it changes.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.logging import get_logger
+from .config import NETWORK_CONFIG
+
+logger = get_logger("game.snapshots")
+
+REMOVED_KEY = "__removed__"
+
+
+def diff_state(base: dict, current: dict) -> dict:
+    """Delta that turns base into current."""
+    delta = {}
+    for key, value in current.items():
+        if key not in base:
+            delta[key] = value
+            continue
+        old = base[key]
+        if value is old:
+            continue  # Cached fragment (state_cache.py), unchanged by construction
+        if isinstance(value, dict) and isinstance(old, dict):
+            sub = diff_state(old, value)
+            if sub:
+                delta[key] = sub
+        elif old != value:
+            delta[key] = value
+
+    removed = [key for key in base if key not in current]
+    if removed:
+        delta[REMOVED_KEY] = removed
+    return delta
+
+
+def apply_delta(base: dict, delta: dict) -> dict:
+    """Apply a delta to base, returning a new dict (base is not modified)."""
+    result = dict(base)
+    for key, value in delta.items():
+        if key == REMOVED_KEY:
+            for removed in value:
+                result.pop(removed, None)
+        elif isinstance(value, dict) and isinstance(result.get(key), dict):
+            result[key] = apply_delta(result[key], value)
+        else:
+            result[key] = value
+    return result
+
+
+class DeltaEncoder:
+    """Snapshot history and client acks for one lobby."""
+
+    def __init__(self, history_size: int = NETWORK_CONFIG.snapshot_history):
+        self.history_size = history_size
+        self._history: "OrderedDict[int, dict]" = OrderedDict()
+        self._acks: Dict[str, int] = {}
+        self.keyframes_sent = 0
+        self.deltas_sent = 0
+
+    @property
+    def last_tick(self) -> Optional[int]:
+        return next(reversed(self._history)) if self._history else None
+
+    def ack(self, user_id: str, tick: int) -> bool:
+        """Record a client ack. Ignores unknown or out-of-order ticks."""
+        if tick not in self._history:
+            return False
+        if tick <= self._acks.get(user_id, -1):
+            return False
+        self._acks[user_id] = tick
+        return True
+
+    def remove_client(self, user_id: str) -> None:
+        self._acks.pop(user_id, None)
+
+    def reset(self) -> None:
+        """Drop history and acks (e.g. a new match restarted tick numbering)."""
+        self._history.clear()
+        self._acks.clear()
+
+    def encode(
+        self, payload: dict, user_ids: Iterable[str]
+    ) -> List[Tuple[dict, List[str]]]:
+        """
+        Build outgoing messages for a snapshot.
+
+        Returns (message, user_ids) groups; clients sharing a base tick
+        share one message, so each distinct message is built once.
+        """
+        tick = payload["tick"]
+        last = self.last_tick
+        if last is not None and tick <= last:
+            self.reset()
+
+        groups: Dict[Optional[int], List[str]] = {}
+        for user_id in user_ids:
+            base_tick = self._acks.get(user_id)
+            if base_tick not in self._history:
+                base_tick = None
+            groups.setdefault(base_tick, []).append(user_id)
+
+        out = []
+        for base_tick, users in groups.items():
+            if base_tick is None:
+                message = {"type": "state_update", "payload": payload}
+                self.keyframes_sent += len(users)
+            else:
+                message = {
+                    "type": "state_delta",
+                    "payload": {
+                        "tick": tick,
+                        "base_tick": base_tick,
+                        "delta": diff_state(self._history[base_tick], payload),
+                    },
+                }
+                self.deltas_sent += len(users)
+            out.append((message, users))
+
+        self._history[tick] = payload
+        while len(self._history) > self.history_size:
+            self._history.popitem(last=False)
+        return out
+
+
+class SnapshotRegistry:
+    """Per-lobby DeltaEncoders."""
+
+    def __init__(self, config=NETWORK_CONFIG):
+        self.config = config
+        self._encoders: Dict[str, DeltaEncoder] = {}
+
+    def encode(
+        self, lobby_id: str, payload: dict, user_ids: Iterable[str]
+    ) -> List[Tuple[dict, List[str]]]:
+        """Encode a state_update payload for the lobby's clients."""
+        user_ids = list(user_ids)
+        if not self.config.delta_snapshots:
+            return [({"type": "state_update", "payload": payload}, user_ids)]
+
+        encoder = self._encoders.get(lobby_id)
+        if encoder is None:
+            encoder = self._encoders[lobby_id] = DeltaEncoder(self.config.snapshot_history)
+        return encoder.encode(payload, user_ids)
+
+    def ack(self, lobby_id: str, user_id: str, tick) -> bool:
+        """Record a client's state_ack."""
+        encoder = self._encoders.get(lobby_id)
+        if encoder is None or not isinstance(tick, int):
+            return False
+        return encoder.ack(user_id, tick)
+
+    def remove_client(self, lobby_id: str, user_id: str) -> None:
+        """Forget a client; the next snapshot it gets is a keyframe."""
+        encoder = self._encoders.get(lobby_id)
+        if encoder:
+            encoder.remove_client(user_id)
+
+    def remove_lobby(self, lobby_id: str) -> None:
+        self._encoders.pop(lobby_id, None)
+
+    def get_stats(self) -> dict:
+        """Get snapshot statistics for monitoring."""
+        return {
+            "lobbies": len(self._encoders),
+            "keyframes_sent": sum(e.keyframes_sent for e in self._encoders.values()),
+            "deltas_sent": sum(e.deltas_sent for e in self._encoders.values()),
+        }
+
+
+# Global instance
+snapshot_registry = SnapshotRegistry()
@@ -0,0 +1,79 @@
+"""
+Dirty-tracked broadcast state.
+
+Single responsibility: keep each entity's serialized state fragment
+(the dict or list it contributes to a state_update) until the entity
+changes, so assembling a snapshot costs what changed since the last one
+instead of one fresh dict per entity per broadcast.
+
+Managers mark() an entity when one of its broadcast fields changes and
+drop() it when the entity goes away. state() rebuilds only the marked
+fragments and returns the very same list (or dict) object while nothing
+changed. Fragments and containers are replaced, never mutated: snapshot
+history (snapshots.py) keeps earlier payloads, and diff_state skips
+values that are the same object as in its base.
+
+Fragments come out in the order entities were first built, which is the
+manager's dict order as long as every add marks and every remove drops.
+
+Usage:
+    self._fragments = FragmentCache(self._fragment)  # key -> fragment (None if gone)
+    self._fragments.mark(hazard_id)  # after a broadcast field changes
+    return self._fragments.state()  # in get_state()
+"""
+
+from typing import Callable, Dict, Generic, Hashable, List, Optional, TypeVar, Union
+
+K = TypeVar("K", bound=Hashable)
+
+
+class FragmentCache(Generic[K]):
+    """Per-entity state fragments, rebuilt only for entities marked dirty."""
+
+    __slots__ = ("_build", "_keyed", "_fragments", "_dirty", "_state", "rebuilt")
+
+    def __init__(self, build: Callable[[K], Optional[object]], keyed: bool = False):
+        """
+        Args:
+            build: Builds the fragment for a key (None when the entity is gone)
+            keyed: state() returns {key: fragment} instead of a list
+        """
+        self._build = build
+        self._keyed = keyed
+        self._fragments: Dict[K, object] = {}
+        self._dirty: Dict[K, None] = {}
+        self._state: Optional[Union[list, dict]] = None
+        self.rebuilt = 0
+
+    def mark(self, key: K) -> None:
+        """Rebuild key's fragment at the next state()."""
+        self._dirty[key] = None
+        self._state = None
+
+    def drop(self, key: K) -> None:
+        """Forget a removed entity."""
+        self._dirty.pop(key, None)
+        if self._fragments.pop(key, None) is not None:
+            self._state = None
+
+    def clear(self) -> None:
+        self._fragments.clear()
+        self._dirty.clear()
+        self._state = None
+
+    def state(self) -> Union[List[object], Dict[K, object]]:
+        """Current fragments; the same object as last time if nothing was marked."""
+        if self._state is None:
+            if self._dirty:
+                build = self._build
+                fragments = self._fragments
+                for key in self._dirty:
+                    fragment = build(key)
+                    if fragment is None:
+                        fragments.pop(key, None)
+                    else:
+                        fragments[key] = fragment
+                self.rebuilt += len(self._dirty)
+                self._dirty.clear()
+            self._state = dict(self._fragments) if self._keyed else list(self._fragments.values())
+        return self._state
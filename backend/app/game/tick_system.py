@@ -6,22 +6,53 @@ Coordinates game loop, delegates to specialized modules:
 - lag_compensation.py: Position history and hit detection
 - config.py: All tunable parameters
 - models.py: Data structures
+- input_log.py: Per-match input log for re-simulation
 """
 
 import asyncio
+import dataclasses
+import random
 import time
-from typing import Dict, Optional, Callable, Awaitable
-from collections import deque
+from typing import Dict, List, Optional, Callable, Awaitable
 
+from app.core.config import get_settings
 from app.core.logging import get_logger
-from .config import TICK_CONFIG, MOVEMENT_CONFIG, LAG_COMP_CONFIG
-from .models import GameState, PlayerState, PlayerInput, FireInput
+from .config import (
+    TICK_CONFIG,
+    MOVEMENT_CONFIG,
+    LAG_COMP_CONFIG,
+    SCHEDULER_CONFIG,
+    COMBAT_CONFIG,
+    NETWORK_CONFIG,
+    PROFILER_CONFIG,
+    RATE_CONFIG,
+    INPUT_LOG_CONFIG,
+)
+from .models import GameState, PlayerState, PlayerInput, FireInput, PositionHistory, InputQueue, INPUT_POOL, FRAME_POOL
 from .validation import InputValidator
 from .lag_compensation import LagCompensator
-from .combat import ServerCombatSystem
+from .combat import ServerCombatSystem, PROJECTILE_POOL
 from .arena_systems import ServerArenaSystems, HazardType, TrapType, TrapEffect
 from .dynamic_spawns import ServerDynamicSpawnManager
 from .buffs import BuffManager
+from .quiz_rewards import QuizRewardDispatcher
+from .scheduler import TickScheduler
+from .rate_control import RateController
+from .frames import TickFrame
+from .map_registry import map_registry
+from .input_log import open_input_log
+from .profiler import (
+    TickProfiler,
+    PHASE_INPUT,
+    PHASE_FIRE,
+    PHASE_COMBAT,
+    PHASE_TRANSPORT,
+    PHASE_ARENA,
+    PHASE_SPAWNS,
+    PHASE_BUFFS,
+    PHASE_LAG_COMP,
+    PHASE_BROADCAST,
+)
 
 logger = get_logger("game.tick_system")
 
@@ -30,24 +61,64 @@ class TickSystem:
     """
     Authoritative server tick system.
     
-    Runs at 60Hz, processing inputs and updating game state.
+    Runs at the tick config's rate (60Hz by default), processing inputs
+    and updating game state. Swept projectile collision keeps hits exact
+    at lower rates, e.g. tick_config=TickConfig.at_rate(30).
     Delegates validation and lag compensation to specialized classes.
+    
+    By default each lobby gets its own tick task. With a shared
+    scheduler config, all lobbies are stepped from one TickScheduler.
+    
+    Simulated time comes from clock (wall time by default), which is
+    handed to every combat, buff and arena system the game creates;
+    the simulator and input log replay pass virtual clocks. rates
+    replaces the adaptive RateController built from rate_config.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        tick_config=TICK_CONFIG,
+        scheduler_config=SCHEDULER_CONFIG,
+        combat_config=COMBAT_CONFIG,
+        network_config=NETWORK_CONFIG,
+        profiler_config=PROFILER_CONFIG,
+        rate_config=RATE_CONFIG,
+        input_log_config=INPUT_LOG_CONFIG,
+        rates: Optional[RateController] = None,
+        clock: Optional[Callable[[], float]] = None,
+    ):
+        if clock is None:
+            clock = time.time
+        self._clock = clock
         self._games: Dict[str, GameState] = {}
         self._tasks: Dict[str, asyncio.Task] = {}
         self._broadcast_callback: Optional[Callable[[str, dict], Awaitable[None]]] = None
         self._kick_callback: Optional[Callable[[str, str, str], Awaitable[None]]] = None
         
         # Delegates
-        self._validator = InputValidator()
-        self._lag_comp = LagCompensator()
+        self._validator = InputValidator(tick_config=tick_config, clock=clock)
+        self._lag_comp = LagCompensator(clock=clock)
+        self._profiler = TickProfiler(profiler_config)
+        self._rates = rates if rates is not None else RateController(tick_config, rate_config)
+        self._input_totals = InputQueue().get_stats()  # Counters of games already stopped
         
         # Config
-        self._tick_config = TICK_CONFIG
+        self._tick_config = tick_config
         self._movement_config = MOVEMENT_CONFIG
         self._lag_comp_config = LAG_COMP_CONFIG
+        self._combat_config = combat_config
+        self._network_config = network_config
+        self._input_log_config = input_log_config
+        self._input_log_totals = {"matches": 0, "ticks": 0, "bytes": 0}  # Logs already closed
+        
+        # Shared scheduler (optional)
+        self._scheduler: Optional[TickScheduler] = None
+        if scheduler_config.shared:
+            self._scheduler = TickScheduler(
+                self._process_tick,
+                tick_config=self._tick_config,
+                config=scheduler_config,
+            )
     
     def set_broadcast_callback(self, callback: Callable[[str, dict], Awaitable[None]]) -> None:
         """Set callback for broadcasting state updates."""
@@ -64,55 +135,93 @@ class TickSystem:
         player2_id: str,
         spawn1: tuple = (160, 360),
         spawn2: tuple = (1120, 360),
+        seed: Optional[int] = None,
     ) -> GameState:
-        """Create a new game."""
+        """Create a new game (seed: the match RNG seed, random by default)."""
         history_size = self._lag_comp_config.history_size(self._tick_config.rate_hz)
         
         game = GameState(lobby_id=lobby_id)
+        game.seed = random.getrandbits(32) if seed is None else seed
         game.players[player1_id] = PlayerState(
             player_id=player1_id,
             x=spawn1[0],
             y=spawn1[1],
             last_valid_position=spawn1,
-            position_history=deque(maxlen=history_size),
+            position_history=PositionHistory(history_size),
         )
         game.players[player2_id] = PlayerState(
             player_id=player2_id,
             x=spawn2[0],
             y=spawn2[1],
             last_valid_position=spawn2,
-            position_history=deque(maxlen=history_size),
+            position_history=PositionHistory(history_size),
         )
         
         # Initialize buff manager for quiz rewards
-        game.buff_manager = BuffManager()
+        game.buff_manager = BuffManager(clock=self._clock)
         game.buff_manager.init_player(player1_id)
         game.buff_manager.init_player(player2_id)
         
         # Initialize combat system for this game (with buff manager)
-        game.combat_system = ServerCombatSystem(buff_manager=game.buff_manager)
+        game.combat_system = ServerCombatSystem(
+            buff_manager=game.buff_manager,
+            vectorized=self._combat_config.vectorized_projectiles,
+            swept=self._combat_config.swept_collision,
+            clock=self._clock,
+        )
         game.combat_system.init_player(player1_id)
         game.combat_system.init_player(player2_id)
         
         # Initialize arena systems (hazards, traps, transport)
-        game.arena_systems = ServerArenaSystems()
+        game.arena_systems = ServerArenaSystems(clock=self._clock)
         
         # Initialize dynamic spawn manager
-        game.dynamic_spawns = ServerDynamicSpawnManager()
+        game.dynamic_spawns = ServerDynamicSpawnManager(rng=random.Random(game.seed), clock=self._clock)
+        
+        # Stream accepted inputs for re-simulation (input_log.py)
+        game.input_log = open_input_log(
+            self._input_log_config, lobby_id, game.seed,
+            (player1_id, player2_id), self._tick_config.duration_s,
+        )
+        if game.input_log:
+            game.input_log.match(self._clock(), {
+                "lobby_id": lobby_id,
+                "players": [player1_id, player2_id],
+                "spawns": [list(spawn1), list(spawn2)],
+                "seed": game.seed,
+                "rate_hz": self._tick_config.rate_hz,
+                "broadcast_divisor": self._tick_config.broadcast_divisor,
+                "vectorized": self._combat_config.vectorized_projectiles,
+                "swept": self._combat_config.swept_collision,
+                "rates": dataclasses.asdict(self._rates.config),
+            })
         
         self._games[lobby_id] = game
         logger.info(f"[TICK] Created game {lobby_id} with players: {player1_id}, {player2_id}")
         return game
     
-    def start_game(self, lobby_id: str) -> bool:
-        """Start the tick loop."""
+    def start_game(self, lobby_id: str, headless: bool = False) -> bool:
+        """
+        Start the tick loop.
+        
+        With headless=True the game is marked running but no loop is
+        started; the caller steps it with step_game() (simulator, tests).
+        """
         game = self._games.get(lobby_id)
         if not game or game.is_running:
             return game.is_running if game else False
         
         game.is_running = True
-        game.start_time = time.time()
-        self._tasks[lobby_id] = asyncio.create_task(self._tick_loop(lobby_id))
+        game.start_time = self._clock()
+        self._rates.add(lobby_id, game.start_time)
+        if game.input_log:
+            game.input_log.start(game.start_time)
+        if headless:
+            return True
+        if self._scheduler:
+            self._scheduler.register(game)
+        else:
+            self._tasks[lobby_id] = asyncio.create_task(self._tick_loop(lobby_id))
         
         # Schedule immediate initial state broadcast so clients know spawn positions
         asyncio.create_task(self._broadcast_initial_state(game))
@@ -120,6 +229,14 @@ class TickSystem:
         logger.info(f"Started tick loop for {lobby_id}")
         return True
     
+    async def step_game(self, lobby_id: str) -> bool:
+        """Process one tick of a headless game. Returns False if it is not running."""
+        game = self._games.get(lobby_id)
+        if not game or not game.is_running:
+            return False
+        await self._process_tick(game)
+        return True
+    
     async def _broadcast_initial_state(self, game: GameState) -> None:
         """Broadcast initial state immediately so clients see each other at spawn."""
         await asyncio.sleep(0.1)  # Small delay to ensure clients are ready
@@ -134,12 +251,29 @@ class TickSystem:
         task = self._tasks.pop(lobby_id, None)
         if task:
             task.cancel()
+        if self._scheduler:
+            self._scheduler.unregister(lobby_id)
         
-        self._games.pop(lobby_id, None)
+        self._profiler.remove_lobby(lobby_id)
+        self._rates.remove(lobby_id)
+        game = self._games.pop(lobby_id, None)
+        if game:
+            for key, count in game.pending_inputs.get_stats().items():
+                self._input_totals[key] += count
+            if game.input_log:
+                game.input_log.close(self._clock())
+                self._input_log_totals["matches"] += 1
+                self._input_log_totals["ticks"] += game.input_log.ticks
+                self._input_log_totals["bytes"] += game.input_log.bytes_written
         logger.info(f"Stopped tick loop for {lobby_id}")
     
     def queue_input(self, lobby_id: str, player_input: PlayerInput) -> bool:
-        """Queue input for next tick."""
+        """
+        Queue input for next tick, replacing the player's pending input.
+        
+        Returns False for stale or out-of-order inputs. The input is
+        recycled into INPUT_POOL once consumed or discarded.
+        """
         game = self._games.get(lobby_id)
         if not game or not game.is_running:
             logger.warning(f"[TICK] Cannot queue input: game={bool(game)}, running={game.is_running if game else False}")
@@ -150,7 +284,10 @@ class TickSystem:
             logger.warning(f"[TICK] Player {player_input.player_id} is kicked, ignoring input")
             return False
         
-        game.pending_inputs.append(player_input)
+        last_sequence = player.last_input_sequence if player else 0
+        if not game.pending_inputs.offer(player_input, last_sequence):
+            return False
+        self._rates.wake(lobby_id)
         return True
     
     def queue_fire(self, lobby_id: str, fire_input: FireInput) -> bool:
@@ -164,42 +301,37 @@ class TickSystem:
             return False
         
         game.pending_fire_inputs.append(fire_input)
+        self._rates.wake(lobby_id)
         return True
     
-    def init_arena_config(self, lobby_id: str, arena_config: dict) -> bool:
-        """Initialize arena systems with map configuration."""
+    def init_arena_config(
+        self, lobby_id: str, arena_config: dict, map_slug: Optional[str] = None
+    ) -> bool:
+        """
+        Initialize arena systems with map configuration.
+
+        The config is compiled once per (map_slug, layout) and shared;
+        returns False for unknown games and malformed configs.
+        """
         game = self._games.get(lobby_id)
         if not game:
             return False
         
+        try:
+            arena_map = map_registry.get(map_slug, arena_config)
+        except ValueError as e:
+            logger.warning(f"[TICK] Rejected arena config for {lobby_id} ({map_slug}): {e}")
+            return False
+        
+        if game.input_log:
+            game.input_log.arena(self._clock(), map_slug, arena_config)
         if game.arena_systems:
-            game.arena_systems.initialize_from_config(arena_config)
+            game.arena_systems.initialize_from_map(arena_map)
         
-        # Initialize dynamic spawns with exclusion zones
+        # Initialize dynamic spawns with exclusion zones (teleporters,
+        # jump pads and spawn points, precomputed with the map)
         if game.dynamic_spawns:
-            exclusion_zones = []
-            # Add teleporters as exclusion zones
-            for tp in arena_config.get("teleporters", []):
-                exclusion_zones.append({
-                    "x": tp["position"]["x"],
-                    "y": tp["position"]["y"],
-                    "radius": tp["radius"] + 60
-                })
-            # Add jump pads as exclusion zones
-            for jp in arena_config.get("jumpPads", []):
-                exclusion_zones.append({
-                    "x": jp["position"]["x"],
-                    "y": jp["position"]["y"],
-                    "radius": jp["radius"] + 60
-                })
-            # Add spawn points as exclusion zones
-            for sp in arena_config.get("spawnPoints", []):
-                exclusion_zones.append({
-                    "x": sp["position"]["x"],
-                    "y": sp["position"]["y"],
-                    "radius": 100
-                })
-            game.dynamic_spawns.initialize(exclusion_zones)
+            game.dynamic_spawns.initialize(arena_map.exclusion_zones)
         
         return True
     
@@ -250,18 +382,22 @@ class TickSystem:
             game.is_running = False
     
     async def _process_tick(self, game: GameState) -> None:
-        """Process a single tick."""
+        """Process a single tick (skipped while the match runs at a reduced rate)."""
+        if not self._rates.should_step(game.lobby_id):
+            return
         game.tick_count += 1
-        current_time = time.time()
-        tick_duration = self._tick_config.duration_s
+        current_time = self._clock()
+        tick_duration = self._rates.step_duration(game.lobby_id)
+        sample = self._profiler.begin(game.lobby_id)
         
         # Decay violations
         for player in game.players.values():
             self._validator.decay_violations(player, game.tick_count)
         
-        # Process movement inputs
-        inputs = game.pending_inputs.copy()
-        game.pending_inputs.clear()
+        # Process movement inputs (newest per player)
+        inputs = game.pending_inputs.drain()
+        if game.input_log:
+            game.input_log.tick(current_time, tick_duration, inputs)
         
         for input_data in inputs:
             player = game.players.get(input_data.player_id)
@@ -283,11 +419,25 @@ class TickSystem:
             
             if player.is_kicked and self._kick_callback:
                 await self._kick_callback(game.lobby_id, player.player_id, "violations")
+        active = bool(inputs)
+        INPUT_POOL.release_all(inputs)
+        if sample:
+            sample.lap(PHASE_INPUT)
+        
+        # Get current player positions for combat and arena updates
+        player_positions = {
+            pid: (p.x, p.y)
+            for pid, p in game.players.items()
+            if not p.is_kicked
+        }
         
         # Process fire inputs (combat)
         if game.combat_system:
             fire_inputs = game.pending_fire_inputs.copy()
             game.pending_fire_inputs.clear()
+            active = active or bool(fire_inputs)
+            if game.input_log and fire_inputs:
+                game.input_log.fires(fire_inputs)
             
             for fire_input in fire_inputs:
                 player = game.players.get(fire_input.player_id)
@@ -298,16 +448,13 @@ class TickSystem:
                         (fire_input.direction_x, fire_input.direction_y),
                         fire_input.client_timestamp,
                     )
-            
-            # Get current player positions for combat update
-            player_positions = {
-                pid: (p.x, p.y)
-                for pid, p in game.players.items()
-                if not p.is_kicked
-            }
+            if sample:
+                sample.lap(PHASE_FIRE)
             
             # Update combat simulation
             game.combat_system.update(tick_duration, player_positions)
+        if sample:
+            sample.lap(PHASE_COMBAT)
         
         # Update arena systems (hazards, traps, transport)
         if game.arena_systems:
@@ -327,9 +474,13 @@ class TickSystem:
                 velocity = game.arena_systems.check_jump_pad(player_id, pos)
                 if velocity:
                     player.velocity_x, player.velocity_y = velocity
+            if sample:
+                sample.lap(PHASE_TRANSPORT)
             
             # Update hazards and traps
             game.arena_systems.update(tick_duration, player_positions)
+        if sample:
+            sample.lap(PHASE_ARENA)
         
         # Update dynamic spawns
         if game.dynamic_spawns and game.arena_systems:
@@ -363,25 +514,43 @@ class TickSystem:
                     trap_cfg.get("chainRadius"),
                     trap_cfg.get("despawn_time")
                 )
+        if sample:
+            sample.lap(PHASE_SPAWNS)
         
         # Update buffs (expire old ones)
         if game.buff_manager:
             expired_buffs = game.buff_manager.update(current_time)
             # Could broadcast buff expiry events here if needed
+        if sample:
+            sample.lap(PHASE_BUFFS)
         
         # Record history
         for player in game.players.values():
             self._lag_comp.record_position(player, current_time, game.tick_count)
+        if sample:
+            sample.lap(PHASE_LAG_COMP)
+        
+        # Activity decides this match's rate for the next ticks
+        if game.combat_system and game.combat_system.has_activity():
+            active = True
+        elif game.arena_systems and game.arena_systems.has_pending_events():
+            active = True
+        self._rates.observe(game.lobby_id, active, current_time)
         
         # Broadcast
         if game.tick_count % self._tick_config.broadcast_divisor == 0:
             await self._broadcast_state(game)
+        if sample:
+            sample.lap(PHASE_BROADCAST)
+            self._profiler.end(sample)
     
     async def _broadcast_state(self, game: GameState) -> None:
-        """Broadcast state to clients."""
+        """Broadcast this tick's events and state to clients."""
         if not self._broadcast_callback:
             return
         
+        frame = TickFrame(game.tick_count)
+        
         players_state = {
             pid: {
                 "x": round(p.x, 1),
@@ -397,62 +566,47 @@ class TickSystem:
         # Build state payload
         payload = {
             "tick": game.tick_count,
-            "timestamp": time.time(),
+            "timestamp": self._clock(),
+            "tick_rate": self._rates.tick_rate(game.lobby_id),
+            "broadcast_rate": self._rates.broadcast_rate(game.lobby_id),
             "players": players_state,
         }
         
-        # Add combat state if available
+        # Add combat state and queue combat events
         if game.combat_system:
-            combat_state = game.combat_system.get_combat_state()
-            payload["combat"] = combat_state
-            
-            # Get and broadcast combat events
-            events = game.combat_system.get_and_clear_events()
-            if events:
-                for event in events:
-                    event_msg = {
-                        "type": f"combat_{event.event_type}",
-                        "payload": event.data,
-                    }
-                    try:
-                        await self._broadcast_callback(game.lobby_id, event_msg)
-                    except Exception as e:
-                        logger.error(f"Combat event broadcast failed: {e}")
-        
-        # Add arena state if available
+            payload["combat"] = game.combat_system.get_combat_state()
+            frame.add_events("combat", game.combat_system.get_and_clear_events())
+        
+        # Add arena state and queue arena events
         if game.arena_systems:
-            arena_state = game.arena_systems.get_arena_state()
-            payload["arena"] = arena_state
-            
-            # Get and broadcast arena events
-            arena_events = game.arena_systems.get_and_clear_events()
-            if arena_events:
-                for event in arena_events:
-                    event_msg = {
-                        "type": f"arena_{event.event_type}",
-                        "payload": event.data,
-                    }
-                    try:
-                        await self._broadcast_callback(game.lobby_id, event_msg)
-                    except Exception as e:
-                        logger.error(f"Arena event broadcast failed: {e}")
+            payload["arena"] = game.arena_systems.get_arena_state()
+            frame.add_events("arena", game.arena_systems.get_and_clear_events())
         
         # Add buff state if available
         if game.buff_manager:
             payload["buffs"] = game.buff_manager.get_buff_state_for_broadcast()
         
-        state = {
+        frame.add({
             "type": "state_update",
             "payload": payload,
-        }
+        })
         
-        # Periodic state logging removed for production
+        await self._send_frame(game.lobby_id, frame)
+    
+    async def _send_frame(self, lobby_id: str, frame: TickFrame) -> None:
+        """Send a tick's messages as one tick_frame, or one by one in compat mode."""
+        if self._network_config.tick_frames:
+            try:
+                await self._broadcast_callback(lobby_id, frame.to_message())
+            except Exception as e:
+                logger.error(f"Broadcast failed: {e}")
+            return
         
-        try:
-            await self._broadcast_callback(game.lobby_id, state)
-        except Exception as e:
-            logger.error(f"Broadcast failed: {e}")
-
+        for message in frame.messages:
+            try:
+                await self._broadcast_callback(lobby_id, message)
+            except Exception as e:
+                logger.error(f"Broadcast of {message['type']} failed: {e}")
 
     def get_arena_state(self, lobby_id: str) -> Optional[dict]:
         """Get current arena state for a game."""
@@ -467,7 +621,93 @@ class TickSystem:
         if not game or not game.buff_manager:
             return None
         return game.buff_manager.get_buff_state_for_broadcast()
+    
+    def is_running(self, lobby_id: str) -> bool:
+        """Check if a game exists and its tick loop is running."""
+        game = self._games.get(lobby_id)
+        return game is not None and game.is_running
+    
+    def game_count(self) -> int:
+        """Get number of games held (running or not yet started)."""
+        return len(self._games)
+    
+    def lobby_ids(self) -> List[str]:
+        """Get lobby ids of all games held."""
+        return list(self._games)
+    
+    def dispatch_quiz_rewards(
+        self,
+        lobby_id: str,
+        round_result: dict,
+        question_time_ms: int,
+    ) -> dict:
+        """Apply quiz round rewards as combat buffs. Returns reward summary."""
+        game = self._games.get(lobby_id)
+        if not game or not game.buff_manager:
+            return {}
+        if game.input_log:
+            game.input_log.quiz(self._clock(), round_result, question_time_ms)
+        dispatcher = QuizRewardDispatcher(game.buff_manager)
+        return dispatcher.dispatch_for_round(round_result, question_time_ms)
+    
+    def shutdown(self) -> None:
+        """Stop all games."""
+        for lobby_id in self.lobby_ids():
+            self.stop_game(lobby_id)
+    
+    def get_scheduler_stats(self) -> Optional[dict]:
+        """Get shared scheduler stats, or None when using per-lobby tasks."""
+        if not self._scheduler:
+            return None
+        return self._scheduler.get_stats()
+    
+    def get_rate_stats(self) -> dict:
+        """Get per-match tick rate counts."""
+        return self._rates.get_stats()
+    
+    def get_input_stats(self) -> dict:
+        """Get movement input queue counters summed over all games."""
+        totals = dict(self._input_totals)
+        for game in self._games.values():
+            for key, count in game.pending_inputs.get_stats().items():
+                totals[key] += count
+        return totals
+    
+    def get_pool_stats(self) -> dict:
+        """Get freelist sizes and reuse counts for recycled per-tick objects."""
+        return {
+            "inputs": INPUT_POOL.get_stats(),
+            "frames": FRAME_POOL.get_stats(),
+            "projectiles": PROJECTILE_POOL.get_stats(),
+        }
+    
+    def get_map_stats(self) -> dict:
+        """Get compiled arena map registry counters."""
+        return map_registry.get_stats()
+    
+    def get_input_log_stats(self) -> dict:
+        """Get input log counters (closed and open match logs)."""
+        totals = dict(self._input_log_totals)
+        open_logs = [g.input_log for g in self._games.values() if g.input_log]
+        totals["open"] = len(open_logs)
+        totals["ticks"] += sum(log.ticks for log in open_logs)
+        totals["bytes"] += sum(log.bytes_written for log in open_logs)
+        totals["enabled"] = self._input_log_config.enabled
+        return totals
+    
+    def get_profiler_stats(self) -> dict:
+        """Get per-phase tick timing histograms."""
+        return self._profiler.get_stats()
+
+
+def create_tick_system():
+    """Build the process-wide tick system, sharded when workers are configured."""
+    workers = get_settings().TICK_WORKER_PROCESSES
+    if workers > 0:
+        from .sharding import ShardedTickSystem
+        return ShardedTickSystem(workers)
+    return TickSystem()
 
 
 # Global instance
-tick_system = TickSystem()
+tick_system = create_tick_system()
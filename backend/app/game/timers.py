@@ -0,0 +1,166 @@
+"""
+Deadline timers for game state.
+
+Single responsibility: hand back the keys whose deadline has passed,
+so per-tick expiry checks cost O(expiring * log n) instead of a scan
+over every entity.
+
+TimerQueue is a binary heap of (deadline, key) with one live deadline
+per key: scheduling a key again replaces its deadline and cancel()
+forgets it. Replaced and cancelled entries stay in the heap until they
+surface (or the heap is compacted) and are skipped when popped.
+
+Used by combat (respawns), buffs (expiry), hazards and traps
+(despawns, trap chains). DeadlineRunner puts a TimerQueue behind one
+asyncio task for wall-clock deadlines outside the tick loop (quiz
+question timeouts), instead of a sleeping task per deadline.
+
+Usage:
+    timers.schedule(("respawn", player_id), now + 3.0)
+    for kind, player_id in timers.pop_due(now):
+        ...
+"""
+
+import asyncio
+import heapq
+import time
+from typing import Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Set, Tuple, TypeVar
+
+from app.core.logging import get_logger
+
+logger = get_logger("game.timers")
+
+K = TypeVar("K", bound=Hashable)
+
+# Rebuild the heap once stale entries outnumber live ones by this much
+COMPACT_SLACK = 64
+
+
+class TimerQueue(Generic[K]):
+    """Min-heap of deadlines, one per key."""
+
+    __slots__ = ("_heap", "_live", "_counter")
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, K]] = []
+        self._live: Dict[K, Tuple[float, int]] = {}  # key -> (deadline, entry id)
+        self._counter = 0
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._live
+
+    def schedule(self, key: K, deadline: float) -> None:
+        """Set (or replace) the deadline for key."""
+        self._counter += 1
+        self._live[key] = (deadline, self._counter)
+        heapq.heappush(self._heap, (deadline, self._counter, key))
+        if len(self._heap) > 2 * len(self._live) + COMPACT_SLACK:
+            self._compact()
+
+    def cancel(self, key: K) -> bool:
+        """Forget key's deadline; False when none was set."""
+        return self._live.pop(key, None) is not None
+
+    def deadline(self, key: K) -> Optional[float]:
+        entry = self._live.get(key)
+        return entry[0] if entry else None
+
+    def next_deadline(self) -> Optional[float]:
+        """Earliest live deadline, or None when empty."""
+        heap = self._heap
+        while heap:
+            deadline, entry_id, key = heap[0]
+            if self._live.get(key, (None, None))[1] == entry_id:
+                return deadline
+            heapq.heappop(heap)
+        return None
+
+    def pop_due(self, now: float) -> List[K]:
+        """Remove and return the keys due at or before now, earliest first."""
+        heap = self._heap
+        live = self._live
+        due: List[K] = []
+        while heap and heap[0][0] <= now:
+            _, entry_id, key = heapq.heappop(heap)
+            entry = live.get(key)
+            if entry is not None and entry[1] == entry_id:
+                del live[key]
+                due.append(key)
+        return due
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._live.clear()
+
+    def _compact(self) -> None:
+        self._heap = [(deadline, entry_id, key) for key, (deadline, entry_id) in self._live.items()]
+        heapq.heapify(self._heap)
+
+
+class DeadlineRunner:
+    """
+    Runs async callbacks at monotonic deadlines from a single task.
+
+    The task sleeps until the earliest deadline (or until an earlier one
+    is scheduled), then starts each due callback as its own task. It
+    exits when no deadlines are left and restarts on the next call_later.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._timers: TimerQueue = TimerQueue()
+        self._callbacks: Dict[Hashable, Callable[[], Awaitable[None]]] = {}
+        self._running: Set[asyncio.Task] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def call_later(self, key: Hashable, delay_s: float, callback: Callable[[], Awaitable[None]]) -> None:
+        """Run callback after delay_s, replacing any pending callback for key."""
+        earliest = self._timers.next_deadline()
+        deadline = self._clock() + delay_s
+        self._timers.schedule(key, deadline)
+        self._callbacks[key] = callback
+
+        if self._task is None or self._task.done():
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        elif earliest is None or deadline < earliest:
+            self._wake.set()
+
+    def cancel(self, key: Hashable) -> bool:
+        self._callbacks.pop(key, None)
+        return self._timers.cancel(key)
+
+    async def _run(self) -> None:
+        while True:
+            next_at = self._timers.next_deadline()
+            if next_at is None:
+                return
+            delay = next_at - self._clock()
+            if delay > 0:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            for key in self._timers.pop_due(self._clock()):
+                callback = self._callbacks.pop(key, None)
+                if callback is None:
+                    continue
+                task = asyncio.create_task(self._fire(key, callback))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+    @staticmethod
+    async def _fire(key: Hashable, callback: Callable[[], Awaitable[None]]) -> None:
+        try:
+            await callback()
+        except Exception as e:
+            logger.error(f"Deadline callback {key!r} failed: {e}")
@@ -4,7 +4,8 @@ Input validation and anti-cheat.
 Single responsibility: validate player inputs.
 """
 
-from typing import Tuple
+import logging
+from typing import Callable, Tuple
 from app.core.logging import get_logger
 from .models import GameState, PlayerState, PlayerInput, ViolationType, Violation
 from .config import MOVEMENT_CONFIG, ANTI_CHEAT_CONFIG, TICK_CONFIG
@@ -21,7 +22,9 @@ class InputValidator:
         movement_config=MOVEMENT_CONFIG,
         anti_cheat_config=ANTI_CHEAT_CONFIG,
         tick_config=TICK_CONFIG,
+        clock: Callable[[], float] = time.time,
     ):
+        self._clock = clock
         self.movement = movement_config
         self.anti_cheat = anti_cheat_config
         self.tick = tick_config
@@ -52,7 +55,8 @@ class InputValidator:
         
         # Check teleport
         distance = self._calculate_distance(player, input_data)
-        logger.debug(f"[VALIDATE] Player {player.player_id}: current=({player.x}, {player.y}), input=({input_data.x}, {input_data.y}), distance={distance:.1f}")
+        if logger.isEnabledFor(logging.DEBUG):  # Runs per input; skip formatting when off
+            logger.debug(f"[VALIDATE] Player {player.player_id}: current=({player.x}, {player.y}), input=({input_data.x}, {input_data.y}), distance={distance:.1f}")
         if distance > self.movement.teleport_threshold_px:
             self._add_violation(
                 player,
@@ -115,7 +119,7 @@ class InputValidator:
         """Record a violation."""
         player.violations.append(Violation(
             type=vtype,
-            timestamp=time.time(),
+            timestamp=self._clock(),
             details=details,
         ))
         player.violation_count += 1
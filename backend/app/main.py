@@ -23,8 +23,11 @@ from app.middleware.request_logging import RequestLoggingMiddleware
 from app.middleware.rate_limit import RateLimitMiddleware
 from app.api.v1.router import router as v1_router
 from app.websocket.manager import manager
+from app.websocket.spectators import spectator_feed
+from app.websocket.codec import BINARY_PROTOCOL, offered_protocols
+from app.game.config import NETWORK_CONFIG
 from app.websocket.handlers import GameHandler
-from app.websocket.events import build_lobby_state, build_player_joined
+from app.websocket.events import WSEventType, build_error, build_lobby_state, build_player_joined
 from app.services.lobby_service import LobbyService
 from app.services.game_service import GameService
 from app.services.matchmaking_service import init_matchmaking_service, matchmaking_service
@@ -56,6 +59,10 @@ async def lifespan(app: FastAPI):
     # Shutdown - Stop matchmaking service
     if matchmaking_service:
         await matchmaking_service.stop()
+    
+    # Stop game simulation (and tick worker processes, if sharded)
+    from app.game import tick_system
+    tick_system.shutdown()
 
 
 app = FastAPI(
@@ -154,11 +161,27 @@ async def metrics():
         JSON with rate limiter stats and connection counts
     """
     from app.middleware.rate_limit import rate_limiter, message_rate_limiter
+    from app.game import tick_system
+    from app.game.snapshots import snapshot_registry
+    from app.websocket.dispatch import message_stats
+    from app.websocket.context import connection_contexts
     
     return {
         "rate_limiter": rate_limiter.get_stats(),
         "message_rate_limiter": message_rate_limiter.get_stats(),
         "websocket_connections": manager.get_connection_count(),
+        "tick_scheduler": tick_system.get_scheduler_stats(),
+        "tick_profiler": tick_system.get_profiler_stats(),
+        "tick_rates": tick_system.get_rate_stats(),
+        "tick_inputs": tick_system.get_input_stats(),
+        "object_pools": tick_system.get_pool_stats(),
+        "arena_maps": tick_system.get_map_stats(),
+        "input_logs": tick_system.get_input_log_stats(),
+        "snapshots": snapshot_registry.get_stats(),
+        "send_queues": manager.get_queue_stats(),
+        "spectators": spectator_feed.get_stats(),
+        "ws_messages": message_stats.get_stats(),
+        "ws_contexts": connection_contexts.get_stats(),
     }
 
 
@@ -174,13 +197,26 @@ def extract_token_from_subprotocol(websocket: WebSocket) -> str | None:
     This prevents token exposure in server logs, browser history, and referrer headers.
     """
     protocols = websocket.headers.get("sec-websocket-protocol", "")
-    for protocol in protocols.split(","):
-        protocol = protocol.strip()
+    for protocol in offered_protocols(protocols):
         if protocol.startswith("auth."):
             return protocol[5:]  # Remove "auth." prefix
     return None
 
 
+def select_subprotocol(websocket: WebSocket, token: str) -> str:
+    """
+    Pick the subprotocol to accept.
+    
+    Clients opt into the binary codec by also offering BINARY_PROTOCOL;
+    otherwise the auth subprotocol is echoed as before.
+    """
+    if NETWORK_CONFIG.binary_codec:
+        protocols = offered_protocols(websocket.headers.get("sec-websocket-protocol", ""))
+        if BINARY_PROTOCOL in protocols:
+            return BINARY_PROTOCOL
+    return f"auth.{token}"
+
+
 # Matchmaking WebSocket endpoint
 @app.websocket("/ws/matchmaking")
 async def matchmaking_websocket_endpoint(
@@ -301,6 +337,75 @@ async def matchmaking_websocket_endpoint(
         manager.disconnect(websocket)
 
 
+# Spectator WebSocket endpoint
+@app.websocket("/ws/{lobby_code}/spectate")
+async def spectator_websocket_endpoint(
+    websocket: WebSocket,
+    lobby_code: str,
+):
+    """
+    Read-only WebSocket for watching a match.
+    
+    Connect with: ws://host/ws/{lobby_code}/spectate
+    Authentication and the binary codec are negotiated as on /ws/{lobby_code}.
+    
+    Spectators receive delayed state_update snapshots at
+    NETWORK_CONFIG.spectator_interval_s. They are not lobby participants:
+    only ping is answered, every other message gets a SPECTATOR_READ_ONLY
+    error.
+    
+    Close codes:
+    - 4001: Authentication required/invalid
+    - 4003: Server full or lobby spectators full
+    """
+    token = extract_token_from_subprotocol(websocket)
+    user_id = None
+    if token:
+        try:
+            user_id = decode_jwt_token(token).get("sub")
+        except AuthenticationError:
+            await websocket.close(code=4001, reason="Invalid token")
+            return
+    if not user_id:
+        await websocket.close(code=4001, reason="Authentication required")
+        return
+    
+    lobby_code = lobby_code.upper()
+    can_connect, reason = manager.can_accept_spectator(lobby_code)
+    if not can_connect:
+        await websocket.accept()  # Must accept before closing with custom code
+        await websocket.close(code=4003, reason=reason)
+        return
+    
+    try:
+        await manager.connect_spectator(
+            websocket, lobby_code, user_id, subprotocol=select_subprotocol(websocket, token)
+        )
+        await manager.send_personal(websocket, {
+            "type": WSEventType.SPECTATING.value,
+            "payload": {
+                "lobby_code": lobby_code,
+                "interval_ms": int(NETWORK_CONFIG.spectator_interval_s * 1000),
+                "delay_ms": int(NETWORK_CONFIG.spectator_delay_s * 1000),
+            },
+        })
+        
+        while True:
+            data = await manager.receive(websocket)
+            if data.get("type") == "ping":
+                await manager.send_personal(websocket, {"type": "pong", "payload": {}})
+            else:
+                await manager.send_personal(
+                    websocket, build_error("SPECTATOR_READ_ONLY", "Spectators cannot send game messages")
+                )
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.warning(f"Spectator connection error: {e}")
+    finally:
+        manager.disconnect(websocket)
+
+
 # WebSocket endpoint
 @app.websocket("/ws/{lobby_code}")
 async def websocket_endpoint(
@@ -312,6 +417,9 @@ async def websocket_endpoint(
     
     Connect with: ws://host/ws/{lobby_code}
     Authentication: Pass JWT token via Sec-WebSocket-Protocol header as 'auth.{token}'
+    Binary codec: Also offer '1v1bro.bin.v1' to receive hot messages as binary frames
+    Tick frames: Connect with ?frames=1 to receive each tick's events and state
+    as one tick_frame message
     
     Close codes:
     - 4001: Authentication required/invalid
@@ -353,8 +461,14 @@ async def websocket_endpoint(
     
     # Connect to lobby
     try:
-        # Accept with the auth subprotocol to complete the handshake
-        await manager.connect(websocket, lobby_code, user_id, subprotocol=f"auth.{token}")
+        # Accept with the auth (or binary codec) subprotocol to complete the handshake
+        await manager.connect(
+            websocket,
+            lobby_code,
+            user_id,
+            subprotocol=select_subprotocol(websocket, token),
+            tick_frames=websocket.query_params.get("frames") == "1",
+        )
         
         # Send initial lobby state and notify others
         try:
@@ -366,9 +480,12 @@ async def websocket_endpoint(
                 "payload": {"code": "CONNECT_ERROR", "message": str(e)}
             })
         
+        # Resolve lobby, opponents and queues once for the message loop
+        await handler.bind_context(websocket, lobby_code, user_id)
+        
         # Message loop
         while True:
-            data = await websocket.receive_json()
+            data = await manager.receive(websocket)
             await handler.handle_message(websocket, data, lobby_code, user_id)
             
     except WebSocketDisconnect:
@@ -376,3 +493,4 @@ async def websocket_endpoint(
         await handler.handle_disconnect(lobby_code, user_id)
     except Exception:
         manager.disconnect(websocket)
+        handler.release_context()
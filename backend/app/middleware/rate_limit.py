@@ -32,7 +32,7 @@ class RateLimitConfig:
 LOBBY_CREATE_LIMIT = RateLimitConfig(requests=5, window_seconds=60)
 LOBBY_JOIN_LIMIT = RateLimitConfig(requests=10, window_seconds=60)
 API_LIMIT = RateLimitConfig(requests=100, window_seconds=60)
-WS_MESSAGE_LIMIT = RateLimitConfig(requests=60, window_seconds=1)
+WS_MESSAGE_LIMIT = RateLimitConfig(requests=120, window_seconds=1)  # Cost units; a 60Hz position stream costs 60
 
 # Per-endpoint category limits (Requirements 1.3, 7.2)
 AUTH_LIMIT = RateLimitConfig(requests=10, window_seconds=60)  # 10/min for auth
@@ -171,24 +171,26 @@ class MessageRateLimiter:
     """
     Specialized rate limiter for high-frequency WebSocket messages.
     
-    Uses a simpler per-second counter for efficiency.
+    Uses a simpler per-second counter for efficiency. Messages may cost
+    more than one unit (see app.websocket.dispatch).
     """
     
     def __init__(self, max_per_second: int = 60):
         self._max = max_per_second
-        self._counts: Dict[str, tuple] = {}  # user_id -> (second, count)
+        self._counts: Dict[str, tuple] = {}  # user_id -> (second, count, dropped)
         self._lock = Lock()
         
         # Stats
         self._total = 0
         self._blocked = 0
     
-    def check(self, user_id: str) -> bool:
+    def check(self, user_id: str, cost: int = 1) -> bool:
         """
         Check if a message is allowed.
         
         Args:
             user_id: User identifier
+            cost: Units the message uses of the per-second budget
             
         Returns:
             True if allowed, False if rate limited
@@ -198,21 +200,26 @@ class MessageRateLimiter:
         with self._lock:
             self._total += 1
             
-            last_second, count = self._counts.get(user_id, (now, 0))
+            last_second, count, dropped = self._counts.get(user_id, (now, 0, 0))
             
-            # New second - reset counter
+            # New second - reset counters
             if now != last_second:
-                self._counts[user_id] = (now, 1)
-                return True
+                count = dropped = 0
             
-            # Same second - check limit
-            if count >= self._max:
+            # Check limit
+            if count + cost > self._max:
+                self._counts[user_id] = (now, count, dropped + 1)
                 self._blocked += 1
                 return False
             
-            self._counts[user_id] = (last_second, count + 1)
+            self._counts[user_id] = (now, count + cost, dropped)
             return True
     
+    def dropped(self, user_id: str) -> int:
+        """Messages blocked for a user in the second of their last check."""
+        with self._lock:
+            return self._counts.get(user_id, (0, 0, 0))[2]
+    
     def get_stats(self) -> dict:
         """Get message rate limiter statistics."""
         with self._lock:
@@ -225,7 +232,7 @@ class MessageRateLimiter:
 
 # Global instances
 rate_limiter = RateLimiter()
-message_rate_limiter = MessageRateLimiter()
+message_rate_limiter = MessageRateLimiter(max_per_second=WS_MESSAGE_LIMIT.requests)
 
 
 def check_rate_limit(key: str, config: RateLimitConfig) -> None:
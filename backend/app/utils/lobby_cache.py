@@ -4,11 +4,16 @@ Lobby Cache - TTL-based in-memory cache for lobby data.
 Reduces Supabase calls during gameplay by caching lobby lookups.
 Position updates happen at 60Hz per player - without caching, that's
 120 DB calls/second for a single game.
+
+Invalidation listeners (on_invalidate) hear about every lobby event that
+invalidates an entry, so state derived from the lobby elsewhere (the
+ConnectionContexts in app/websocket/context.py) can follow lobby
+events instead of a TTL.
 """
 
 import time
 from dataclasses import dataclass, field
-from typing import Optional, Dict
+from typing import Callable, Dict, List, Optional
 from threading import Lock
 
 from app.core.logging import get_logger
@@ -41,6 +46,8 @@ class LobbyCache:
         self._cache: Dict[str, CacheEntry] = {}
         self._ttl = ttl_seconds
         self._lock = Lock()
+        # Called with the upper-cased code on every invalidate
+        self._listeners: List[Callable[[str], None]] = []
         
         # Stats for monitoring
         self._hits = 0
@@ -93,9 +100,18 @@ class LobbyCache:
                 created_at=now,
             )
     
+    def on_invalidate(self, listener: Callable[[str], None]) -> None:
+        """
+        Register a callback for lobby invalidations.
+        
+        The listener runs outside the lock on every invalidate call,
+        whether or not the lobby was cached.
+        """
+        self._listeners.append(listener)
+    
     def invalidate(self, code: str) -> bool:
         """
-        Remove lobby from cache.
+        Remove lobby from cache and notify invalidation listeners.
         
         Args:
             code: Lobby code (case-insensitive)
@@ -106,12 +122,14 @@ class LobbyCache:
         code = code.upper()
         
         with self._lock:
-            if code in self._cache:
-                del self._cache[code]
+            removed = self._cache.pop(code, None) is not None
+            if removed:
                 self._invalidations += 1
                 logger.debug(f"Cache invalidated for lobby {code}")
-                return True
-            return False
+        
+        for listener in self._listeners:
+            listener(code)
+        return removed
     
     def get_stats(self) -> dict:
         """
@@ -0,0 +1,337 @@
+"""
+Binary wire codec for hot WebSocket messages.
+
+Single responsibility: pack/unpack high-frequency messages into compact
+fixed little-endian layouts.
+
+Negotiation: a client opts in by offering BINARY_PROTOCOL alongside its
+auth.{token} entry in Sec-WebSocket-Protocol. The server then accepts
+BINARY_PROTOCOL as the handshake subprotocol, and both sides may send
+binary frames. Text frames are still JSON in both directions. Messages
+without a binary layout, or whose payload doesn't match its layout
+exactly, fall back to JSON, so the codec never loses fields.
+
+Frame: 1-byte opcode followed by the layout's fields.
+A tick_frame packs each bundled message as a u32-length-prefixed inner
+frame; messages without a layout are carried as OP_JSON + UTF-8 JSON.
+Field kinds: s = u8-length UTF-8 string, f = float32, d = float64,
+h = int16, I = uint32.
+"""
+
+import json
+import struct
+from typing import Dict, List, Optional, Tuple
+
+BINARY_PROTOCOL = "1v1bro.bin.v1"
+
+# Opcodes (server -> client)
+OP_JSON = 0  # UTF-8 JSON message (only inside a tick_frame)
+OP_STATE_UPDATE = 1
+OP_POSITION_UPDATE = 2
+OP_COMBAT_FIRE = 3
+OP_COMBAT_HIT = 4
+OP_COMBAT_DEATH = 5
+OP_COMBAT_HEAL = 6
+OP_COMBAT_RESPAWN = 7
+OP_COMBAT_REGEN_START = 8
+OP_COMBAT_REGEN_STOP = 9
+OP_TICK_FRAME = 10
+
+# Opcodes (client -> server)
+OP_INPUT_POSITION = 64
+OP_INPUT_FIRE = 65
+OP_INPUT_STATE_ACK = 66
+
+# Flat layouts: message type -> (opcode, [(field, kind), ...])
+Layout = Tuple[int, List[Tuple[str, str]]]
+
+SERVER_LAYOUTS: Dict[str, Layout] = {
+    "position_update": (OP_POSITION_UPDATE, [("player_id", "s"), ("x", "f"), ("y", "f")]),
+    "combat_fire": (OP_COMBAT_FIRE, [
+        ("projectile_id", "s"), ("owner_id", "s"),
+        ("x", "f"), ("y", "f"), ("vx", "f"), ("vy", "f"),
+    ]),
+    "combat_hit": (OP_COMBAT_HIT, [
+        ("target_id", "s"), ("shooter_id", "s"),
+        ("damage", "h"), ("base_damage", "h"), ("health_remaining", "f"),
+    ]),
+    "combat_death": (OP_COMBAT_DEATH, [("victim_id", "s"), ("killer_id", "s")]),
+    "combat_heal": (OP_COMBAT_HEAL, [
+        ("player_id", "s"), ("amount", "h"), ("health", "h"), ("source", "s"),
+    ]),
+    "combat_respawn": (OP_COMBAT_RESPAWN, [
+        ("player_id", "s"), ("x", "f"), ("y", "f"), ("invulnerable_until", "d"),
+    ]),
+    "combat_regen_start": (OP_COMBAT_REGEN_START, [("player_id", "s")]),
+    "combat_regen_stop": (OP_COMBAT_REGEN_STOP, [("player_id", "s")]),
+}
+
+CLIENT_LAYOUTS: Dict[str, Layout] = {
+    "position_update": (OP_INPUT_POSITION, [
+        ("x", "f"), ("y", "f"), ("dx", "f"), ("dy", "f"), ("seq", "I"),
+    ]),
+    "combat_fire": (OP_INPUT_FIRE, [("dx", "f"), ("dy", "f"), ("seq", "I")]),
+    "state_ack": (OP_INPUT_STATE_ACK, [("tick", "I")]),
+}
+
+_BOOL_FLAGS = ("is_dead", "invulnerable", "is_regenerating")
+_STATE_PLAYER_KEYS = {"x", "y", "vx", "vy", "seq"}
+_PROJECTILE_KEYS = {"id", "owner_id", "x", "y", "vx", "vy"}
+_HEALTH_KEYS = {"health", "max_health"} | set(_BOOL_FLAGS)
+
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_STATE_HEADER = struct.Struct("<BId")
+_FRAME_HEADER = struct.Struct("<BIH")
+_PLAYER = struct.Struct("<4fI")
+_VEC4 = struct.Struct("<4f")
+_HEALTH = struct.Struct("<hHB")
+_KIND_STRUCTS = {kind: struct.Struct("<" + kind) for kind in "fdhI"}
+
+
+class CodecError(ValueError):
+    """Malformed binary frame."""
+
+
+def _compile(layouts: Dict[str, Layout]) -> Tuple[dict, dict]:
+    """Pre-build per-type encoders and per-opcode decoders."""
+    by_type = {}
+    by_opcode = {}
+    for msg_type, (opcode, fields) in layouts.items():
+        entry = (msg_type, opcode, fields, frozenset(name for name, _ in fields))
+        by_type[msg_type] = entry
+        by_opcode[opcode] = entry
+    return by_type, by_opcode
+
+
+_SERVER_BY_TYPE, _SERVER_BY_OPCODE = _compile(SERVER_LAYOUTS)
+_CLIENT_BY_TYPE, _CLIENT_BY_OPCODE = _compile(CLIENT_LAYOUTS)
+
+
+def _pack_str(out: bytearray, value: str) -> None:
+    raw = value.encode("utf-8")
+    if len(raw) > 255:
+        raise OverflowError("string too long for u8 length")
+    out += _U8.pack(len(raw))
+    out += raw
+
+
+def _unpack_str(data: bytes, offset: int) -> Tuple[str, int]:
+    length = data[offset]
+    end = offset + 1 + length
+    return data[offset + 1:end].decode("utf-8"), end
+
+
+def _encode_flat(entry: tuple, payload: dict) -> Optional[bytes]:
+    _, opcode, fields, keys = entry
+    if payload.keys() != keys:
+        return None
+    out = bytearray(_U8.pack(opcode))
+    for name, kind in fields:
+        value = payload[name]
+        if kind == "s":
+            if not isinstance(value, str):
+                return None
+            _pack_str(out, value)
+        else:
+            if value is None or isinstance(value, bool):
+                return None
+            out += _KIND_STRUCTS[kind].pack(value)
+    return bytes(out)
+
+
+def _decode_flat(entry: tuple, data: bytes) -> dict:
+    msg_type, _, fields, _ = entry
+    payload = {}
+    offset = 1
+    for name, kind in fields:
+        if kind == "s":
+            payload[name], offset = _unpack_str(data, offset)
+        else:
+            fmt = _KIND_STRUCTS[kind]
+            payload[name] = fmt.unpack_from(data, offset)[0]
+            offset += fmt.size
+    return {"type": msg_type, "payload": payload}
+
+
+def _encode_state(payload: dict) -> Optional[bytes]:
+    """state_update: players, projectiles and health packed; the rest as JSON."""
+    players = payload.get("players")
+    combat = payload.get("combat")
+    if not isinstance(players, dict) or not isinstance(payload.get("tick"), int):
+        return None
+    if combat is not None and combat.keys() != {"projectiles", "players"}:
+        return None
+
+    out = bytearray(_STATE_HEADER.pack(OP_STATE_UPDATE, payload["tick"], payload["timestamp"]))
+
+    out += _U16.pack(len(players))
+    for pid, p in players.items():
+        if p.keys() != _STATE_PLAYER_KEYS:
+            return None
+        _pack_str(out, pid)
+        out += _PLAYER.pack(p["x"], p["y"], p["vx"], p["vy"], p["seq"])
+
+    if combat is None:
+        out += _U8.pack(0)
+    else:
+        out += _U8.pack(1)
+        projectiles = combat["projectiles"]
+        out += _U16.pack(len(projectiles))
+        for proj in projectiles:
+            if proj.keys() != _PROJECTILE_KEYS:
+                return None
+            _pack_str(out, proj["id"])
+            _pack_str(out, proj["owner_id"])
+            out += _VEC4.pack(proj["x"], proj["y"], proj["vx"], proj["vy"])
+        health = combat["players"]
+        out += _U16.pack(len(health))
+        for pid, h in health.items():
+            if h.keys() != _HEALTH_KEYS:
+                return None
+            flags = 0
+            for bit, flag in enumerate(_BOOL_FLAGS):
+                if h[flag]:
+                    flags |= 1 << bit
+            _pack_str(out, pid)
+            out += _HEALTH.pack(h["health"], h["max_health"], flags)
+
+    rest = {k: v for k, v in payload.items() if k not in ("tick", "timestamp", "players", "combat")}
+    raw = json.dumps(rest, separators=(",", ":")).encode("utf-8") if rest else b""
+    out += _U32.pack(len(raw))
+    out += raw
+    return bytes(out)
+
+
+def _decode_state(data: bytes) -> dict:
+    _, tick, timestamp = _STATE_HEADER.unpack_from(data, 0)
+    offset = _STATE_HEADER.size
+    payload = {"tick": tick, "timestamp": timestamp}
+
+    (count,) = _U16.unpack_from(data, offset)
+    offset += 2
+    players = {}
+    for _ in range(count):
+        pid, offset = _unpack_str(data, offset)
+        x, y, vx, vy, seq = _PLAYER.unpack_from(data, offset)
+        offset += _PLAYER.size
+        players[pid] = {"x": x, "y": y, "vx": vx, "vy": vy, "seq": seq}
+    payload["players"] = players
+
+    has_combat = data[offset]
+    offset += 1
+    if has_combat:
+        (count,) = _U16.unpack_from(data, offset)
+        offset += 2
+        projectiles = []
+        for _ in range(count):
+            proj_id, offset = _unpack_str(data, offset)
+            owner_id, offset = _unpack_str(data, offset)
+            x, y, vx, vy = _VEC4.unpack_from(data, offset)
+            offset += _VEC4.size
+            projectiles.append({"id": proj_id, "owner_id": owner_id, "x": x, "y": y, "vx": vx, "vy": vy})
+        (count,) = _U16.unpack_from(data, offset)
+        offset += 2
+        health = {}
+        for _ in range(count):
+            pid, offset = _unpack_str(data, offset)
+            hp, max_hp, flags = _HEALTH.unpack_from(data, offset)
+            offset += _HEALTH.size
+            entry = {"health": hp, "max_health": max_hp}
+            for bit, flag in enumerate(_BOOL_FLAGS):
+                entry[flag] = bool(flags & (1 << bit))
+            health[pid] = entry
+        payload["combat"] = {"projectiles": projectiles, "players": health}
+
+    (length,) = _U32.unpack_from(data, offset)
+    offset += 4
+    if length:
+        payload.update(json.loads(data[offset:offset + length]))
+    return {"type": "state_update", "payload": payload}
+
+
+def _encode_tick_frame(payload: dict) -> bytes:
+    """tick_frame: each bundled message as a length-prefixed frame (JSON if no layout)."""
+    messages = payload["messages"]
+    out = bytearray(_FRAME_HEADER.pack(OP_TICK_FRAME, payload["tick"], len(messages)))
+    for message in messages:
+        inner = encode(message)
+        if inner is None:
+            inner = _U8.pack(OP_JSON) + json.dumps(message, separators=(",", ":")).encode("utf-8")
+        out += _U32.pack(len(inner))
+        out += inner
+    return bytes(out)
+
+
+def _decode_tick_frame(data: bytes) -> dict:
+    _, tick, count = _FRAME_HEADER.unpack_from(data, 0)
+    offset = _FRAME_HEADER.size
+    messages = []
+    for _ in range(count):
+        (length,) = _U32.unpack_from(data, offset)
+        offset += 4
+        inner = data[offset:offset + length]
+        offset += length
+        if len(inner) != length:
+            raise CodecError("truncated tick_frame")
+        if inner[0] == OP_JSON:
+            messages.append(json.loads(inner[1:]))
+        else:
+            messages.append(decode(inner, client=False))
+    return {"type": "tick_frame", "payload": {"tick": tick, "messages": messages}}
+
+
+def encode(message: dict, client: bool = False) -> Optional[bytes]:
+    """
+    Encode a message as a binary frame.
+
+    Returns None when the message has no binary layout or doesn't fit
+    it; the caller then sends JSON. client=True uses the client->server
+    layouts (for clients and tests).
+    """
+    msg_type = message.get("type")
+    payload = message.get("payload")
+    if not isinstance(payload, dict):
+        return None
+    try:
+        if not client and msg_type == "state_update":
+            return _encode_state(payload)
+        if not client and msg_type == "tick_frame":
+            return _encode_tick_frame(payload)
+        entry = (_CLIENT_BY_TYPE if client else _SERVER_BY_TYPE).get(msg_type)
+        if entry is None:
+            return None
+        return _encode_flat(entry, payload)
+    except (struct.error, OverflowError, TypeError, KeyError, UnicodeEncodeError):
+        return None
+
+
+def decode(data: bytes, client: bool = True) -> dict:
+    """
+    Decode a binary frame into a {type, payload} message.
+
+    client=True (the server's inbound path) decodes client->server
+    frames; client=False decodes server->client frames.
+    """
+    if not data:
+        raise CodecError("empty frame")
+    opcode = data[0]
+    try:
+        if not client and opcode == OP_STATE_UPDATE:
+            return _decode_state(data)
+        if not client and opcode == OP_TICK_FRAME:
+            return _decode_tick_frame(data)
+        entry = (_CLIENT_BY_OPCODE if client else _SERVER_BY_OPCODE).get(opcode)
+        if entry is None:
+            raise CodecError(f"unknown opcode {opcode}")
+        return _decode_flat(entry, data)
+    except (struct.error, IndexError, UnicodeDecodeError, ValueError) as e:
+        if isinstance(e, CodecError):
+            raise
+        raise CodecError(f"malformed frame for opcode {opcode}: {e}") from e
+
+
+def offered_protocols(header: str) -> List[str]:
+    """Split a Sec-WebSocket-Protocol header into protocol names."""
+    return [p.strip() for p in header.split(",") if p.strip()]
@@ -0,0 +1,187 @@
+"""
+Per-connection context for player WebSocket connections.
+
+Single responsibility: resolve what a player connection's message
+handlers need - the user, the lobby, the opponents, the game session and
+the outbound send queues - once when /ws/{lobby_code} is accepted, so
+per-message handling reads attributes instead of awaiting a lobby lookup.
+
+Contexts follow lobby events rather than a TTL: every LobbyCache
+invalidation (join, ready, start, leave, complete) marks the lobby's
+contexts stale, and a stale context re-reads the lobby once, on its
+connection's next message.
+
+Peers (the opponents' bound contexts) are relinked whenever a context
+in the lobby is bound, refreshed or released, so a broadcast to the
+opponents is a manager.post over queues already in hand.
+
+Usage:
+    context = await connection_contexts.bind(websocket, lobby_code, user_id, lobby_service, game_service)
+    manager.post(context.peers, message)
+    connection_contexts.release(context)
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from fastapi import WebSocket
+
+from app.core.logging import get_logger
+from app.services.game.session import GameSession
+from app.utils.lobby_cache import lobby_cache
+from app.websocket.manager import manager
+from app.websocket.send_queue import SendQueue
+
+logger = get_logger("websocket.context")
+
+
+@dataclass(slots=True, eq=False)
+class ConnectionContext:
+    """Lobby, opponents, game session and send queues of one player connection."""
+    websocket: WebSocket
+    lobby_code: str
+    user_id: str
+    queue: Optional[SendQueue]  # This connection's outbound queue
+    lobby_service: object
+    game_service: object
+    lobby: dict = field(default_factory=dict)
+    lobby_id: Optional[str] = None
+    opponent_ids: Tuple[str, ...] = ()
+    peers: Tuple["ConnectionContext", ...] = ()  # Bound contexts of the opponents
+    stale: bool = True  # Lobby changed since it was read; refresh before use
+    _game: Optional[GameSession] = None
+
+    @property
+    def game(self) -> Optional[GameSession]:
+        """The lobby's game session, kept once it exists."""
+        game = self._game
+        if game is None and self.lobby_id is not None:
+            game = self._game = self.game_service.get_session(self.lobby_id)
+        return game
+
+    def apply(self, lobby: dict) -> None:
+        """Take lobby, opponents and (lazily) the game session from a lobby dict."""
+        self.lobby = lobby
+        self.lobby_id = lobby["id"]
+        self.opponent_ids = tuple(
+            player_id
+            for player_id in (lobby.get("host_id"), lobby.get("opponent_id"))
+            if player_id and player_id != self.user_id
+        )
+        self._game = None
+
+
+class ConnectionContextRegistry:
+    """Bound contexts by lobby code and user, invalidated by lobby events."""
+
+    def __init__(self):
+        # lobby_code -> user_id -> context
+        self._lobbies: Dict[str, Dict[str, ConnectionContext]] = {}
+        self._refreshes = 0
+        self._failed_refreshes = 0
+        self._invalidations = 0
+
+    async def bind(
+        self,
+        websocket: WebSocket,
+        lobby_code: str,
+        user_id: str,
+        lobby_service,
+        game_service,
+    ) -> ConnectionContext:
+        """
+        Create and register the context of a newly accepted connection.
+
+        A reconnect replaces the user's previous context. If the lobby
+        cannot be read, the context stays stale and handlers fall back
+        to their own lookups until a refresh succeeds.
+        """
+        context = ConnectionContext(
+            websocket, lobby_code, user_id, manager.get_queue(websocket), lobby_service, game_service,
+        )
+        self._lobbies.setdefault(lobby_code, {})[user_id] = context
+        if not await self.refresh(context):
+            self._link(lobby_code)
+        return context
+
+    async def refresh(self, context: ConnectionContext) -> bool:
+        """
+        Re-read a context's lobby (through the lobby cache).
+
+        Returns:
+            True if the context is current
+        """
+        context.stale = False  # An invalidation during the read marks it again
+        try:
+            lobby = await context.lobby_service.get_lobby(context.lobby_code)
+        except Exception as e:
+            context.stale = True
+            self._failed_refreshes += 1
+            logger.warning(f"Could not refresh context of {context.user_id} in {context.lobby_code}: {e}")
+            return False
+        context.apply(lobby)
+        self._refreshes += 1
+        self._link(context.lobby_code)
+        return True
+
+    def release(self, context: ConnectionContext) -> None:
+        """Unregister a context whose connection has closed."""
+        contexts = self._lobbies.get(context.lobby_code)
+        if contexts is None or contexts.get(context.user_id) is not context:
+            return  # Already replaced by a reconnect
+        del contexts[context.user_id]
+        if contexts:
+            self._link(context.lobby_code)
+        else:
+            del self._lobbies[context.lobby_code]
+
+    def invalidate(self, lobby_code: str) -> int:
+        """
+        Mark a lobby's contexts stale (LobbyCache invalidation listener).
+
+        Returns:
+            Number of contexts marked
+        """
+        contexts = self._lobbies.get(lobby_code.upper())
+        if not contexts:
+            return 0
+        for context in contexts.values():
+            context.stale = True
+        self._invalidations += 1
+        return len(contexts)
+
+    def get(self, lobby_code: str, user_id: str) -> Optional[ConnectionContext]:
+        """Get a user's bound context in a lobby."""
+        return self._lobbies.get(lobby_code, {}).get(user_id)
+
+    def _link(self, lobby_code: str) -> None:
+        contexts = self._lobbies.get(lobby_code, {})
+        for context in contexts.values():
+            context.peers = tuple(
+                contexts[player_id] for player_id in context.opponent_ids if player_id in contexts
+            )
+
+    def get_stats(self) -> dict:
+        """
+        Get context metrics for monitoring.
+
+        Returns:
+            Dict with bound contexts, lobbies, stale contexts, refreshes and invalidations
+        """
+        contexts = [c for lobby in self._lobbies.values() for c in lobby.values()]
+        return {
+            "contexts": len(contexts),
+            "lobbies": len(self._lobbies),
+            "stale": sum(1 for c in contexts if c.stale),
+            "refreshes": self._refreshes,
+            "failed_refreshes": self._failed_refreshes,
+            "invalidations": self._invalidations,
+        }
+
+    def clear(self) -> None:
+        self._lobbies.clear()
+
+
+# Global connection context registry, following lobby cache invalidations
+connection_contexts = ConnectionContextRegistry()
+lobby_cache.on_invalidate(connection_contexts.invalidate)
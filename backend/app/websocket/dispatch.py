@@ -0,0 +1,195 @@
+"""
+Table-driven WebSocket message dispatch.
+
+Single responsibility: route an incoming message to its handler through
+one dict lookup, applying the message type's metadata on the way -
+payload schema, rate cost against the sender's per-second budget, and
+how (and how often) receipt is logged. Only types given a cost (the
+high-frequency gameplay stream) are throttled; game-flow messages such as
+answers and kills are free, so a burst of buffered input cannot drop them. A sender over budget gets one
+RATE_LIMITED error per second; the rest of that second's drops are silent.
+
+Per-type counters and handler latency are process-wide (message_stats),
+since GameHandler, and so the route table, exists once per connection.
+
+Hot types (position updates, fire) log receipt at most once per
+log_every_s, with a count of the messages not logged since; everything
+else logs each message as before.
+
+Usage:
+    dispatcher = MessageDispatcher({"ping": MessageRoute(pong, cost=0, log_level=None)})
+    await dispatcher.dispatch(websocket, message, lobby_code, user_id)
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple
+
+from fastapi import WebSocket
+
+from app.core.logging import get_logger
+from app.middleware.rate_limit import MessageRateLimiter, message_rate_limiter
+from app.websocket.events import build_error
+from app.websocket.manager import manager
+
+logger = get_logger("websocket.handlers")
+
+# (websocket, lobby_code, user_id, payload)
+RouteHandler = Callable[[WebSocket, str, str, dict], Awaitable[None]]
+
+NUMBER = (int, float)
+LIMITED_LOG_EVERY = 100  # Log the first rate-limited drop of a type, then every Nth
+
+
+@dataclass(frozen=True, slots=True)
+class MessageRoute:
+    """Handler and metadata for one message type."""
+    handler: RouteHandler
+    schema: Mapping[str, Tuple[type, ...]] = field(default_factory=dict)  # Payload field -> accepted types, checked when present
+    cost: int = 0  # Units of the sender's per-second message budget (0 = never throttled)
+    log_level: Optional[int] = logging.INFO  # Level of the "received" line (None = never logged)
+    log_every_s: float = 0.0  # Log receipt at most once per interval (0 = every message)
+
+
+@dataclass(slots=True)
+class _TypeStats:
+    received: int = 0
+    rejected: int = 0  # Payload failed the schema
+    limited: int = 0  # Over the sender's budget, dropped
+    errors: int = 0  # Handler raised
+    handler_s: float = 0.0
+    max_handler_s: float = 0.0
+    logged_at: float = float("-inf")
+    unlogged: int = 0  # Received since the last sampled log line
+
+
+class MessageStats:
+    """Process-wide per-type message counters, latency and log sampling."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._types: Dict[str, _TypeStats] = {}
+
+    def get(self, msg_type: str) -> _TypeStats:
+        stats = self._types.get(msg_type)
+        if stats is None:
+            stats = self._types[msg_type] = _TypeStats()
+        return stats
+
+    def sample_log(self, stats: _TypeStats, every_s: float) -> Optional[int]:
+        """Messages skipped since the last logged one, or None if this one is not logged."""
+        if every_s <= 0:
+            return 0
+        now = self._clock()
+        if now - stats.logged_at < every_s:
+            stats.unlogged += 1
+            return None
+        skipped = stats.unlogged
+        stats.logged_at = now
+        stats.unlogged = 0
+        return skipped
+
+    def get_stats(self) -> dict:
+        """
+        Get per-type message metrics for monitoring.
+
+        Returns:
+            Dict of message type -> counts and mean/max handler latency
+        """
+        result = {}
+        for msg_type, s in self._types.items():
+            handled = s.received - s.rejected - s.limited
+            result[msg_type] = {
+                "received": s.received,
+                "rejected": s.rejected,
+                "limited": s.limited,
+                "errors": s.errors,
+                "mean_handler_ms": round(s.handler_s / handled * 1000, 3) if handled else 0.0,
+                "max_handler_ms": round(s.max_handler_s * 1000, 3),
+            }
+        return result
+
+    def reset(self) -> None:
+        self._types.clear()
+
+
+class MessageDispatcher:
+    """Routes messages by type through a route table."""
+
+    def __init__(
+        self,
+        routes: Dict[str, MessageRoute],
+        limiter: MessageRateLimiter = message_rate_limiter,
+        stats: Optional[MessageStats] = None,
+    ):
+        self.routes = routes
+        self._limiter = limiter
+        self._stats = stats or message_stats
+
+    async def dispatch(self, websocket: WebSocket, message: dict, lobby_code: str, user_id: str) -> None:
+        """Validate, budget, log and run the handler for one message."""
+        msg_type = message.get("type")
+        payload = message.get("payload", {})
+        route = self.routes.get(msg_type)
+        stats = self._stats.get(msg_type if route else "unknown")
+        stats.received += 1
+
+        if route is None:
+            logger.info(f"[WS] Unknown message type={msg_type} from user={user_id}")
+            await manager.send_personal(
+                websocket, build_error("UNKNOWN_MESSAGE", f"Unknown message type: {msg_type}")
+            )
+            return
+
+        if route.cost and not self._limiter.check(user_id, route.cost):
+            stats.limited += 1
+            if stats.limited % LIMITED_LOG_EVERY == 1:
+                logger.warning(f"[WS] Rate limited type={msg_type} from user={user_id} ({stats.limited} dropped)")
+            if self._limiter.dropped(user_id) == 1:
+                await manager.send_personal(
+                    websocket, build_error("RATE_LIMITED", f"Too many messages; {msg_type} dropped")
+                )
+            return
+
+        problem = self._check_payload(route, payload) if route.schema else None
+        if problem:
+            stats.rejected += 1
+            await manager.send_personal(
+                websocket, build_error("INVALID_PAYLOAD", f"Invalid {msg_type} payload: {problem}")
+            )
+            return
+
+        if route.log_level is not None and logger.isEnabledFor(route.log_level):
+            skipped = self._stats.sample_log(stats, route.log_every_s)
+            if skipped is not None:
+                more = f" (+{skipped} since last logged)" if skipped else ""
+                logger.log(route.log_level, f"[WS] Received message type={msg_type} from user={user_id}{more}")
+
+        start = time.perf_counter()
+        try:
+            await route.handler(websocket, lobby_code, user_id, payload)
+        except Exception as e:
+            stats.errors += 1
+            logger.error(f"Error handling message: {e}")
+            await manager.send_personal(websocket, build_error("HANDLER_ERROR", str(e)))
+        finally:
+            elapsed = time.perf_counter() - start
+            stats.handler_s += elapsed
+            if elapsed > stats.max_handler_s:
+                stats.max_handler_s = elapsed
+
+    @staticmethod
+    def _check_payload(route: MessageRoute, payload: Any) -> Optional[str]:
+        """Reason the payload does not fit the route's schema, or None."""
+        if not isinstance(payload, dict):
+            return "payload must be an object"
+        for name, types in route.schema.items():
+            value = payload.get(name)
+            if value is not None and not isinstance(value, types):
+                return f"{name} must be {' or '.join(t.__name__ for t in types)}"
+        return None
+
+
+# Global message stats instance
+message_stats = MessageStats()
@@ -72,9 +72,18 @@ class WSEventType(str, Enum):
     BARRIER_DAMAGED = "barrier_damaged"
     BARRIER_DESTROYED = "barrier_destroyed"
     
+    # Authoritative state sync
+    STATE_UPDATE = "state_update"  # Server -> Client (full keyframe)
+    STATE_DELTA = "state_delta"  # Server -> Client (delta vs acked tick)
+    STATE_ACK = "state_ack"  # Client -> Server
+    TICK_FRAME = "tick_frame"  # Server -> Client (bundled events + state)
+    
     # Buff events (Server -> Client)
     BUFF_APPLIED = "buff_applied"
     BUFF_EXPIRED = "buff_expired"
+    
+    # Spectators (Server -> Client)
+    SPECTATING = "spectating"  # Accepted; carries the snapshot interval and delay
 
 
 def build_message(event_type: WSEventType, payload: Optional[Dict] = None) -> Dict:
@@ -3,10 +3,13 @@ Arena-related WebSocket handlers.
 """
 
 import time
+from typing import Optional
 from app.core.logging import get_logger
 from app.game import tick_system
-from app.game.models import PlayerInput
-from .base import BaseHandler
+from app.game.models import INPUT_POOL
+from app.websocket.context import ConnectionContext
+from app.websocket.events import WSEventType
+from .base import BaseHandler, number
 
 logger = get_logger("websocket.handlers.arena")
 
@@ -14,19 +17,33 @@ logger = get_logger("websocket.handlers.arena")
 class ArenaHandler(BaseHandler):
     """Handles arena events (position, hazards, traps, transport)."""
 
-    async def handle_position_update(self, lobby_code: str, user_id: str, payload: dict) -> None:
-        """Handle player position update with tick system integration."""
-        x = payload.get("x", 0)
-        y = payload.get("y", 0)
-        dx = payload.get("dx", 0)
-        dy = payload.get("dy", 0)
-        seq = payload.get("seq", 0)
+    async def handle_position_update(
+        self,
+        lobby_code: str,
+        user_id: str,
+        payload: dict,
+        context: Optional[ConnectionContext] = None,
+    ) -> None:
+        """
+        Handle player position update with tick system integration.
+        
+        With a current connection context nothing is awaited: the game
+        session and the opponents' send queues come from the context.
+        """
+        x = number(payload.get("x"))
+        y = number(payload.get("y"))
+        dx = number(payload.get("dx"))
+        dy = number(payload.get("dy"))
+        seq = number(payload.get("seq"))
 
-        lobby = await self.get_lobby(lobby_code)
-        lobby_id = lobby["id"]
+        if context is not None:
+            session = context.game
+        else:
+            lobby = await self.get_lobby(lobby_code)
+            session = self.game_service.get_session(lobby["id"])
 
         # Queue input for tick system
-        player_input = PlayerInput(
+        player_input = INPUT_POOL.acquire(
             player_id=user_id,
             x=x,
             y=y,
@@ -38,21 +55,22 @@ class ArenaHandler(BaseHandler):
         tick_system.queue_input(lobby_code, player_input)
 
         # Update game service state
-        session = self.game_service.get_session(lobby_id)
         if session and user_id in session.player_states:
             session.player_states[user_id].position_x = x
             session.player_states[user_id].position_y = y
 
         # Broadcast to other players
-        from app.websocket.events import WSEventType
-        await self.manager.broadcast_to_lobby(
-            lobby_code,
-            {
-                "type": WSEventType.POSITION_UPDATE.value,
-                "payload": {"player_id": user_id, "x": x, "y": y}
-            },
-            exclude_user_id=user_id,
-        )
+        message = {
+            "type": WSEventType.POSITION_UPDATE.value,
+            "payload": {"player_id": user_id, "x": x, "y": y}
+        }
+        key = f"position_update:{user_id}"
+        if context is not None:
+            self.manager.post(context.peers, message, coalesce_key=key)
+        else:
+            await self.manager.broadcast_to_lobby(
+                lobby_code, message, exclude_user_id=user_id, coalesce_key=key,
+            )
 
     async def handle_arena_init(self, lobby_code: str, user_id: str, payload: dict) -> None:
         """Handle arena config initialization from host client."""
@@ -61,8 +79,9 @@ class ArenaHandler(BaseHandler):
             return
 
         arena_config = payload.get("config", {})
-        if arena_config:
-            tick_system.init_arena_config(lobby_code, arena_config)
+        if arena_config and tick_system.init_arena_config(
+            lobby_code, arena_config, lobby.get("map_slug")
+        ):
             logger.info(f"Initialized arena config for {lobby_code}")
 
     async def broadcast_arena_state(self, lobby_code: str) -> None:
@@ -12,6 +12,11 @@ from app.websocket.events import build_error
 logger = get_logger("websocket.handlers")
 
 
+def number(value, default=0):
+    """A payload value if it is a number, else default (explicit nulls pass the route schema)."""
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else default
+
+
 class BaseHandler:
     """Base class for domain-specific handlers."""
 
@@ -3,11 +3,13 @@ Combat-related WebSocket handlers.
 """
 
 import time
+from typing import Optional
 from app.core.logging import get_logger
 from app.game import tick_system
 from app.game.models import FireInput
 from app.utils.combat_tracker import CombatTracker
-from .base import BaseHandler
+from app.websocket.context import ConnectionContext
+from .base import BaseHandler, number
 
 logger = get_logger("websocket.handlers.combat")
 
@@ -17,9 +19,9 @@ class CombatHandler(BaseHandler):
 
     async def handle_fire(self, lobby_code: str, user_id: str, payload: dict) -> None:
         """Handle fire event - queue for server-authoritative processing."""
-        direction_x = payload.get("dx", 0)
-        direction_y = payload.get("dy", 0)
-        sequence = payload.get("seq", 0)
+        direction_x = number(payload.get("dx"))
+        direction_y = number(payload.get("dy"))
+        sequence = number(payload.get("seq"))
 
         fire_input = FireInput(
             player_id=user_id,
@@ -30,7 +32,13 @@ class CombatHandler(BaseHandler):
         )
         tick_system.queue_fire(lobby_code, fire_input)
 
-    async def handle_kill(self, lobby_code: str, user_id: str, payload: dict) -> None:
+    async def handle_kill(
+        self,
+        lobby_code: str,
+        user_id: str,
+        payload: dict,
+        context: Optional[ConnectionContext] = None,
+    ) -> None:
         """Handle kill event for stats tracking."""
         victim_id = payload.get("victim_id")
         weapon = payload.get("weapon", "projectile")
@@ -38,10 +46,16 @@ class CombatHandler(BaseHandler):
         if not victim_id:
             return
 
-        lobby = await self.get_lobby(lobby_code)
-        CombatTracker.record_kill(lobby["id"], user_id, victim_id, weapon)
+        lobby_id = context.lobby_id if context is not None else (await self.get_lobby(lobby_code))["id"]
+        CombatTracker.record_kill(lobby_id, user_id, victim_id, weapon)
 
-    async def handle_damage(self, lobby_code: str, user_id: str, payload: dict) -> None:
+    async def handle_damage(
+        self,
+        lobby_code: str,
+        user_id: str,
+        payload: dict,
+        context: Optional[ConnectionContext] = None,
+    ) -> None:
         """Handle damage event for stats tracking."""
         target_id = payload.get("target_id")
         amount = payload.get("amount", 0)
@@ -50,12 +64,18 @@ class CombatHandler(BaseHandler):
         if not target_id or amount <= 0:
             return
 
-        lobby = await self.get_lobby(lobby_code)
-        CombatTracker.record_damage(lobby["id"], user_id, target_id, amount, source)
+        lobby_id = context.lobby_id if context is not None else (await self.get_lobby(lobby_code))["id"]
+        CombatTracker.record_damage(lobby_id, user_id, target_id, amount, source)
 
-    async def handle_shot(self, lobby_code: str, user_id: str, payload: dict) -> None:
+    async def handle_shot(
+        self,
+        lobby_code: str,
+        user_id: str,
+        payload: dict,
+        context: Optional[ConnectionContext] = None,
+    ) -> None:
         """Handle shot event for stats tracking."""
         hit = payload.get("hit", False)
 
-        lobby = await self.get_lobby(lobby_code)
-        CombatTracker.record_shot(lobby["id"], user_id, hit)
+        lobby_id = context.lobby_id if context is not None else (await self.get_lobby(lobby_code))["id"]
+        CombatTracker.record_shot(lobby_id, user_id, hit)
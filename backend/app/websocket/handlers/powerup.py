@@ -2,10 +2,12 @@
 Power-up related WebSocket handlers.
 """
 
+from typing import Optional
 from app.core.logging import get_logger
 from app.services.powerup_service import powerup_service
 from app.schemas.ws_messages import PowerUpType
 from app.utils.combat_tracker import CombatTracker
+from app.websocket.context import ConnectionContext
 from app.websocket.events import WSEventType
 from .base import BaseHandler
 
@@ -15,14 +17,21 @@ logger = get_logger("websocket.handlers.powerup")
 class PowerUpHandler(BaseHandler):
     """Handles power-up collection and usage."""
 
-    async def handle_collect(self, lobby_code: str, user_id: str, payload: dict) -> None:
+    async def handle_collect(
+        self,
+        lobby_code: str,
+        user_id: str,
+        payload: dict,
+        context: Optional[ConnectionContext] = None,
+    ) -> None:
         """Handle power-up collection."""
         powerup_id = payload.get("powerup_id")
 
-        lobby = await self.get_lobby(lobby_code)
-        lobby_id = lobby["id"]
-
-        session = self.game_service.get_session(lobby_id)
+        if context is not None:
+            lobby_id, session = context.lobby_id, context.game
+        else:
+            lobby_id = (await self.get_lobby(lobby_code))["id"]
+            session = self.game_service.get_session(lobby_id)
         if not session or user_id not in session.player_states:
             return
 
@@ -50,14 +59,21 @@ class PowerUpHandler(BaseHandler):
                 }
             )
 
-    async def handle_use(self, lobby_code: str, user_id: str, payload: dict) -> None:
+    async def handle_use(
+        self,
+        lobby_code: str,
+        user_id: str,
+        payload: dict,
+        context: Optional[ConnectionContext] = None,
+    ) -> None:
         """Handle power-up usage."""
         powerup_type = payload.get("type")
 
-        lobby = await self.get_lobby(lobby_code)
-        lobby_id = lobby["id"]
-
-        session = self.game_service.get_session(lobby_id)
+        if context is not None:
+            lobby_id, session = context.lobby_id, context.game
+        else:
+            lobby_id = (await self.get_lobby(lobby_code))["id"]
+            session = self.game_service.get_session(lobby_id)
         if not session or user_id not in session.player_states:
             return
 
@@ -3,26 +3,38 @@ Quiz-related WebSocket handlers.
 """
 
 import asyncio
+from functools import partial
+from typing import Optional
+
 from app.core.config import get_settings
 from app.core.logging import get_logger
 from app.websocket.events import build_question, build_round_result, build_game_end
 from app.utils.helpers import get_timestamp_ms
 from app.game import tick_system
-from app.game.quiz_rewards import QuizRewardDispatcher
+from app.game.timers import DeadlineRunner
+from app.websocket.context import ConnectionContext
 from .base import BaseHandler
 
 settings = get_settings()
 logger = get_logger("websocket.handlers.quiz")
 
+# Question timeouts for every lobby, keyed by lobby id (one per lobby at a time)
+question_deadlines = DeadlineRunner()
+
 
 class QuizHandler(BaseHandler):
     """Handles quiz question/answer flow."""
 
-    async def handle_answer(self, lobby_code: str, user_id: str, payload: dict) -> None:
+    async def handle_answer(
+        self,
+        lobby_code: str,
+        user_id: str,
+        payload: dict,
+        context: Optional[ConnectionContext] = None,
+    ) -> None:
         """Handle answer submission from player."""
         try:
-            lobby = await self.get_lobby(lobby_code)
-            lobby_id = lobby["id"]
+            lobby_id = context.lobby_id if context is not None else (await self.get_lobby(lobby_code))["id"]
 
             q_num = payload.get("q_num")
             answer = payload.get("answer")
@@ -66,17 +78,17 @@ class QuizHandler(BaseHandler):
                 )
             )
 
-            asyncio.create_task(
-                self.check_timeout(lobby_code, lobby_id, q_num, start_time)
+            question_deadlines.call_later(
+                lobby_id,
+                settings.QUESTION_TIME_SECONDS + 1,
+                partial(self.check_timeout, lobby_code, lobby_id, q_num, start_time),
             )
 
         except Exception as e:
             logger.error(f"Error sending question: {e}")
 
     async def check_timeout(self, lobby_code: str, lobby_id: str, q_num: int, start_time: int) -> None:
-        """Check for answer timeout and process if needed."""
-        await asyncio.sleep(settings.QUESTION_TIME_SECONDS + 1)
-
+        """Process an answer timeout (fired by question_deadlines)."""
         session = self.game_service.get_session(lobby_id)
         if not session or session.current_question != q_num:
             return
@@ -97,12 +109,12 @@ class QuizHandler(BaseHandler):
         else:
             # Safety net: schedule another check in case something went wrong
             logger.warning(f"Both players still haven't answered Q{q_num} after timeout, scheduling retry")
-            asyncio.create_task(self.check_timeout_retry(lobby_code, lobby_id, q_num))
+            question_deadlines.call_later(
+                lobby_id, 5, partial(self.check_timeout_retry, lobby_code, lobby_id, q_num)
+            )
 
     async def check_timeout_retry(self, lobby_code: str, lobby_id: str, q_num: int) -> None:
-        """Retry timeout check after a delay - safety net for stuck games."""
-        await asyncio.sleep(5)  # Wait 5 more seconds
-        
+        """Force the round end 5s after a timeout that did not resolve - safety net for stuck games."""
         session = self.game_service.get_session(lobby_id)
         if not session or session.current_question != q_num:
             return  # Already moved on
@@ -136,11 +148,10 @@ class QuizHandler(BaseHandler):
             
             # Dispatch quiz rewards (combat buffs)
             # Note: tick_system uses lobby_code as key, not lobby_id
-            rewards = {}
-            game = tick_system._games.get(lobby_code)
-            if game and game.buff_manager:
-                dispatcher = QuizRewardDispatcher(game.buff_manager)
-                rewards = dispatcher.dispatch_for_round(result, settings.QUESTION_TIME_MS)
+            rewards = tick_system.dispatch_quiz_rewards(
+                lobby_code, result, settings.QUESTION_TIME_MS
+            )
+            if rewards:
                 logger.info(f"Quiz rewards dispatched: {rewards}")
 
             # Detect if this is the final question (Q15)
@@ -181,6 +192,7 @@ class QuizHandler(BaseHandler):
         logger.info(f"[GAME_END] Starting process_game_end for lobby_code={lobby_code}, lobby_id={lobby_id}")
         try:
             # Stop the arena tick system first
+            question_deadlines.cancel(lobby_id)
             tick_system.stop_game(lobby_code)
             logger.info(f"[GAME_END] Stopped tick system for: {lobby_code}")
             
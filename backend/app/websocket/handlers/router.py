@@ -3,15 +3,20 @@ WebSocket message router.
 Routes incoming messages to domain-specific handlers.
 """
 
-from typing import Optional
+from typing import Dict, Optional
 from fastapi import WebSocket
 
 from app.core.logging import get_logger
 from app.services.game_service import GameService
 from app.services.lobby_service import LobbyService
 from app.websocket.manager import manager
-from app.websocket.events import WSEventType, build_error
+from app.websocket.context import ConnectionContext, connection_contexts
+from app.websocket.dispatch import NUMBER, MessageDispatcher, MessageRoute
+from app.websocket.events import WSEventType
+from app.websocket.spectators import spectator_feed
 from app.game import tick_system
+from app.game.frames import TICK_FRAME, build_frame, split_frame
+from app.game.snapshots import snapshot_registry
 
 from .quiz import QuizHandler
 from .combat import CombatHandler
@@ -24,11 +29,57 @@ from .emote import EmoteHandler
 
 logger = get_logger("websocket.handlers")
 
+HOT_LOG_EVERY_S = 10.0  # Receipt of per-tick input types is logged at most this often
+
 
 # Wire up tick system broadcast callback
 async def _broadcast_tick_state(lobby_code: str, message: dict) -> None:
-    """Broadcast tick state update to all players in lobby."""
-    await manager.broadcast_to_lobby(lobby_code, message)
+    """
+    Broadcast a tick's messages to all players in lobby.
+    
+    Tick output arrives as a tick_frame (events + state_update) or, in
+    compat mode, as individual messages. The state_update is
+    delta-encoded per client against the client's last acked tick.
+    Frame-capable clients get one tick_frame; other clients get the
+    events and then the state as separate messages, in order.
+    Spectators are fed from the state by spectator_feed.
+    """
+    events, state = split_frame(message)
+    if state is not None:
+        spectator_feed.sample(lobby_code, state)
+    if state is None and message.get("type") != TICK_FRAME:
+        await manager.broadcast_to_lobby(lobby_code, message)
+        return
+    
+    users = manager.get_lobby_users(lobby_code)
+    groups = []
+    if state is not None:
+        groups = snapshot_registry.encode(lobby_code, state["payload"], users)
+    framed = {u for u in users if manager.wants_tick_frames(u)}
+    
+    if not framed and all(m["type"] == WSEventType.STATE_UPDATE.value for m, _ in groups):
+        # Legacy clients only and nobody has a usable ack: plain broadcasts
+        for event in events:
+            await manager.broadcast_to_lobby(lobby_code, event)
+        for state_message, _ in groups:
+            await manager.broadcast_to_lobby(lobby_code, state_message)
+        return
+    
+    legacy = [u for u in users if u not in framed]
+    if legacy:
+        for event in events:
+            await manager.send_to_users(legacy, event)
+    
+    tick = message["payload"]["tick"] if state is None else state["payload"]["tick"]
+    if not groups and framed:
+        await manager.send_to_users(list(framed), build_frame(tick, events))
+    for state_message, user_ids in groups:
+        framed_ids = [u for u in user_ids if u in framed]
+        legacy_ids = [u for u in user_ids if u not in framed]
+        if framed_ids:
+            await manager.send_to_users(framed_ids, build_frame(tick, events + [state_message]))
+        if legacy_ids:
+            await manager.send_to_users(legacy_ids, state_message)
 
 tick_system.set_broadcast_callback(_broadcast_tick_state)
 
@@ -37,7 +88,8 @@ class GameHandler:
     """
     Main WebSocket message router.
     
-    Routes messages to domain-specific handlers:
+    Routes messages through a MessageDispatcher route table (one lookup
+    per message, see dispatch.py) to domain-specific handlers:
     - QuizHandler: Questions, answers, rounds
     - CombatHandler: Fire, damage, kills
     - ArenaHandler: Position, hazards, traps
@@ -45,6 +97,10 @@ class GameHandler:
     - TelemetryHandler: Replay upload/flagging
     - LobbyHandler: Join, leave, ready, start
     - MatchmakingHandler: Queue join/leave
+    
+    One GameHandler serves one connection; its ConnectionContext (see
+    context.py) is bound after connect and handed to the hot handlers,
+    which then skip their per-message lobby lookups.
     """
 
     def __init__(self, lobby_service: LobbyService, game_service: GameService, cosmetics_service=None):
@@ -62,6 +118,9 @@ class GameHandler:
         self.lobby = LobbyHandler(lobby_service, game_service, self.quiz, cosmetics_service)
         self.emote = EmoteHandler(lobby_service, game_service)
 
+        self.context: Optional[ConnectionContext] = None
+        self.dispatcher = MessageDispatcher(self._routes())
+
     async def handle_message(
         self,
         websocket: WebSocket,
@@ -70,79 +129,106 @@ class GameHandler:
         user_id: str,
     ) -> None:
         """Route incoming message to appropriate handler."""
-        msg_type = message.get("type")
-        payload = message.get("payload", {})
-
-        if msg_type != "ping":
-            logger.info(f"[WS] Received message type={msg_type} from user={user_id}")
-
-        try:
-            # Ping/pong for latency
-            if msg_type == "ping":
-                await manager.send_personal(websocket, {"type": "pong", "payload": {}})
-                return
-
-            # Route to appropriate handler
-            if msg_type == WSEventType.START_GAME.value:
-                await self.lobby.handle_start_game(lobby_code, user_id)
-
-            elif msg_type == WSEventType.ANSWER.value:
-                await self.quiz.handle_answer(lobby_code, user_id, payload)
-
-            elif msg_type == "request_resync":
-                await self.quiz.handle_resync_request(lobby_code, user_id, payload)
-
-            elif msg_type == WSEventType.READY.value:
-                await self.lobby.handle_ready(lobby_code, user_id)
-
-            elif msg_type == WSEventType.POSITION_UPDATE.value:
-                await self.arena.handle_position_update(lobby_code, user_id, payload)
-
-            elif msg_type == "arena_init":
-                await self.arena.handle_arena_init(lobby_code, user_id, payload)
-
-            elif msg_type == "combat_fire":
-                await self.combat.handle_fire(lobby_code, user_id, payload)
-
-            elif msg_type == WSEventType.COMBAT_KILL.value:
-                await self.combat.handle_kill(lobby_code, user_id, payload)
-
-            elif msg_type == WSEventType.COMBAT_DAMAGE.value:
-                await self.combat.handle_damage(lobby_code, user_id, payload)
-
-            elif msg_type == WSEventType.COMBAT_SHOT.value:
-                await self.combat.handle_shot(lobby_code, user_id, payload)
-
-            elif msg_type == WSEventType.POWERUP_COLLECTED.value:
-                await self.powerup.handle_collect(lobby_code, user_id, payload)
-
-            elif msg_type == WSEventType.POWERUP_USE.value:
-                await self.powerup.handle_use(lobby_code, user_id, payload)
-
-            elif msg_type == "telemetry_upload_replay":
-                await self.telemetry.handle_upload_replay(lobby_code, user_id, payload)
-
-            elif msg_type == "telemetry_flag_death":
-                await self.telemetry.handle_flag_death(user_id, payload)
-
-            elif msg_type == WSEventType.QUEUE_JOIN.value:
-                await self.matchmaking.handle_queue_join(user_id, payload)
-
-            elif msg_type == WSEventType.QUEUE_LEAVE.value:
-                await self.matchmaking.handle_queue_leave(user_id)
-
-            elif msg_type == "emote_trigger":
-                await self.emote.handle_trigger(lobby_code, user_id, payload)
-
-            else:
-                await manager.send_personal(
-                    websocket,
-                    build_error("UNKNOWN_MESSAGE", f"Unknown message type: {msg_type}")
-                )
-
-        except Exception as e:
-            logger.error(f"Error handling message: {e}")
-            await manager.send_personal(websocket, build_error("HANDLER_ERROR", str(e)))
+        context = self.context
+        if context is not None and context.stale:
+            await connection_contexts.refresh(context)  # Once per lobby event, not per message
+        await self.dispatcher.dispatch(websocket, message, lobby_code, user_id)
+
+    def _bound(self) -> Optional[ConnectionContext]:
+        """The connection context if current (handlers look the lobby up otherwise)."""
+        context = self.context
+        return context if context is not None and not context.stale else None
+
+    def _routes(self) -> Dict[str, MessageRoute]:
+        """Message type -> handler, payload schema, rate cost and logging."""
+        return {
+            # Latency pings and snapshot acks are high-frequency, free and unlogged
+            "ping": MessageRoute(self._pong, cost=0, log_level=None),
+            WSEventType.STATE_ACK.value: MessageRoute(
+                self._state_ack, {"tick": (int,)}, cost=0, log_level=None,
+            ),
+
+            # Per-tick gameplay input: throttled, logged at most once per HOT_LOG_EVERY_S
+            WSEventType.POSITION_UPDATE.value: MessageRoute(
+                lambda ws, lobby, user, p: self.arena.handle_position_update(lobby, user, p, self._bound()),
+                {"x": NUMBER, "y": NUMBER, "dx": NUMBER, "dy": NUMBER, "seq": (int,)},
+                cost=1, log_every_s=HOT_LOG_EVERY_S,
+            ),
+            "combat_fire": MessageRoute(
+                lambda ws, lobby, user, p: self.combat.handle_fire(lobby, user, p),
+                {"dx": NUMBER, "dy": NUMBER, "seq": (int,)},
+                cost=1, log_every_s=HOT_LOG_EVERY_S,
+            ),
+            WSEventType.COMBAT_SHOT.value: MessageRoute(
+                lambda ws, lobby, user, p: self.combat.handle_shot(lobby, user, p, self._bound()),
+                {"hit": (bool,)},
+                cost=1, log_every_s=HOT_LOG_EVERY_S,
+            ),
+            WSEventType.COMBAT_DAMAGE.value: MessageRoute(
+                lambda ws, lobby, user, p: self.combat.handle_damage(lobby, user, p, self._bound()),
+                {"target_id": (str,), "amount": NUMBER, "source": (str,)},
+                cost=1, log_every_s=HOT_LOG_EVERY_S,
+            ),
+
+            # Game flow: never throttled, a dropped answer or kill cannot be resent
+            WSEventType.COMBAT_KILL.value: MessageRoute(
+                lambda ws, lobby, user, p: self.combat.handle_kill(lobby, user, p, self._bound()),
+                {"victim_id": (str,), "weapon": (str,)},
+            ),
+            WSEventType.START_GAME.value: MessageRoute(
+                lambda ws, lobby, user, p: self.lobby.handle_start_game(lobby, user),
+            ),
+            WSEventType.READY.value: MessageRoute(
+                lambda ws, lobby, user, p: self.lobby.handle_ready(lobby, user),
+            ),
+            WSEventType.ANSWER.value: MessageRoute(
+                lambda ws, lobby, user, p: self.quiz.handle_answer(lobby, user, p, self._bound()),
+                {"q_num": (int,), "time_ms": NUMBER},
+            ),
+            "request_resync": MessageRoute(
+                lambda ws, lobby, user, p: self.quiz.handle_resync_request(lobby, user, p),
+                {"q_num": (int,), "reason": (str,)},
+            ),
+            "arena_init": MessageRoute(
+                lambda ws, lobby, user, p: self.arena.handle_arena_init(lobby, user, p),
+                {"config": (dict,)},
+            ),
+            WSEventType.POWERUP_COLLECTED.value: MessageRoute(
+                lambda ws, lobby, user, p: self.powerup.handle_collect(lobby, user, p, self._bound()),
+                {"powerup_id": (str,)},
+            ),
+            WSEventType.POWERUP_USE.value: MessageRoute(
+                lambda ws, lobby, user, p: self.powerup.handle_use(lobby, user, p, self._bound()),
+                {"type": (str,)},
+            ),
+            WSEventType.QUEUE_JOIN.value: MessageRoute(
+                lambda ws, lobby, user, p: self.matchmaking.handle_queue_join(user, p),
+                {"category": (str,), "map_slug": (str,)},
+            ),
+            WSEventType.QUEUE_LEAVE.value: MessageRoute(
+                lambda ws, lobby, user, p: self.matchmaking.handle_queue_leave(user),
+            ),
+
+            # Emotes and telemetry: throttled, heavier
+            "emote_trigger": MessageRoute(
+                lambda ws, lobby, user, p: self.emote.handle_trigger(lobby, user, p),
+                {"emote_id": (str,), "timestamp": NUMBER}, cost=2,
+            ),
+            "telemetry_upload_replay": MessageRoute(
+                lambda ws, lobby, user, p: self.telemetry.handle_upload_replay(lobby, user, p),
+                {"victimId": (str,), "killerId": (str,), "deathTick": (int,), "frames": (list,)}, cost=20,
+            ),
+            "telemetry_flag_death": MessageRoute(
+                lambda ws, lobby, user, p: self.telemetry.handle_flag_death(user, p),
+                {"replayId": (str,), "reason": (str,)}, cost=5,
+            ),
+        }
+
+    async def _pong(self, websocket: WebSocket, lobby_code: str, user_id: str, payload: dict) -> None:
+        await manager.send_personal(websocket, {"type": "pong", "payload": {}})
+
+    async def _state_ack(self, websocket: WebSocket, lobby_code: str, user_id: str, payload: dict) -> None:
+        snapshot_registry.ack(lobby_code, user_id, payload.get("tick"))
 
     async def handle_connect(
         self,
@@ -153,6 +239,23 @@ class GameHandler:
         """Handle new player connection."""
         await self.lobby.handle_connect(lobby_code, user_id, display_name)
 
+    async def bind_context(self, websocket: WebSocket, lobby_code: str, user_id: str) -> ConnectionContext:
+        """Resolve this connection's context once, after connect."""
+        self.context = await connection_contexts.bind(
+            websocket, lobby_code, user_id, self.lobby_service, self.game_service,
+        )
+        return self.context
+
+    def release_context(self) -> None:
+        """Drop this connection's context."""
+        if self.context is not None:
+            connection_contexts.release(self.context)
+            self.context = None
+
     async def handle_disconnect(self, lobby_code: str, user_id: str) -> None:
         """Handle player disconnection."""
+        self.release_context()
+        snapshot_registry.remove_client(lobby_code, user_id)
+        if manager.get_lobby_connections(lobby_code) == 0:
+            snapshot_registry.remove_lobby(lobby_code)
         await self.lobby.handle_disconnect(lobby_code, user_id)
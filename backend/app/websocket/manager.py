@@ -1,21 +1,74 @@
 """
 WebSocket connection manager.
 Handles connection lifecycle and message broadcasting.
+
+Outbound messages are serialized once and enqueued on each connection's
+SendQueue; a per-connection writer task does the socket writes, so one
+slow client cannot stall a broadcast.
+
+Spectators are kept in their own per-lobby sets: lobby broadcasts and
+player lookups never see them, and they only receive the frames handed
+to fan_out_to_spectators (see spectators.py).
 """
 
 import asyncio
 import json
 import time
-from typing import Dict, Optional, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
-from fastapi import WebSocket
+from fastapi import WebSocket, WebSocketDisconnect
 
 from app.core.logging import get_logger
+from app.game.config import NETWORK_CONFIG, NetworkConfig
 from app.services.presence_service import presence_service
+from app.websocket import codec
+from app.websocket.send_queue import QueueOverflow, SendQueue, coalesce_key, is_droppable
 
 logger = get_logger("websocket")
 
 
+class _Frames:
+    """One message serialized at most once per wire format."""
+    
+    __slots__ = ("message", "message_type", "key", "_text", "_binary", "_droppable")
+    
+    def __init__(self, message: dict, key: Optional[str] = None):
+        self.message = message
+        self.message_type = message.get("type", "unknown")
+        # Coalescing key: explicit, or derived from the message type
+        self.key = key if key is not None else coalesce_key(message)
+        self._text: Optional[str] = None
+        self._binary: Optional[bytes] = None
+        self._droppable: Optional[bool] = None
+    
+    @property
+    def droppable(self) -> bool:
+        """Whether a slow consumer may miss this message."""
+        if self._droppable is None:
+            self._droppable = is_droppable(self.message)
+        return self._droppable
+    
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = json.dumps(self.message)
+        return self._text
+    
+    @property
+    def binary(self) -> Optional[bytes]:
+        """Binary frame, or None when the message has no binary layout."""
+        if self._binary is None:
+            self._binary = codec.encode(self.message) or b""
+        return self._binary or None
+    
+    def encode(self, text: bool, binary: bool) -> None:
+        """Serialize now, so later sends don't read a message that has since changed."""
+        if binary and self.binary is None:
+            text = True  # No binary layout: binary clients get the JSON text
+        if text and self._text is None:
+            self._text = json.dumps(self.message)
+
+
 class ConnectionManager:
     """
     Manages WebSocket connections for game lobbies.
@@ -28,6 +81,7 @@ class ConnectionManager:
         self,
         max_connections: int = 500,
         max_per_lobby: int = 10,
+        network_config: Optional[NetworkConfig] = None,
     ):
         """
         Initialize connection manager.
@@ -35,10 +89,12 @@ class ConnectionManager:
         Args:
             max_connections: Maximum total WebSocket connections
             max_per_lobby: Maximum connections per lobby
+            network_config: Send queue depth and slow-consumer policy
         """
         # Connection limits
         self.max_connections = max_connections
         self.max_per_lobby = max_per_lobby
+        self._network_config = network_config or NETWORK_CONFIG
         
         # lobby_code -> set of websockets
         self.active_connections: Dict[str, Set[WebSocket]] = {}
@@ -51,6 +107,19 @@ class ConnectionManager:
         # Track connection timestamps for health monitoring
         self._connection_times: Dict[str, float] = {}
         self._last_message_times: Dict[str, float] = {}
+        # Connections that negotiated the binary codec
+        self._binary_connections: Set[WebSocket] = set()
+        # Users whose client accepts bundled tick_frame messages
+        self._frame_users: Set[str] = set()
+        # websocket -> outbound queue (connections registered via connect)
+        self._queues: Dict[WebSocket, SendQueue] = {}
+        # lobby_code -> spectator websockets (never in active_connections)
+        self.spectator_connections: Dict[str, Set[WebSocket]] = {}
+        # spectator websocket -> (lobby_code, user_id)
+        self._spectator_info: Dict[WebSocket, tuple] = {}
+        # Counters folded in from closed queues
+        self._queue_totals = {"sent": 0, "dropped": 0, "coalesced": 0, "high_water": 0}
+        self._slow_consumer_disconnects = 0
     
     def can_accept_connection(self, lobby_code: str) -> Tuple[bool, str]:
         """
@@ -63,7 +132,7 @@ class ConnectionManager:
             Tuple of (can_accept, reason_if_rejected)
         """
         # Check total connections
-        total = sum(len(conns) for conns in self.active_connections.values())
+        total = self.get_connection_count()
         if total >= self.max_connections:
             logger.warning(f"Server full: {total}/{self.max_connections} connections")
             return False, "server_full"
@@ -76,6 +145,29 @@ class ConnectionManager:
         
         return True, ""
     
+    def can_accept_spectator(self, lobby_code: str) -> Tuple[bool, str]:
+        """
+        Check if we can accept a new spectator.
+        
+        Spectators count toward max_connections but not max_per_lobby;
+        they have their own per-lobby limit.
+        
+        Returns:
+            Tuple of (can_accept, reason_if_rejected)
+        """
+        total = self.get_connection_count()
+        if total >= self.max_connections:
+            logger.warning(f"Server full: {total}/{self.max_connections} connections")
+            return False, "server_full"
+        
+        watching = len(self.spectator_connections.get(lobby_code, ()))
+        limit = self._network_config.max_spectators_per_lobby
+        if watching >= limit:
+            logger.warning(f"Lobby {lobby_code} spectators full: {watching}/{limit}")
+            return False, "spectators_full"
+        
+        return True, ""
+    
     def get_stats(self) -> dict:
         """
         Get connection statistics for monitoring.
@@ -83,7 +175,7 @@ class ConnectionManager:
         Returns:
             Dict with connection metrics
         """
-        total = sum(len(conns) for conns in self.active_connections.values())
+        total = self.get_connection_count()
         return {
             "total_connections": total,
             "max_connections": self.max_connections,
@@ -93,7 +185,8 @@ class ConnectionManager:
             "connections_by_lobby": {
                 code: len(conns) 
                 for code, conns in self.active_connections.items()
-            }
+            },
+            "spectators": len(self._spectator_info),
         }
 
     async def connect(
@@ -102,6 +195,7 @@ class ConnectionManager:
         lobby_code: str,
         user_id: str,
         subprotocol: Optional[str] = None,
+        tick_frames: bool = False,
     ) -> None:
         """
         Accept and register a WebSocket connection.
@@ -110,9 +204,13 @@ class ConnectionManager:
             websocket: WebSocket connection
             lobby_code: Lobby code to join
             user_id: User UUID
-            subprotocol: Optional subprotocol to accept (for auth token handshake)
+            subprotocol: Optional subprotocol to accept (auth token handshake,
+                or codec.BINARY_PROTOCOL to enable binary frames)
+            tick_frames: Client accepts bundled tick_frame messages
         """
         await websocket.accept(subprotocol=subprotocol)
+        if subprotocol == codec.BINARY_PROTOCOL:
+            self._binary_connections.add(websocket)
         
         # Add to lobby connections
         if lobby_code not in self.active_connections:
@@ -122,6 +220,12 @@ class ConnectionManager:
         # Track connection info
         self.connection_info[websocket] = (lobby_code, user_id)
         self.user_connections[user_id] = websocket
+        if tick_frames:
+            self._frame_users.add(user_id)
+        else:
+            self._frame_users.discard(user_id)
+        
+        self._open_queue(websocket)
         
         # Track connection time for health monitoring
         self._connection_times[user_id] = time.time()
@@ -132,6 +236,46 @@ class ConnectionManager:
         
         logger.info(f"User {user_id} connected to lobby {lobby_code}")
 
+    async def connect_spectator(
+        self,
+        websocket: WebSocket,
+        lobby_code: str,
+        user_id: str,
+        subprotocol: Optional[str] = None,
+    ) -> None:
+        """
+        Accept and register a read-only spectator connection.
+        
+        The spectator is not a lobby participant: it is not tracked as
+        the user's connection and gets no lobby broadcasts or presence.
+        
+        Args:
+            websocket: WebSocket connection
+            lobby_code: Lobby code to watch
+            user_id: User UUID
+            subprotocol: Optional subprotocol to accept (see connect)
+        """
+        await websocket.accept(subprotocol=subprotocol)
+        if subprotocol == codec.BINARY_PROTOCOL:
+            self._binary_connections.add(websocket)
+        
+        self.spectator_connections.setdefault(lobby_code, set()).add(websocket)
+        self._spectator_info[websocket] = (lobby_code, user_id)
+        self._open_queue(websocket)
+        
+        logger.info(f"User {user_id} spectating lobby {lobby_code}")
+
+    def _open_queue(self, websocket: WebSocket) -> None:
+        queue = SendQueue(
+            send=lambda frames: self._send_frames(websocket, frames),
+            on_error=lambda error: self._on_send_error(websocket, error),
+            max_depth=self._network_config.send_queue_depth,
+            policy=self._network_config.slow_consumer_policy,
+            coalesce=self._network_config.coalesce_updates,
+        )
+        self._queues[websocket] = queue
+        queue.start()
+
     def disconnect(self, websocket: WebSocket) -> Optional[tuple]:
         """
         Remove a WebSocket connection.
@@ -142,6 +286,9 @@ class ConnectionManager:
         Returns:
             Tuple of (lobby_code, user_id) or None
         """
+        if websocket in self._spectator_info:
+            return self._disconnect_spectator(websocket)
+        
         info = self.connection_info.get(websocket)
         if info:
             lobby_code, user_id = info
@@ -154,8 +301,11 @@ class ConnectionManager:
             
             # Remove from tracking
             del self.connection_info[websocket]
+            self._binary_connections.discard(websocket)
+            self._close_queue(websocket)
             if user_id in self.user_connections:
                 del self.user_connections[user_id]
+            self._frame_users.discard(user_id)
             
             # Clean up health monitoring data
             self._connection_times.pop(user_id, None)
@@ -170,12 +320,25 @@ class ConnectionManager:
         
         return None
 
+    def _disconnect_spectator(self, websocket: WebSocket) -> tuple:
+        lobby_code, user_id = info = self._spectator_info.pop(websocket)
+        watchers = self.spectator_connections.get(lobby_code)
+        if watchers is not None:
+            watchers.discard(websocket)
+            if not watchers:
+                del self.spectator_connections[lobby_code]
+        self._binary_connections.discard(websocket)
+        self._close_queue(websocket)
+        logger.info(f"User {user_id} stopped spectating lobby {lobby_code}")
+        return info
+
     async def broadcast_to_lobby(
         self,
         lobby_code: str,
         message: dict,
         exclude: Optional[WebSocket] = None,
         exclude_user_id: Optional[str] = None,
+        coalesce_key: Optional[str] = None,
     ) -> None:
         """
         Broadcast a message to all connections in a lobby.
@@ -185,23 +348,26 @@ class ConnectionManager:
             message: Message dict to send
             exclude: Optional WebSocket to exclude from broadcast
             exclude_user_id: Optional user ID to exclude from broadcast
+            coalesce_key: Replace any unsent message with the same key
+                (droppable messages only; derived from the type if omitted)
         """
         if lobby_code not in self.active_connections:
             logger.warning(f"No connections for lobby {lobby_code}")
             return
         
-        data = json.dumps(message)
+        frames = _Frames(message, coalesce_key)
         disconnected = []
         sent_count = 0
         
-        for connection in self.active_connections[lobby_code]:
+        # Copy: slow consumers may be disconnected mid-broadcast
+        for connection in list(self.active_connections[lobby_code]):
             if exclude and connection == exclude:
                 continue
             if exclude_user_id and self.get_user_id(connection) == exclude_user_id:
                 continue
             try:
-                await connection.send_text(data)
-                sent_count += 1
+                if await self._deliver(connection, frames):
+                    sent_count += 1
             except Exception as e:
                 logger.warning(f"Failed to send to connection: {e}")
                 disconnected.append(connection)
@@ -209,7 +375,7 @@ class ConnectionManager:
         # Log for position updates to debug
         msg_type = message.get("type", "unknown")
         if msg_type == "position_update":
-            total_conns = len(self.active_connections[lobby_code])
+            total_conns = len(self.active_connections.get(lobby_code, ()))
             logger.debug(f"Broadcast {msg_type} to {sent_count}/{total_conns} connections in {lobby_code} (excluded: {exclude_user_id})")
         
         # Clean up failed connections
@@ -225,15 +391,231 @@ class ConnectionManager:
             message: Message dict to send
             
         Returns:
-            True if sent successfully, False otherwise
+            True if sent (or queued) successfully, False otherwise
         """
         try:
-            await websocket.send_text(json.dumps(message))
-            return True
+            return await self._deliver(websocket, _Frames(message))
         except Exception as e:
             logger.warning(f"Failed to send personal message: {e}")
             return False
 
+    async def send_to_users(
+        self,
+        user_ids: List[str],
+        message: dict,
+        coalesce_key: Optional[str] = None,
+    ) -> int:
+        """
+        Send one message to several users, serializing it once.
+        
+        Args:
+            user_ids: Target user UUIDs
+            message: Message dict to send
+            coalesce_key: Replace any unsent message with the same key
+                (droppable messages only; derived from the type if omitted)
+            
+        Returns:
+            Number of users the message was sent to
+        """
+        frames = _Frames(message, coalesce_key)
+        sent = 0
+        disconnected = []
+        
+        for user_id in user_ids:
+            websocket = self.user_connections.get(user_id)
+            if not websocket:
+                continue
+            try:
+                if await self._deliver(websocket, frames):
+                    sent += 1
+            except Exception as e:
+                logger.warning(f"Failed to send to user {user_id}: {e}")
+                disconnected.append(websocket)
+        
+        for conn in disconnected:
+            self.disconnect(conn)
+        return sent
+
+    def has_spectators(self, lobby_code: str) -> bool:
+        """Check if anyone is watching a lobby."""
+        return lobby_code in self.spectator_connections
+
+    def spectator_frames(self, lobby_code: str, message: dict) -> _Frames:
+        """
+        Serialize a message once for every spectator of a lobby.
+        
+        Encodes it now in each wire format the lobby's spectators use;
+        the result is shared by all of them in fan_out_to_spectators.
+        """
+        watchers = self.spectator_connections.get(lobby_code, ())
+        binary = sum(1 for ws in watchers if ws in self._binary_connections)
+        frames = _Frames(message)
+        frames.encode(text=binary < len(watchers), binary=binary > 0)
+        return frames
+
+    def fan_out_to_spectators(self, lobby_code: str, frames: _Frames) -> int:
+        """
+        Enqueue shared frames on every spectator queue of a lobby.
+        
+        Never awaits: each spectator's writer task does its own socket
+        writes, and spectators that cannot keep up are disconnected by
+        the send queue policy.
+        
+        Returns:
+            Number of spectators the frames were queued for
+        """
+        queued = 0
+        for websocket in list(self.spectator_connections.get(lobby_code, ())):
+            queue = self._queues.get(websocket)
+            if queue is None:
+                continue
+            try:
+                queued += queue.put(frames, frames.message_type, frames.droppable, frames.key)
+            except QueueOverflow as e:
+                self._drop_slow_consumer(websocket, str(e))
+        return queued
+
+    def post(self, contexts: Iterable, message: dict, coalesce_key: Optional[str] = None) -> int:
+        """
+        Enqueue one message on connections whose queues are already resolved.
+        
+        For ConnectionContexts (see context.py), which hold their
+        peers' send queues: the message is serialized once, and nothing
+        is awaited or looked up per target. A closed queue (connection
+        gone) just refuses the message.
+        
+        Args:
+            contexts: Objects with websocket and queue attributes
+            message: Message dict to send
+            coalesce_key: Replace any unsent message with the same key
+                (droppable messages only; derived from the type if omitted)
+            
+        Returns:
+            Number of connections the message was queued for
+        """
+        frames = _Frames(message, coalesce_key)
+        queued = 0
+        for context in contexts:
+            queue = context.queue
+            if queue is None:
+                continue
+            try:
+                queued += queue.put(frames, frames.message_type, frames.droppable, frames.key)
+            except QueueOverflow as e:
+                self._drop_slow_consumer(context.websocket, str(e))
+        return queued
+
+    async def _deliver(self, websocket: WebSocket, frames: _Frames) -> bool:
+        """
+        Enqueue frames on the connection's send queue.
+        
+        Connections without a queue (not registered through connect) are
+        written to directly.
+        
+        Returns:
+            False if the message was dropped for a slow consumer
+        """
+        queue = self._queues.get(websocket)
+        if queue is None:
+            await self._send_frames(websocket, frames)
+            return True
+        try:
+            return queue.put(frames, frames.message_type, frames.droppable, frames.key)
+        except QueueOverflow as e:
+            self._drop_slow_consumer(websocket, str(e))
+            return False
+    
+    def _drop_slow_consumer(self, websocket: WebSocket, reason: str) -> None:
+        """Disconnect a client that cannot keep up with its send queue."""
+        self._slow_consumer_disconnects += 1
+        info = self.disconnect(websocket)
+        logger.warning(f"Disconnecting slow consumer {info[1] if info else 'unknown'}: {reason}")
+        asyncio.get_running_loop().create_task(self._close_socket(websocket, 1013, "slow_consumer"))
+    
+    def _on_send_error(self, websocket: WebSocket, error: Exception) -> None:
+        """Writer task failed: treat the connection as gone."""
+        logger.warning(f"Failed to send to connection: {error}")
+        self.disconnect(websocket)
+    
+    def _close_queue(self, websocket: WebSocket) -> None:
+        queue = self._queues.pop(websocket, None)
+        if queue is None:
+            return
+        totals = self._queue_totals
+        totals["sent"] += queue.sent
+        totals["dropped"] += queue.dropped
+        totals["coalesced"] += queue.coalesced
+        totals["high_water"] = max(totals["high_water"], queue.high_water)
+        queue.close()
+    
+    @staticmethod
+    async def _close_socket(websocket: WebSocket, code: int, reason: str) -> None:
+        try:
+            await websocket.close(code=code, reason=reason)
+        except Exception:
+            pass  # Already closed
+    
+    async def flush(self) -> None:
+        """Wait until every connection's send queue has been written out."""
+        await asyncio.gather(*(queue.join() for queue in list(self._queues.values())))
+    
+    def get_queue_stats(self) -> dict:
+        """
+        Get outbound send queue metrics for monitoring.
+        
+        Returns:
+            Dict with queue depths, drop counts and slow-consumer disconnects
+        """
+        queues = list(self._queues.values())
+        totals = self._queue_totals
+        return {
+            "policy": self._network_config.slow_consumer_policy,
+            "max_depth": self._network_config.send_queue_depth,
+            "queues": len(queues),
+            "queued": sum(q.depth for q in queues),
+            "deepest": max((q.depth for q in queues), default=0),
+            "high_water": max([totals["high_water"]] + [q.high_water for q in queues]),
+            "sent": totals["sent"] + sum(q.sent for q in queues),
+            "dropped": totals["dropped"] + sum(q.dropped for q in queues),
+            "coalesced": totals["coalesced"] + sum(q.coalesced for q in queues),
+            "slow_consumer_disconnects": self._slow_consumer_disconnects,
+        }
+
+    async def _send_frames(self, websocket: WebSocket, frames: _Frames) -> None:
+        """Send in the connection's negotiated format (binary when possible)."""
+        if websocket in self._binary_connections:
+            data = frames.binary
+            if data is not None:
+                await websocket.send_bytes(data)
+                return
+        await websocket.send_text(frames.text)
+    
+    async def receive(self, websocket: WebSocket) -> dict:
+        """
+        Receive one message from a connection.
+        
+        Text frames are JSON; binary frames are decoded with the codec.
+        
+        Raises:
+            WebSocketDisconnect: When the client disconnects
+            ValueError: On malformed JSON or binary frames
+        """
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+        data = message.get("bytes")
+        if data is not None:
+            return codec.decode(data)
+        return json.loads(message["text"])
+    
+    def wants_tick_frames(self, user_id: str) -> bool:
+        """Check if a user's client accepts bundled tick_frame messages."""
+        return user_id in self._frame_users
+    
+    def is_binary(self, websocket: WebSocket) -> bool:
+        """Check if a connection negotiated the binary codec."""
+        return websocket in self._binary_connections
+
     async def send_to_user(self, user_id: str, message: dict) -> bool:
         """
         Send a message to a specific user by ID.
@@ -259,6 +641,10 @@ class ConnectionManager:
         info = self.connection_info.get(websocket)
         return info[1] if info else None
 
+    def get_queue(self, websocket: WebSocket) -> Optional[SendQueue]:
+        """Get the outbound send queue of a registered connection."""
+        return self._queues.get(websocket)
+
     def get_lobby_code(self, websocket: WebSocket) -> Optional[str]:
         """Get lobby code for a WebSocket connection."""
         info = self.connection_info.get(websocket)
@@ -279,8 +665,12 @@ class ConnectionManager:
         return users
 
     def get_connection_count(self) -> int:
-        """Get total number of active connections."""
-        return sum(len(conns) for conns in self.active_connections.values())
+        """Get total number of active connections (players and spectators)."""
+        return sum(len(conns) for conns in self.active_connections.values()) + len(self._spectator_info)
+
+    def get_spectator_count(self, lobby_code: str) -> int:
+        """Get number of spectators watching a lobby."""
+        return len(self.spectator_connections.get(lobby_code, ()))
 
     async def ping_user(self, user_id: str, timeout: float = 2.0) -> Tuple[bool, Optional[float]]:
         """
@@ -0,0 +1,280 @@
+"""
+Per-connection outbound send queues.
+
+Single responsibility: decouple broadcasting from socket writes. Each
+connection gets a bounded queue drained by its own writer task, so a
+slow client only backs up its own queue instead of stalling the rest
+of the lobby (and the tick loop waiting on the broadcast).
+
+Droppable messages may carry a coalescing key (e.g.
+"position_update:{player_id}" or "state"). A newer message with the
+same key replaces an older one that is still unsent - latest wins - and
+takes its place at the back of the queue, so ordering relative to
+critical messages is preserved.
+
+When a queue is full the slow-consumer policy decides what happens:
+- drop_oldest: evict the oldest droppable (non-critical) message
+- coalesce: keep only the newest droppable message per coalescing key
+  (or type), then fall back to drop_oldest
+- disconnect: drop the connection
+
+Critical messages (game flow, questions, combat events) are never
+dropped or coalesced; if a queue overflows with nothing droppable left
+to evict the client is disconnected whatever the policy.
+"""
+
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional
+
+from app.core.logging import get_logger
+
+logger = get_logger("websocket.send_queue")
+
+POLICY_DROP_OLDEST = "drop_oldest"
+POLICY_COALESCE = "coalesce"
+POLICY_DISCONNECT = "disconnect"
+POLICIES = (POLICY_DROP_OLDEST, POLICY_COALESCE, POLICY_DISCONNECT)
+
+# Superseded by the next message of the same kind; safe to drop for a
+# client that is behind.
+DROPPABLE_TYPES = frozenset({
+    "position_update",
+    "state_update",
+    "state_delta",
+    "tick_frame",
+    "combat_regen_tick",
+})
+
+# Full and delta snapshots supersede each other
+STATE_KEY = "state"
+
+
+def is_droppable(message: dict) -> bool:
+    """
+    Check if a message may be dropped for a slow consumer.
+
+    A tick_frame is only droppable when everything bundled in it is.
+    """
+    msg_type = message.get("type")
+    if msg_type not in DROPPABLE_TYPES:
+        return False
+    if msg_type == "tick_frame":
+        return all(is_droppable(m) for m in message["payload"]["messages"])
+    return True
+
+
+def coalesce_key(message: dict) -> Optional[str]:
+    """
+    Default coalescing key for a message, or None if it must not coalesce.
+
+    Only droppable messages get a key; reliable messages are always
+    delivered individually.
+    """
+    msg_type = message.get("type")
+    if msg_type in ("state_update", "state_delta"):
+        return STATE_KEY
+    if msg_type == "position_update":
+        player_id = message.get("payload", {}).get("player_id")
+        return f"position_update:{player_id}" if player_id else None
+    if msg_type == "tick_frame" and is_droppable(message):
+        return STATE_KEY
+    return None
+
+
+class QueueOverflow(Exception):
+    """Raised by SendQueue.put when the connection must be dropped."""
+
+
+class _Item:
+    __slots__ = ("frames", "message_type", "droppable", "key")
+
+    def __init__(self, frames: object, message_type: str, droppable: bool, key: Optional[str]):
+        self.frames = frames
+        self.message_type = message_type
+        self.droppable = droppable
+        self.key = key
+
+
+class SendQueue:
+    """
+    Bounded outbound queue for one connection.
+
+    The writer task calls `send(frames)` for each queued item in order;
+    a send failure ends the writer and reports through `on_error`.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[object], Awaitable[None]],
+        on_error: Callable[[Exception], None],
+        max_depth: int = 64,
+        policy: str = POLICY_DROP_OLDEST,
+        coalesce: bool = True,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown slow-consumer policy: {policy}")
+        self._send = send
+        self._on_error = on_error
+        self.max_depth = max(1, max_depth)
+        self.policy = policy
+        self.coalesce = coalesce
+
+        self._items: Deque[_Item] = deque()
+        # coalescing key -> unsent item carrying it
+        self._keyed: Dict[str, _Item] = {}
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._closed = False
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.high_water = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._items)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def start(self) -> None:
+        """Start the writer task on the running loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def put(
+        self,
+        frames: object,
+        message_type: str,
+        droppable: bool,
+        key: Optional[str] = None,
+    ) -> bool:
+        """
+        Enqueue a message without blocking.
+
+        Args:
+            frames: Serialized message handed to `send`
+            message_type: Message type (coalescing fallback, metrics)
+            droppable: Whether a slow consumer may miss the message
+            key: Coalescing key; ignored for critical messages
+
+        Returns:
+            False if the message itself was dropped
+
+        Raises:
+            QueueOverflow: When the policy (or a critical overflow)
+                requires disconnecting the client
+        """
+        if self._closed:
+            return False
+
+        if not (droppable and self.coalesce):
+            key = None
+        if key is not None:
+            stale = self._keyed.pop(key, None)
+            if stale is not None:
+                self._items.remove(stale)
+                self.coalesced += 1
+
+        if len(self._items) >= self.max_depth and not self._make_room(message_type, droppable, key):
+            self.dropped += 1
+            return False
+
+        item = _Item(frames, message_type, droppable, key)
+        self._items.append(item)
+        if key is not None:
+            self._keyed[key] = item
+        if len(self._items) > self.high_water:
+            self.high_water = len(self._items)
+        self._idle.clear()
+        self._wakeup.set()
+        return True
+
+    def _make_room(self, message_type: str, droppable: bool, key: Optional[str]) -> bool:
+        """Apply the slow-consumer policy to a full queue."""
+        if self.policy == POLICY_DISCONNECT:
+            raise QueueOverflow("send queue full")
+
+        if self.policy == POLICY_COALESCE:
+            self._coalesce((key or message_type) if droppable else None)
+            if len(self._items) < self.max_depth:
+                return True
+
+        for item in self._items:
+            if item.droppable:
+                self._discard(item)
+                self.dropped += 1
+                return True
+
+        if droppable:
+            # Nothing older to evict; drop the incoming message instead
+            return False
+        raise QueueOverflow("send queue full of critical messages")
+
+    def _coalesce(self, incoming: Optional[str]) -> None:
+        """Keep only the newest droppable message per key (or type)."""
+        seen = set()
+        if incoming is not None:
+            seen.add(incoming)
+        kept: Deque[_Item] = deque()
+        for item in reversed(self._items):
+            if item.droppable:
+                group = item.key or item.message_type
+                if group in seen:
+                    if item.key is not None:
+                        self._keyed.pop(item.key, None)
+                    self.coalesced += 1
+                    continue
+                seen.add(group)
+            kept.appendleft(item)
+        self._items = kept
+
+    def _discard(self, item: _Item) -> None:
+        self._items.remove(item)
+        if item.key is not None and self._keyed.get(item.key) is item:
+            del self._keyed[item.key]
+
+    async def join(self) -> None:
+        """Wait until every queued message has been written."""
+        await self._idle.wait()
+
+    def close(self) -> None:
+        """Discard pending messages and stop the writer."""
+        self._closed = True
+        self._items.clear()
+        self._keyed.clear()
+        self._idle.set()
+        self._wakeup.set()
+        task, self._task = self._task, None
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+
+    async def _run(self) -> None:
+        while not self._closed:
+            if not self._items:
+                self._idle.set()
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            item = self._items.popleft()
+            if item.key is not None and self._keyed.get(item.key) is item:
+                del self._keyed[item.key]
+            try:
+                await self._send(item.frames)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._closed = True
+                self._items.clear()
+                self._keyed.clear()
+                self._idle.set()
+                self._on_error(e)
+                return
+            self.sent += 1
@@ -0,0 +1,105 @@
+"""
+Spectator snapshot feed.
+
+Single responsibility: turn a lobby's tick broadcasts into the
+spectator stream - full state snapshots at a lower rate, held back by a
+fixed delay, serialized once per lobby and shared by every watcher.
+
+The tick loop only calls sample(). Without spectators that is a dict
+lookup; with spectators, one snapshot per spectator_interval_s is
+serialized and handed to a DeadlineRunner, which fans it out
+spectator_delay_s later from its own task. Spectators never get
+per-player messages (position rebroadcasts, deltas against acks) and
+their connections never reach GameHandler, so they cannot send inputs.
+
+Usage:
+    spectator_feed.sample(lobby_code, state_message)  # In the tick broadcast
+"""
+
+import time
+from typing import Callable, Dict, Optional
+
+from app.core.logging import get_logger
+from app.game.config import NETWORK_CONFIG, NetworkConfig
+from app.game.timers import DeadlineRunner
+from app.websocket.events import WSEventType
+from app.websocket.manager import ConnectionManager, manager
+
+logger = get_logger("websocket.spectators")
+
+
+class SpectatorFeed:
+    """Delayed, rate-limited snapshot stream shared by a lobby's spectators."""
+
+    def __init__(
+        self,
+        connections: ConnectionManager = manager,
+        network_config: Optional[NetworkConfig] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._connections = connections
+        self._network_config = network_config or NETWORK_CONFIG
+        self._clock = clock
+        self._runner = DeadlineRunner(clock)
+        # lobby_code -> clock time of the last sampled snapshot
+        self._last_sample: Dict[str, float] = {}
+
+        # Metrics
+        self.sampled = 0
+        self.delivered = 0
+
+    def sample(self, lobby_code: str, state: dict) -> bool:
+        """
+        Offer a lobby's state_update to its spectators.
+
+        Args:
+            lobby_code: Lobby the state belongs to
+            state: Full state_update message from the tick
+
+        Returns:
+            True if the snapshot was taken for publishing
+        """
+        if not self._connections.has_spectators(lobby_code):
+            self._last_sample.pop(lobby_code, None)
+            return False
+
+        now = self._clock()
+        last = self._last_sample.get(lobby_code)
+        if last is not None and now - last < self._network_config.spectator_interval_s:
+            return False
+        self._last_sample[lobby_code] = now
+
+        frames = self._connections.spectator_frames(lobby_code, {
+            "type": WSEventType.STATE_UPDATE.value,
+            "payload": state["payload"],
+        })
+        self.sampled += 1
+
+        async def publish() -> None:
+            self.delivered += self._connections.fan_out_to_spectators(lobby_code, frames)
+
+        self._runner.call_later(
+            (lobby_code, self.sampled), self._network_config.spectator_delay_s, publish
+        )
+        return True
+
+    def get_stats(self) -> dict:
+        """
+        Get spectator feed metrics for monitoring.
+
+        Returns:
+            Dict with watcher counts, snapshots sampled and deliveries
+        """
+        return {
+            "spectators": sum(len(s) for s in self._connections.spectator_connections.values()),
+            "watched_lobbies": len(self._connections.spectator_connections),
+            "interval_s": self._network_config.spectator_interval_s,
+            "delay_s": self._network_config.spectator_delay_s,
+            "sampled": self.sampled,
+            "pending": len(self._runner),
+            "delivered": self.delivered,
+        }
+
+
+# Global spectator feed instance
+spectator_feed = SpectatorFeed()
@@ -0,0 +1 @@
+# Performance benchmarks (run explicitly, not collected by default)
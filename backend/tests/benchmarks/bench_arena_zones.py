@@ -0,0 +1,131 @@
+"""
+Arena zone benchmark: linear hazard/trap scans vs spatial grid.
+
+Measures HazardManager.update() + TrapManager.update() per tick on a
+map with 60 hazards and 60 pressure/projectile traps (plus a few timed
+traps) while 8 players wander the arena. The linear managers replay the
+old loops: every hazard is tested against every player, and every trap
+is stepped every tick.
+
+Run:
+    python -m pytest tests/benchmarks/bench_arena_zones.py -s
+    python tests/benchmarks/bench_arena_zones.py
+"""
+
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("SUPABASE_URL", "https://test.supabase.co")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test-anon-key")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "test-service-key")
+
+from app.game.arena import HazardManager, HazardType, TrapEffect, TrapManager, TrapType
+
+DT = 1 / 60
+TICKS = 3000
+HAZARDS = 60
+TRAPS = 60
+TIMED = 4
+PLAYERS = 8
+WIDTH, HEIGHT = 1280, 720
+
+
+class LinearHazards(HazardManager):
+    """Every hazard is a candidate for every player."""
+
+    def _candidates(self, player_id, px, py):
+        return list(self._hazards)
+
+
+class LinearTraps(TrapManager):
+    """Every trap is stepped every tick."""
+
+    def _track(self, trap_id, trap):
+        self._busy[trap_id] = None
+
+    def _pressed(self, player_positions):
+        return []
+
+
+def build(hazards_cls, traps_cls):
+    rng = random.Random(3)
+    hazards, traps = hazards_cls(), traps_cls()
+    for i in range(HAZARDS):
+        hazards.add(
+            f"h{i}", rng.choice(list(HazardType)),
+            rng.uniform(0, WIDTH - 120), rng.uniform(0, HEIGHT - 120),
+            rng.uniform(40, 120), rng.uniform(40, 120),
+        )
+    for i in range(TRAPS):
+        traps.add(
+            f"t{i}", rng.choice([TrapType.PRESSURE, TrapType.PROJECTILE]),
+            rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT), rng.uniform(20, 40),
+            rng.choice(list(TrapEffect)), 10, 3.0,
+            chain_radius=rng.choice([None, 120]),
+        )
+    for i in range(TIMED):
+        traps.add(
+            f"timed{i}", TrapType.TIMED, rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT),
+            30, TrapEffect.DAMAGE, 10, 1.0, interval=5.0,
+        )
+    return hazards, traps
+
+
+def paths():
+    """Per-tick player positions: random walks at run speed."""
+    rng = random.Random(9)
+    positions = {f"p{i}": (rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT)) for i in range(PLAYERS)}
+    frames = []
+    for _ in range(TICKS):
+        positions = {
+            pid: (min(WIDTH, max(0, x + rng.uniform(-5, 5))), min(HEIGHT, max(0, y + rng.uniform(-5, 5))))
+            for pid, (x, y) in positions.items()
+        }
+        frames.append(positions)
+    return frames
+
+
+def bench(hazards_cls, traps_cls, frames) -> tuple:
+    hazards, traps = build(hazards_cls, traps_cls)
+    events = 0
+    start = time.perf_counter()
+    for tick, positions in enumerate(frames):
+        now = tick * DT
+        hazards.update(positions, now)
+        traps.update(DT, positions, now)
+        traps.process_chains(now, positions)
+        events += len(hazards.get_and_clear_events()) + len(traps.get_and_clear_events())
+    elapsed = time.perf_counter() - start
+    return elapsed / len(frames) * 1e6, events
+
+
+def run() -> dict:
+    frames = paths()
+    return {
+        "linear": bench(LinearHazards, LinearTraps, frames),
+        "grid": bench(HazardManager, TrapManager, frames),
+    }
+
+
+def report(result: dict) -> None:
+    print(f"\n{HAZARDS} hazards, {TRAPS + TIMED} traps, {PLAYERS} players, {TICKS} ticks")
+    print(f"{'path':>8} {'us/tick':>10} {'events':>8}")
+    for name, (us, events) in result.items():
+        print(f"{name:>8} {us:>10.1f} {events:>8}")
+    print(f"speedup {result['linear'][0] / result['grid'][0]:.1f}x")
+
+
+def test_arena_zone_updates():
+    """Benchmark zone updates and check the grid path matches and wins."""
+    result = run()
+    report(result)
+    assert result["grid"][1] == result["linear"][1]
+    assert result["grid"][0] < result["linear"][0]
+
+
+if __name__ == "__main__":
+    report(run())
@@ -0,0 +1,101 @@
+"""
+Wire codec microbenchmark: JSON vs the binary codec.
+
+Measures encode/decode time and frame size for a 2-player state_update
+snapshot (with 0 and 20 projectiles), a position_update broadcast and
+a client position input.
+
+Run:
+    python -m pytest tests/benchmarks/bench_codec.py -s
+    python tests/benchmarks/bench_codec.py
+"""
+
+import json
+import os
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("SUPABASE_URL", "https://test.supabase.co")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test-anon-key")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "test-service-key")
+
+from app.websocket import codec
+
+ITERATIONS = 20000
+P1 = "5b2f8a4e-1c3d-4e5f-8a9b-0c1d2e3f4a5b"
+P2 = "9c8b7a6d-5e4f-4a3b-9c2d-1e0f9a8b7c6d"
+
+
+def _state(projectiles: int) -> dict:
+    health = {"health": 100, "max_health": 100, "is_dead": False,
+              "invulnerable": False, "is_regenerating": False}
+    return {
+        "type": "state_update",
+        "payload": {
+            "tick": 4321,
+            "timestamp": 1700000000.25,
+            "players": {
+                P1: {"x": 412.3, "y": 380.1, "vx": 180.0, "vy": -42.5, "seq": 1200},
+                P2: {"x": 880.7, "y": 301.9, "vx": -90.0, "vy": 0.0, "seq": 1187},
+            },
+            "combat": {
+                "projectiles": [
+                    {"id": f"proj_{i}", "owner_id": P1 if i % 2 else P2,
+                     "x": 400.0 + i, "y": 300.0 + i, "vx": 600.0, "vy": -12.5}
+                    for i in range(projectiles)
+                ],
+                "players": {P1: dict(health), P2: dict(health)},
+            },
+            "buffs": {P1: [], P2: []},
+        },
+    }
+
+
+CASES = {
+    "state_update (0 proj)": (_state(0), False),
+    "state_update (20 proj)": (_state(20), False),
+    "position_update": ({"type": "position_update",
+                         "payload": {"player_id": P1, "x": 412.3, "y": 380.1}}, False),
+    "client position input": ({"type": "position_update",
+                               "payload": {"x": 412.3, "y": 380.1, "dx": 1.0, "dy": 0.0, "seq": 1201}}, True),
+}
+
+
+def _us(fn) -> float:
+    return timeit.timeit(fn, number=ITERATIONS) / ITERATIONS * 1e6
+
+
+def run() -> list:
+    rows = []
+    for name, (message, client) in CASES.items():
+        text = json.dumps(message)
+        frame = codec.encode(message, client=client)
+        rows.append((
+            name,
+            len(text), len(frame),
+            _us(lambda: json.dumps(message)),
+            _us(lambda: codec.encode(message, client=client)),
+            _us(lambda: json.loads(text)),
+            _us(lambda: codec.decode(frame, client=client)),
+        ))
+    return rows
+
+
+def report(rows: list) -> None:
+    print(f"\n{'message':<24} {'json B':>7} {'bin B':>6} {'json enc':>9} {'bin enc':>8} "
+          f"{'json dec':>9} {'bin dec':>8}  (us/op)")
+    for name, jb, bb, je, be, jd, bd in rows:
+        print(f"{name:<24} {jb:>7} {bb:>6} {je:>9.2f} {be:>8.2f} {jd:>9.2f} {bd:>8.2f}")
+
+
+def test_codec_throughput():
+    """Benchmark JSON vs binary for each hot message."""
+    rows = run()
+    report(rows)
+    assert all(bb < jb for _, jb, bb, *_ in rows)
+
+
+if __name__ == "__main__":
+    report(run())
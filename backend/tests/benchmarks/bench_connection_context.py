@@ -0,0 +1,118 @@
+"""
+Position update benchmark: per-message lobby lookup vs bound connection context.
+
+Feeds MESSAGES position updates from the host of a running 1v1 lobby
+through ArenaHandler.handle_position_update. The lookup path is the old
+one: await the lobby through LobbyService (a LobbyCache hit), look up the
+game session, and broadcast to the lobby, finding the sender's user id
+for every connection. The context path reads the lobby id, game session
+and the opponent's send queue from a ConnectionContext bound once. Both
+go through the real tick input queue and the opponent's SendQueue (not
+drained, so position updates coalesce); nothing is written to a socket.
+
+Run:
+    python -m pytest tests/benchmarks/bench_connection_context.py -s
+    python tests/benchmarks/bench_connection_context.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("SUPABASE_URL", "https://test.supabase.co")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test-anon-key")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "test-service-key")
+
+from app.game import tick_system
+from app.services.game.session import GameSession
+from app.services.lobby_service import LobbyService
+from app.utils.lobby_cache import lobby_cache
+from app.websocket.context import ConnectionContextRegistry
+from app.websocket.handlers.arena import ArenaHandler
+from app.websocket.manager import ConnectionManager
+from app.websocket.send_queue import SendQueue
+
+MESSAGES = 60_000
+CODE = "BENCH1"
+LOBBY = {"id": "bench-lobby", "code": CODE, "host_id": "u1", "opponent_id": "u2", "status": "in_progress"}
+
+
+async def _noop(*args) -> None:
+    pass
+
+
+def _manager(host_ws, guest_ws) -> ConnectionManager:
+    """Both players registered as if connected, with unstarted send queues."""
+    manager = ConnectionManager()
+    manager.active_connections[CODE] = {host_ws, guest_ws}
+    for ws, user_id in ((host_ws, "u1"), (guest_ws, "u2")):
+        manager.connection_info[ws] = (CODE, user_id)
+        manager.user_connections[user_id] = ws
+        manager._queues[ws] = SendQueue(send=_noop, on_error=lambda e: None)
+    return manager
+
+
+async def bench(bound: bool) -> float:
+    host_ws, guest_ws = MagicMock(), MagicMock()
+    manager = _manager(host_ws, guest_ws)
+    game = GameSession(lobby_id=LOBBY["id"], player1_id="u1", player2_id="u2", questions=[])
+    game_service = MagicMock()
+    game_service.get_session = lambda lobby_id: game
+    lobby_service = LobbyService(MagicMock())
+    lobby_cache._ttl = 3600.0  # Stay a cache hit for the whole run
+    lobby_cache.set(CODE, LOBBY)
+
+    handler = ArenaHandler(lobby_service, game_service)
+    handler.manager = manager
+    context = None
+    if bound:
+        registry = ConnectionContextRegistry()
+        context = await registry.bind(host_ws, CODE, "u1", lobby_service, game_service)
+        guest = await registry.bind(guest_ws, CODE, "u2", lobby_service, game_service)
+        context.queue, guest.queue = manager._queues[host_ws], manager._queues[guest_ws]
+
+    tick_system.create_game(CODE, "u1", "u2", seed=1)
+    tick_system.start_game(CODE, headless=True)
+    try:
+        start = time.perf_counter()
+        for i in range(MESSAGES):
+            payload = {"x": 100.0 + i % 500, "y": 360.0, "dx": 1, "dy": 0, "seq": i + 1}
+            await handler.handle_position_update(CODE, "u1", payload, context)
+        elapsed = time.perf_counter() - start
+    finally:
+        tick_system.stop_game(CODE)
+        lobby_cache.invalidate(CODE)
+    assert game.player_states["u1"].position_x == 100.0 + (MESSAGES - 1) % 500
+    assert manager._queues[guest_ws].depth == 1  # Coalesced to the latest position
+    return elapsed / MESSAGES * 1e6
+
+
+def run() -> dict:
+    ttl = lobby_cache._ttl
+    try:
+        return {"lookup": asyncio.run(bench(False)), "context": asyncio.run(bench(True))}
+    finally:
+        lobby_cache._ttl = ttl
+
+
+def report(result: dict) -> None:
+    print(f"\n{MESSAGES} position updates from one player of a running 1v1")
+    print(f"{'path':>8} {'us/msg':>8}")
+    for name, us in result.items():
+        print(f"{name:>8} {us:>8.2f}")
+    print(f"speedup {result['lookup'] / result['context']:.1f}x")
+
+
+def test_connection_context():
+    """Benchmark position updates and check the bound context is faster."""
+    result = run()
+    report(result)
+    assert result["context"] < result["lookup"]
+
+
+if __name__ == "__main__":
+    report(run())
@@ -0,0 +1,126 @@
+"""
+Message dispatch benchmark: if/elif chain with per-message logging vs route table.
+
+Feeds MESSAGES inbound messages shaped like live traffic for one player
+(60Hz position updates and snapshot acks, a shot every 15 ticks, a
+ready now and then) through the old GameHandler.handle_message shape -
+an if/elif chain that logs every non-ping message at INFO - and through
+MessageDispatcher with GameHandler's route table metadata. Logging is
+on at INFO into an in-memory stream, as in production; handlers are
+no-ops so only dispatch and logging are measured.
+
+Run:
+    python -m pytest tests/benchmarks/bench_dispatch.py -s
+    python tests/benchmarks/bench_dispatch.py
+"""
+
+import asyncio
+import io
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("SUPABASE_URL", "https://test.supabase.co")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test-anon-key")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "test-service-key")
+
+from app.middleware.rate_limit import MessageRateLimiter
+from app.websocket.dispatch import MessageDispatcher, MessageRoute, MessageStats
+from app.websocket.handlers.router import GameHandler
+
+MESSAGES = 60_000
+ORDER = [
+    "request_resync", "ready", "arena_init", "combat_kill", "combat_damage", "combat_shot",
+    "powerup_collected", "powerup_use", "telemetry_upload_replay", "telemetry_flag_death",
+    "queue_join", "queue_leave", "emote_trigger", "start_game", "answer",
+    "position_update", "combat_fire",
+]  # Old chain order after ping/ack, hot types near the end as in the original
+
+
+async def _noop(*args) -> None:
+    pass
+
+
+def traffic() -> list:
+    messages = []
+    for i in range(MESSAGES // 2):
+        messages.append({"type": "position_update", "payload": {"x": 1.0 * i, "y": 2.0, "dx": 1, "dy": 0, "seq": i}})
+        messages.append({"type": "state_ack", "payload": {"tick": i}})
+        if i % 15 == 0:
+            messages.append({"type": "combat_fire", "payload": {"dx": 1.0, "dy": 0.0, "seq": i}})
+        if i % 600 == 0:
+            messages.append({"type": "ready", "payload": {}})
+    return messages
+
+
+async def chain(logger: logging.Logger, messages: list) -> None:
+    """The old handle_message: log, then compare types in order."""
+    for message in messages:
+        msg_type = message.get("type")
+        payload = message.get("payload", {})
+        if msg_type not in ("ping", "state_ack"):
+            logger.info(f"[WS] Received message type={msg_type} from user=u1")
+        if msg_type == "ping" or msg_type == "state_ack":
+            await _noop(payload)
+            continue
+        for name in ORDER:
+            if msg_type == name:
+                await _noop(payload)
+                break
+
+
+async def table(messages: list) -> None:
+    routes = GameHandler(None, None)._routes()
+    dispatcher = MessageDispatcher(
+        {t: MessageRoute(_noop, r.schema, 0, r.log_level, r.log_every_s) for t, r in routes.items()},
+        MessageRateLimiter(10_000), MessageStats(),
+    )
+    for message in messages:
+        await dispatcher.dispatch(None, message, "LOBBY", "u1")
+
+
+def run() -> dict:
+    logger = logging.getLogger("websocket.handlers")
+    sink = io.StringIO()
+    handler = logging.StreamHandler(sink)
+    saved = logger.level, logger.propagate
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    messages = traffic()
+    result = {}
+    try:
+        for name, job in (("chain", lambda: chain(logger, messages)), ("table", lambda: table(messages))):
+            sink.seek(0)
+            sink.truncate()
+            start = time.perf_counter()
+            asyncio.run(job())
+            result[name] = ((time.perf_counter() - start) / len(messages) * 1e6, sink.getvalue().count("\n"))
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(saved[0])
+        logger.propagate = saved[1]
+    return result
+
+
+def report(result: dict) -> None:
+    print(f"\n{MESSAGES} position updates + acks (+ fire, ready), INFO logging on")
+    print(f"{'path':>8} {'us/msg':>8} {'log lines':>10}")
+    for name, (us, lines) in result.items():
+        print(f"{name:>8} {us:>8.2f} {lines:>10}")
+    print(f"speedup {result['chain'][0] / result['table'][0]:.1f}x")
+
+
+def test_dispatch():
+    """Benchmark dispatch and check the route table logs less and runs faster."""
+    result = run()
+    report(result)
+    assert result["table"][1] < result["chain"][1]
+    assert result["table"][0] < result["chain"][0]
+
+
+if __name__ == "__main__":
+    report(run())
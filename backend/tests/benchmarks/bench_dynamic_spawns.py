@@ -0,0 +1,107 @@
+"""
+Dynamic spawn placement benchmark: rejection sampling vs FreeSpace.
+
+Places hazard-sized spawns on the vortex-arena exclusion zones with 0,
+4 and 7 live spawns already on the map. The rejection path replays the
+old _find_valid_position (up to 20 random tries checked against every
+zone); the FreeSpace path copies the map's precomputed free space, blocks
+the live spawns, and samples. Reports microseconds per placement and
+the share of placements that found a position.
+
+Run:
+    python -m pytest tests/benchmarks/bench_dynamic_spawns.py -s
+    python tests/benchmarks/bench_dynamic_spawns.py
+"""
+
+import json
+import math
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("SUPABASE_URL", "https://test.supabase.co")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test-anon-key")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "test-service-key")
+
+from app.game.arena.maps import parse_map
+from app.game.dynamic_spawns import HAZARD_CLEARANCE, SpawnConfig, static_free_space
+
+MAP = Path(__file__).resolve().parent / "maps" / "vortex-arena.json"
+PLACEMENTS = 5000
+LIVE = (0, 4, 7)  # Default SpawnConfig allows 3 hazards + 4 traps
+LIVE_RADIUS = 45
+
+
+def _rejection(rng, config: SpawnConfig, zones: list, clearance: float, max_attempts: int = 20):
+    """The pre-FreeSpace sampler: random tries checked against every zone."""
+    for _ in range(max_attempts):
+        x = rng.uniform(config.spawn_margin, config.arena_width - config.spawn_margin)
+        y = rng.uniform(config.spawn_margin, config.arena_height - config.spawn_margin)
+        if all(math.sqrt((x - zx) ** 2 + (y - zy) ** 2) >= zr + clearance for zx, zy, zr in zones):
+            return x, y
+    return None
+
+
+def _live_spawns(config: SpawnConfig, count: int) -> list:
+    """count live spawns at seeded random positions."""
+    rng = random.Random(count)
+    return [
+        (
+            rng.uniform(config.spawn_margin, config.arena_width - config.spawn_margin),
+            rng.uniform(config.spawn_margin, config.arena_height - config.spawn_margin),
+            LIVE_RADIUS,
+        )
+        for _ in range(count)
+    ]
+
+
+def run() -> dict:
+    config = SpawnConfig()
+    static = tuple((z["x"], z["y"], z["radius"]) for z in parse_map(json.loads(MAP.read_text())).exclusion_zones)
+    result = {}
+    for count in LIVE:
+        live = _live_spawns(config, count)
+        zones = list(static) + live
+
+        rng = random.Random(1)
+        found = 0
+        start = time.perf_counter()
+        for _ in range(PLACEMENTS):
+            found += _rejection(rng, config, zones, HAZARD_CLEARANCE) is not None
+        rejection = ((time.perf_counter() - start) / PLACEMENTS * 1e6, found / PLACEMENTS)
+
+        rng = random.Random(1)
+        space = static_free_space(static, config, HAZARD_CLEARANCE).copy()
+        for circle in live:
+            space.block(*circle)
+        found = 0
+        start = time.perf_counter()
+        for _ in range(PLACEMENTS):
+            found += space.sample(rng) is not None
+        sampled = ((time.perf_counter() - start) / PLACEMENTS * 1e6, found / PLACEMENTS)
+
+        result[count] = {"rejection": rejection, "free_space": sampled}
+    return result
+
+
+def report(result: dict) -> None:
+    print(f"\n{'live':>5} {'path':>11} {'us/spawn':>9} {'found':>7}")
+    for count, paths in result.items():
+        for name, (us, found) in paths.items():
+            print(f"{count:>5} {name:>11} {us:>9.2f} {found:>7.1%}")
+
+
+def test_dynamic_spawn_placement():
+    """Benchmark placement and check FreeSpace always finds room when rejection can."""
+    result = run()
+    report(result)
+    for paths in result.values():
+        assert paths["free_space"][0] < paths["rejection"][0]
+        assert paths["free_space"][1] >= paths["rejection"][1]
+
+
+if __name__ == "__main__":
+    report(run())
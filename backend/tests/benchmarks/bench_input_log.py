@@ -0,0 +1,91 @@
+"""
+Input log benchmark: log size and per-tick cost.
+
+Simulates MATCHES matches for DURATION_S seconds with and without the
+input log and reports the tick cost each way. Each log is then
+re-simulated to capture the state messages the match broadcast, which
+are encoded the way ReplayService stores replay frames (JSON, zlib
+level 6, base64) to compare against the log's size.
+
+Run:
+    python -m pytest tests/benchmarks/bench_input_log.py -s
+    python tests/benchmarks/bench_input_log.py
+"""
+
+import base64
+import json
+import os
+import sys
+import tempfile
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("SUPABASE_URL", "https://test.supabase.co")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test-anon-key")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "test-service-key")
+
+from app.game.config import InputLogConfig
+from app.game.input_log import resimulate
+from app.game.simulation import SimulationConfig, simulate
+
+MAPS_DIR = Path(__file__).resolve().parent / "maps"
+MATCHES = 20
+DURATION_S = 30.0
+
+
+def load_maps() -> dict:
+    return {path.stem: json.loads(path.read_text()) for path in sorted(MAPS_DIR.glob("*.json"))}
+
+
+def replay_size(messages: list) -> int:
+    """Bytes ReplayService.store_replay would store for these frames."""
+    compressed = zlib.compress(json.dumps(messages).encode(), level=6)
+    return len(base64.b64encode(compressed))
+
+
+def run() -> dict:
+    maps = load_maps()
+    config = SimulationConfig(matches=MATCHES, duration_s=DURATION_S)
+    plain = simulate(config, maps)
+    with tempfile.TemporaryDirectory() as directory:
+        logged = simulate(config, maps, input_log_config=InputLogConfig(enabled=True, directory=directory))
+        log_bytes = replay_bytes = 0
+        for path in sorted(Path(directory).glob("*.ilog")):
+            messages = []
+
+            async def capture(lobby_id: str, message: dict) -> None:
+                messages.append(message)
+
+            resimulate(str(path), broadcast=capture)
+            log_bytes += path.stat().st_size
+            replay_bytes += replay_size(json.loads(json.dumps(messages, default=str)))
+    return {
+        "ticks": logged.ticks,
+        "plain": plain,
+        "logged": logged,
+        "log_bytes": log_bytes,
+        "replay_bytes": replay_bytes,
+    }
+
+
+def report(result: dict) -> None:
+    print(f"\n{'path':>8} {'ticks/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for name in ("plain", "logged"):
+        r = result[name]
+        print(f"{name:>8} {r.ticks_per_sec:>10.0f} {r.tick_ms_p50:>8.3f} {r.tick_ms_p99:>8.3f}")
+    ticks = result["ticks"]
+    print(f"input log  {result['log_bytes'] / 1024:>8.1f} KiB  {result['log_bytes'] / ticks:>6.1f} B/tick")
+    print(f"replay     {result['replay_bytes'] / 1024:>8.1f} KiB  {result['replay_bytes'] / ticks:>6.1f} B/tick")
+    print(f"ratio      {result['log_bytes'] / result['replay_bytes']:.1%}")
+
+
+def test_input_log():
+    """Benchmark the input log and check it is a small fraction of the replay size."""
+    result = run()
+    report(result)
+    assert result["log_bytes"] < result["replay_bytes"] / 4
+
+
+if __name__ == "__main__":
+    report(run())
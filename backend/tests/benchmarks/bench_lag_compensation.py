@@ -0,0 +1,106 @@
+"""
+Lag compensation benchmark: linear deque scan vs PositionHistory bisect.
+
+Measures LagCompensator.check_hit() throughput (hit checks per second)
+against a full 5s history at 60Hz and 120Hz, the shape of a high fire
+rate burst. The deque path replays the original oldest-first scan.
+
+Run:
+    python -m pytest tests/benchmarks/bench_lag_compensation.py -s
+    python tests/benchmarks/bench_lag_compensation.py
+"""
+
+import os
+import random
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("SUPABASE_URL", "https://test.supabase.co")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test-anon-key")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "test-service-key")
+
+from app.game.config import LAG_COMP_CONFIG
+from app.game.lag_compensation import LagCompensator
+from app.game.models import PlayerState, PositionFrame, PositionHistory
+
+CHECKS = 20000
+RATES = (60, 120)
+
+
+def _linear_position(frames: deque, target_time: float) -> PositionFrame:
+    """The pre-ring rewind: scan from the oldest frame."""
+    before = after = None
+    for frame in frames:
+        if frame.timestamp <= target_time:
+            before = frame
+        else:
+            after = frame
+            break
+    if before and after:
+        dt = after.timestamp - before.timestamp
+        if dt > 0:
+            t = min(1.0, max(0.0, (target_time - before.timestamp) / dt))
+            return PositionFrame(
+                target_time,
+                before.x + (after.x - before.x) * t,
+                before.y + (after.y - before.y) * t,
+                before.sequence,
+            )
+    return before or after
+
+
+def _player(rate: int, now: float) -> PlayerState:
+    """A player with a full history ending at now."""
+    rng = random.Random(rate)
+    size = LAG_COMP_CONFIG.history_size(rate)
+    player = PlayerState(player_id="target", position_history=PositionHistory(size))
+    for i in range(size):
+        player.x, player.y = rng.uniform(0, 1280), rng.uniform(0, 720)
+        player.position_history.record(now - (size - i) / rate, player.x, player.y, i)
+    return player
+
+
+def bench(rate: int) -> tuple:
+    """(deque checks/s, ring checks/s) at one history tick rate."""
+    lag_comp = LagCompensator()
+    now = time.time()
+    player = _player(rate, now)
+    frames = deque(player.position_history, maxlen=player.position_history.maxlen)
+    rng = random.Random(0)
+    targets = [now - rng.uniform(0.0, LAG_COMP_CONFIG.max_rewind_s) for _ in range(CHECKS)]
+
+    start = time.perf_counter()
+    for target in targets:
+        _linear_position(frames, target)
+    linear = CHECKS / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for target in targets:
+        lag_comp.check_hit(player, (640.0, 360.0), target)
+    ring = CHECKS / (time.perf_counter() - start)
+    return linear, ring
+
+
+def run() -> list:
+    return [(rate, *bench(rate)) for rate in RATES]
+
+
+def report(rows: list) -> None:
+    print(f"\n{'history':>10} {'deque checks/s':>16} {'ring checks/s':>16} {'speedup':>8}")
+    for rate, linear, ring in rows:
+        frames = LAG_COMP_CONFIG.history_size(rate)
+        print(f"{frames:>7} fr {linear:>16.0f} {ring:>16.0f} {ring / linear:>7.1f}x")
+
+
+def test_hit_check_throughput():
+    """Benchmark rewind lookups at each history size."""
+    rows = run()
+    report(rows)
+    assert all(ring > 0 for _, _, ring in rows)
+
+
+if __name__ == "__main__":
+    report(run())
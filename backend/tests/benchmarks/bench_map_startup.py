@@ -0,0 +1,120 @@
+"""
+Match startup benchmark: per-match config parsing vs compiled maps.
+
+For each benchmark map, measures the arena part of match startup (load
+the arena systems and build dynamic-spawn exclusion zones) when every
+match parses the raw config, and when matches load the registry's
+compiled map (fingerprint lookup + copy-on-write grid). Also reports
+traced KiB held by MATCHES live arenas each way.
+
+Run:
+    python -m pytest tests/benchmarks/bench_map_startup.py -s
+    python tests/benchmarks/bench_map_startup.py
+"""
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("SUPABASE_URL", "https://test.supabase.co")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test-anon-key")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "test-service-key")
+
+from app.game.arena import ServerArenaSystems
+from app.game.map_registry import MapRegistry
+
+MAPS_DIR = Path(__file__).resolve().parent / "maps"
+STARTS = 300
+ROUNDS = 3
+MATCHES = 100
+
+
+def load_maps() -> dict:
+    return {path.stem: json.loads(path.read_text()) for path in sorted(MAPS_DIR.glob("*.json"))}
+
+
+def _legacy_exclusion_zones(config: dict) -> list:
+    """The per-match exclusion zone build init_arena_config used to run."""
+    zones = []
+    for tp in config.get("teleporters", []):
+        zones.append({"x": tp["position"]["x"], "y": tp["position"]["y"], "radius": tp["radius"] + 60})
+    for jp in config.get("jumpPads", []):
+        zones.append({"x": jp["position"]["x"], "y": jp["position"]["y"], "radius": jp["radius"] + 60})
+    for sp in config.get("spawnPoints", []):
+        zones.append({"x": sp["position"]["x"], "y": sp["position"]["y"], "radius": 100})
+    return zones
+
+
+def start_parsed(slug: str, config: dict, registry: MapRegistry) -> ServerArenaSystems:
+    arena = ServerArenaSystems()
+    arena.initialize_from_config(config)
+    _legacy_exclusion_zones(config)
+    return arena
+
+
+def start_compiled(slug: str, config: dict, registry: MapRegistry) -> ServerArenaSystems:
+    arena = ServerArenaSystems()
+    arena_map = registry.get(slug, config)
+    arena.initialize_from_map(arena_map)
+    return arena
+
+
+def time_starts(start, slug: str, config: dict) -> float:
+    """Microseconds per match startup (best of ROUNDS)."""
+    registry = MapRegistry()
+    start(slug, config, registry)  # Compile outside the timed region
+    best = float("inf")
+    for _ in range(ROUNDS):
+        began = time.perf_counter()
+        for _ in range(STARTS):
+            start(slug, config, registry).reset()
+        best = min(best, time.perf_counter() - began)
+    return best / STARTS * 1e6
+
+
+def kib_per_match(start, slug: str, config: dict) -> float:
+    """Traced KiB held per live match arena (the compiled map itself excluded)."""
+    registry = MapRegistry()
+    start(slug, config, registry)
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    arenas = [start(slug, config, registry) for _ in range(MATCHES)]
+    for arena in arenas:
+        arena.get_and_clear_events()
+    size = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return size / MATCHES / 1024
+
+
+def run() -> dict:
+    return {
+        slug: {
+            "parsed": (time_starts(start_parsed, slug, config), kib_per_match(start_parsed, slug, config)),
+            "compiled": (time_starts(start_compiled, slug, config), kib_per_match(start_compiled, slug, config)),
+        }
+        for slug, config in load_maps().items()
+    }
+
+
+def report(result: dict) -> None:
+    print(f"\n{'map':>16} {'path':>9} {'us/start':>9} {'KiB/match':>10}")
+    for slug, paths in result.items():
+        for name, (us, kib) in paths.items():
+            print(f"{slug:>16} {name:>9} {us:>9.1f} {kib:>10.1f}")
+
+
+def test_map_startup():
+    """Benchmark arena startup and check compiled maps are cheaper per match."""
+    result = run()
+    report(result)
+    for paths in result.values():
+        assert paths["compiled"][0] < paths["parsed"][0]
+        assert paths["compiled"][1] < paths["parsed"][1]
+
+
+if __name__ == "__main__":
+    report(run())
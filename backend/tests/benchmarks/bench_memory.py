@@ -0,0 +1,143 @@
+"""
+Memory benchmark: per-tick model footprint and per-match memory.
+
+Reports, for each per-tick model, bytes per instance as a plain
+__dict__ dataclass (before) and as the slotted dataclass (after), then
+runs traced headless matches with the object pools disabled and enabled
+and reports allocation per tick, traced KiB per match and an estimate
+of what the live model instances would cost per match without slots.
+
+Finishes with a soak run (several simulated minutes) and reports traced
+memory growth over its second half, which should stay at ~0.
+
+Run:
+    python -m pytest tests/benchmarks/bench_memory.py -s
+    python tests/benchmarks/bench_memory.py
+"""
+
+import dataclasses
+import json
+import os
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("SUPABASE_URL", "https://test.supabase.co")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test-anon-key")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "test-service-key")
+
+from app.game.arena.types import ArenaEvent
+from app.game.buffs import Buff, BuffType
+from app.game.combat import PROJECTILE_POOL, CombatEvent, PlayerCombatState, ServerProjectile
+from app.game.models import FRAME_POOL, INPUT_POOL, FireInput, PlayerInput, PlayerState, PositionFrame
+from app.game.simulation import SimulationConfig, simulate
+
+MAPS_DIR = Path(__file__).resolve().parent / "maps"
+INSTANCES = 10_000
+MATCHES = 4
+DURATION_S = 10.0
+SOAK_S = 180.0
+
+# One constructor call per model, with typical field values
+SAMPLES = {
+    PlayerState: lambda: PlayerState(player_id="p1", x=100.0, y=200.0),
+    PositionFrame: lambda: PositionFrame(1.0, 100.0, 200.0, 1),
+    PlayerInput: lambda: PlayerInput("p1", 100.0, 200.0, 1.0, 0.0, 1, 1.0),
+    FireInput: lambda: FireInput("p1", 1.0, 0.0, 1, 1.0),
+    ServerProjectile: lambda: ServerProjectile("p_1", "p1", 1.0, 2.0, 600.0, 0.0, 1.0, 2.0, 1.0),
+    PlayerCombatState: lambda: PlayerCombatState(player_id="p1"),
+    CombatEvent: lambda: CombatEvent("fire", {}, 1.0),
+    ArenaEvent: lambda: ArenaEvent("hazard_spawn", {}, 1.0),
+    Buff: lambda: Buff(BuffType.DAMAGE_BOOST, 0.25, 1.0, "quiz_correct"),
+}
+
+
+def load_maps() -> dict:
+    return {path.stem: json.loads(path.read_text()) for path in sorted(MAPS_DIR.glob("*.json"))}
+
+
+def unslotted(cls: type) -> type:
+    """The same fields as a plain dataclass (the pre-slots layout)."""
+    return dataclasses.make_dataclass(cls.__name__, [(f.name, f.type) for f in dataclasses.fields(cls)])
+
+
+def bytes_per_instance(build) -> float:
+    """Traced bytes per instance, excluding shared field values."""
+    keep = []
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    for _ in range(INSTANCES):
+        keep.append(build())
+    size = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return size / INSTANCES - 8  # Minus the list slot
+
+
+def model_sizes() -> dict:
+    sizes = {}
+    for cls, sample in SAMPLES.items():
+        obj = sample()
+        values = [getattr(obj, f.name) for f in dataclasses.fields(cls)]
+        plain = unslotted(cls)
+        sizes[cls.__name__] = (
+            bytes_per_instance(lambda: plain(*values)),
+            bytes_per_instance(lambda: cls(*values)),
+        )
+    return sizes
+
+
+def set_pools(capacity: int) -> None:
+    for pool in (INPUT_POOL, FRAME_POOL, PROJECTILE_POOL):
+        pool.capacity = capacity
+        pool.clear()
+
+
+def run() -> dict:
+    maps = load_maps()
+    config = SimulationConfig(matches=MATCHES, duration_s=DURATION_S, trace_allocations=True)
+    capacities = {pool: pool.capacity for pool in (INPUT_POOL, FRAME_POOL, PROJECTILE_POOL)}
+    try:
+        set_pools(0)
+        unpooled = simulate(config, maps)
+    finally:
+        for pool, capacity in capacities.items():
+            pool.capacity = capacity
+    pooled = simulate(config, maps)
+    soak = simulate(SimulationConfig(matches=2, duration_s=SOAK_S, trace_allocations=True), maps)
+    return {"sizes": model_sizes(), "unpooled": unpooled, "pooled": pooled, "soak": soak}
+
+
+def per_match_before(result: dict) -> float:
+    """Traced KiB/match had the live model instances kept a __dict__."""
+    pooled = result["pooled"]
+    extra = sum(
+        count * (result["sizes"][name][0] - result["sizes"][name][1])
+        for name, count in pooled.live_objects.items()
+    )
+    return pooled.kib_per_match + extra / 1024 / pooled.matches
+
+
+def report(result: dict) -> None:
+    print(f"\n{'model':>18} {'dict B':>8} {'slots B':>8} {'saved':>6}")
+    for name, (before, after) in result["sizes"].items():
+        print(f"{name:>18} {before:>8.0f} {after:>8.0f} {1 - after / before:>6.0%}")
+
+    unpooled, pooled, soak = result["unpooled"], result["pooled"], result["soak"]
+    print(f"\n{'per match':>18} {'before':>10} {'after':>10}")
+    print(f"{'traced KiB':>18} {per_match_before(result):>10.1f} {pooled.kib_per_match:>10.1f}")
+    print(f"{'alloc KiB/tick':>18} {unpooled.alloc_kib_per_tick:>10.2f} {pooled.alloc_kib_per_tick:>10.2f}")
+    print(f"\nsoak {soak.simulated_s:.0f}s x {soak.matches}: "
+          f"growth {soak.growth_kib_per_match:+.2f} KiB/match over the second half")
+
+
+def test_memory_per_match():
+    """Benchmark model footprint and check the soak run does not grow."""
+    result = run()
+    report(result)
+    assert all(after < before for before, after in result["sizes"].values())
+    assert result["soak"].growth_kib_per_match < 8.0
+
+
+if __name__ == "__main__":
+    report(run())
@@ -0,0 +1,81 @@
+"""
+Projectile engine benchmark: dict path vs NumPy struct-of-arrays store.
+
+Measures ServerCombatSystem.update() throughput with 10, 100 and 1000
+live projectiles. Projectiles are re-seeded outside the timed region so
+every timed tick simulates the full population.
+
+Run:
+    python -m pytest tests/benchmarks/bench_projectiles.py -s
+    python tests/benchmarks/bench_projectiles.py
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("SUPABASE_URL", "https://test.supabase.co")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test-anon-key")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "test-service-key")
+
+from app.game.combat import ServerCombatSystem
+from app.game.projectiles import NUMPY_AVAILABLE
+
+DT = 1 / 60
+TICKS = 200
+COUNTS = (10, 100, 1000)
+PLAYERS = {"p1": (100.0, 100.0), "p2": (1180.0, 620.0)}
+
+
+def _seed(combat: ServerCombatSystem, count: int) -> None:
+    """Fill the arena with count projectiles that miss everything."""
+    combat.reset()
+    for pid in PLAYERS:
+        combat.init_player(pid)
+    for i in range(count):
+        combat._combat_states["p1"].last_fire_time = 0
+        # Rows of slow horizontal shots in the open lanes
+        y = 130 + (i % 50) * 1.0
+        combat.process_fire("p1", (300.0 + (i // 50) * 10, y), (1, 0), 0.0)
+
+
+def bench(count: int, vectorized: bool) -> float:
+    """Ticks per second for update() at a fixed projectile count."""
+    combat = ServerCombatSystem(vectorized=vectorized)
+    combat.PROJECTILE_SPEED = 1.0
+    elapsed = 0.0
+    for _ in range(TICKS // 20):
+        _seed(combat, count)
+        start = time.perf_counter()
+        for _ in range(20):
+            combat.update(DT, PLAYERS)
+        elapsed += time.perf_counter() - start
+    return TICKS / elapsed
+
+
+def run() -> list:
+    rows = []
+    for count in COUNTS:
+        dict_tps = bench(count, vectorized=False)
+        vec_tps = bench(count, vectorized=True) if NUMPY_AVAILABLE else float("nan")
+        rows.append((count, dict_tps, vec_tps))
+    return rows
+
+
+def report(rows: list) -> None:
+    print(f"\n{'projectiles':>12} {'dict ticks/s':>14} {'numpy ticks/s':>14} {'speedup':>8}")
+    for count, dict_tps, vec_tps in rows:
+        print(f"{count:>12} {dict_tps:>14.0f} {vec_tps:>14.0f} {vec_tps / dict_tps:>7.1f}x")
+
+
+def test_projectile_throughput():
+    """Benchmark both projectile paths at each population size."""
+    rows = run()
+    report(rows)
+    assert all(dict_tps > 0 for _, dict_tps, _ in rows)
+
+
+if __name__ == "__main__":
+    report(run())
@@ -0,0 +1,133 @@
+"""
+Spectator fan-out benchmark: watchers as participants vs spectators.
+
+Broadcasts TICKS tick frames (combat event + state_update) to a lobby
+with two players and WATCHERS extra connections, first joined as
+ordinary participants (the old /ws/{lobby_code} path) and then as
+spectators. Reports the time the tick loop spends in the broadcast per
+tick, and the time the delayed spectator fan-out takes per snapshot
+(spent outside the tick).
+
+Run:
+    python -m pytest tests/benchmarks/bench_spectators.py -s
+    python tests/benchmarks/bench_spectators.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("SUPABASE_URL", "https://test.supabase.co")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test-anon-key")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "test-service-key")
+
+from app.game.config import NetworkConfig
+from app.game.frames import build_frame
+from app.game.snapshots import SnapshotRegistry
+from app.websocket.handlers import router
+from app.websocket.manager import ConnectionManager
+from app.websocket.spectators import SpectatorFeed
+
+TICKS = 600
+WATCHERS = (0, 100, 500)
+CONFIG = NetworkConfig(spectator_interval_s=0.25, spectator_delay_s=0.0)
+
+
+class _Socket:
+    """Socket stand-in whose writes cost nothing."""
+
+    async def accept(self, subprotocol=None) -> None:
+        pass
+
+    async def send_text(self, data: str) -> None:
+        pass
+
+    async def send_bytes(self, data: bytes) -> None:
+        pass
+
+
+def _frame(tick: int) -> dict:
+    players = {
+        pid: {"x": 100.0 + tick, "y": 200.0, "vx": 1.0, "vy": 0.0, "seq": tick, "health": 100}
+        for pid in ("p1", "p2")
+    }
+    projectiles = [{"id": f"b{i}", "owner_id": "p1", "x": 10.0 * i, "y": 5.0, "vx": 300.0, "vy": 0.0} for i in range(8)]
+    state = {"type": "state_update", "payload": {"tick": tick, "players": players, "combat": {"projectiles": projectiles}}}
+    event = {"type": "combat_hit", "payload": {"target_id": "p2", "damage": 10}}
+    return build_frame(tick, [event, state])
+
+
+async def _run(watchers: int, spectate: bool) -> dict:
+    manager = ConnectionManager(max_connections=10_000, max_per_lobby=10_000, network_config=CONFIG)
+    feed = SpectatorFeed(manager, CONFIG)
+    router.manager, router.snapshot_registry, router.spectator_feed = manager, SnapshotRegistry(), feed
+    for pid in ("p1", "p2"):
+        await manager.connect(_Socket(), "LOBBY", pid, tick_frames=True)
+    for i in range(watchers):
+        if spectate:
+            await manager.connect_spectator(_Socket(), "LOBBY", f"w{i}")
+        else:
+            await manager.connect(_Socket(), "LOBBY", f"w{i}", tick_frames=True)
+
+    fanout = manager.fan_out_to_spectators
+    fanout_s = 0.0
+
+    def timed_fanout(lobby_code, frames):
+        nonlocal fanout_s
+        start = time.perf_counter()
+        queued = fanout(lobby_code, frames)
+        fanout_s += time.perf_counter() - start
+        return queued
+
+    manager.fan_out_to_spectators = timed_fanout
+    tick_s = 0.0
+    for tick in range(TICKS):
+        message = _frame(tick)
+        start = time.perf_counter()
+        await router._broadcast_tick_state("LOBBY", message)
+        tick_s += time.perf_counter() - start
+        if tick % 6 == 0:
+            feed._last_sample.clear()  # Sample every 6th tick whatever the wall time
+        await manager.flush()
+        await asyncio.sleep(0)  # Let due spectator snapshots fan out
+    return {
+        "tick_us": tick_s / TICKS * 1e6,
+        "fanout_us": fanout_s / max(1, feed.sampled) * 1e6 if spectate else 0.0,
+        "sampled": feed.sampled,
+    }
+
+
+def run() -> dict:
+    saved = router.manager, router.snapshot_registry, router.spectator_feed
+    try:
+        return {
+            (watchers, spectate): asyncio.run(_run(watchers, spectate))
+            for watchers in WATCHERS
+            for spectate in (False, True)
+        }
+    finally:
+        router.manager, router.snapshot_registry, router.spectator_feed = saved
+
+
+def report(result: dict) -> None:
+    print(f"\n{'watchers':>8} {'as':>12} {'tick us':>9} {'fan-out us':>11}")
+    for (watchers, spectate), r in result.items():
+        role = "spectators" if spectate else "participants"
+        print(f"{watchers:>8} {role:>12} {r['tick_us']:>9.1f} {r['fanout_us']:>11.1f}")
+
+
+def test_spectator_fanout():
+    """Benchmark fan-out and check spectators keep the tick cost flat."""
+    result = run()
+    report(result)
+    base = result[(0, True)]["tick_us"]
+    for watchers in WATCHERS[1:]:
+        assert result[(watchers, True)]["tick_us"] < result[(watchers, False)]["tick_us"]
+        assert result[(watchers, True)]["tick_us"] < base * 3
+
+
+if __name__ == "__main__":
+    report(run())
@@ -0,0 +1,152 @@
+"""
+State assembly benchmark: full per-tick rebuild vs dirty-tracked fragments.
+
+Builds the combat, arena and buff parts of state_update for TICKS ticks
+on an arena with 60 hazards, 60 traps, 40 barriers, 20 power-ups and a
+few doors and moving platforms, with 8 players wandering over it. Each
+tick's state is then diffed against the previous one, as the snapshot
+registry does for acked clients. The full path rebuilds every entity's
+fragment every tick (the old get_state loops); the cached path only
+rebuilds entities that changed.
+
+Run:
+    python -m pytest tests/benchmarks/bench_state_assembly.py -s
+    python tests/benchmarks/bench_state_assembly.py
+"""
+
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("SUPABASE_URL", "https://test.supabase.co")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test-anon-key")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "test-service-key")
+
+from app.game.arena import HazardType, ServerArenaSystems, TrapEffect, TrapType
+from app.game.buffs import BuffManager, BuffType
+from app.game.combat import ServerCombatSystem
+from app.game.snapshots import diff_state
+
+DT = 1 / 60
+TICKS = 3000
+PLAYERS = 8
+WIDTH, HEIGHT = 1280, 720
+
+
+def build():
+    rng = random.Random(3)
+    arena = ServerArenaSystems()
+    for i in range(60):
+        arena.add_hazard(
+            f"h{i}", rng.choice(list(HazardType)), rng.uniform(0, WIDTH - 120), rng.uniform(0, HEIGHT - 120),
+            rng.uniform(40, 120), rng.uniform(40, 120),
+        )
+    for i in range(60):
+        arena.add_trap(
+            f"t{i}", rng.choice([TrapType.PRESSURE, TrapType.PROJECTILE]), rng.uniform(0, WIDTH),
+            rng.uniform(0, HEIGHT), rng.uniform(20, 40), rng.choice(list(TrapEffect)), 10, 3.0,
+        )
+    for i in range(6):
+        arena.add_door(f"d{i}", 200 * i, 50, 40, 120, trigger="pressure_plate", linked_trigger_id=f"plate{i}")
+    for i in range(4):
+        y = 150 + 150 * i
+        arena.add_platform(f"pl{i}", 100, 20, [{"x": 100, "y": y}, {"x": 500, "y": y}], 100, pause_at_waypoints=1.0)
+    for i in range(40):
+        arena.add_barrier(
+            f"b{i}", rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT), 40, 40,
+            barrier_type=rng.choice(["solid", "destructible"]), health=1000,
+        )
+    for i in range(20):
+        arena.spawn_powerup(f"pu{i}", rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT), "shield")
+
+    buffs = BuffManager()
+    combat = ServerCombatSystem(buff_manager=buffs)
+    for i in range(PLAYERS):
+        combat.init_player(f"p{i}")
+        buffs.init_player(f"p{i}")
+    return arena, combat, buffs
+
+
+def full_state(arena, combat, buffs) -> dict:
+    """Every fragment rebuilt, as the get_state loops did before caching."""
+    return {
+        "combat": {
+            "projectiles": [],
+            "players": {pid: combat._player_fragment(pid) for pid in combat._combat_states},
+        },
+        "arena": {
+            "hazards": [arena.hazards._fragment(k) for k in arena.hazards._hazards],
+            "traps": [arena.traps._fragment(k) for k in arena.traps._traps],
+            "doors": [arena.doors._fragment(k) for k in arena.doors.doors],
+            "platforms": [arena.platforms._fragment(k) for k in arena.platforms.platforms],
+            "barriers": [arena.barriers._fragment(k) for k in arena.barriers.barriers],
+            "powerups": [arena.powerups._fragment(k) for k in arena.powerups.powerups],
+        },
+        "buffs": {pid: buffs._fragment(pid) for pid in buffs._players},
+    }
+
+
+def cached_state(arena, combat, buffs) -> dict:
+    return {
+        "combat": combat.get_combat_state(),
+        "arena": arena.get_arena_state(),
+        "buffs": buffs.get_buff_state_for_broadcast(),
+    }
+
+
+def bench(assemble) -> tuple:
+    arena, combat, buffs = build()
+    rng = random.Random(9)
+    positions = {f"p{i}": (rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT)) for i in range(PLAYERS)}
+    previous, delta_keys, elapsed = None, 0, 0.0
+    for tick in range(TICKS):
+        now = 1000.0 + tick * DT
+        positions = {
+            pid: (min(WIDTH, max(0, x + rng.uniform(-5, 5))), min(HEIGHT, max(0, y + rng.uniform(-5, 5))))
+            for pid, (x, y) in positions.items()
+        }
+        arena.hazards.update(positions, now)
+        arena.traps.update(DT, positions, now)
+        arena.doors.update(DT, now)
+        arena.platforms.update(DT)
+        if tick % 120 == 0:
+            arena.doors.trigger_by_link(f"plate{tick // 120 % 6}", now)
+            arena.apply_barrier_damage(f"b{tick // 120 % 40}", 10)
+            combat._apply_damage(f"p{tick // 120 % PLAYERS}", "p0", 10, now)
+        if tick % 600 == 0:
+            buffs.apply_buff(f"p{tick // 600 % PLAYERS}", BuffType.SPEED_BOOST, 0.2, 2.0, "quiz")
+        buffs.update(time.time())
+
+        start = time.perf_counter()
+        state = assemble(arena, combat, buffs)
+        if previous is not None:
+            delta_keys += len(diff_state(previous, state))
+        elapsed += time.perf_counter() - start
+        previous = state
+    return elapsed / TICKS * 1e6, delta_keys
+
+
+def run() -> dict:
+    return {"full": bench(full_state), "cached": bench(cached_state)}
+
+
+def report(result: dict) -> None:
+    print(f"\n{PLAYERS} players, 190 arena entities, {TICKS} ticks (assemble + diff)")
+    print(f"{'path':>8} {'us/tick':>10} {'deltas':>8}")
+    for name, (us, deltas) in result.items():
+        print(f"{name:>8} {us:>10.1f} {deltas:>8}")
+    print(f"speedup {result['full'][0] / result['cached'][0]:.1f}x")
+
+
+def test_state_assembly():
+    """Benchmark state assembly and check the cached path wins."""
+    result = run()
+    report(result)
+    assert result["cached"][0] < result["full"][0]
+
+
+if __name__ == "__main__":
+    report(run())
@@ -0,0 +1,74 @@
+"""
+Tick benchmark: headless matches on the real client map configs.
+
+Runs the simulator with 1, 10 and 100 concurrent matches for 10
+simulated seconds each and reports ticks/sec, p50/p99 tick latency and
+RSS per match, then a smaller tracemalloc pass for allocations per tick.
+Maps are the client MapConfigs in tests/benchmarks/maps/, as sent in
+arena_init.
+
+Set TICK_BENCH_MAX_P99_MS to fail the run when any p99 exceeds it
+(regression gate for game/ changes).
+
+Run:
+    python -m pytest tests/benchmarks/bench_tick.py -s
+    python tests/benchmarks/bench_tick.py
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("SUPABASE_URL", "https://test.supabase.co")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test-anon-key")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "test-service-key")
+
+from app.game.simulation import SimulationConfig, simulate
+
+MAPS_DIR = Path(__file__).resolve().parent / "maps"
+MATCH_COUNTS = (1, 10, 100)
+DURATION_S = 10.0
+
+
+def load_maps() -> dict:
+    return {path.stem: json.loads(path.read_text()) for path in sorted(MAPS_DIR.glob("*.json"))}
+
+
+def run() -> list:
+    maps = load_maps()
+    reports = [
+        simulate(SimulationConfig(matches=count, duration_s=DURATION_S), maps)
+        for count in MATCH_COUNTS
+    ]
+    reports.append(
+        simulate(SimulationConfig(matches=3, duration_s=2.0, trace_allocations=True), maps)
+    )
+    return reports
+
+
+def report(reports: list) -> None:
+    print(f"\n{'matches':>8} {'ticks/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+          f"{'KiB/tick':>9} {'RSS KiB/match':>14}")
+    for r in reports:
+        alloc = f"{r.alloc_kib_per_tick:.1f}" if r.alloc_kib_per_tick is not None else "-"
+        rss = f"{r.rss_kib_per_match:.0f}" if r.rss_kib_per_match is not None else "-"
+        print(f"{r.matches:>8} {r.ticks_per_sec:>10.0f} {r.tick_ms_p50:>8.3f} {r.tick_ms_p99:>8.3f} "
+              f"{r.tick_ms_max:>8.3f} {alloc:>9} {rss:>14}")
+
+
+def test_tick_throughput():
+    """Benchmark headless matches at each concurrency level."""
+    reports = run()
+    report(reports)
+    assert all(r.ticks_per_sec > 0 for r in reports)
+
+    max_p99 = os.environ.get("TICK_BENCH_MAX_P99_MS")
+    if max_p99:
+        timed = [r for r in reports if r.alloc_kib_per_tick is None]
+        assert all(r.tick_ms_p99 <= float(max_p99) for r in timed), "tick p99 regression"
+
+
+if __name__ == "__main__":
+    report(run())
@@ -0,0 +1,194 @@
+"""
+Unit tests for grid-indexed hazards and traps.
+
+Tests enter/exit tracking from cell membership, idle trap skipping,
+and parity with the linear hazard/trap scans they replaced.
+"""
+
+import random
+
+from app.game.arena import (
+    HazardManager,
+    HazardType,
+    ServerArenaSystems,
+    TrapEffect,
+    TrapManager,
+    TrapState,
+    TrapType,
+)
+
+
+def _events(manager, name):
+    return [e.data for e in manager.get_and_clear_events() if e.event_type == name]
+
+
+class TestHazardZones:
+    """Hazard enter/exit tracking tests."""
+
+    def test_enter_and_exit_across_cells(self):
+        """Test a player leaving for a far cell still gets its exit event."""
+        manager = HazardManager()
+        manager.add("h1", HazardType.SLOW, 0, 0, 100, 100, intensity=0.5)
+        manager.get_and_clear_events()
+
+        manager.update({"p1": (50, 50)}, 1.0)
+        assert _events(manager, "hazard_enter") == [
+            {"hazard_id": "h1", "player_id": "p1", "type": "slow"}
+        ]
+        assert manager.get_speed_multiplier("p1") == 0.75
+
+        manager.update({"p1": (1000, 600)}, 1.1)
+        assert _events(manager, "hazard_exit") == [{"hazard_id": "h1", "player_id": "p1"}]
+        assert manager.get_speed_multiplier("p1") == 1.0
+
+    def test_enter_reported_once(self):
+        """Test staying inside does not repeat the enter event."""
+        manager = HazardManager()
+        manager.add("h1", HazardType.EMP, 0, 0, 100, 100)
+        manager.update({"p1": (10, 10)}, 1.0)
+        manager.get_and_clear_events()
+
+        manager.update({"p1": (20, 20)}, 1.1)
+
+        assert manager.get_and_clear_events() == []
+        assert manager.are_powerups_disabled("p1")
+
+    def test_hazard_added_under_player(self):
+        """Test a hazard spawning in the player's current cell is seen."""
+        manager = HazardManager()
+        manager.update({"p1": (50, 50)}, 1.0)
+
+        manager.add("h1", HazardType.DAMAGE, 0, 0, 100, 100)
+        manager.update({"p1": (50, 50)}, 1.1)
+
+        assert _events(manager, "hazard_damage") == [
+            {"player_id": "p1", "hazard_id": "h1", "damage": 5}
+        ]
+
+    def test_remove_clears_inside(self):
+        """Test removing a hazard drops its effects without an exit event."""
+        manager = HazardManager()
+        manager.add("h1", HazardType.SLOW, 0, 0, 100, 100)
+        manager.update({"p1": (50, 50)}, 1.0)
+
+        manager.remove("h1")
+        manager.update({"p1": (50, 50)}, 1.1)
+
+        assert _events(manager, "hazard_exit") == []
+        assert manager.get_speed_multiplier("p1") == 1.0
+
+    def test_arena_wires_grid(self):
+        """Test the arena coordinator shares its grid with hazards and traps."""
+        arena = ServerArenaSystems()
+
+        assert arena.hazards._grid is arena.grid
+        assert arena.traps._grid is arena.grid
+
+    def test_parity_with_linear_scan(self):
+        """Test events match a brute-force scan over every hazard."""
+        rng = random.Random(11)
+        manager = HazardManager()
+        for i in range(60):
+            manager.add(
+                f"h{i}", rng.choice(list(HazardType)),
+                rng.uniform(0, 1200), rng.uniform(0, 650),
+                rng.uniform(20, 200), rng.uniform(20, 200),
+            )
+        manager.get_and_clear_events()
+        hazards = manager._hazards.values()
+        inside = {pid: set() for pid in ("p1", "p2", "p3")}
+        positions = {pid: (rng.uniform(0, 1280), rng.uniform(0, 720)) for pid in inside}
+
+        for _ in range(300):
+            positions = {
+                pid: (min(1280, max(0, x + rng.uniform(-40, 40))), min(720, max(0, y + rng.uniform(-40, 40))))
+                for pid, (x, y) in positions.items()
+            }
+            expected = set()
+            for pid, (x, y) in positions.items():
+                now = {h.id for h in hazards if h.bounds.contains(x, y)}
+                expected |= {("hazard_enter", pid, hid) for hid in now - inside[pid]}
+                expected |= {("hazard_exit", pid, hid) for hid in inside[pid] - now}
+                inside[pid] = now
+
+            manager.update(positions, 0.0)
+            got = {
+                (e.event_type, e.data["player_id"], e.data["hazard_id"])
+                for e in manager.get_and_clear_events()
+                if e.event_type != "hazard_damage"
+            }
+            assert got == expected
+
+
+class TestTrapZones:
+    """Trap trigger tests."""
+
+    def _pressure(self, manager, id, x, y, **kwargs):
+        return manager.add(id, TrapType.PRESSURE, x, y, 30, TrapEffect.DAMAGE, 10, 2.0, **kwargs)
+
+    def test_pressure_triggers_only_near_player(self):
+        """Test only the pressure trap under a player starts warning."""
+        manager = TrapManager()
+        near = self._pressure(manager, "near", 100, 100)
+        far = self._pressure(manager, "far", 900, 500)
+
+        manager.update(1 / 60, {"p1": (110, 100)}, 1.0)
+
+        assert near.state == TrapState.WARNING
+        assert far.state == TrapState.ARMED
+
+    def test_idle_traps_not_busy(self):
+        """Test armed pressure traps leave the busy set until triggered, then return."""
+        manager = TrapManager()
+        trap = self._pressure(manager, "t1", 100, 100)
+        manager.add("timer", TrapType.TIMED, 500, 500, 30, TrapEffect.STUN, 1, 1.0, interval=2.0)
+        assert list(manager._busy) == ["timer"]
+
+        manager.update(0.1, {"p1": (100, 100)}, 1.0)
+        assert "t1" in manager._busy
+
+        manager.update(0.1, {}, 1.5)  # Warning elapsed -> triggered
+        manager.update(0.1, {}, 1.7)  # Triggered elapsed -> cooldown
+        assert trap.state == TrapState.COOLDOWN
+        manager.update(2.5, {}, 4.2)  # Cooldown elapsed -> armed
+        assert trap.state == TrapState.ARMED
+        assert "t1" not in manager._busy
+
+    def test_projectile_trap_hit(self):
+        """Test a projectile hit only triggers the projectile trap it lands in."""
+        manager = TrapManager()
+        hit = manager.add("hit", TrapType.PROJECTILE, 100, 100, 20, TrapEffect.STUN, 1, 1.0)
+        miss = manager.add("miss", TrapType.PROJECTILE, 140, 100, 20, TrapEffect.STUN, 1, 1.0)
+
+        manager.on_projectile_hit((105, 100), {})
+
+        assert hit.state == TrapState.WARNING
+        assert miss.state == TrapState.ARMED
+
+    def test_chain_uses_radius(self):
+        """Test a chain only queues armed traps inside the chain radius."""
+        manager = TrapManager()
+        self._pressure(manager, "src", 100, 100, chain_radius=80)
+        self._pressure(manager, "in", 160, 100)
+        self._pressure(manager, "out", 300, 100)
+
+        manager.update(0.1, {"p1": (100, 100)}, 1.0)
+        manager.update(0.1, {}, 1.4)
+
+        assert list(manager._pending_chains._live) == ["in"]
+
+    def test_pressure_parity_with_linear_scan(self):
+        """Test the grid finds the same pressed traps as a scan over every trap."""
+        rng = random.Random(5)
+        manager = TrapManager()
+        for i in range(60):
+            self._pressure(manager, f"t{i}", rng.uniform(0, 1280), rng.uniform(0, 720))
+        traps = list(manager._traps.values())
+
+        for _ in range(200):
+            positions = {f"p{j}": (rng.uniform(0, 1280), rng.uniform(0, 720)) for j in range(4)}
+            expected = {
+                t.id for t in traps
+                if any(manager._distance(t.position, p) <= t.radius for p in positions.values())
+            }
+            assert set(manager._pressed(positions)) == expected
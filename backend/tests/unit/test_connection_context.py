@@ -0,0 +1,173 @@
+"""
+Unit tests for per-connection contexts.
+
+Tests that a context resolves lobby, opponents and game session once at
+bind, that hot handlers then skip lobby lookups and post straight to the
+opponents' queues, that lobby cache invalidations (not time) trigger a
+single refresh, and that reconnects and releases relink peers.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.game.session import GameSession
+from app.utils.lobby_cache import lobby_cache
+from app.websocket.context import ConnectionContextRegistry, connection_contexts
+from app.websocket.handlers.router import GameHandler
+from app.websocket.manager import manager
+
+
+def _lobby(opponent_id="u2") -> dict:
+    return {"id": "lobby-1", "code": "ABCDEF", "host_id": "u1", "opponent_id": opponent_id, "status": "in_progress"}
+
+
+def _services(lobby: dict, game=None):
+    lobby_service = MagicMock()
+    lobby_service.get_lobby = AsyncMock(return_value=lobby)
+    game_service = MagicMock()
+    game_service.get_session = MagicMock(return_value=game)
+    return lobby_service, game_service
+
+
+@pytest.fixture
+def queues(monkeypatch):
+    """Fake send queues registered for MagicMock websockets."""
+    def make(websocket):
+        queue = MagicMock()
+        queue.put = MagicMock(return_value=True)
+        monkeypatch.setitem(manager._queues, websocket, queue)
+        return queue
+
+    return make
+
+
+@pytest.fixture(autouse=True)
+def _clean_contexts():
+    yield
+    connection_contexts.clear()
+
+
+class TestContextRegistry:
+    """Bind, invalidate, refresh and release."""
+
+    @pytest.mark.asyncio
+    async def test_bind_resolves_once(self, queues):
+        """Test bind reads the lobby once and links the opponents' contexts as peers."""
+        registry = ConnectionContextRegistry()
+        game = GameSession(lobby_id="lobby-1", player1_id="u1", player2_id="u2", questions=[])
+        lobby_service, game_service = _services(_lobby(), game)
+        host_ws, guest_ws = MagicMock(), MagicMock()
+        queues(host_ws)
+        queues(guest_ws)
+
+        host = await registry.bind(host_ws, "ABCDEF", "u1", lobby_service, game_service)
+        assert host.opponent_ids == ("u2",) and host.peers == ()
+        guest = await registry.bind(guest_ws, "ABCDEF", "u2", lobby_service, game_service)
+
+        assert host.peers == (guest,) and guest.peers == (host,)
+        assert host.lobby_id == "lobby-1" and not host.stale
+        assert host.game is game and host.game is game
+        assert game_service.get_session.call_count == 1  # Kept once it exists
+        assert lobby_service.get_lobby.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidation_marks_lobby_stale(self):
+        """Test lobby cache invalidations mark only that lobby's contexts stale."""
+        lobby_service, game_service = _services(_lobby())
+        here = await connection_contexts.bind(MagicMock(), "ABCDEF", "u1", lobby_service, game_service)
+        other = await connection_contexts.bind(MagicMock(), "ZZZZZZ", "u9", lobby_service, game_service)
+
+        lobby_cache.invalidate("abcdef")
+
+        assert here.stale and not other.stale
+        assert connection_contexts.get_stats()["stale"] == 1
+
+    @pytest.mark.asyncio
+    async def test_release_keeps_reconnect(self, queues):
+        """Test releasing a replaced context leaves the reconnected one bound."""
+        registry = ConnectionContextRegistry()
+        lobby_service, game_service = _services(_lobby())
+        host_ws = MagicMock()
+        queues(host_ws)
+        host = await registry.bind(host_ws, "ABCDEF", "u1", lobby_service, game_service)
+        first = await registry.bind(MagicMock(), "ABCDEF", "u2", lobby_service, game_service)
+        second = await registry.bind(MagicMock(), "ABCDEF", "u2", lobby_service, game_service)
+
+        registry.release(first)
+        assert registry.get("ABCDEF", "u2") is second and host.peers == (second,)
+        registry.release(second)
+        assert host.peers == ()
+        registry.release(host)
+        assert registry.get_stats()["lobbies"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_stays_stale(self):
+        """Test a lobby that cannot be read leaves the context stale."""
+        registry = ConnectionContextRegistry()
+        lobby_service, game_service = _services(_lobby())
+        lobby_service.get_lobby.side_effect = RuntimeError("gone")
+
+        context = await registry.bind(MagicMock(), "ABCDEF", "u1", lobby_service, game_service)
+
+        assert context.stale and context.lobby_id is None
+        assert registry.get_stats()["failed_refreshes"] == 1
+
+
+class TestHandlersWithContext:
+    """GameHandler routes hot messages through its context."""
+
+    @pytest.mark.asyncio
+    async def test_position_updates_skip_lobby_lookups(self, queues):
+        """Test position updates read no lobby and post to the opponent's queue."""
+        game = GameSession(lobby_id="lobby-1", player1_id="u1", player2_id="u2", questions=[])
+        lobby_service, game_service = _services(_lobby(), game)
+        host_ws, guest_ws = MagicMock(), MagicMock()
+        queues(host_ws)
+        guest_queue = queues(guest_ws)
+        handler = GameHandler(lobby_service, game_service)
+        await handler.bind_context(host_ws, "ABCDEF", "u1")
+        await connection_contexts.bind(guest_ws, "ABCDEF", "u2", lobby_service, game_service)
+        lobby_service.get_lobby.reset_mock()
+
+        for i in range(5):
+            payload = {"x": 10.0 * i, "y": 5.0, "dx": 1, "dy": 0, "seq": i}
+            await handler.handle_message(host_ws, {"type": "position_update", "payload": payload}, "ABCDEF", "u1")
+
+        lobby_service.get_lobby.assert_not_awaited()
+        assert game.player_states["u1"].position_x == 40.0
+        assert guest_queue.put.call_count == 5
+        frames = guest_queue.put.call_args.args[0]
+        assert frames.message["payload"] == {"player_id": "u1", "x": 40.0, "y": 5.0}
+        assert guest_queue.put.call_args.args[3] == "position_update:u1"
+
+    @pytest.mark.asyncio
+    async def test_lobby_event_refreshes_once(self, monkeypatch):
+        """Test an invalidation costs one lobby read on the next message, then none."""
+        lobby_service, game_service = _services(_lobby(opponent_id=None))
+        handler = GameHandler(lobby_service, game_service)
+        recorded = MagicMock()
+        monkeypatch.setattr("app.websocket.handlers.combat.CombatTracker.record_shot", recorded)
+        context = await handler.bind_context(MagicMock(), "ABCDEF", "u1")
+        assert context.opponent_ids == ()
+
+        lobby_service.get_lobby.return_value = _lobby(opponent_id="u2")
+        lobby_cache.invalidate("ABCDEF")  # Opponent joined
+        for _ in range(3):
+            await handler.handle_message(MagicMock(), {"type": "combat_shot", "payload": {"hit": True}}, "ABCDEF", "u1")
+
+        assert lobby_service.get_lobby.await_count == 2  # Bind + one refresh
+        assert context.opponent_ids == ("u2",)
+        assert recorded.call_count == 3 and recorded.call_args.args == ("lobby-1", "u1", True)
+
+    @pytest.mark.asyncio
+    async def test_disconnect_releases_context(self):
+        """Test handle_disconnect unregisters the connection's context."""
+        lobby_service, game_service = _services(_lobby())
+        handler = GameHandler(lobby_service, game_service)
+        handler.lobby.handle_disconnect = AsyncMock()
+        await handler.bind_context(MagicMock(), "ABCDEF", "u1")
+
+        await handler.handle_disconnect("ABCDEF", "u1")
+
+        assert handler.context is None
+        assert connection_contexts.get("ABCDEF", "u1") is None
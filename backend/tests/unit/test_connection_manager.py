@@ -206,6 +206,21 @@ class TestConnectionManagerOperations:
         code = manager.get_lobby_code(ws)
         
         assert code == "ABCDEF"
+    
+    @pytest.mark.asyncio
+    async def test_send_to_users_serializes_once(self):
+        """Test group send delivers the same payload to each listed user."""
+        manager = ConnectionManager()
+        ws1, ws2, ws3 = MagicMock(), MagicMock(), MagicMock()
+        for ws in (ws1, ws2, ws3):
+            ws.send_text = AsyncMock()
+        manager.user_connections = {"u1": ws1, "u2": ws2, "u3": ws3}
+        
+        sent = await manager.send_to_users(["u1", "u2", "missing"], {"type": "state_delta"})
+        
+        assert sent == 2
+        assert ws1.send_text.await_args == ws2.send_text.await_args
+        ws3.send_text.assert_not_awaited()
 
 
 class TestEdgeCases:
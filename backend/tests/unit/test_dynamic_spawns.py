@@ -0,0 +1,148 @@
+"""
+Unit tests for dynamic spawn placement.
+
+Tests FreeSpace sampling and incremental blocking, shared per-map free
+space, seeded determinism, and release of live spawns at despawn.
+"""
+
+import math
+import random
+
+from app.game.dynamic_spawns import (
+    FreeSpace,
+    ServerDynamicSpawnManager,
+    SpawnConfig,
+    static_free_space,
+)
+
+ZONES = [
+    {"x": 640, "y": 360, "radius": 160},
+    {"x": 200, "y": 200, "radius": 60},
+    {"x": 1080, "y": 520, "radius": 60},
+]
+
+
+def _clear_of(point, circles, clearance):
+    return all(math.hypot(point[0] - x, point[1] - y) >= r + clearance for x, y, r in circles)
+
+
+class TestFreeSpace:
+    """Lattice sampling and blocking tests."""
+
+    def test_samples_clear_blocked_circles(self):
+        """Test every sample keeps the clearance from every blocked circle."""
+        rng = random.Random(1)
+        space = FreeSpace(100, 100, 1180, 620, 20, 40)
+        circles = [(rng.uniform(100, 1180), rng.uniform(100, 620), rng.uniform(10, 80)) for _ in range(12)]
+        for circle in circles:
+            space.block(*circle)
+
+        for _ in range(2000):
+            point = space.sample(rng)
+            assert 100 <= point[0] <= 1180 and 100 <= point[1] <= 620
+            assert _clear_of(point, circles, 40)
+
+    def test_unblock_restores_cells(self):
+        """Test overlapping blocks release only their own share."""
+        space = FreeSpace(0, 0, 400, 400, 20, 0)
+        total = len(space)
+
+        space.block(200, 200, 50)
+        space.block(220, 200, 50)
+        both = len(space)
+        space.unblock(200, 200, 50)
+
+        assert both < len(space) < total
+        space.unblock(220, 200, 50)
+        assert len(space) == total
+
+    def test_full_space_returns_none(self):
+        """Test sampling a fully blocked area fails instead of looping."""
+        space = FreeSpace(0, 0, 100, 100, 20, 0)
+        space.block(50, 50, 200)
+
+        assert space.sample(random.Random(0)) is None
+
+    def test_static_space_shared_and_copied(self):
+        """Test matches on the same map share the static free space."""
+        zones = ((640.0, 360.0, 100.0),)
+        first = static_free_space(zones, SpawnConfig(), 40)
+
+        assert static_free_space(zones, SpawnConfig(), 40) is first
+        copy = first.copy()
+        copy.block(300, 300, 50)
+        assert len(copy) < len(first)
+
+
+class TestDynamicSpawnManager:
+    """Spawn manager placement tests."""
+
+    def _manager(self, seed=7, **config):
+        manager = ServerDynamicSpawnManager(SpawnConfig(**config), rng=random.Random(seed))
+        manager.initialize(ZONES)
+        return manager
+
+    def _run(self, manager, until, step=1.0):
+        spawned = []
+        t = manager._last_hazard_spawn
+        end = t + until
+        while t < end:
+            t += step
+            result = manager.update(t)
+            spawned.extend(result["new_hazards"] + result["new_traps"])
+        return spawned
+
+    def test_same_seed_same_spawns(self):
+        """Test a seeded manager replays the same spawn sequence."""
+        first = self._run(self._manager(), 120)
+        second = self._run(self._manager(), 120)
+
+        assert first
+        assert [s["id"] for s in first] == [s["id"] for s in second]
+        assert [s.get("position") or s["bounds"] for s in first] == [
+            s.get("position") or s["bounds"] for s in second
+        ]
+
+    def test_spawns_avoid_zones_and_live_spawns(self):
+        """Test positions clear exclusion zones and the spawns alive at the time."""
+        manager = self._manager(max_hazards=10, max_traps=10, hazard_spawn_interval=1, trap_spawn_interval=1)
+        zones = [(z["x"], z["y"], z["radius"]) for z in ZONES]
+        t = manager._last_hazard_spawn
+        checked = 0
+
+        for _ in range(8):
+            t += 1.0
+            result = manager.update(t)
+            for spawn in result["new_hazards"] + result["new_traps"]:
+                _, x, y, _ = manager._live[spawn["id"]]
+                clearance = 80 if spawn["id"].startswith("dyn_hazard") else 40
+                earlier = [
+                    (ox, oy, r) for sid, (_, ox, oy, r) in manager._live.items()
+                    if int(sid.rsplit("_", 1)[1]) < int(spawn["id"].rsplit("_", 1)[1])
+                ]
+                assert _clear_of((x, y), zones, clearance)
+                assert _clear_of((x, y), earlier, clearance)
+                checked += 1
+
+        assert checked > 8
+
+    def test_lifetime_frees_slots(self):
+        """Test spawning continues after earlier spawns reach their lifetime."""
+        manager = self._manager(max_hazards=1, hazard_spawn_interval=1, hazard_lifetime=5)
+
+        hazards = [s for s in self._run(manager, 30) if "bounds" in s]
+
+        assert len(hazards) > 1
+        assert manager._active_hazard_count == 1
+
+    def test_early_despawn_releases(self):
+        """Test on_hazard_despawn frees the slot and space at once."""
+        manager = self._manager(max_hazards=1, hazard_spawn_interval=1)
+        hazard = self._run(manager, 2)[0]
+        free = len(manager._space(80))
+
+        manager.on_hazard_despawn(hazard["id"])
+        manager.on_hazard_despawn(hazard["id"])
+
+        assert manager._active_hazard_count == 0
+        assert len(manager._space(80)) > free
@@ -0,0 +1,185 @@
+"""
+Unit tests for the per-match input log.
+
+Tests that re-simulating a logged match reproduces every broadcast
+(including idle-rate steps, fire and quiz rewards), rebuilding a given
+tick, reading logs cut off by a crash, and that logging is opt-in.
+"""
+
+import asyncio
+import json
+import random
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from app.game.config import InputLogConfig
+from app.game.input_log import REC_TICK, InputLogWriter, read_input_log, resimulate
+from app.game.models import FireInput, PlayerInput
+from app.game.simulation import SimClock, SimulationConfig, SyntheticPlayer
+from app.game.tick_system import TickSystem
+from app.websocket.handlers import combat
+from app.websocket.handlers.combat import CombatHandler
+
+MAP = Path(__file__).resolve().parents[1] / "benchmarks" / "maps" / "vortex-arena.json"
+ACTIVE_TICKS = 240
+IDLE_TICKS = 240  # Long enough to drop to the idle rate
+QUIZ_TICK = 100
+ROUND_RESULT = {"answers": {"p1": "a", "p2": "b"}, "scores": {"p1": 850, "p2": 0}}
+
+
+def _play(directory: Path):
+    """Live headless match with logging; returns (system, log path, per-tick players, broadcasts)."""
+    clock = SimClock()
+    broadcasts = []
+    states = {}
+
+    async def capture(lobby_id: str, message: dict) -> None:
+        broadcasts.append(json.loads(json.dumps(message, default=str)))
+
+    async def run():
+        system = TickSystem(input_log_config=InputLogConfig(enabled=True, directory=str(directory)), clock=clock)
+        system.set_broadcast_callback(capture)
+        config = json.loads(MAP.read_text())
+        game = system.create_game("L1", "p1", "p2", (160, 360), (1120, 360))
+        system.init_arena_config("L1", config, "vortex-arena")
+        system.start_game("L1", headless=True)
+        sim = SimulationConfig(fire_rate_hz=6.0)
+        bots = [
+            SyntheticPlayer("p1", (160, 360), random.Random(1), sim),
+            SyntheticPlayer("p2", (1120, 360), random.Random(2), sim),
+        ]
+        dt = system._tick_config.duration_s
+        for base_tick in range(2 * ACTIVE_TICKS + IDLE_TICKS):
+            clock.advance(dt)
+            if not ACTIVE_TICKS <= base_tick < ACTIVE_TICKS + IDLE_TICKS:
+                for shooter, target in (bots, bots[::-1]):
+                    system.queue_input("L1", shooter.move(dt, clock.now))
+                    fire = shooter.maybe_fire(target, dt, clock.now)
+                    if fire:
+                        system.queue_fire("L1", fire)
+            if base_tick == QUIZ_TICK:
+                system.dispatch_quiz_rewards("L1", ROUND_RESULT, 30000)
+            await system.step_game("L1")
+            states[game.tick_count] = {pid: (p.x, p.y) for pid, p in game.players.items()}
+        path = game.input_log.path
+        system.stop_game("L1")
+        return system, path
+
+    system, path = asyncio.run(run())
+    return system, path, states, broadcasts
+
+
+class TestResimulate:
+    """Offline rebuild from the log."""
+
+    def test_replay_reproduces_broadcasts(self, tmp_path):
+        """Test re-simulation sends the same state and events as the live match."""
+        system, path, states, live = _play(tmp_path)
+        replayed = []
+
+        async def capture(lobby_id: str, message: dict) -> None:
+            replayed.append(json.loads(json.dumps(message, default=str)))
+
+        game = resimulate(path, broadcast=capture)
+
+        assert game.tick_count == max(states)
+        assert max(states) < 2 * ACTIVE_TICKS + IDLE_TICKS  # Idle steps covered several base ticks
+        assert replayed == live
+        payloads = [m["payload"] for f in live for m in f["payload"]["messages"] if m["type"] == "state_update"]
+        assert any(state["buffs"]["p1"] for state in payloads)
+        assert any(state["combat"]["projectiles"] for state in payloads)
+        assert any(state["tick_rate"] < 60 for state in payloads)
+
+    def test_until_tick(self, tmp_path):
+        """Test a given tick is rebuilt with the positions it had live."""
+        _, path, states, _ = _play(tmp_path)
+
+        game = resimulate(path, until_tick=300)
+
+        assert game.tick_count == 300
+        assert {pid: (p.x, p.y) for pid, p in game.players.items()} == states[300]
+
+    def test_log_is_compact(self, tmp_path):
+        """Test the log stays a few bytes per tick and is counted in the stats."""
+        system, path, states, _ = _play(tmp_path)
+        stats = system.get_input_log_stats()
+
+        assert stats["matches"] == 1 and stats["open"] == 0
+        assert stats["ticks"] == max(states)
+        assert stats["bytes"] == Path(path).stat().st_size
+        assert stats["bytes"] < 40 * stats["ticks"] + 4096  # Map config included once
+
+
+class TestInputLogWriter:
+    """Writer and reader tests."""
+
+    def test_crashed_log_reads_to_last_flush(self, tmp_path):
+        """Test a log that was never closed yields the ticks flushed so far."""
+        path = str(tmp_path / "crash.ilog")
+        writer = InputLogWriter(path, ["p1", "p2"], 1 / 60, flush_every_ticks=10)
+        writer.match(0.0, {"players": ["p1", "p2"]})
+        for tick in range(25):
+            writer.tick(tick / 60, 1 / 60, [PlayerInput("p1", tick, 0.0, sequence=tick + 1)])
+
+        ticks = [r for r in read_input_log(path) if r[0] == REC_TICK]
+
+        assert len(ticks) == 20
+        assert ticks[-1][3] == [(0, 19.0, 0.0, 0.0, 0.0, 20, 0.0)]
+
+    def test_inputs_round_trip(self, tmp_path):
+        """Test tick times, moves and fires read back exactly as written."""
+        path = str(tmp_path / "l.ilog")
+        writer = InputLogWriter(path, ["p1", "p2"], 1 / 60)
+        writer.start(1_700_000_000.0)
+        now = 1_700_000_000.0 + 1 / 60
+        writer.tick(now, 1 / 60, [
+            PlayerInput("p1", 100.1, 200.2, 0.71, -0.71, 5, now - 0.003),
+            PlayerInput("p2", 100 / 3, 200.2, 0.5, 0.5, 6, now),
+        ])
+        writer.fires([FireInput("p1", 0.6, 0.8, 5, now - 0.004), FireInput("p2", 2 ** 0.5 / 2, 0.1, 6, now)])
+        writer.close(now)
+
+        (tick,) = [r for r in read_input_log(path) if r[0] == REC_TICK]
+        assert tick[1] == now
+        assert tick[3] == [
+            (0, 100.1, 200.2, 0.71, -0.71, 5, now - 0.003),
+            (1, 100 / 3, 200.2, 0.5, 0.5, 6, now),
+        ]
+        assert tick[4] == [(0, 0.6, 0.8, 5, now - 0.004), (1, 2 ** 0.5 / 2, 0.1, 6, now)]
+
+    def test_unknown_players_skipped(self, tmp_path):
+        """Test inputs for players outside the match are not logged."""
+        path = str(tmp_path / "l.ilog")
+        writer = InputLogWriter(path, ["p1", "p2"], 1 / 60)
+        writer.tick(0.0, 1 / 60, [PlayerInput("p3", 1, 1), PlayerInput("p2", 2, 2)])
+        writer.close(1.0)
+
+        (tick,) = [r for r in read_input_log(path) if r[0] == REC_TICK]
+        assert [move[0] for move in tick[3]] == [1]
+
+    def test_null_fire_fields_logged_as_zero(self, tmp_path, monkeypatch):
+        """Test a fire message with null seq and dx is logged as 0 and the match keeps running."""
+        clock = SimClock()
+        system = TickSystem(input_log_config=InputLogConfig(enabled=True, directory=str(tmp_path)), clock=clock)
+        monkeypatch.setattr(combat, "tick_system", system)
+        game = system.create_game("L1", "p1", "p2")
+        system.start_game("L1", headless=True)
+
+        async def run():
+            await CombatHandler(MagicMock(), MagicMock()).handle_fire("L1", "p1", {"dx": None, "dy": 1, "seq": None})
+            clock.advance(system._tick_config.duration_s)
+            await system.step_game("L1")
+
+        asyncio.run(run())
+        path = game.input_log.path
+        assert game.is_running
+        system.stop_game("L1")
+
+        fires = [fire for r in read_input_log(path) if r[0] == REC_TICK for fire in r[4]]
+        assert [fire[:4] for fire in fires] == [(0, 0.0, 1.0, 0)]
+
+    def test_disabled_by_default(self, tmp_path):
+        """Test matches are not logged unless enabled."""
+        game = TickSystem().create_game("L1", "p1", "p2")
+
+        assert game.input_log is None
@@ -0,0 +1,106 @@
+"""
+Unit tests for per-player movement input coalescing.
+
+Tests stale and reordered inputs are dropped, faster-than-tick inputs
+collapse to one validated movement, and the counters.
+"""
+
+import pytest
+
+from app.game.config import AntiCheatConfig
+from app.game.models import InputQueue, PlayerInput
+from app.game.tick_system import TickSystem
+from app.game.validation import InputValidator
+
+
+def _input(player_id: str, x: float, sequence: int) -> PlayerInput:
+    return PlayerInput(player_id=player_id, x=x, y=360.0, sequence=sequence)
+
+
+class TestInputQueue:
+    """Slot decisions."""
+
+    def test_newest_input_wins(self):
+        """Test newer inputs replace the pending one."""
+        queue = InputQueue()
+        queue.offer(_input("p1", 161.0, 1), last_sequence=0)
+        queue.offer(_input("p1", 162.0, 2), last_sequence=0)
+        queue.offer(_input("p2", 1100.0, 5), last_sequence=0)
+
+        inputs = queue.drain()
+
+        assert [(i.player_id, i.sequence) for i in inputs] == [("p1", 2), ("p2", 5)]
+        assert len(queue) == 0
+        assert queue.get_stats() == {"queued": 3, "dropped": 0, "reordered": 0, "coalesced": 1}
+
+    def test_reordered_input_dropped(self):
+        """Test an input older than the pending one is discarded."""
+        queue = InputQueue()
+        queue.offer(_input("p1", 163.0, 3), last_sequence=0)
+
+        assert not queue.offer(_input("p1", 162.0, 2), last_sequence=0)
+        assert [i.sequence for i in queue] == [3]
+        assert queue.reordered == 1
+
+    def test_processed_sequence_dropped(self):
+        """Test inputs at or below the last processed sequence are discarded."""
+        queue = InputQueue()
+
+        assert not queue.offer(_input("p1", 160.0, 7), last_sequence=7)
+        assert not queue.offer(_input("p1", 160.0, 4), last_sequence=7)
+        assert queue.offer(_input("p1", 160.0, 8), last_sequence=7)
+        assert queue.dropped == 2
+
+    def test_unsequenced_inputs_coalesce(self):
+        """Test inputs without sequence numbers are never dropped."""
+        queue = InputQueue()
+        queue.offer(_input("p1", 161.0, 0), last_sequence=5)
+        queue.offer(_input("p1", 170.0, 0), last_sequence=5)
+
+        assert [i.x for i in queue.drain()] == [170.0]
+        assert queue.dropped == 0
+
+
+class TestTickSystemInputs:
+    """Coalescing in the tick loop."""
+
+    def _system(self):
+        system = TickSystem()
+        system._validator = InputValidator(anti_cheat_config=AntiCheatConfig(enabled=True))
+        game = system.create_game("LOBBY", "p1", "p2")
+        game.is_running = True
+        return system, game
+
+    @pytest.mark.asyncio
+    async def test_one_movement_per_tick(self):
+        """Test several inputs in one tick apply only the newest position."""
+        system, game = self._system()
+        for seq in range(1, 4):
+            system.queue_input("LOBBY", _input("p1", 160.0 + seq, seq))
+
+        await system._process_tick(game)
+
+        player = game.players["p1"]
+        assert (player.x, player.last_input_sequence) == (163.0, 3)
+        assert player.violation_count == 0
+
+    @pytest.mark.asyncio
+    async def test_stale_input_rejected_after_tick(self):
+        """Test a late input from an already processed sequence is refused."""
+        system, game = self._system()
+        system.queue_input("LOBBY", _input("p1", 165.0, 5))
+        await system._process_tick(game)
+
+        assert not system.queue_input("LOBBY", _input("p1", 162.0, 3))
+        assert len(game.pending_inputs) == 0
+
+    @pytest.mark.asyncio
+    async def test_counters_survive_stop(self):
+        """Test input counters include games that have stopped."""
+        system, game = self._system()
+        system.queue_input("LOBBY", _input("p1", 161.0, 1))
+        system.queue_input("LOBBY", _input("p1", 162.0, 2))
+
+        system.stop_game("LOBBY")
+
+        assert system.get_input_stats() == {"queued": 2, "dropped": 0, "reordered": 0, "coalesced": 1}
@@ -62,6 +62,18 @@ class TestLobbyCacheBasics:
         
         assert result is False
     
+    def test_invalidate_notifies_listeners(self):
+        """Test listeners hear every invalidation, cached or not."""
+        cache = LobbyCache()
+        heard = []
+        cache.on_invalidate(heard.append)
+        cache.set("ABCDEF", {"id": "123"})
+        
+        cache.invalidate("abcdef")
+        cache.invalidate("NOTHERE")
+        
+        assert heard == ["ABCDEF", "NOTHERE"]
+    
     def test_clear_removes_all(self):
         """Test clear removes all entries."""
         cache = LobbyCache()
@@ -0,0 +1,154 @@
+"""
+Unit tests for compiled arena maps.
+
+Tests parse/compile parity with loading the raw config, registry keying
+and eviction, config validation, and copy-on-write grid sharing.
+"""
+
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from app.game.arena import ServerArenaSystems, SpatialHashGrid
+from app.game.arena.spatial import LAYER_BARRIER
+from app.game.map_registry import MapRegistry, compile_map, map_fingerprint
+from app.game.tick_system import TickSystem
+
+MAPS_DIR = Path(__file__).resolve().parents[1] / "benchmarks" / "maps"
+MAPS = {path.stem: json.loads(path.read_text()) for path in sorted(MAPS_DIR.glob("*.json"))}
+
+
+def _loaded(config: dict = None, arena_map=None) -> ServerArenaSystems:
+    arena = ServerArenaSystems()
+    if arena_map is not None:
+        arena.initialize_from_map(arena_map)
+    else:
+        arena.initialize_from_config(config)
+    return arena
+
+
+class TestCompiledMaps:
+    """Compile and load parity tests."""
+
+    @pytest.mark.parametrize("slug", sorted(MAPS))
+    def test_compiled_load_matches_config_load(self, slug):
+        """Test a match loaded from a compiled map matches one loaded from the config."""
+        legacy = _loaded(MAPS[slug])
+        compiled = _loaded(arena_map=compile_map(MAPS[slug]))
+
+        assert compiled.get_arena_state() == legacy.get_arena_state()
+        assert compiled.grid._cells == legacy.grid._cells
+        assert compiled.grid._entries == legacy.grid._entries
+        assert [(e.event_type, e.data) for e in compiled.get_and_clear_events()] == [
+            (e.event_type, e.data) for e in legacy.get_and_clear_events()
+        ]
+
+    def test_exclusion_zones_precomputed(self):
+        """Test teleporter, jump pad and spawn point keep-out circles."""
+        arena_map = compile_map({
+            "teleporters": [{"id": "t1", "pairId": "a", "position": {"x": 10, "y": 20}, "radius": 30}],
+            "spawnPoints": [{"id": "s1", "position": {"x": 5, "y": 6}}],
+        })
+
+        assert arena_map.exclusion_zones == (
+            {"x": 10, "y": 20, "radius": 90},
+            {"x": 5, "y": 6, "radius": 100},
+        )
+
+    def test_invalid_config_names_entry(self):
+        """Test a malformed entry raises ValueError naming its section."""
+        config = {"hazards": [{"id": "h1", "type": "lava", "bounds": {"x": 0, "y": 0, "width": 1, "height": 1}}]}
+
+        with pytest.raises(ValueError, match=r"hazards\[0\]"):
+            compile_map(config)
+
+    def test_tick_system_rejects_invalid_config(self):
+        """Test init_arena_config returns False instead of raising."""
+        system = TickSystem()
+        system.create_game("L1", "p1", "p2", (100, 100), (200, 200))
+
+        assert system.init_arena_config("L1", {"barriers": [{"id": "b1"}]}, "simple-arena") is False
+        assert system.init_arena_config("L1", MAPS["simple-arena"], "simple-arena") is True
+
+
+class TestMapRegistry:
+    """Registry keying tests."""
+
+    def test_same_layout_shared(self):
+        """Test matches on the same map get the same compiled definition."""
+        registry = MapRegistry()
+        first = registry.get("simple-arena", MAPS["simple-arena"])
+        second = registry.get("simple-arena", copy.deepcopy(MAPS["simple-arena"]))
+
+        assert second is first
+        assert registry.get_stats()["hits"] == 1
+
+    def test_changed_layout_under_same_slug(self):
+        """Test a different layout sent under a known slug is not served the cached map."""
+        registry = MapRegistry()
+        original = registry.get("simple-arena", MAPS["simple-arena"])
+        config = copy.deepcopy(MAPS["simple-arena"])
+        config["barriers"] = config["barriers"][:1]
+
+        changed = registry.get("simple-arena", config)
+
+        assert changed is not original
+        assert len(changed.barriers) == 1
+        assert registry.get("simple-arena", MAPS["simple-arena"]) is original
+
+    def test_fingerprint_ignores_unloaded_sections(self):
+        """Test client-only sections (tiles, metadata) do not split the cache."""
+        config = copy.deepcopy(MAPS["simple-arena"])
+        config["metadata"] = {"name": "renamed"}
+
+        assert map_fingerprint(config) == map_fingerprint(MAPS["simple-arena"])
+
+    def test_lru_eviction(self):
+        """Test the least recently used definition is evicted at capacity."""
+        registry = MapRegistry(capacity=2)
+        for slug in ("simple-arena", "vortex-arena", "cornfield-arena"):
+            registry.get(slug, MAPS[slug])
+
+        assert len(registry) == 2
+        assert registry.get_stats()["evicted"] == 1
+
+    def test_invalid_config_not_cached(self):
+        """Test failed compiles leave the registry untouched."""
+        registry = MapRegistry()
+        with pytest.raises(ValueError):
+            registry.get("bad", {"traps": [{"id": "t1"}]})
+
+        assert len(registry) == 0
+
+
+class TestCopyOnWriteGrid:
+    """Shared grid isolation tests."""
+
+    def test_match_writes_do_not_touch_map_grid(self):
+        """Test a destroyed barrier in one match stays in the map and other matches."""
+        arena_map = compile_map(MAPS["cornfield-arena"])
+        base_cells = {k: dict(v) for k, v in arena_map.grid._cells.items()}
+        one, two = _loaded(arena_map=arena_map), _loaded(arena_map=arena_map)
+        barrier_id = arena_map.barriers[0].id
+
+        one.barriers.remove(barrier_id)
+
+        assert arena_map.grid._cells == base_cells
+        assert (LAYER_BARRIER, barrier_id) in two.grid
+        assert (LAYER_BARRIER, barrier_id) not in one.grid
+
+    def test_unwritten_buckets_shared(self):
+        """Test a loaded grid only copies the buckets it writes to."""
+        base = SpatialHashGrid()
+        base.insert("wall", "a", 0, 0, 10, 10)
+        base.insert("wall", "b", 500, 500, 10, 10)
+        grid = SpatialHashGrid()
+        grid.load(base)
+
+        grid.insert("wall", "c", 0, 0, 10, 10)
+
+        assert grid._cells[("wall", 7, 7)] is base._cells[("wall", 7, 7)]
+        assert grid.query_point("wall", 5, 5) == ["a", "c"]
+        assert base.query_point("wall", 5, 5) == ["a"]
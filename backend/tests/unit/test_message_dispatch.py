@@ -0,0 +1,194 @@
+"""
+Unit tests for table-driven WebSocket message dispatch.
+
+Tests routing by type, payload schema checks, per-type rate costs,
+sampled receipt logging, per-type stats, and that GameHandler's route
+table keeps every message type the old if/elif chain handled.
+"""
+
+import logging
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.middleware.rate_limit import MessageRateLimiter
+from app.websocket.dispatch import NUMBER, MessageDispatcher, MessageRoute, MessageStats
+from app.websocket.handlers.router import GameHandler
+from app.websocket.manager import manager
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def sent(monkeypatch) -> AsyncMock:
+    send = AsyncMock(return_value=True)
+    monkeypatch.setattr(manager, "send_personal", send)
+    return send
+
+
+def _dispatcher(routes, max_per_second=1000, clock=None):
+    stats = MessageStats(clock or _Clock())
+    return MessageDispatcher(routes, MessageRateLimiter(max_per_second), stats), stats
+
+
+def _errors(send: AsyncMock) -> list:
+    return [c.args[1]["payload"]["code"] for c in send.await_args_list if c.args[1]["type"] == "error"]
+
+
+class TestMessageDispatcher:
+    """Routing, schema, rate cost and stats."""
+
+    @pytest.mark.asyncio
+    async def test_routes_by_type(self, sent):
+        """Test a message reaches its handler and unknown types get an error."""
+        handler = AsyncMock()
+        dispatcher, stats = _dispatcher({"move": MessageRoute(handler)})
+        ws = MagicMock()
+
+        await dispatcher.dispatch(ws, {"type": "move", "payload": {"x": 1}}, "LOBBY", "u1")
+        await dispatcher.dispatch(ws, {"type": "nope"}, "LOBBY", "u1")
+
+        handler.assert_awaited_once_with(ws, "LOBBY", "u1", {"x": 1})
+        assert _errors(sent) == ["UNKNOWN_MESSAGE"]
+        assert stats.get_stats()["move"]["received"] == 1
+        assert stats.get_stats()["unknown"]["received"] == 1
+
+    @pytest.mark.asyncio
+    async def test_schema_rejects_wrong_types(self, sent):
+        """Test fields present with the wrong type are rejected before the handler."""
+        handler = AsyncMock()
+        dispatcher, stats = _dispatcher({"move": MessageRoute(handler, {"x": NUMBER, "seq": (int,)})})
+
+        await dispatcher.dispatch(MagicMock(), {"type": "move", "payload": {"x": "far"}}, "L", "u1")
+        await dispatcher.dispatch(MagicMock(), {"type": "move", "payload": None}, "L", "u1")
+        await dispatcher.dispatch(MagicMock(), {"type": "move", "payload": {"x": 2.5}}, "L", "u1")
+
+        assert handler.await_count == 1  # Missing fields are left to the handler's defaults
+        assert _errors(sent) == ["INVALID_PAYLOAD", "INVALID_PAYLOAD"]
+        assert stats.get_stats()["move"]["rejected"] == 2
+
+    @pytest.mark.asyncio
+    async def test_rate_cost(self, sent):
+        """Test costly types use up the budget and free types never do."""
+        upload, ping = AsyncMock(), AsyncMock()
+        dispatcher, stats = _dispatcher(
+            {"upload": MessageRoute(upload, cost=4), "ping": MessageRoute(ping, cost=0)}, max_per_second=10,
+        )
+
+        for _ in range(3):
+            await dispatcher.dispatch(MagicMock(), {"type": "upload"}, "L", "u1")
+        for _ in range(50):
+            await dispatcher.dispatch(MagicMock(), {"type": "ping"}, "L", "u1")
+
+        assert upload.await_count == 2
+        assert ping.await_count == 50
+        assert stats.get_stats()["upload"]["limited"] == 1
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_error_once_per_second(self, sent, monkeypatch):
+        """Test the first drop in a second tells the client and later ones do not."""
+        now = [100.0]
+        monkeypatch.setattr("app.middleware.rate_limit.time.time", lambda: now[0])
+        dispatcher, stats = _dispatcher({"move": MessageRoute(AsyncMock(), cost=1)}, max_per_second=2)
+
+        for _ in range(5):
+            await dispatcher.dispatch(MagicMock(), {"type": "move"}, "L", "u1")
+        now[0] = 101.0
+        for _ in range(3):
+            await dispatcher.dispatch(MagicMock(), {"type": "move"}, "L", "u1")
+
+        assert _errors(sent) == ["RATE_LIMITED", "RATE_LIMITED"]
+        assert stats.get_stats()["move"]["limited"] == 4
+
+    @pytest.mark.asyncio
+    async def test_handler_error_counted(self, sent):
+        """Test a raising handler reports HANDLER_ERROR and is counted."""
+        dispatcher, stats = _dispatcher({"boom": MessageRoute(AsyncMock(side_effect=ValueError("bad")))})
+
+        await dispatcher.dispatch(MagicMock(), {"type": "boom"}, "L", "u1")
+
+        assert _errors(sent) == ["HANDLER_ERROR"]
+        assert stats.get_stats()["boom"]["errors"] == 1
+        assert stats.get_stats()["boom"]["max_handler_ms"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_sampled_logging(self, sent, caplog):
+        """Test hot types log receipt once per interval with a skipped count."""
+        clock = _Clock()
+        dispatcher, _ = _dispatcher(
+            {
+                "move": MessageRoute(AsyncMock(), log_every_s=10.0),
+                "ack": MessageRoute(AsyncMock(), log_level=None),
+                "ready": MessageRoute(AsyncMock()),
+            },
+            clock=clock,
+        )
+        caplog.set_level(logging.INFO, logger="websocket.handlers")
+
+        for _ in range(60):
+            await dispatcher.dispatch(MagicMock(), {"type": "move"}, "L", "u1")
+            await dispatcher.dispatch(MagicMock(), {"type": "ack"}, "L", "u1")
+        clock.now = 11.0
+        await dispatcher.dispatch(MagicMock(), {"type": "move"}, "L", "u1")
+        await dispatcher.dispatch(MagicMock(), {"type": "ready"}, "L", "u1")
+        await dispatcher.dispatch(MagicMock(), {"type": "ready"}, "L", "u1")
+
+        lines = [r.getMessage() for r in caplog.records]
+        assert len([line for line in lines if "type=move" in line]) == 2
+        assert "(+59 since last logged)" in lines[1]
+        assert not [line for line in lines if "type=ack" in line]
+        assert len([line for line in lines if "type=ready" in line]) == 2
+
+
+class TestGameHandlerRoutes:
+    """GameHandler's route table."""
+
+    def test_covers_message_types(self):
+        """Test every message type the if/elif chain handled has a route."""
+        handler = GameHandler(MagicMock(), MagicMock())
+
+        assert set(handler.dispatcher.routes) == {
+            "ping", "state_ack", "start_game", "answer", "request_resync", "ready",
+            "position_update", "arena_init", "combat_fire", "combat_kill", "combat_damage",
+            "combat_shot", "powerup_collected", "powerup_use", "telemetry_upload_replay",
+            "telemetry_flag_death", "queue_join", "queue_leave", "emote_trigger",
+        }
+
+    @pytest.mark.asyncio
+    async def test_ping_and_routed_call(self, sent):
+        """Test ping still pongs and routes pass lobby, user and payload on."""
+        handler = GameHandler(MagicMock(), MagicMock())
+        handler.combat.handle_fire = AsyncMock()
+        ws = MagicMock()
+
+        await handler.handle_message(ws, {"type": "ping"}, "LOBBY", "u1")
+        await handler.handle_message(ws, {"type": "combat_fire", "payload": {"dx": 1, "dy": 0}}, "LOBBY", "u1")
+
+        sent.assert_awaited_once_with(ws, {"type": "pong", "payload": {}})
+        handler.combat.handle_fire.assert_awaited_once_with("LOBBY", "u1", {"dx": 1, "dy": 0})
+
+    @pytest.mark.asyncio
+    async def test_game_flow_not_throttled(self, sent):
+        """Test an answer and a kill go through after the second's position budget is used up."""
+        handler = GameHandler(MagicMock(), MagicMock())
+        handler.dispatcher = MessageDispatcher(handler.dispatcher.routes, MessageRateLimiter(10), MessageStats())
+        handler.arena.handle_position_update = AsyncMock()
+        handler.quiz.handle_answer = AsyncMock()
+        handler.combat.handle_kill = AsyncMock()
+        ws = MagicMock()
+
+        for i in range(20):
+            payload = {"x": 1.0, "y": 1.0, "dx": 0, "dy": 0, "seq": i}
+            await handler.handle_message(ws, {"type": "position_update", "payload": payload}, "LOBBY", "u1")
+        await handler.handle_message(ws, {"type": "answer", "payload": {"q_num": 1, "time_ms": 900}}, "LOBBY", "u1")
+        await handler.handle_message(ws, {"type": "combat_kill", "payload": {"victim_id": "u2"}}, "LOBBY", "u1")
+
+        assert handler.arena.handle_position_update.await_count < 20
+        handler.quiz.handle_answer.assert_awaited_once()
+        handler.combat.handle_kill.assert_awaited_once()
@@ -0,0 +1,120 @@
+"""
+Unit tests for slotted per-tick models and their freelists.
+
+Tests models carry no __dict__, FreeList reuse and capacity, and that
+the tick loop, lag compensation and combat recycle into the pools.
+"""
+
+import pytest
+
+from app.game.arena.types import ArenaEvent
+from app.game.buffs import Buff
+from app.game.combat import CombatEvent, PlayerCombatState, ServerCombatSystem, ServerProjectile
+from app.game.lag_compensation import LagCompensator
+from app.game.models import FRAME_POOL, INPUT_POOL, FireInput, PlayerInput, PlayerState, PositionFrame
+from app.game.pool import FreeList
+from app.game.tick_system import TickSystem
+
+
+class TestSlottedModels:
+    """Per-tick models are slotted dataclasses."""
+
+    @pytest.mark.parametrize("cls", [
+        PlayerState, PositionFrame, PlayerInput, FireInput, ServerProjectile,
+        PlayerCombatState, CombatEvent, ArenaEvent, Buff,
+    ])
+    def test_no_instance_dict(self, cls):
+        """Test instances have __slots__ and no __dict__."""
+        assert "__slots__" in vars(cls)
+        assert "__dict__" not in vars(cls)
+
+    def test_unknown_attribute_rejected(self):
+        """Test typos in attribute names fail instead of adding fields."""
+        with pytest.raises(AttributeError):
+            PlayerInput(player_id="p1", x=0.0, y=0.0).sequnce = 3
+
+
+class TestFreeList:
+    """Bounded freelist."""
+
+    def test_reuses_released_instance(self):
+        """Test acquire after release reinitializes the same object."""
+        pool = FreeList(PositionFrame, 4)
+        frame = pool.acquire(1.0, 10.0, 20.0, 1)
+        pool.release(frame)
+
+        again = pool.acquire(2.0, 30.0, 40.0, 2)
+
+        assert again is frame
+        assert again == PositionFrame(2.0, 30.0, 40.0, 2)
+        assert pool.get_stats() == {"free": 0, "capacity": 4, "created": 1, "reused": 1}
+
+    def test_defaults_reset_on_reuse(self):
+        """Test fields omitted on acquire get their defaults again."""
+        pool = FreeList(PlayerInput, 4)
+        used = pool.acquire("p1", 1.0, 2.0, sequence=9, client_timestamp=5.0)
+        pool.release(used)
+
+        reused = pool.acquire("p2", 3.0, 4.0)
+
+        assert reused.sequence == 0
+        assert reused.client_timestamp == 0.0
+
+    def test_capacity_bounds_freelist(self):
+        """Test releases beyond capacity are dropped."""
+        pool = FreeList(PositionFrame, 2)
+        pool.release_all([PositionFrame(0.0, 0.0, 0.0, i) for i in range(5)])
+        pool.release(PositionFrame(0.0, 0.0, 0.0, 9))
+
+        assert len(pool) == 2
+
+    def test_zero_capacity_disables(self):
+        """Test a zero-capacity pool always constructs."""
+        pool = FreeList(PositionFrame, 0)
+        frame = pool.acquire(1.0, 0.0, 0.0, 1)
+        pool.release(frame)
+
+        assert pool.acquire(1.0, 0.0, 0.0, 1) is not frame
+
+
+class TestRecycling:
+    """Pools wired into the tick loop and combat."""
+
+    @pytest.mark.asyncio
+    async def test_tick_recycles_inputs(self):
+        """Test inputs consumed by a tick return to INPUT_POOL."""
+        system = TickSystem()
+        game = system.create_game("LOBBY", "p1", "p2")
+        game.is_running = True
+        player_input = INPUT_POOL.acquire(player_id="p1", x=110.0, y=360.0, sequence=1)
+        system.queue_input("LOBBY", player_input)
+
+        await system._process_tick(game)
+
+        assert INPUT_POOL.acquire(player_id="p2", x=0.0, y=0.0) is player_input
+
+    def test_hit_check_recycles_frame(self):
+        """Test check_hit releases the rewound frame."""
+        player = PlayerState(player_id="p1", x=100.0, y=100.0)
+        player.position_history.record(1000.0, 100.0, 100.0, 1)
+        free = len(FRAME_POOL)
+
+        hit, _ = LagCompensator().check_hit(player, (100.0, 100.0), 1000.0)
+
+        assert hit
+        assert len(FRAME_POOL) == max(free, 1)
+
+    def test_spent_projectiles_recycled(self):
+        """Test projectiles removed from the dict store are reused by the next shot."""
+        combat = ServerCombatSystem(swept=False)
+        combat.init_player("p1")
+        combat.process_fire("p1", (100.0, 100.0), (1.0, 0.0), 0.0)
+        proj = next(iter(combat._projectiles.values()))
+
+        combat.update(10.0, {"p1": (100.0, 100.0)})  # Flies out of range
+        assert not combat._projectiles
+
+        combat._combat_states["p1"].last_fire_time = 0.0
+        combat.process_fire("p1", (200.0, 200.0), (0.0, 1.0), 0.0)
+        assert next(iter(combat._projectiles.values())) is proj
+        assert (proj.spawn_x, proj.spawn_y, proj.damage) == (200.0, 200.0, 10)
@@ -0,0 +1,100 @@
+"""
+Unit tests for the array-backed position history ring.
+
+Tests deque-compatible reads, wraparound, and bisect rewind lookups
+against a linear-scan reference.
+"""
+
+import random
+
+import pytest
+
+from app.game.config import LagCompConfig
+from app.game.lag_compensation import LagCompensator
+from app.game.models import PlayerState, PositionFrame, PositionHistory
+
+
+def _linear_position(frames, target_time):
+    """Reference: the original linear scan over a frame list."""
+    before = after = None
+    for frame in frames:
+        if frame.timestamp <= target_time:
+            before = frame
+        else:
+            after = frame
+            break
+    if before and after:
+        dt = after.timestamp - before.timestamp
+        if dt > 0:
+            t = min(1.0, max(0.0, (target_time - before.timestamp) / dt))
+            return (before.x + (after.x - before.x) * t, before.y + (after.y - before.y) * t)
+    frame = before or after
+    return (frame.x, frame.y)
+
+
+class TestPositionHistory:
+    """Ring buffer behaviour."""
+
+    def test_reads_like_a_deque(self):
+        """Test len, indexing and iteration yield PositionFrames."""
+        history = PositionHistory(4)
+        for i in range(3):
+            history.record(float(i), i * 10.0, 5.0, i)
+
+        assert len(history) == 3
+        assert history[0] == PositionFrame(0.0, 0.0, 5.0, 0)
+        assert history[-1] == PositionFrame(2.0, 20.0, 5.0, 2)
+        assert [f.sequence for f in history] == [0, 1, 2]
+
+    def test_overwrites_oldest_when_full(self):
+        """Test the ring keeps only the newest maxlen frames."""
+        history = PositionHistory(3)
+        for i in range(7):
+            history.record(float(i), float(i), 0.0, i)
+
+        assert len(history) == 3
+        assert [f.sequence for f in history] == [4, 5, 6]
+
+    def test_index_out_of_range(self):
+        """Test reads past the end raise IndexError."""
+        history = PositionHistory(3)
+
+        with pytest.raises(IndexError):
+            history[0]
+
+    @pytest.mark.parametrize("recorded", [3, 5, 8, 13])
+    def test_index_before_matches_scan(self, recorded):
+        """Test bisect lookups across wrapped and unwrapped rings."""
+        history = PositionHistory(5)
+        for i in range(recorded):
+            history.record(i * 1.0, 0.0, 0.0, i)
+        timestamps = [f.timestamp for f in history]
+
+        for target in [t + d for t in range(-1, recorded + 1) for d in (0.0, 0.5)]:
+            expected = sum(1 for t in timestamps if t <= target) - 1
+            assert history.index_before(target) == expected
+
+
+class TestRewind:
+    """LagCompensator lookups over the ring."""
+
+    def test_matches_linear_reference(self):
+        """Test interpolated rewinds equal the original linear scan."""
+        rng = random.Random(7)
+        # Rewind window wider than the history, so lookups are never clamped
+        lag_comp = LagCompensator(LagCompConfig(max_rewind_ms=10_000))
+        player = PlayerState(player_id="p1", position_history=PositionHistory(60))
+        frames = []
+        now = 1000.0
+        for i in range(150):
+            now += 1 / 60
+            player.x, player.y = rng.uniform(0, 1280), rng.uniform(0, 720)
+            lag_comp.record_position(player, now, i)
+            frames.append(PositionFrame(now, player.x, player.y, i))
+        kept = frames[-60:]
+
+        for _ in range(200):
+            target = rng.uniform(kept[0].timestamp - 0.1, now + 0.1)
+            frame = lag_comp.get_position_at_time(player, target, current_time=now)
+
+            assert (frame.x, frame.y) == pytest.approx(_linear_position(kept, target))
@@ -0,0 +1,165 @@
+"""
+Unit tests for the adaptive per-match tick rate.
+
+Tests idle slow-down, immediate wake-up on input and fire, step
+durations that cover skipped ticks, and TickSystem integration.
+"""
+
+import pytest
+
+from app.game.arena import ServerArenaSystems
+from app.game.config import RateConfig, TickConfig
+from app.game.models import FireInput, PlayerInput
+from app.game.rate_control import RateController
+from app.game.tick_system import TickSystem
+
+IDLE = RateConfig(idle_after_s=1.0, idle_divisor=4)
+
+
+def _steps(rates: RateController, lobby_id: str, ticks: int) -> int:
+    """Count how many of the next base ticks are stepped."""
+    stepped = 0
+    for _ in range(ticks):
+        if rates.should_step(lobby_id):
+            rates.step_duration(lobby_id)
+            stepped += 1
+    return stepped
+
+
+class TestRateController:
+    """Rate decisions for one match."""
+
+    def test_busy_match_steps_every_tick(self):
+        """Test activity keeps the full rate."""
+        rates = RateController(TickConfig(), IDLE)
+        rates.add("L", now=0.0)
+
+        rates.observe("L", active=True, now=5.0)
+
+        assert _steps(rates, "L", 8) == 8
+        assert rates.tick_rate("L") == 60
+        assert rates.broadcast_rate("L") == 10
+
+    def test_quiet_match_slows_down(self):
+        """Test a match idle past the threshold steps every Nth tick."""
+        rates = RateController(TickConfig(), IDLE)
+        rates.add("L", now=0.0)
+
+        rates.observe("L", active=False, now=0.5)
+        assert rates.tick_rate("L") == 60
+
+        rates.observe("L", active=False, now=1.0)
+        assert _steps(rates, "L", 8) == 2
+        assert rates.tick_rate("L") == 15
+        assert rates.broadcast_rate("L") == 2.5
+
+    def test_step_covers_skipped_ticks(self):
+        """Test an idle step simulates every base tick since the last step."""
+        rates = RateController(TickConfig(), IDLE)
+        rates.add("L", now=0.0)
+        rates.observe("L", active=False, now=2.0)
+
+        for _ in range(3):
+            assert not rates.should_step("L")
+        assert rates.should_step("L")
+        assert rates.step_duration("L") == pytest.approx(4 / 60)
+
+    def test_wake_restores_full_rate(self):
+        """Test wake() steps on the very next base tick."""
+        rates = RateController(TickConfig(), IDLE)
+        rates.add("L", now=0.0)
+        rates.observe("L", active=False, now=2.0)
+        assert not rates.should_step("L")
+
+        rates.wake("L")
+
+        assert rates.should_step("L")
+        assert rates.step_duration("L") == pytest.approx(2 / 60)
+        assert rates.tick_rate("L") == 60
+
+    def test_disabled_never_slows(self):
+        """Test adaptive=False keeps every match at the full rate."""
+        rates = RateController(TickConfig(), RateConfig(adaptive=False))
+        rates.add("L", now=0.0)
+
+        rates.observe("L", active=False, now=100.0)
+
+        assert _steps(rates, "L", 6) == 6
+
+    def test_unknown_lobby_always_steps(self):
+        """Test matches that were never added run at the full rate."""
+        rates = RateController(TickConfig(), IDLE)
+
+        assert rates.should_step("missing")
+        assert rates.step_duration("missing") == pytest.approx(1 / 60)
+
+
+class TestArenaActivity:
+    """Pending arena events keep a match awake."""
+
+    def test_pending_events_until_cleared(self):
+        """Test has_pending_events follows each manager's queue."""
+        systems = ServerArenaSystems()
+        assert not systems.has_pending_events()
+
+        systems.add_barrier("b1", 800, 300, 60, 60, barrier_type="destructible", health=10)
+        systems.apply_barrier_damage("b1", 20)
+        assert systems.barriers.has_pending_events()
+        assert systems.has_pending_events()
+
+        systems.get_and_clear_events()
+        assert not systems.has_pending_events()
+
+
+class TestTickSystemRates:
+    """Rate controller wiring in TickSystem."""
+
+    def _system(self):
+        system = TickSystem(rate_config=RateConfig(idle_after_s=0.0, idle_divisor=4))
+        game = system.create_game("LOBBY", "p1", "p2")
+        game.is_running = True
+        system._rates.add("LOBBY", now=0.0)
+        return system, game
+
+    @pytest.mark.asyncio
+    async def test_idle_match_skips_ticks(self):
+        """Test a quiet match only simulates every Nth base tick."""
+        system, game = self._system()
+
+        for _ in range(9):
+            await system._process_tick(game)
+
+        assert game.tick_count == 3
+
+    @pytest.mark.asyncio
+    async def test_input_and_fire_wake_the_match(self):
+        """Test queued input or fire is processed on the next base tick."""
+        system, game = self._system()
+        await system._process_tick(game)
+        ticks = game.tick_count
+
+        system.queue_input("LOBBY", PlayerInput(player_id="p1", x=170.0, y=360.0, sequence=1))
+        await system._process_tick(game)
+        assert game.tick_count == ticks + 1
+
+        system.queue_fire("LOBBY", FireInput(player_id="p1", direction_x=1.0, direction_y=0.0))
+        await system._process_tick(game)
+        assert game.tick_count == ticks + 2
+
+    @pytest.mark.asyncio
+    async def test_state_update_reports_rate(self):
+        """Test state_update carries the current tick and broadcast rates."""
+        system, game = self._system()
+        sent = []
+
+        async def callback(lobby_id: str, message: dict) -> None:
+            sent.append(message)
+
+        system.set_broadcast_callback(callback)
+        await system._process_tick(game)
+        await system._broadcast_state(game)
+
+        state = sent[-1]["payload"]["messages"][-1]
+        assert state["type"] == "state_update"
+        assert state["payload"]["tick_rate"] == 15
+        assert state["payload"]["broadcast_rate"] == 2.5
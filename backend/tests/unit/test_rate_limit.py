@@ -232,6 +232,27 @@ class TestMessageRateLimiter:
         # User 2 should still be allowed
         assert limiter.check("user2") is True
     
+    def test_cost_uses_budget(self):
+        """Test costly messages use several units of the budget."""
+        limiter = MessageRateLimiter(max_per_second=10)
+        
+        assert limiter.check("user1", cost=6) is True
+        assert limiter.check("user1", cost=6) is False
+        assert limiter.check("user1", cost=4) is True
+        assert limiter.check("user1") is False
+    
+    def test_dropped_counts_current_second(self):
+        """Test dropped counts a user's blocked messages in the current second."""
+        limiter = MessageRateLimiter(max_per_second=1)
+        
+        assert limiter.dropped("user1") == 0
+        limiter.check("user1")
+        limiter.check("user1")
+        limiter.check("user1")
+        
+        assert limiter.dropped("user1") == 2
+        assert limiter.dropped("user2") == 0
+    
     def test_get_stats(self):
         """Test stats tracking."""
         limiter = MessageRateLimiter(max_per_second=2)
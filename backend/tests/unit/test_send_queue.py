@@ -0,0 +1,233 @@
+"""
+Unit tests for per-connection send queues.
+
+Tests slow-consumer policies, droppable message classification,
+latest-wins coalescing, and ConnectionManager fan-out through the queues.
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.game.config import NetworkConfig
+from app.websocket.manager import ConnectionManager
+from app.websocket.send_queue import (
+    POLICY_COALESCE,
+    POLICY_DISCONNECT,
+    POLICY_DROP_OLDEST,
+    STATE_KEY,
+    QueueOverflow,
+    SendQueue,
+    coalesce_key,
+    is_droppable,
+)
+
+
+def _queue(policy: str, depth: int = 3) -> SendQueue:
+    return SendQueue(send=AsyncMock(), on_error=MagicMock(), max_depth=depth, policy=policy)
+
+
+def _types(queue: SendQueue) -> list:
+    return [item.frames for item in queue._items]
+
+
+class TestDroppable:
+    """Message classification."""
+
+    def test_state_is_droppable(self):
+        """Test superseded state traffic is droppable."""
+        assert is_droppable({"type": "state_update", "payload": {}})
+        assert is_droppable({"type": "position_update", "payload": {}})
+
+    def test_game_flow_is_critical(self):
+        """Test game flow messages are never droppable."""
+        assert not is_droppable({"type": "game_end", "payload": {}})
+        assert not is_droppable({"type": "question", "payload": {}})
+
+    def test_tick_frame_with_events_is_critical(self):
+        """Test a tick_frame carrying combat events is not droppable."""
+        state = {"type": "state_update", "payload": {}}
+        death = {"type": "combat_death", "payload": {}}
+
+        assert is_droppable({"type": "tick_frame", "payload": {"tick": 1, "messages": [state]}})
+        assert not is_droppable({"type": "tick_frame", "payload": {"tick": 1, "messages": [death, state]}})
+
+    @pytest.mark.parametrize("policy", [POLICY_DROP_OLDEST, POLICY_COALESCE])
+    def test_health_ping_survives_full_queue(self, policy):
+        """Test a health_ping (awaiting its pong) is never evicted from a full queue."""
+        ping = {"type": "health_ping", "payload": {}}
+        queue = _queue(policy)
+        queue.put("ping", "health_ping", is_droppable(ping))
+        queue.put("state1", "state_update", True)
+        queue.put("state2", "state_update", True)
+
+        for i in range(5):
+            assert queue.put(f"state{i + 3}", "state_update", True)
+
+        assert not is_droppable(ping)
+        assert _types(queue)[0] == "ping"
+
+
+class TestPolicies:
+    """Slow-consumer policies on a full queue."""
+
+    def test_drop_oldest_keeps_critical(self):
+        """Test the oldest droppable message is evicted, critical ones stay."""
+        queue = _queue(POLICY_DROP_OLDEST)
+        queue.put("question", "question", False)
+        queue.put("state1", "state_update", True)
+        queue.put("state2", "state_update", True)
+
+        assert queue.put("state3", "state_update", True)
+
+        assert _types(queue) == ["question", "state2", "state3"]
+        assert queue.dropped == 1
+
+    def test_coalesce_keeps_newest_per_type(self):
+        """Test coalescing collapses older droppable messages of the same type."""
+        queue = _queue(POLICY_COALESCE)
+        queue.put("pos1", "position_update", True)
+        queue.put("state1", "state_update", True)
+        queue.put("pos2", "position_update", True)
+
+        assert queue.put("state2", "state_update", True)
+
+        assert _types(queue) == ["pos2", "state2"]
+        assert queue.coalesced == 2
+
+    def test_disconnect_policy_raises(self):
+        """Test the disconnect policy rejects any overflow."""
+        queue = _queue(POLICY_DISCONNECT, depth=1)
+        queue.put("state1", "state_update", True)
+
+        with pytest.raises(QueueOverflow):
+            queue.put("state2", "state_update", True)
+
+    def test_critical_overflow_raises(self):
+        """Test a queue full of critical messages disconnects under any policy."""
+        queue = _queue(POLICY_DROP_OLDEST, depth=2)
+        queue.put("q1", "question", False)
+        queue.put("q2", "question", False)
+
+        assert queue.put("state", "state_update", True) is False
+        with pytest.raises(QueueOverflow):
+            queue.put("end", "game_end", False)
+
+    def test_unknown_policy_rejected(self):
+        """Test misconfigured policies fail fast."""
+        with pytest.raises(ValueError):
+            _queue("block")
+
+
+class TestCoalescingKeys:
+    """Latest-wins replacement of unsent messages."""
+
+    def test_default_keys(self):
+        """Test positions key by player and snapshots share one key."""
+        position = {"type": "position_update", "payload": {"player_id": "p1", "x": 1, "y": 2}}
+
+        assert coalesce_key(position) == "position_update:p1"
+        assert coalesce_key({"type": "state_update", "payload": {}}) == STATE_KEY
+        assert coalesce_key({"type": "state_delta", "payload": {}}) == STATE_KEY
+        assert coalesce_key({"type": "game_end", "payload": {}}) is None
+
+    def test_newer_message_replaces_unsent(self):
+        """Test a newer keyed message replaces the stale one and moves to the back."""
+        queue = _queue(POLICY_DROP_OLDEST, depth=8)
+        queue.put("pos1", "position_update", True, "position_update:p1")
+        queue.put("pos_other", "position_update", True, "position_update:p2")
+        queue.put("question", "question", False)
+
+        queue.put("pos2", "position_update", True, "position_update:p1")
+
+        assert _types(queue) == ["pos_other", "question", "pos2"]
+        assert queue.coalesced == 1
+
+    def test_reliable_messages_never_coalesce(self):
+        """Test keys on critical messages are ignored."""
+        queue = _queue(POLICY_DROP_OLDEST, depth=8)
+        queue.put("end1", "game_end", False, "game_end")
+        queue.put("end2", "game_end", False, "game_end")
+
+        assert _types(queue) == ["end1", "end2"]
+
+    def test_coalescing_can_be_disabled(self):
+        """Test the coalesce flag keeps every message."""
+        queue = SendQueue(send=AsyncMock(), on_error=MagicMock(), coalesce=False)
+        queue.put("state1", "state_update", True, STATE_KEY)
+        queue.put("state2", "state_update", True, STATE_KEY)
+
+        assert _types(queue) == ["state1", "state2"]
+
+
+class TestManagerQueues:
+    """ConnectionManager fan-out through send queues."""
+
+    def _socket(self) -> MagicMock:
+        ws = MagicMock()
+        ws.accept = AsyncMock()
+        ws.send_text = AsyncMock()
+        ws.close = AsyncMock()
+        return ws
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_block_broadcast(self):
+        """Test a stalled socket doesn't delay the broadcast or other clients."""
+        manager = ConnectionManager()
+        stalled = asyncio.Event()
+        slow_ws, fast_ws = self._socket(), self._socket()
+
+        async def stall(_):
+            await stalled.wait()
+
+        slow_ws.send_text = AsyncMock(side_effect=stall)
+        await manager.connect(slow_ws, "LOBBY", "slow")
+        await manager.connect(fast_ws, "LOBBY", "fast")
+
+        await asyncio.wait_for(
+            manager.broadcast_to_lobby("LOBBY", {"type": "state_update", "payload": {}}),
+            timeout=0.5,
+        )
+        await asyncio.sleep(0.01)
+
+        fast_ws.send_text.assert_awaited_once()
+        stalled.set()
+        await manager.flush()
+        assert manager.get_queue_stats()["sent"] == 2
+
+    @pytest.mark.asyncio
+    async def test_overflow_disconnects_slow_consumer(self):
+        """Test the disconnect policy drops and closes a backed-up client."""
+        manager = ConnectionManager(
+            network_config=NetworkConfig(send_queue_depth=1, slow_consumer_policy=POLICY_DISCONNECT),
+        )
+        ws = self._socket()
+
+        async def stall(_):
+            await asyncio.Event().wait()
+
+        ws.send_text = AsyncMock(side_effect=stall)
+        await manager.connect(ws, "LOBBY", "slow")
+
+        for i in range(3):
+            await manager.broadcast_to_lobby("LOBBY", {"type": "position_update", "payload": {"player_id": f"p{i}"}})
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        assert not manager.is_user_connected("slow")
+        assert manager.get_queue_stats()["slow_consumer_disconnects"] == 1
+        ws.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_send_error_disconnects(self):
+        """Test a failing socket write removes the connection."""
+        manager = ConnectionManager()
+        ws = self._socket()
+        ws.send_text = AsyncMock(side_effect=RuntimeError("closed"))
+        await manager.connect(ws, "LOBBY", "gone")
+
+        await manager.send_to_user("gone", {"type": "game_end", "payload": {}})
+        await manager.flush()
+
+        assert not manager.is_user_connected("gone")
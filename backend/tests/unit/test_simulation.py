@@ -0,0 +1,89 @@
+"""
+Unit tests for the headless match simulator.
+
+Tests real map configs load, runs are deterministic per seed, and the
+report covers every match-tick.
+"""
+
+import json
+import random
+import time
+from pathlib import Path
+
+import pytest
+
+from app.game.arena import ServerArenaSystems
+from app.game.config import ProfilerConfig
+from app.game.simulation import SimulationConfig, simulate
+
+MAPS_DIR = Path(__file__).resolve().parents[1] / "benchmarks" / "maps"
+
+
+@pytest.fixture(scope="module")
+def maps() -> dict:
+    return {path.stem: json.loads(path.read_text()) for path in sorted(MAPS_DIR.glob("*.json"))}
+
+
+class TestMapConfigs:
+    """Client map configs as sent in arena_init."""
+
+    def test_every_map_initializes(self, maps):
+        """Test barriers with size {x, y} and full/half types load."""
+        for slug, config in maps.items():
+            arena = ServerArenaSystems()
+            arena.initialize_from_config(config)
+
+            assert len(arena.barriers.barriers) == len(config["barriers"]), slug
+
+
+class TestSimulate:
+    """Headless runs."""
+
+    def test_report_counts(self, maps):
+        """Test every match is stepped and broadcast at the configured rates."""
+        report = simulate(SimulationConfig(matches=3, duration_s=1.0), maps)
+
+        assert report.ticks == 3 * 60
+        assert report.broadcasts == 3 * 10
+        assert sorted(report.maps) == sorted(maps)
+        assert report.ticks_per_sec > 0
+        assert report.tick_ms_p99 >= report.tick_ms_p50
+
+    def test_same_seed_same_match(self, maps):
+        """Test runs with one seed replay identically and seeds differ."""
+        config = SimulationConfig(matches=2, duration_s=3.0, fire_rate_hz=8.0)
+
+        first = simulate(config, maps)
+        second = simulate(config, maps)
+        other = simulate(SimulationConfig(matches=2, duration_s=3.0, fire_rate_hz=8.0, seed=2), maps)
+
+        assert first.checksum == second.checksum
+        assert first.checksum != other.checksum
+
+    def test_leaves_globals_alone(self, maps):
+        """Test a run neither patches time.time nor touches the global RNG."""
+        state = random.getstate()
+
+        simulate(SimulationConfig(matches=1, duration_s=0.1), maps)
+
+        assert random.getstate() == state
+        assert abs(time.time() - 1_700_000_000.0) > 1e6
+
+    def test_allocation_and_profile(self, maps):
+        """Test tracemalloc and profiler passes fill their report fields."""
+        report = simulate(
+            SimulationConfig(matches=1, duration_s=0.5, trace_allocations=True),
+            maps,
+            profiler_config=ProfilerConfig(enabled=True),
+        )
+
+        assert report.alloc_kib_per_tick is not None
+        assert report.phases["enabled"]
+
+    def test_soak_does_not_grow(self, maps):
+        """Test traced game memory stays flat over the second half of a long run."""
+        report = simulate(SimulationConfig(matches=2, duration_s=30.0, trace_allocations=True), maps)
+
+        assert report.growth_kib_per_match < 4.0
+        assert report.live_objects["PlayerState"] >= 4
+        assert report.pools["inputs"]["reused"] > 0
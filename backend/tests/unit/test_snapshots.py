@@ -0,0 +1,144 @@
+"""
+Unit tests for delta-compressed state snapshots.
+
+Tests delta round trips, ack handling, keyframe fallback, and the
+lobby registry.
+"""
+
+from app.game.config import NetworkConfig
+from app.game.snapshots import (
+    REMOVED_KEY,
+    DeltaEncoder,
+    SnapshotRegistry,
+    apply_delta,
+    diff_state,
+)
+
+
+def _payload(tick: int, p1_x: float = 100.0, projectiles=None) -> dict:
+    return {
+        "tick": tick,
+        "timestamp": 1000.0 + tick,
+        "players": {
+            "p1": {"x": p1_x, "y": 200.0, "seq": tick},
+            "p2": {"x": 900.0, "y": 200.0, "seq": 0},
+        },
+        "combat": {"projectiles": projectiles or []},
+        "arena": {"barriers": [{"id": "b1", "health": 100}]},
+    }
+
+
+class TestDiff:
+    """diff_state / apply_delta tests."""
+
+    def test_roundtrip(self):
+        """Test applying a delta reproduces the current state."""
+        base = _payload(6)
+        current = _payload(12, p1_x=130.0, projectiles=[{"id": "proj_1"}])
+
+        delta = diff_state(base, current)
+
+        assert apply_delta(base, delta) == current
+
+    def test_unchanged_sections_are_omitted(self):
+        """Test static state is not resent."""
+        delta = diff_state(_payload(6), _payload(12, p1_x=130.0))
+
+        assert "arena" not in delta
+        assert "combat" not in delta
+        assert delta["players"] == {"p1": {"x": 130.0, "seq": 12}}
+
+    def test_removed_keys(self):
+        """Test keys missing from the new state are removed."""
+        base = _payload(6)
+        current = _payload(12)
+        del current["players"]["p2"]
+
+        delta = diff_state(base, current)
+
+        assert delta["players"][REMOVED_KEY] == ["p2"]
+        assert apply_delta(base, delta) == current
+
+
+class TestDeltaEncoder:
+    """Per-lobby ack and keyframe tests."""
+
+    def test_unacked_clients_get_keyframes(self):
+        """Test clients that never ack keep receiving full state_update."""
+        encoder = DeltaEncoder()
+
+        encoder.encode(_payload(6), ["p1"])
+        groups = encoder.encode(_payload(12), ["p1"])
+
+        assert groups == [({"type": "state_update", "payload": _payload(12)}, ["p1"])]
+
+    def test_acked_client_gets_delta(self):
+        """Test a client that acked gets a delta against its ack."""
+        encoder = DeltaEncoder()
+        encoder.encode(_payload(6), ["p1", "p2"])
+        assert encoder.ack("p1", 6)
+
+        groups = encoder.encode(_payload(12, p1_x=130.0), ["p1", "p2"])
+        by_user = {users[0]: message for message, users in groups}
+
+        assert by_user["p1"]["type"] == "state_delta"
+        assert by_user["p1"]["payload"]["base_tick"] == 6
+        assert apply_delta(_payload(6), by_user["p1"]["payload"]["delta"]) == _payload(12, p1_x=130.0)
+        assert by_user["p2"]["type"] == "state_update"
+
+    def test_stale_ack_falls_back_to_keyframe(self):
+        """Test an ack older than the history yields a keyframe."""
+        encoder = DeltaEncoder(history_size=2)
+        encoder.encode(_payload(6), ["p1"])
+        encoder.ack("p1", 6)
+        encoder.encode(_payload(12), ["p1"])
+        encoder.encode(_payload(18), ["p1"])
+
+        groups = encoder.encode(_payload(24), ["p1"])
+
+        assert groups[0][0]["type"] == "state_update"
+
+    def test_unknown_and_old_acks_ignored(self):
+        """Test acks for unsent or older ticks are rejected."""
+        encoder = DeltaEncoder()
+        encoder.encode(_payload(6), ["p1"])
+        encoder.encode(_payload(12), ["p1"])
+
+        assert encoder.ack("p1", 99) is False
+        assert encoder.ack("p1", 12) is True
+        assert encoder.ack("p1", 6) is False
+
+    def test_tick_restart_resets_history(self):
+        """Test a new match (tick numbering restarts) forces keyframes."""
+        encoder = DeltaEncoder()
+        encoder.encode(_payload(600), ["p1"])
+        encoder.ack("p1", 600)
+
+        groups = encoder.encode(_payload(6), ["p1"])
+
+        assert groups[0][0]["type"] == "state_update"
+
+
+class TestSnapshotRegistry:
+    """Registry wiring tests."""
+
+    def test_disabled_sends_full_state(self):
+        """Test delta snapshots can be switched off."""
+        registry = SnapshotRegistry(NetworkConfig(delta_snapshots=False))
+
+        groups = registry.encode("LOBBY", _payload(6), ["p1"])
+
+        assert groups[0][0]["type"] == "state_update"
+        assert registry.ack("LOBBY", "p1", 6) is False
+
+    def test_reconnect_gets_keyframe(self):
+        """Test a removed client restarts from a keyframe."""
+        registry = SnapshotRegistry()
+        registry.encode("LOBBY", _payload(6), ["p1"])
+        registry.ack("LOBBY", "p1", 6)
+
+        registry.remove_client("LOBBY", "p1")
+        groups = registry.encode("LOBBY", _payload(12), ["p1"])
+
+        assert groups[0][0]["type"] == "state_update"
+        assert registry.get_stats()["keyframes_sent"] == 2
@@ -0,0 +1,159 @@
+"""
+Unit tests for the arena spatial hash grid.
+
+Tests grid bookkeeping, incremental updates for moving platforms and
+destroyed barriers, and parity with linear-scan collision checks.
+"""
+
+import random
+
+from app.game.arena import (
+    BarrierManager,
+    DoorManager,
+    PlatformManager,
+    ServerArenaSystems,
+    SpatialHashGrid,
+    TransportManager,
+)
+from app.game.arena.spatial import LAYER_BARRIER, LAYER_PLATFORM
+
+
+class TestSpatialHashGrid:
+    """Grid bookkeeping tests."""
+
+    def test_query_finds_only_nearby(self):
+        """Test a point query skips objects in other cells."""
+        grid = SpatialHashGrid(cell_size=64)
+        grid.insert("wall", "near", 0, 0, 10, 10)
+        grid.insert("wall", "far", 1000, 1000, 10, 10)
+
+        assert grid.query_point("wall", 5, 5) == ["near"]
+
+    def test_layers_are_isolated(self):
+        """Test queries only see their own layer."""
+        grid = SpatialHashGrid()
+        grid.insert("a", "x", 0, 0, 10, 10)
+        grid.insert("b", "y", 0, 0, 10, 10)
+
+        assert grid.query_point("a", 5, 5) == ["x"]
+
+    def test_results_in_insertion_order(self):
+        """Test candidates come back in insertion order across cells."""
+        grid = SpatialHashGrid(cell_size=10)
+        grid.insert("wall", "c", 15, 0, 5, 5)
+        grid.insert("wall", "a", 0, 0, 5, 5)
+        grid.insert("wall", "b", 0, 0, 30, 5)
+
+        assert grid.query_rect("wall", 0, 0, 30, 5) == ["c", "a", "b"]
+
+    def test_move_rebuckets_and_keeps_order(self):
+        """Test re-inserting moves an object without reordering it."""
+        grid = SpatialHashGrid(cell_size=64)
+        grid.insert("plat", "first", 0, 0, 10, 10)
+        grid.insert("plat", "second", 500, 0, 10, 10)
+
+        grid.insert("plat", "first", 500, 0, 10, 10)
+
+        assert grid.query_point("plat", 5, 5) == []
+        assert grid.query_point("plat", 505, 5) == ["first", "second"]
+
+    def test_clear_layer(self):
+        """Test clearing one layer leaves others intact."""
+        grid = SpatialHashGrid()
+        grid.insert("a", "x", 0, 0, 10, 10)
+        grid.insert("b", "y", 0, 0, 10, 10)
+
+        grid.clear("a")
+
+        assert len(grid) == 1
+        assert grid.query_point("a", 5, 5) == []
+
+
+class TestManagerIntegration:
+    """Managers query the grid and keep it in sync."""
+
+    def test_destroyed_barrier_leaves_grid(self):
+        """Test destroying a barrier removes it from the index."""
+        manager = BarrierManager()
+        manager.add("b1", 100, 100, 50, 50, "destructible", health=10)
+        assert manager.check_projectile_collision(120, 120) == "b1"
+
+        manager.apply_damage("b1", 10)
+
+        assert manager.check_projectile_collision(120, 120) is None
+        assert (LAYER_BARRIER, "b1") not in manager._grid
+
+    def test_moving_platform_is_reindexed(self):
+        """Test riding detection follows a moving platform."""
+        manager = PlatformManager()
+        manager.add(
+            "p1", 100, 20,
+            [{"x": 0, "y": 500}, {"x": 600, "y": 500}],
+            speed=600,
+        )
+
+        manager.update(0.5)
+        platform = manager.platforms["p1"]
+
+        assert platform.x == 300
+        assert manager.check_player_on_platform(350, 480, 20) is not None
+        assert manager.check_player_on_platform(50, 480, 20) is None
+        assert manager._grid.query_point(LAYER_PLATFORM, 350, 510) == ["p1"]
+
+    def test_door_collision_through_grid(self):
+        """Test closed doors block and open doors do not."""
+        manager = DoorManager()
+        manager.add("d1", 200, 200, 100, 20)
+
+        assert manager.check_collision(250, 210, 5) == "d1"
+
+        manager.doors["d1"].is_blocking = False
+        assert manager.check_collision(250, 210, 5) is None
+
+    def test_teleport_through_grid(self):
+        """Test teleporter lookup uses indexed pads."""
+        manager = TransportManager()
+        manager.add_teleporter("t1", "pair", 100, 100, 30)
+        manager.add_teleporter("t2", "pair", 900, 500, 30)
+        manager.link_teleporters()
+
+        assert manager.check_teleport("p1", (600, 600)) is None
+        assert manager.check_teleport("p1", (110, 100)) == (900, 500)
+
+    def test_managers_share_arena_grid(self):
+        """Test the arena coordinator wires one grid into all managers."""
+        arena = ServerArenaSystems()
+
+        assert arena.barriers._grid is arena.grid
+        assert arena.doors._grid is arena.grid
+        assert arena.platforms._grid is arena.grid
+        assert arena.transport._grid is arena.grid
+
+    def test_barrier_parity_with_linear_scan(self):
+        """Test grid-backed checks match a brute-force scan."""
+        rng = random.Random(7)
+        manager = BarrierManager()
+        for i in range(80):
+            manager.add(
+                f"b{i}",
+                rng.uniform(0, 1200), rng.uniform(0, 650),
+                rng.uniform(10, 150), rng.uniform(10, 150),
+                rng.choice(["solid", "destructible", "half_wall"]),
+            )
+
+        def linear_circle(x, y, r):
+            for b in manager.barriers.values():
+                if b.is_active and manager._circle_rect_collision(x, y, r, b):
+                    return b.id
+            return None
+
+        def linear_point(x, y):
+            for b in manager.barriers.values():
+                if b.is_active and b.barrier_type.value != "half_wall" and manager._point_in_rect(x, y, b):
+                    return b.id
+            return None
+
+        for _ in range(500):
+            x, y = rng.uniform(0, 1280), rng.uniform(0, 720)
+            assert manager.check_collision(x, y, 20) == linear_circle(x, y, 20)
+            assert manager.check_projectile_collision(x, y) == linear_point(x, y)
@@ -0,0 +1,161 @@
+"""
+Unit tests for spectator connections and the spectator snapshot feed.
+
+Tests that spectators are kept apart from lobby participants, that the
+feed samples at the spectator rate and publishes after the delay, and
+that one serialized frame is shared by every spectator of a lobby.
+"""
+
+import asyncio
+import json
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.game.config import NetworkConfig
+from app.game.frames import TICK_FRAME
+from app.game.snapshots import SnapshotRegistry
+from app.websocket.handlers import router
+from app.websocket.manager import ConnectionManager
+from app.websocket.spectators import SpectatorFeed
+
+FAST = NetworkConfig(spectator_interval_s=0.05, spectator_delay_s=0.05)
+
+
+def _socket() -> MagicMock:
+    ws = MagicMock()
+    ws.accept = AsyncMock()
+    ws.send_text = AsyncMock()
+    ws.send_bytes = AsyncMock()
+    ws.close = AsyncMock()
+    return ws
+
+
+def _state(tick: int) -> dict:
+    return {"type": "state_update", "payload": {"tick": tick, "players": {"p1": {"x": 1.0, "y": 2.0}}}}
+
+
+def _sent(ws: MagicMock) -> list:
+    return [json.loads(c.args[0]) for c in ws.send_text.await_args_list]
+
+
+class TestSpectatorConnections:
+    """Spectator registration in ConnectionManager."""
+
+    @pytest.mark.asyncio
+    async def test_spectators_are_not_participants(self):
+        """Test lobby broadcasts and user lookups skip spectators."""
+        manager = ConnectionManager()
+        player, spectator = _socket(), _socket()
+        await manager.connect(player, "LOBBY", "p1")
+        await manager.connect_spectator(spectator, "LOBBY", "p2")
+
+        await manager.broadcast_to_lobby("LOBBY", {"type": "position_update", "payload": {"player_id": "p1"}})
+        await manager.flush()
+
+        assert manager.get_lobby_users("LOBBY") == {"p1"}
+        assert not manager.is_user_connected("p2")
+        assert manager.get_spectator_count("LOBBY") == 1
+        assert manager.get_connection_count() == 2
+        spectator.send_text.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_spectating_keeps_players_connection(self):
+        """Test a player watching another lobby keeps their own connection."""
+        manager = ConnectionManager()
+        player, spectator = _socket(), _socket()
+        await manager.connect(player, "LOBBY1", "p1")
+        await manager.connect_spectator(spectator, "LOBBY2", "p1")
+
+        assert manager.disconnect(spectator) == ("LOBBY2", "p1")
+
+        assert manager.is_user_connected("p1")
+        assert not manager.has_spectators("LOBBY2")
+        assert manager.get_queue_stats()["queues"] == 1
+
+    def test_spectator_limit(self):
+        """Test spectators have their own per-lobby limit."""
+        manager = ConnectionManager(max_per_lobby=2, network_config=NetworkConfig(max_spectators_per_lobby=1))
+        manager.active_connections["LOBBY"] = {MagicMock(), MagicMock()}
+
+        assert manager.can_accept_spectator("LOBBY") == (True, "")
+        ws = MagicMock()
+        manager.spectator_connections["LOBBY"] = {ws}
+        manager._spectator_info[ws] = ("LOBBY", "s1")
+        assert manager.can_accept_spectator("LOBBY") == (False, "spectators_full")
+
+
+class TestSpectatorFeed:
+    """Sampling, delay and shared encoding."""
+
+    @pytest.mark.asyncio
+    async def test_no_spectators_no_work(self):
+        """Test lobbies nobody watches are not sampled."""
+        feed = SpectatorFeed(ConnectionManager(), FAST)
+
+        assert feed.sample("LOBBY", _state(1)) is False
+        assert feed.get_stats()["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_delayed_and_rate_limited(self):
+        """Test one snapshot per interval, delivered only after the delay."""
+        manager = ConnectionManager()
+        feed = SpectatorFeed(manager, FAST)
+        ws = _socket()
+        await manager.connect_spectator(ws, "LOBBY", "s1")
+
+        assert feed.sample("LOBBY", _state(1))
+        assert not feed.sample("LOBBY", _state(2))
+        await asyncio.sleep(0.01)
+        ws.send_text.assert_not_awaited()
+
+        await asyncio.sleep(0.1)
+        await manager.flush()
+        assert [m["payload"]["tick"] for m in _sent(ws)] == [1]
+        assert feed.sample("LOBBY", _state(7))
+        assert feed.get_stats()["delivered"] == 1
+
+    @pytest.mark.asyncio
+    async def test_one_encoding_shared(self):
+        """Test every spectator gets the same frames, serialized when sampled."""
+        manager = ConnectionManager()
+        feed = SpectatorFeed(manager, FAST)
+        watchers = [_socket() for _ in range(200)]
+        for i, ws in enumerate(watchers):
+            await manager.connect_spectator(ws, "LOBBY", f"s{i}")
+
+        state = _state(3)
+        feed.sample("LOBBY", state)
+        state["payload"]["players"]["p1"]["x"] = 99.0  # Tick moves on before the delay
+        await asyncio.sleep(0.1)
+
+        await manager.flush()
+        sent = [c.args[0] for ws in watchers for c in ws.send_text.await_args_list]
+        assert len(sent) == 200
+        assert len({id(text) for text in sent}) == 1  # One str object, not 200 encodings
+        assert json.loads(sent[0])["payload"]["players"]["p1"]["x"] == 1.0
+        assert feed.get_stats()["delivered"] == 200
+
+    @pytest.mark.asyncio
+    async def test_tick_broadcast_feeds_spectators(self, monkeypatch):
+        """Test spectators get the tick's state later, without its events."""
+        manager = ConnectionManager()
+        feed = SpectatorFeed(manager, FAST)
+        monkeypatch.setattr(router, "manager", manager)
+        monkeypatch.setattr(router, "snapshot_registry", SnapshotRegistry())
+        monkeypatch.setattr(router, "spectator_feed", feed)
+        player, spectator = _socket(), _socket()
+        await manager.connect(player, "LOBBY", "p1", tick_frames=True)
+        await manager.connect_spectator(spectator, "LOBBY", "s1")
+
+        event = {"type": "combat_death", "payload": {"victim_id": "p2", "killer_id": "p1"}}
+        await router._broadcast_tick_state(
+            "LOBBY", {"type": TICK_FRAME, "payload": {"tick": 6, "messages": [event, _state(6)]}}
+        )
+        await manager.flush()
+        assert [m["type"] for m in _sent(player)] == [TICK_FRAME]
+        spectator.send_text.assert_not_awaited()
+
+        await asyncio.sleep(0.1)
+        await manager.flush()
+        assert _sent(spectator) == [_state(6)]
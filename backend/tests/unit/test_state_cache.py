@@ -0,0 +1,179 @@
+"""
+Unit tests for dirty-tracked broadcast state.
+
+Tests that FragmentCache rebuilds only marked entities and returns the
+same object while nothing changed, that the arena, combat and buff
+states stay identical to a full rebuild as a match plays out, and that
+diff_state skips unchanged fragments by identity.
+"""
+
+import random
+import time
+
+from app.game.arena import HazardType, ServerArenaSystems, TrapEffect, TrapType
+from app.game.buffs import BuffManager, BuffType
+from app.game.combat import ServerCombatSystem
+from app.game.snapshots import diff_state
+from app.game.state_cache import FragmentCache
+
+DT = 1 / 60
+
+
+def _full_arena(systems: ServerArenaSystems) -> dict:
+    """Arena state rebuilt from scratch, the way get_state() used to."""
+    managers = {
+        "hazards": (systems.hazards, systems.hazards._hazards),
+        "traps": (systems.traps, systems.traps._traps),
+        "doors": (systems.doors, systems.doors.doors),
+        "platforms": (systems.platforms, systems.platforms.platforms),
+        "barriers": (systems.barriers, systems.barriers.barriers),
+        "powerups": (systems.powerups, systems.powerups.powerups),
+    }
+    return {name: [m._fragment(k) for k in entities] for name, (m, entities) in managers.items()}
+
+
+def _arena() -> ServerArenaSystems:
+    systems = ServerArenaSystems()
+    systems.add_hazard("h1", HazardType.DAMAGE, 100, 100, 80, 80)
+    systems.add_trap("t1", TrapType.PRESSURE, 300, 300, 30, TrapEffect.DAMAGE, 10, 1.0, chain_radius=200)
+    systems.add_trap("t2", TrapType.PROJECTILE, 400, 300, 30, TrapEffect.KNOCKBACK, 100, 1.0)
+    systems.add_trap("t3", TrapType.TIMED, 900, 500, 30, TrapEffect.STUN, 1, 1.0, interval=0.5)
+    systems.add_door("d1", 600, 100, 40, 120, trigger="pressure_plate", linked_trigger_id="plate")
+    systems.add_platform("pl1", 100, 20, [{"x": 100, "y": 600}, {"x": 400, "y": 600}], 120, pause_at_waypoints=0.5)
+    systems.add_barrier("b1", 800, 300, 60, 60, barrier_type="destructible", health=50)
+    systems.add_barrier("b2", 800, 400, 60, 60)
+    systems.spawn_powerup("pu1", 1000, 100, "shield")
+    return systems
+
+
+class TestFragmentCache:
+    """Dirty set and identity tests."""
+
+    def test_rebuilds_only_marked(self):
+        """Test only marked keys are rebuilt and clean state is reused."""
+        values = {"a": 1, "b": 2}
+        cache = FragmentCache(lambda key: {"v": values[key]} if key in values else None)
+        cache.mark("a")
+        cache.mark("b")
+        first = cache.state()
+        assert first == [{"v": 1}, {"v": 2}]
+        assert cache.state() is first
+
+        values["b"] = 3
+        cache.mark("b")
+        second = cache.state()
+        assert second == [{"v": 1}, {"v": 3}]
+        assert second is not first and second[0] is first[0]
+        assert first == [{"v": 1}, {"v": 2}]  # Earlier state untouched
+        assert cache.rebuilt == 3
+
+    def test_drop_and_keyed(self):
+        """Test dropped or vanished entities leave the keyed state."""
+        values = {"a": 1, "b": 2, "c": 3}
+        cache = FragmentCache(lambda key: values.get(key), keyed=True)
+        for key in values:
+            cache.mark(key)
+        assert cache.state() == {"a": 1, "b": 2, "c": 3}
+
+        cache.drop("a")
+        del values["c"]
+        cache.mark("c")
+        assert cache.state() == {"b": 2}
+        cache.clear()
+        assert cache.state() == {}
+
+
+class TestArenaState:
+    """Cached arena state against full rebuilds."""
+
+    def test_idle_arena_reuses_state(self):
+        """Test an arena nobody touches returns the same lists every tick."""
+        systems = _arena()
+        systems.platforms.remove("pl1")
+        systems.traps.remove("t3")
+        first = systems.get_arena_state()
+        for _ in range(10):
+            systems.update(DT, {"p1": (640.0, 360.0)})
+            state = systems.get_arena_state()
+            for name, fragments in state.items():
+                assert fragments is first[name], name
+
+    def test_matches_full_rebuild(self):
+        """Test cached state equals a full rebuild through a busy match."""
+        systems = _arena()
+        rng = random.Random(5)
+        for tick in range(400):
+            now = 1000.0 + tick * DT
+            positions = {"p1": (rng.uniform(0, 1280), rng.uniform(0, 720)), "p2": (300.0, 300.0)}
+            systems.hazards.update(positions, now)
+            systems.traps.update(DT, positions, now)
+            systems.traps.process_chains(now, positions)
+            systems.doors.update(DT, now)
+            systems.platforms.update(DT)
+            if tick % 40 == 0:
+                systems.doors.trigger_by_link("plate", now)
+                systems.apply_barrier_damage("b1", 10)
+            if tick % 90 == 0:
+                systems.traps.on_projectile_hit((400.0, 300.0), positions)
+            if tick == 200:
+                systems.powerups.check_collection("p1", (1000.0, 100.0))
+                systems.remove_hazard("h1")
+                systems.remove_barrier("b2")
+                systems.spawn_powerup("pu2", 50, 50, "sos")
+
+            assert systems.get_arena_state() == _full_arena(systems)
+
+
+class TestCombatAndBuffState:
+    """Cached combat players and buffs."""
+
+    def test_combat_players_follow_changes(self):
+        """Test player fragments change on damage and invulnerability expiry only."""
+        combat = ServerCombatSystem()
+        combat.init_player("p1")
+        combat.init_player("p2")
+        players = combat.get_combat_state()["players"]
+        assert combat.get_combat_state()["players"] is players
+
+        combat._apply_damage("p2", "p1", 200, current_time=1000.0)
+        players = combat.get_combat_state()["players"]
+        assert players["p2"]["is_dead"] and players["p2"]["health"] == 0
+
+        combat._respawn_player("p2", {"p1": (100.0, 100.0)}, 1000.0)
+        assert combat.get_combat_state()["players"]["p2"]["invulnerable"] is False  # Window long over
+
+        now = time.time()
+        combat._respawn_player("p2", {"p1": (100.0, 100.0)}, now)
+        assert combat.get_combat_state()["players"]["p2"]["invulnerable"] is True
+        combat._invulnerable.schedule("p2", now - 1)  # Window ends
+        combat._combat_states["p2"].invulnerable_until = now - 1
+        assert combat.get_combat_state()["players"]["p2"]["invulnerable"] is False
+
+    def test_buffs_follow_apply_and_expiry(self):
+        """Test buff lists rebuild while buffs run and empty out on expiry."""
+        manager = BuffManager()
+        manager.init_player("p1")
+        manager.init_player("p2")
+        idle = manager.get_buff_state_for_broadcast()
+        assert idle == {"p1": [], "p2": []}
+        assert manager.get_buff_state_for_broadcast() is idle
+
+        buff = manager.apply_buff("p1", BuffType.SPEED_BOOST, 0.5, 10.0, "quiz")
+        state = manager.get_buff_state_for_broadcast()
+        assert [b["type"] for b in state["p1"]] == [BuffType.SPEED_BOOST.value]
+        assert state["p2"] is idle["p2"]
+
+        manager.update(buff.expires_at + 1)
+        assert manager.get_buff_state_for_broadcast() == {"p1": [], "p2": []}
+
+
+class TestDiffIdentity:
+    """diff_state skips shared fragments."""
+
+    def test_same_object_is_unchanged(self):
+        """Test a fragment shared by base and current yields no delta."""
+        shared = [{"id": "t1", "state": "armed"}]
+        base = {"arena": {"traps": shared, "doors": [{"id": "d1"}]}}
+        current = {"arena": {"traps": shared, "doors": [{"id": "d1", "state": "open"}]}}
+
+        assert diff_state(base, current) == {"arena": {"doors": [{"id": "d1", "state": "open"}]}}
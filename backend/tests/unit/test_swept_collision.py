@@ -0,0 +1,144 @@
+"""
+Unit tests for swept projectile collision.
+
+Tests the segment primitives, tunneling at low tick rates, earliest
+impact resolution, and parity between the dict and NumPy paths.
+"""
+
+import pytest
+
+from app.game.combat import ServerCombatSystem
+from app.game.projectiles import NUMPY_AVAILABLE
+from app.game.sweep import (
+    range_toi,
+    segment_aabb_toi,
+    segment_circle_toi,
+    segment_exit_toi,
+)
+
+
+def _fire(combat: ServerCombatSystem, player_id: str, position, direction) -> str:
+    """Fire ignoring cooldown."""
+    combat._combat_states[player_id].last_fire_time = 0
+    return combat.process_fire(player_id, position, direction, 0.0)
+
+
+def _hits(combat: ServerCombatSystem) -> list:
+    return [e.data for e in combat.get_and_clear_events() if e.event_type == "hit"]
+
+
+class TestPrimitives:
+    """Segment time-of-impact tests."""
+
+    def test_circle_entry_time(self):
+        """Test a segment crossing a circle reports the entry point."""
+        assert segment_circle_toi(0, 0, 100, 0, 50, 0, 10) == pytest.approx(0.4)
+
+    def test_circle_miss_and_behind(self):
+        """Test misses, circles behind the start, and zero-length segments."""
+        assert segment_circle_toi(0, 0, 100, 0, 50, 30, 10) is None
+        assert segment_circle_toi(0, 0, 100, 0, -50, 0, 10) is None
+        assert segment_circle_toi(0, 0, 0, 0, 50, 0, 10) is None
+
+    def test_circle_start_inside(self):
+        """Test a segment starting inside the circle hits at t=0."""
+        assert segment_circle_toi(50, 0, 100, 0, 50, 0, 10) == 0.0
+
+    def test_aabb_entry_time(self):
+        """Test slab entry, misses, and axis-parallel segments."""
+        assert segment_aabb_toi(0, 50, 100, 0, 25, 0, 75, 100) == pytest.approx(0.25)
+        assert segment_aabb_toi(0, 150, 100, 0, 25, 0, 75, 100) is None
+        assert segment_aabb_toi(0, 0, 10, 0, 25, 0, 75, 100) is None
+        assert segment_aabb_toi(30, 50, 0, 0, 25, 0, 75, 100) == 0.0
+
+    def test_exit_and_range(self):
+        """Test arena exit and max-range times."""
+        assert segment_exit_toi(1200, 10, 160, 0, 1280, 720) == pytest.approx(0.5)
+        assert segment_exit_toi(100, 10, 160, 0, 1280, 720) is None
+        assert range_toi(560, 80, 600) == pytest.approx(0.5)
+        assert range_toi(100, 80, 600) is None
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+class TestSweptCombat:
+    """ServerCombatSystem with swept collision at a low tick rate."""
+
+    DT = 1 / 20  # 40px per tick at 800px/s
+
+    def _combat(self, vectorized: bool, swept: bool = True) -> ServerCombatSystem:
+        if vectorized and not NUMPY_AVAILABLE:
+            pytest.skip("numpy not installed")
+        combat = ServerCombatSystem(vectorized=vectorized, swept=swept)
+        for pid in ("p1", "p2", "p3"):
+            combat.init_player(pid)
+        return combat
+
+    def test_no_tunneling_through_players(self, vectorized):
+        """Test a shot that jumps over a target between ticks still hits."""
+        combat = self._combat(vectorized)
+        combat.PROJECTILE_SPEED = 2000.0  # 100px per tick, wider than the hitbox
+        _fire(combat, "p1", (100, 100), (1, 0))
+
+        for _ in range(3):
+            combat.update(self.DT, {"p1": (100.0, 100.0), "p2": (160.0, 100.0)})
+
+        assert [h["target_id"] for h in _hits(combat)] == ["p2"]
+        assert combat.get_combat_state()["projectiles"] == []
+
+    def test_point_tests_tunnel(self, vectorized):
+        """Test the same shot passes through with swept=False."""
+        combat = self._combat(vectorized, swept=False)
+        combat.PROJECTILE_SPEED = 2000.0
+        _fire(combat, "p1", (100, 100), (1, 0))
+
+        combat.update(self.DT, {"p1": (100.0, 100.0), "p2": (160.0, 100.0)})
+
+        assert _hits(combat) == []
+
+    def test_barrier_blocks_before_player(self, vectorized):
+        """Test a barrier in front of the target absorbs the shot."""
+        combat = self._combat(vectorized)
+        combat.PROJECTILE_SPEED = 4000.0
+        # Barrier spans x 590..690 at y 360; target just behind it
+        _fire(combat, "p1", (560, 360), (1, 0))
+
+        combat.update(self.DT, {"p1": (560.0, 360.0), "p2": (720.0, 360.0)})
+
+        assert _hits(combat) == []
+        assert combat.get_combat_state()["projectiles"] == []
+
+    def test_earliest_target_is_hit(self, vectorized):
+        """Test the nearer of two targets on the path takes the hit."""
+        combat = self._combat(vectorized)
+        combat.PROJECTILE_SPEED = 4000.0
+        _fire(combat, "p1", (100, 100), (1, 0))
+
+        positions = {"p1": (100.0, 100.0), "p3": (250.0, 100.0), "p2": (160.0, 100.0)}
+        combat.update(self.DT, positions)
+
+        assert [h["target_id"] for h in _hits(combat)] == ["p2"]
+
+
+@pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy not installed")
+def test_vectorized_parity_at_20hz():
+    """Test the dict and NumPy swept paths produce identical events and state."""
+    positions = {"p1": (170.0, 360.0), "p2": (400.0, 360.0), "p3": (640.0, 600.0)}
+    scalar = ServerCombatSystem()
+    vector = ServerCombatSystem(vectorized=True)
+    for combat in (scalar, vector):
+        for pid in positions:
+            combat.init_player(pid)
+        for i in range(12):
+            _fire(combat, "p1", (160, 360), (1, 0))
+            _fire(combat, "p2", (400, 360), (-1, 0.01 * i))
+            _fire(combat, "p3", (640, 600), (0, -1))
+            _fire(combat, "p1", (160, 360), (1, 1))
+
+    for _ in range(40):
+        scalar.update(1 / 20, positions)
+        vector.update(1 / 20, positions)
+
+        assert [(e.event_type, e.data) for e in scalar.get_and_clear_events()] == [
+            (e.event_type, e.data) for e in vector.get_and_clear_events()
+        ]
+        assert scalar.get_combat_state() == vector.get_combat_state()
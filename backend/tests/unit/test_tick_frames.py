@@ -0,0 +1,115 @@
+"""
+Unit tests for bundled per-tick frames.
+
+Tests frame building in the tick system, the per-message compat mode,
+router fan-out to frame-capable and legacy clients, and the binary
+tick_frame layout.
+"""
+
+import json
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.game.config import NetworkConfig
+from app.game.frames import TICK_FRAME, split_frame
+from app.game.snapshots import SnapshotRegistry
+from app.game.tick_system import TickSystem
+from app.websocket import codec
+from app.websocket.handlers import router
+from app.websocket.manager import ConnectionManager
+
+
+async def _capture_tick(system: TickSystem) -> list:
+    """Run one broadcast with a pending fire event and capture output."""
+    sent = []
+
+    async def callback(lobby_id: str, message: dict) -> None:
+        sent.append(message)
+
+    system.set_broadcast_callback(callback)
+    game = system.create_game("LOBBY", "p1", "p2")
+    game.combat_system.process_fire("p1", (160, 360), (1, 0), 0.0)
+    await system._broadcast_state(game)
+    return sent
+
+
+class TestTickSystemFrames:
+    """Frame building in TickSystem."""
+
+    @pytest.mark.asyncio
+    async def test_one_frame_per_tick(self):
+        """Test events and state go out as one ordered tick_frame."""
+        sent = await _capture_tick(TickSystem())
+
+        assert len(sent) == 1
+        assert sent[0]["type"] == TICK_FRAME
+        types = [m["type"] for m in sent[0]["payload"]["messages"]]
+        assert types == ["combat_fire", "state_update"]
+
+    @pytest.mark.asyncio
+    async def test_compat_mode_sends_individual_messages(self):
+        """Test the compat flag restores one broadcast per message."""
+        sent = await _capture_tick(TickSystem(network_config=NetworkConfig(tick_frames=False)))
+
+        assert [m["type"] for m in sent] == ["combat_fire", "state_update"]
+
+    def test_split_frame(self):
+        """Test frames split into events and state."""
+        state = {"type": "state_update", "payload": {"tick": 1}}
+        event = {"type": "combat_hit", "payload": {}}
+        frame = {"type": TICK_FRAME, "payload": {"tick": 1, "messages": [event, state]}}
+
+        assert split_frame(frame) == ([event], state)
+        assert split_frame(state) == ([], state)
+        assert split_frame(event) == ([event], None)
+
+
+class TestRouterFanout:
+    """Per-client delivery of tick frames."""
+
+    def _socket(self) -> MagicMock:
+        ws = MagicMock()
+        ws.accept = AsyncMock()
+        ws.send_text = AsyncMock()
+        ws.send_bytes = AsyncMock()
+        return ws
+
+    @pytest.mark.asyncio
+    async def test_framed_and_legacy_clients(self, monkeypatch):
+        """Test framed clients get one message, legacy clients the old stream."""
+        manager = ConnectionManager()
+        monkeypatch.setattr(router, "manager", manager)
+        monkeypatch.setattr(router, "snapshot_registry", SnapshotRegistry())
+        framed_ws, legacy_ws = self._socket(), self._socket()
+        await manager.connect(framed_ws, "LOBBY", "u1", tick_frames=True)
+        await manager.connect(legacy_ws, "LOBBY", "u2")
+
+        event = {"type": "combat_death", "payload": {"victim_id": "u2", "killer_id": "u1"}}
+        state = {"type": "state_update", "payload": {"tick": 6, "players": {}}}
+        await router._broadcast_tick_state(
+            "LOBBY", {"type": TICK_FRAME, "payload": {"tick": 6, "messages": [event, state]}}
+        )
+        await manager.flush()
+
+        framed = [json.loads(c.args[0]) for c in framed_ws.send_text.await_args_list]
+        legacy = [json.loads(c.args[0]) for c in legacy_ws.send_text.await_args_list]
+        assert [m["type"] for m in framed] == [TICK_FRAME]
+        assert framed[0]["payload"]["messages"] == [event, state]
+        assert legacy == [event, state]
+
+
+class TestBinaryTickFrame:
+    """Binary layout for bundled frames."""
+
+    def test_roundtrip_mixed_layouts(self):
+        """Test bundled messages with and without layouts round trip."""
+        hit = {
+            "type": "combat_hit",
+            "payload": {"target_id": "p2", "shooter_id": "p1", "damage": 10,
+                        "base_damage": 10, "health_remaining": 90.0},
+        }
+        trap = {"type": "arena_trap_triggered", "payload": {"trap_id": "t1"}}
+        frame = {"type": TICK_FRAME, "payload": {"tick": 42, "messages": [hit, trap]}}
+
+        assert codec.decode(codec.encode(frame), client=False) == frame
@@ -0,0 +1,114 @@
+"""
+Unit tests for the per-phase tick profiler.
+
+Tests rolling histogram percentiles, sampling, and TickSystem
+integration.
+"""
+
+import pytest
+
+from app.game.config import ProfilerConfig
+from app.game.profiler import PHASES, TOTAL, RollingHistogram, TickProfiler, PHASE_INPUT, PHASE_BROADCAST
+from app.game.tick_system import TickSystem
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRollingHistogram:
+    """Percentile summaries."""
+
+    def test_percentiles(self):
+        """Test percentiles over a full window."""
+        histogram = RollingHistogram(window=100)
+        for value in range(1, 101):
+            histogram.record(float(value))
+
+        summary = histogram.summary()
+
+        assert summary["p50_ms"] == 51.0
+        assert summary["p95_ms"] == 96.0
+        assert summary["p99_ms"] == 100.0
+        assert summary["max_ms"] == 100.0
+
+    def test_window_rolls(self):
+        """Test old samples fall out of the window."""
+        histogram = RollingHistogram(window=4)
+        for value in (100.0, 1.0, 1.0, 1.0, 1.0):
+            histogram.record(value)
+
+        summary = histogram.summary()
+
+        assert summary["max_ms"] == 1.0
+        assert summary["count"] == 5
+
+
+class TestTickProfiler:
+    """Sampling and phase attribution."""
+
+    def test_disabled_returns_no_sample(self):
+        """Test a disabled profiler never samples."""
+        profiler = TickProfiler(ProfilerConfig(enabled=False))
+
+        assert profiler.begin("LOBBY") is None
+
+    def test_sample_every(self):
+        """Test only 1 in N ticks is sampled."""
+        profiler = TickProfiler(ProfilerConfig(enabled=True, sample_every=3))
+
+        samples = [profiler.begin("LOBBY") for _ in range(6)]
+
+        assert sum(s is not None for s in samples) == 2
+
+    def test_laps_attribute_time_to_phases(self):
+        """Test elapsed time between laps lands in the right phase."""
+        clock = FakeClock()
+        profiler = TickProfiler(ProfilerConfig(enabled=True, per_lobby=True), clock=clock)
+
+        sample = profiler.begin("LOBBY")
+        clock.now += 0.002
+        sample.lap(PHASE_INPUT)
+        clock.now += 0.005
+        sample.lap(PHASE_BROADCAST)
+        profiler.end(sample)
+
+        stats = profiler.get_stats()
+        assert stats["phases"]["input"]["max_ms"] == pytest.approx(2.0)
+        assert stats["phases"]["broadcast"]["max_ms"] == pytest.approx(5.0)
+        assert stats["phases"][TOTAL]["max_ms"] == pytest.approx(7.0)
+        assert stats["lobbies"]["LOBBY"]["input"]["count"] == 1
+
+
+class TestTickSystemProfiling:
+    """Profiler wiring in TickSystem."""
+
+    @pytest.mark.asyncio
+    async def test_process_tick_records_every_phase(self):
+        """Test each processed tick feeds every phase histogram."""
+        system = TickSystem(profiler_config=ProfilerConfig(enabled=True, per_lobby=True))
+        game = system.create_game("LOBBY", "p1", "p2")
+
+        for _ in range(6):
+            await system._process_tick(game)
+
+        stats = system.get_profiler_stats()
+        assert set(stats["phases"]) == set(PHASES) | {TOTAL}
+        assert all(summary["count"] == 6 for summary in stats["phases"].values())
+
+        system.stop_game("LOBBY")
+        assert "LOBBY" not in system.get_profiler_stats()["lobbies"]
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self):
+        """Test the default tick system records nothing."""
+        system = TickSystem()
+        game = system.create_game("LOBBY", "p1", "p2")
+
+        await system._process_tick(game)
+
+        assert system.get_profiler_stats()["phases"][TOTAL]["count"] == 0
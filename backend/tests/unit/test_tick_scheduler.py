@@ -0,0 +1,155 @@
+"""
+Unit tests for the shared tick scheduler.
+
+Tests accumulator catch-up limits, drift correction, budget accounting,
+and TickSystem integration.
+"""
+
+import asyncio
+
+import pytest
+
+from app.game.config import SchedulerConfig, TICK_CONFIG
+from app.game.models import GameState
+from app.game.scheduler import MatchBudget, TickScheduler
+from app.game.tick_system import TickSystem
+
+
+TICK = TICK_CONFIG.duration_s
+
+
+async def _noop_step(game: GameState) -> None:
+    return None
+
+
+class TestAccumulator:
+    """Fixed-timestep accumulator tests."""
+
+    def test_first_advance_steps_once(self):
+        """Test the first wake-up steps exactly one tick."""
+        scheduler = TickScheduler(_noop_step)
+
+        assert scheduler.advance(100.0) == 1
+
+    def test_steps_match_elapsed_ticks(self):
+        """Test elapsed time converts to whole ticks."""
+        scheduler = TickScheduler(_noop_step)
+        scheduler.advance(100.0)
+
+        assert scheduler.advance(100.0 + TICK * 3.5) == 3
+
+    def test_remainder_carries_over(self):
+        """Test partial ticks accumulate into the next wake-up."""
+        scheduler = TickScheduler(_noop_step)
+        scheduler.advance(100.0)
+
+        assert scheduler.advance(100.0 + TICK * 0.6) == 0
+        assert scheduler.advance(100.0 + TICK * 1.2) == 1
+
+    def test_catchup_limit_drops_backlog(self):
+        """Test backlog beyond the catch-up cap is dropped."""
+        config = SchedulerConfig(shared=True, max_catchup_ticks=4)
+        scheduler = TickScheduler(_noop_step, config=config)
+        scheduler.advance(100.0)
+
+        steps = scheduler.advance(100.0 + TICK * 20)
+
+        assert steps == 4
+        assert scheduler.get_stats()["dropped_ticks"] == 16
+        # Accumulator keeps only the sub-tick remainder
+        assert scheduler.advance(100.0 + TICK * 20.5) == 0
+
+    def test_drift_correction_shortens_sleep(self):
+        """Test oversleeping shortens the next sleep."""
+        scheduler = TickScheduler(_noop_step)
+        scheduler.advance(100.0)
+        scheduler.advance(100.0 + TICK * 1.4)
+
+        sleep = scheduler.time_until_next_tick(100.0 + TICK * 1.4)
+
+        assert sleep == pytest.approx(TICK * 0.6)
+
+
+class TestBudgetAccounting:
+    """Per-match budget tests."""
+
+    @pytest.mark.asyncio
+    async def test_overrunning_match_is_flagged(self):
+        """Test a match whose tick exceeds budget is reported."""
+        now = [0.0]
+
+        async def step(game: GameState) -> None:
+            # Slow match costs 5ms, fast match costs 0.1ms
+            now[0] += 0.005 if game.lobby_id == "slow" else 0.0001
+
+        config = SchedulerConfig(shared=True, match_budget_ms=2.0)
+        scheduler = TickScheduler(step, config=config, clock=lambda: now[0])
+        for lobby_id in ("slow", "fast"):
+            game = GameState(lobby_id=lobby_id, is_running=True)
+            scheduler._games[lobby_id] = game
+            scheduler._budgets[lobby_id] = MatchBudget(lobby_id=lobby_id)
+
+        await scheduler._step_all()
+
+        stats = scheduler.get_stats()
+        assert stats["overrunning"] == ["slow"]
+        assert stats["matches"]["slow"]["overruns"] == 1
+        assert stats["matches"]["fast"]["overruns"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failing_match_is_removed(self):
+        """Test a match that raises is stopped and dropped from budget stats."""
+        stepped = []
+
+        async def step(game: GameState) -> None:
+            if game.lobby_id == "bad":
+                raise RuntimeError("boom")
+            stepped.append(game.lobby_id)
+
+        scheduler = TickScheduler(step)
+        bad = GameState(lobby_id="bad", is_running=True)
+        good = GameState(lobby_id="good", is_running=True)
+        for game in (bad, good):
+            scheduler._games[game.lobby_id] = game
+            scheduler._budgets[game.lobby_id] = MatchBudget(lobby_id=game.lobby_id)
+
+        await scheduler._step_all()
+
+        assert stepped == ["good"]
+        assert bad.is_running is False
+        assert "bad" not in scheduler._games
+        assert "bad" not in scheduler.get_stats()["matches"]
+
+
+class TestSharedTickSystem:
+    """TickSystem integration with the shared scheduler."""
+
+    @pytest.mark.asyncio
+    async def test_shared_mode_steps_all_games(self):
+        """Test one loop advances every registered game."""
+        system = TickSystem(scheduler_config=SchedulerConfig(shared=True))
+        games = [
+            system.create_game(f"lobby-{i}", f"a{i}", f"b{i}")
+            for i in range(3)
+        ]
+        for game in games:
+            system.start_game(game.lobby_id)
+
+        assert system._tasks == {}
+        await asyncio.sleep(0.1)
+
+        for game in games:
+            assert game.tick_count > 0
+        stats = system.get_scheduler_stats()
+        assert stats["games"] == 3
+
+        for game in games:
+            system.stop_game(game.lobby_id)
+        assert system.get_scheduler_stats()["games"] == 0
+        assert not system._scheduler.is_running
+
+    def test_default_mode_has_no_scheduler(self):
+        """Test per-lobby tasks remain the default."""
+        system = TickSystem()
+
+        assert system.get_scheduler_stats() is None
@@ -0,0 +1,185 @@
+"""
+Unit tests for multi-process sharded tick workers.
+
+Tests shard routing, IPC encoding, command application, and one
+end-to-end round trip through a real worker process.
+"""
+
+import asyncio
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.game.frames import split_frame
+from app.game import sharding
+from app.game.models import PlayerInput, FireInput
+from app.game.sharding import (
+    OP_SHUTDOWN,
+    OP_CREATE,
+    OP_START,
+    ShardedTickSystem,
+    apply_command,
+    decode_fire,
+    decode_input,
+    encode_fire,
+    encode_input,
+    shard_for,
+    _Shard,
+)
+from app.game.tick_system import TickSystem
+
+
+class TestShardRouting:
+    """Lobby -> shard hashing tests."""
+
+    def test_shard_is_stable(self):
+        """Test the same lobby always maps to the same shard."""
+        assert shard_for("ABCDEF", 4) == shard_for("ABCDEF", 4)
+
+    def test_shard_in_range(self):
+        """Test shards are within the worker pool."""
+        for i in range(200):
+            assert 0 <= shard_for(f"LOBBY{i}", 3) < 3
+
+    def test_lobbies_spread_across_shards(self):
+        """Test lobbies are distributed over all workers."""
+        shards = {shard_for(f"LOBBY{i}", 4) for i in range(100)}
+
+        assert shards == {0, 1, 2, 3}
+
+
+class TestIPCEncoding:
+    """Compact tuple encoding tests."""
+
+    def test_input_roundtrip(self):
+        """Test movement inputs survive encoding."""
+        original = PlayerInput(
+            player_id="p1", x=1.5, y=2.5, direction_x=1.0,
+            direction_y=-1.0, sequence=42, client_timestamp=123.0,
+        )
+
+        cmd = encode_input("LOBBY", original)
+
+        assert cmd[1] == "LOBBY"
+        assert decode_input(cmd) == original
+
+    def test_fire_roundtrip(self):
+        """Test fire inputs survive encoding."""
+        original = FireInput(
+            player_id="p1", direction_x=0.0, direction_y=1.0,
+            sequence=7, client_timestamp=99.0,
+        )
+
+        assert decode_fire(encode_fire("LOBBY", original)) == original
+
+    @pytest.mark.asyncio
+    async def test_apply_command_drives_local_system(self):
+        """Test worker-side command application."""
+        system = TickSystem()
+
+        apply_command(system, (OP_CREATE, "LOBBY", "p1", "p2", (100, 100), (900, 100), 7))
+        apply_command(system, (OP_START, "LOBBY"))
+        apply_command(system, encode_input("LOBBY", PlayerInput("p1", 110, 100, sequence=1)))
+
+        game = system._games["LOBBY"]
+        assert system.is_running("LOBBY") and system.lobby_ids() == ["LOBBY"]
+        assert len(game.pending_inputs) == 1
+        system.stop_game("LOBBY")
+        assert not system.is_running("LOBBY") and system.game_count() == 0
+
+
+class TestShardedTickSystem:
+    """Parent facade tests."""
+
+    def test_inputs_rejected_for_unknown_lobby(self):
+        """Test inputs for lobbies never created are dropped without IPC."""
+        system = ShardedTickSystem(num_workers=2)
+
+        assert system.queue_input("NOPE", PlayerInput("p1", 0, 0)) is False
+        assert system.queue_fire("NOPE", FireInput("p1", 1, 0)) is False
+        assert system.start_game("NOPE") is False
+        assert not system.is_started
+
+    def test_rewards_summary_matches_local(self):
+        """Test reward summary computed by the facade matches a local game."""
+        round_result = {
+            "answers": {"p1": "A", "p2": "B"},
+            "scores": {"p1": 900, "p2": 0},
+        }
+        local = TickSystem()
+        local.create_game("LOBBY", "p1", "p2")
+        sharded = ShardedTickSystem(num_workers=1)
+        sharded._running["LOBBY"] = False
+        sharded._send = lambda lobby_id, cmd: True
+
+        expected = local.dispatch_quiz_rewards("LOBBY", round_result, 30000)
+
+        assert sharded.dispatch_quiz_rewards("LOBBY", round_result, 30000) == expected
+
+    def test_backlogged_shard_drops_inputs(self, monkeypatch):
+        """Test inputs and fires over the backlog limit are dropped and counted, lifecycle commands are not."""
+        monkeypatch.setattr(sharding, "MAX_SHARD_BACKLOG", 4)
+        system = ShardedTickSystem(num_workers=1)
+        shard = _Shard(0, MagicMock(), MagicMock(), MagicMock())
+        system._shards = [shard]  # No sender thread: nothing drains the outbox
+        system._running["LOBBY"] = True
+
+        accepted = [system.queue_input("LOBBY", PlayerInput("p1", i, 0, sequence=i)) for i in range(6)]
+        fired = system.queue_fire("LOBBY", FireInput("p1", 1, 0))
+        system.stop_game("LOBBY")
+
+        assert accepted == [True] * 4 + [False] * 2 and fired is False
+        stats = system.get_scheduler_stats()["shards"][0]
+        assert stats["backlog"] == 5 and stats["dropped_inputs"] == 3
+
+    @pytest.mark.asyncio
+    async def test_send_does_not_block_on_full_pipe(self):
+        """Test commands are queued while the sender thread is stuck writing the pipe."""
+        system = ShardedTickSystem(num_workers=1)
+        system._loop = asyncio.get_running_loop()
+        release = threading.Event()
+        cmd_conn = MagicMock()
+        cmd_conn.send.side_effect = lambda cmd: release.wait(5)
+        shard = _Shard(0, MagicMock(), cmd_conn, MagicMock())
+        shard.sender = threading.Thread(target=system._sender_main, args=(shard,), daemon=True)
+        shard.sender.start()
+        system._shards = [shard]
+        system._running["LOBBY"] = True
+
+        for i in range(100):
+            assert system.queue_input("LOBBY", PlayerInput("p1", i, 0, sequence=i))
+        assert cmd_conn.send.call_count <= 1  # Writer blocked on the first command
+
+        release.set()
+        shard.outbox.put((OP_SHUTDOWN, ""))
+        shard.outbox.put(None)
+        shard.sender.join(5)
+        assert cmd_conn.send.call_count == 101
+
+    @pytest.mark.asyncio
+    async def test_worker_round_trip(self):
+        """Test a game runs in a worker and broadcasts back to the parent."""
+        system = ShardedTickSystem(num_workers=1)
+        received = asyncio.Queue()
+
+        async def on_broadcast(lobby_id: str, message: dict) -> None:
+            await received.put((lobby_id, message))
+
+        system.set_broadcast_callback(on_broadcast)
+        try:
+            system.create_game("LOBBY", "p1", "p2")
+            assert system.start_game("LOBBY") is True
+            assert system.queue_input("LOBBY", PlayerInput("p1", 170, 360, sequence=1))
+
+            while True:
+                lobby_id, message = await asyncio.wait_for(received.get(), timeout=30)
+                _, state = split_frame(message)
+                if state is not None:
+                    break
+
+            assert lobby_id == "LOBBY"
+            assert set(state["payload"]["players"]) == {"p1", "p2"}
+            assert system.get_arena_state("LOBBY") is not None
+        finally:
+            system.shutdown()
@@ -0,0 +1,180 @@
+"""
+Unit tests for deadline timers.
+
+Tests TimerQueue ordering, rescheduling and cancellation, the async
+DeadlineRunner, and that respawns, regen, buffs, despawns and trap
+chains fire from their timers.
+"""
+
+import asyncio
+
+import pytest
+
+from app.game.arena.hazards import HazardManager
+from app.game.arena.traps import TrapManager
+from app.game.arena.types import HazardType, TrapEffect, TrapState, TrapType
+from app.game.buffs import BuffManager, BuffType
+from app.game.combat import ServerCombatSystem
+from app.game.timers import DeadlineRunner, TimerQueue
+
+
+class TestTimerQueue:
+    """Heap semantics."""
+
+    def test_pops_due_in_deadline_order(self):
+        """Test only due keys are returned, earliest first."""
+        timers = TimerQueue()
+        timers.schedule("c", 3.0)
+        timers.schedule("a", 1.0)
+        timers.schedule("b", 2.0)
+
+        assert timers.pop_due(2.5) == ["a", "b"]
+        assert timers.pop_due(2.5) == []
+        assert len(timers) == 1
+        assert timers.next_deadline() == 3.0
+
+    def test_reschedule_replaces_deadline(self):
+        """Test scheduling a key again moves its deadline."""
+        timers = TimerQueue()
+        timers.schedule("a", 1.0)
+        timers.schedule("a", 5.0)
+
+        assert timers.pop_due(2.0) == []
+        assert timers.deadline("a") == 5.0
+        assert timers.pop_due(5.0) == ["a"]
+
+    def test_cancel(self):
+        """Test cancelled keys never fire."""
+        timers = TimerQueue()
+        timers.schedule("a", 1.0)
+
+        assert timers.cancel("a")
+        assert not timers.cancel("a")
+        assert timers.pop_due(10.0) == []
+        assert timers.next_deadline() is None
+
+    def test_stale_entries_compacted(self):
+        """Test repeated rescheduling does not grow the heap without bound."""
+        timers = TimerQueue()
+        for i in range(10_000):
+            timers.schedule("a", float(i))
+
+        assert len(timers._heap) < 200
+        assert timers.pop_due(1e9) == ["a"]
+
+
+class TestDeadlineRunner:
+    """One task for many async deadlines."""
+
+    @pytest.mark.asyncio
+    async def test_callbacks_fire_in_order(self):
+        """Test callbacks run at their deadlines and earlier ones wake the runner."""
+        runner = DeadlineRunner()
+        fired = []
+
+        async def record(name):
+            fired.append(name)
+
+        runner.call_later("slow", 0.05, lambda: record("slow"))
+        runner.call_later("fast", 0.01, lambda: record("fast"))
+        runner.call_later("cancelled", 0.02, lambda: record("cancelled"))
+        runner.cancel("cancelled")
+        await asyncio.sleep(0.1)
+
+        assert fired == ["fast", "slow"]
+        assert len(runner) == 0
+
+    @pytest.mark.asyncio
+    async def test_replace_and_restart(self):
+        """Test rescheduling a key replaces its callback and the task restarts when idle."""
+        runner = DeadlineRunner()
+        fired = []
+
+        async def record(name):
+            fired.append(name)
+
+        runner.call_later("q", 0.01, lambda: record("first"))
+        runner.call_later("q", 0.01, lambda: record("second"))
+        await asyncio.sleep(0.05)
+        runner.call_later("q", 0.01, lambda: record("third"))
+        await asyncio.sleep(0.05)
+
+        assert fired == ["second", "third"]
+
+
+class TestGameTimers:
+    """Subsystems driven by timers."""
+
+    def test_respawn_fires_from_timer(self):
+        """Test a killed player respawns once the respawn time passes."""
+        combat = ServerCombatSystem()
+        combat.init_player("p1")
+        combat.init_player("p2")
+        combat._apply_damage("p2", "p1", 200, current_time=1000.0)
+        state = combat._combat_states["p2"]
+        assert state.is_dead
+        assert "p2" not in combat._wounded
+
+        for pid in list(combat._respawns.pop_due(state.respawn_time)):
+            combat._respawn_player(pid, {"p1": (100.0, 100.0)}, state.respawn_time)
+
+        assert not state.is_dead
+        assert state.health == state.max_health
+
+    def test_only_wounded_players_regen(self):
+        """Test regen bookkeeping tracks players below max health only."""
+        combat = ServerCombatSystem()
+        combat.init_player("p1")
+        combat.init_player("p2")
+        combat._apply_damage("p2", "p1", 10, current_time=1000.0)
+
+        assert list(combat._wounded) == ["p2"]
+
+        state = combat._combat_states["p2"]
+        state.health = state.max_health
+        combat._update_health_regen("p2", (100.0, 100.0), 1 / 60, 1001.0)
+        assert not combat._wounded
+
+    def test_buff_expiry_from_timer(self):
+        """Test buffs expire at their deadline and clear_player cancels them."""
+        manager = BuffManager()
+        manager.init_player("p1")
+        manager.init_player("p2")
+        buff = manager.apply_buff("p1", BuffType.DAMAGE_BOOST, 0.2, 5.0, "test")
+        manager.apply_buff("p2", BuffType.SHIELD, 10, 5.0, "test")
+        manager.clear_player("p2")
+
+        assert manager.update(buff.expires_at - 0.1) == {}
+        assert manager.update(buff.expires_at) == {"p1": [buff]}
+        assert len(manager._expiries) == 0
+
+    def test_hazard_and_trap_despawn(self):
+        """Test despawn times remove hazards and traps, and removal cancels them."""
+        hazards = HazardManager()
+        hazards.add("h1", HazardType.DAMAGE, 0, 0, 10, 10, despawn_time=5.0)
+        hazards.add("h2", HazardType.SLOW, 0, 0, 10, 10, despawn_time=9.0)
+        hazards.remove("h2")
+        traps = TrapManager()
+        traps.add("t1", TrapType.TIMED, 0, 0, 10, TrapEffect.DAMAGE, 10, 1.0, interval=2.0, despawn_time=5.0)
+
+        hazards.check_despawns(4.9)
+        traps.check_despawns(4.9)
+        assert len(hazards.get_state()) == 1 and len(traps.get_state()) == 1
+
+        hazards.check_despawns(5.0)
+        traps.check_despawns(5.0)
+        assert hazards.get_state() == [] and traps.get_state() == []
+        assert len(hazards._despawns) == 0
+
+    def test_trap_chain_from_timer(self):
+        """Test chained traps start their warning after the chain delay."""
+        traps = TrapManager()
+        traps.add("t1", TrapType.PRESSURE, 100, 100, 20, TrapEffect.DAMAGE, 10, 1.0, chain_radius=100)
+        traps.add("t2", TrapType.PRESSURE, 150, 100, 20, TrapEffect.DAMAGE, 10, 1.0)
+        traps._queue_chains("t1", 100, current_time=10.0)
+
+        traps.process_chains(10.0 + TrapManager.CHAIN_DELAY - 0.01, {})
+        assert traps._traps["t2"].state == TrapState.ARMED
+
+        traps.process_chains(10.0 + TrapManager.CHAIN_DELAY, {})
+        assert traps._traps["t2"].state == TrapState.WARNING
@@ -0,0 +1,103 @@
+"""
+Unit tests for the vectorized projectile store.
+
+Tests parity with the dict-based combat path, order-preserving
+compaction, and capacity growth.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.game.combat import ServerCombatSystem
+from app.game.projectiles import VectorizedProjectileStore
+
+
+DT = 1 / 60
+
+
+def _fire(combat: ServerCombatSystem, player_id: str, position, direction) -> str:
+    """Fire ignoring cooldown."""
+    combat._combat_states[player_id].last_fire_time = 0
+    return combat.process_fire(player_id, position, direction, 0.0)
+
+
+def _events(combat: ServerCombatSystem) -> list:
+    return [(e.event_type, e.data) for e in combat.get_and_clear_events()]
+
+
+def _scenario(combat: ServerCombatSystem) -> None:
+    """Crossfire: both players shoot each other, walls and open space."""
+    for pid in ("p1", "p2", "p3"):
+        combat.init_player(pid)
+    for i in range(12):
+        _fire(combat, "p1", (160, 360), (1, 0))
+        _fire(combat, "p2", (400, 360), (-1, 0.01 * i))
+        _fire(combat, "p3", (640, 600), (0, -1))
+        _fire(combat, "p1", (160, 360), (1, 1))
+
+
+class TestParity:
+    """Vectorized path matches the dict path tick for tick."""
+
+    def test_events_and_state_match(self):
+        """Test hits, kills and projectile state are identical."""
+        positions = {"p1": (170.0, 360.0), "p2": (400.0, 360.0), "p3": (640.0, 600.0)}
+        scalar = ServerCombatSystem()
+        vector = ServerCombatSystem(vectorized=True)
+        _scenario(scalar)
+        _scenario(vector)
+        assert _events(scalar) == _events(vector)
+
+        for _ in range(120):
+            scalar.update(DT, positions)
+            vector.update(DT, positions)
+
+            assert _events(scalar) == _events(vector)
+            assert scalar.get_combat_state() == vector.get_combat_state()
+
+    def test_owner_is_never_hit(self):
+        """Test projectiles pass through their shooter."""
+        combat = ServerCombatSystem(vectorized=True)
+        combat.init_player("p1")
+        _fire(combat, "p1", (160, 360), (1, 0))
+
+        combat.update(DT, {"p1": (165.0, 360.0)})
+
+        assert combat.get_player_health("p1") == 100
+        assert len(combat.get_combat_state()["projectiles"]) == 1
+
+    def test_reset_clears_store(self):
+        """Test reset drops vectorized projectiles."""
+        combat = ServerCombatSystem(vectorized=True)
+        combat.init_player("p1")
+        _fire(combat, "p1", (160, 360), (1, 0))
+
+        combat.reset()
+
+        assert combat.get_combat_state()["projectiles"] == []
+
+
+class TestStore:
+    """Struct-of-arrays storage tests."""
+
+    def test_capacity_grows(self):
+        """Test adding past capacity keeps existing slots."""
+        store = VectorizedProjectileStore(capacity=2)
+        for i in range(5):
+            store.add(f"proj_{i}", "p1", float(i), 0.0, 1.0, 0.0, 0.0)
+
+        assert len(store) == 5
+        assert store.x[:5].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+    def test_compact_preserves_order(self):
+        """Test removal keeps survivors in spawn order."""
+        store = VectorizedProjectileStore()
+        for i in range(4):
+            store.add(f"proj_{i}", f"p{i % 2}", float(i), 0.0, 0.0, 0.0, 0.0)
+
+        store.compact(np.array([True, False, True, False]))
+
+        assert store.ids == ["proj_0", "proj_2"]
+        assert store.x[:2].tolist() == [0.0, 2.0]
+        assert [p["owner_id"] for p in store.get_state()] == ["p0", "p0"]
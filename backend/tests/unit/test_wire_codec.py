@@ -0,0 +1,170 @@
+"""
+Unit tests for the binary wire codec.
+
+Tests layout round trips, JSON fallback, malformed frames, and
+ConnectionManager format selection.
+"""
+
+import json
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.websocket import codec
+from app.websocket.manager import ConnectionManager
+
+
+def _state_update() -> dict:
+    return {
+        "type": "state_update",
+        "payload": {
+            "tick": 1234,
+            "timestamp": 1700000000.125,
+            "players": {
+                "p1": {"x": 160.5, "y": 360.0, "vx": 12.5, "vy": -3.0, "seq": 88},
+                "p2": {"x": 1120.0, "y": 360.0, "vx": 0.0, "vy": 0.0, "seq": 41},
+            },
+            "combat": {
+                "projectiles": [
+                    {"id": "proj_7", "owner_id": "p1", "x": 300.5, "y": 360.0, "vx": 600.0, "vy": 0.0},
+                ],
+                "players": {
+                    "p1": {"health": 100, "max_health": 100, "is_dead": False,
+                           "invulnerable": True, "is_regenerating": False},
+                    "p2": {"health": 40, "max_health": 100, "is_dead": False,
+                           "invulnerable": False, "is_regenerating": True},
+                },
+            },
+            "arena": {"hazards": [], "barriers": [{"id": "b1", "health": 80}]},
+            "buffs": {"p1": [], "p2": []},
+        },
+    }
+
+
+class TestLayouts:
+    """Encode/decode round trips."""
+
+    def test_state_update_roundtrip(self):
+        """Test snapshot fields survive the binary layout."""
+        message = _state_update()
+
+        decoded = codec.decode(codec.encode(message), client=False)
+
+        assert decoded["type"] == "state_update"
+        payload = decoded["payload"]
+        assert payload["tick"] == 1234
+        assert payload["timestamp"] == message["payload"]["timestamp"]
+        assert payload["players"]["p1"] == pytest.approx(message["payload"]["players"]["p1"])
+        assert payload["combat"]["players"] == message["payload"]["combat"]["players"]
+        assert payload["combat"]["projectiles"][0]["id"] == "proj_7"
+        assert payload["arena"] == message["payload"]["arena"]
+        assert payload["buffs"] == message["payload"]["buffs"]
+
+    def test_state_update_smaller_than_json(self):
+        """Test the binary snapshot is smaller than its JSON form."""
+        message = _state_update()
+
+        assert len(codec.encode(message)) < len(json.dumps(message))
+
+    def test_flat_event_roundtrip(self):
+        """Test a fixed-layout combat event round trips."""
+        message = {
+            "type": "combat_hit",
+            "payload": {
+                "target_id": "p2", "shooter_id": "p1",
+                "damage": 15, "base_damage": 10, "health_remaining": 85.0,
+            },
+        }
+
+        assert codec.decode(codec.encode(message), client=False) == message
+
+    def test_client_input_roundtrip(self):
+        """Test client position input decodes on the server side."""
+        message = {
+            "type": "position_update",
+            "payload": {"x": 100.0, "y": 200.0, "dx": 1.0, "dy": 0.0, "seq": 9},
+        }
+
+        assert codec.decode(codec.encode(message, client=True)) == message
+
+
+class TestFallback:
+    """Messages that must stay JSON."""
+
+    def test_unknown_type_falls_back(self):
+        """Test messages without a layout are not encoded."""
+        assert codec.encode({"type": "game_end", "payload": {"winner_id": "p1"}}) is None
+
+    def test_extra_fields_fall_back(self):
+        """Test payloads that don't match the layout exactly are not encoded."""
+        message = {"type": "position_update", "payload": {"player_id": "p1", "x": 1, "y": 2, "z": 3}}
+
+        assert codec.encode(message) is None
+
+    def test_unexpected_state_shape_falls_back(self):
+        """Test a snapshot with unknown player fields is not encoded."""
+        message = _state_update()
+        message["payload"]["players"]["p1"]["extra"] = 1
+
+        assert codec.encode(message) is None
+
+    def test_malformed_frame_raises(self):
+        """Test truncated or unknown frames raise CodecError."""
+        frame = codec.encode({"type": "state_ack", "payload": {"tick": 5}}, client=True)
+
+        with pytest.raises(codec.CodecError):
+            codec.decode(frame[:2])
+        with pytest.raises(codec.CodecError):
+            codec.decode(b"\xff")
+
+
+class TestManagerFormats:
+    """ConnectionManager picks the negotiated format per connection."""
+
+    def _socket(self) -> MagicMock:
+        ws = MagicMock()
+        ws.accept = AsyncMock()
+        ws.send_text = AsyncMock()
+        ws.send_bytes = AsyncMock()
+        return ws
+
+    @pytest.mark.asyncio
+    async def test_mixed_lobby_broadcast(self):
+        """Test binary and JSON clients each get their own format."""
+        manager = ConnectionManager()
+        binary_ws, json_ws = self._socket(), self._socket()
+        await manager.connect(binary_ws, "LOBBY", "u1", subprotocol=codec.BINARY_PROTOCOL)
+        await manager.connect(json_ws, "LOBBY", "u2", subprotocol="auth.token")
+
+        await manager.broadcast_to_lobby("LOBBY", _state_update())
+        await manager.flush()
+
+        binary_ws.send_bytes.assert_awaited_once()
+        binary_ws.send_text.assert_not_awaited()
+        json_ws.send_text.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_binary_client_gets_json_fallback(self):
+        """Test messages without a layout reach binary clients as JSON."""
+        manager = ConnectionManager()
+        ws = self._socket()
+        await manager.connect(ws, "LOBBY", "u1", subprotocol=codec.BINARY_PROTOCOL)
+
+        await manager.send_personal(ws, {"type": "game_end", "payload": {}})
+        await manager.flush()
+
+        ws.send_text.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_receive_decodes_both_formats(self):
+        """Test inbound binary and text frames decode to the same dict."""
+        manager = ConnectionManager()
+        message = {"type": "state_ack", "payload": {"tick": 42}}
+        ws = self._socket()
+        ws.receive = AsyncMock(side_effect=[
+            {"type": "websocket.receive", "bytes": codec.encode(message, client=True)},
+            {"type": "websocket.receive", "text": json.dumps(message)},
+        ])
+
+        assert await manager.receive(ws) == message
+        assert await manager.receive(ws) == message